@@ -5,10 +5,10 @@ import logging
 import os
 from functools import partial
 from typing import Any, Dict, List, Optional
-from datetime import timedelta
+from datetime import datetime, timedelta
 
 import voluptuous as vol
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.const import Platform
 from homeassistant.exceptions import HomeAssistantError, ServiceValidationError, ConfigEntryNotReady
@@ -40,10 +40,16 @@ from .const import (
     CONF_POWER_SENSOR,
     CONF_STARTUP_TIMEOUT,
     STARTUP_TIMEOUT_SEC,
+    CONF_TWO_NODE_THERMAL_MODEL,
+    DEFAULT_TWO_NODE_THERMAL_MODEL,
 )
 from .data_store import SmartClimateDataStore
+from .persistence_writer import async_get_persistence_writer, async_remove_persistence_writer
+from .forecast_cache import async_remove_forecast_cache
+from .dashboard_refresh import AdaptiveRefreshPolicy
 from .entity_waiter import EntityWaiter, EntityNotAvailableError
 from .helpers import async_wait_for_entities
+from .models import OffsetInput
 from .offset_engine import OffsetEngine
 from .seasonal_learner import SeasonalHysteresisLearner
 from .feature_engineering import FeatureEngineering
@@ -54,6 +60,7 @@ from .humidity_monitor import HumidityMonitor
 from .thermal_models import ThermalState, ThermalConstants
 from .thermal_preferences import UserPreferences, PreferenceLevel
 from .thermal_model import PassiveThermalModel
+from .thermal_two_node import TwoNodeThermalModel
 from .thermal_manager import ThermalManager
 from .thermal_sensor import SmartClimateStatusSensor
 from .probe_manager import ProbeManager
@@ -293,7 +300,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             if outdoor_sensor_id is not None:
                 try:
                     # Create seasonal learner for this entity
-                    seasonal_learner = SeasonalHysteresisLearner(hass, outdoor_sensor_id)
+                    seasonal_learner = SeasonalHysteresisLearner(
+                        hass, outdoor_sensor_id, sensor_manager=sensor_manager
+                    )
                     
                     # Store for OffsetEngine integration
                     entry_data["seasonal_learners"][entity_id] = seasonal_learner
@@ -366,6 +375,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     # Register the dashboard generation service (only once per HA instance)
     await _async_register_services(hass)
+    # Register the what-if offset prediction service (only once per HA instance)
+    await _async_register_prediction_service(hass)
     
     # Register update listener for options changes (HACS reload support)
     entry.async_on_unload(entry.add_update_listener(update_listener))
@@ -413,7 +424,13 @@ async def _async_setup_entity_persistence(hass: HomeAssistant, entry: ConfigEntr
             try:
                 _LOGGER.info("[DEBUG] Creating thermal model for entity: %s", entity_id)
                 # Phase 1: Foundation components
-                thermal_model = PassiveThermalModel(
+                # Optional second-order model for rooms with heavy thermal mass
+                thermal_model_cls = (
+                    TwoNodeThermalModel
+                    if config.get(CONF_TWO_NODE_THERMAL_MODEL, DEFAULT_TWO_NODE_THERMAL_MODEL)
+                    else PassiveThermalModel
+                )
+                thermal_model = thermal_model_cls(
                     tau_cooling=config.get("tau_cooling", 90.0),
                     tau_warming=config.get("tau_warming", 150.0)
                 )
@@ -666,23 +683,44 @@ async def _async_setup_entity_persistence(hass: HomeAssistant, entry: ConfigEntr
     
         # Create DataUpdateCoordinator for this entity
         _LOGGER.info("[DEBUG] Creating DataUpdateCoordinator for entity: %s", entity_id)
+        refresh_policy = AdaptiveRefreshPolicy()
+
         async def async_update_data():
-            """Fetch data from offset engine."""
+            """Fetch data from offset engine and adapt the next refresh to engine activity."""
             try:
                 data = await offset_engine.async_get_dashboard_data()
-                return data
             except Exception as exc:
+                refresh_policy.reset()
+                coordinator.update_interval = timedelta(seconds=refresh_policy.interval)
                 _LOGGER.error("Error fetching dashboard data for %s: %s", entity_id, exc)
                 raise UpdateFailed(f"Error fetching dashboard data: {exc}") from exc
+            try:
+                interval = refresh_policy.next_interval(offset_engine.get_dashboard_token())
+            except Exception as exc:
+                _LOGGER.debug("Dashboard activity token unavailable for %s: %s", entity_id, exc)
+                refresh_policy.reset()
+                interval = refresh_policy.interval
+            coordinator.update_interval = timedelta(seconds=interval)
+            return data
         
         coordinator = DataUpdateCoordinator(
             hass,
             _LOGGER,
             name=f"smart_climate_{entry.entry_id}_{entity_id}",
             update_method=async_update_data,
-            update_interval=timedelta(seconds=30),
+            update_interval=timedelta(seconds=refresh_policy.interval),
         )
         _LOGGER.info("[DEBUG] DataUpdateCoordinator created successfully")
+
+        def _async_engine_updated():
+            """Refresh the dashboard right away when the engine reports a state change."""
+            refresh_policy.reset()
+            coordinator.update_interval = timedelta(seconds=refresh_policy.interval)
+            hass.async_create_task(coordinator.async_request_refresh())
+
+        hass.data[DOMAIN][entry.entry_id]["unload_listeners"].append(
+            offset_engine.register_update_callback(_async_engine_updated)
+        )
         
         # Store the coordinator instance for the sensor platform to use
         _LOGGER.info("[DEBUG] Storing coordinator in hass.data for entity: %s", entity_id)
@@ -692,7 +730,8 @@ async def _async_setup_entity_persistence(hass: HomeAssistant, entry: ConfigEntr
         # 3. Try to create persistence - graceful degradation if it fails
         _LOGGER.info("[DEBUG] Creating data persistence for entity: %s", entity_id)
         try:
-            data_store = SmartClimateDataStore(hass, entity_id)
+            writer = async_get_persistence_writer(hass)
+            data_store = SmartClimateDataStore(hass, entity_id, writer=writer)
             _LOGGER.info("[DEBUG] DataStore created successfully")
             
             # Store the data store instance for the button platform to use
@@ -703,10 +742,13 @@ async def _async_setup_entity_persistence(hass: HomeAssistant, entry: ConfigEntr
             offset_engine.set_data_store(data_store)
             _LOGGER.info("[DEBUG] DataStore linked to OffsetEngine")
         
-            # 5. Load saved learning data and restore engine state
+            # 5. Load saved learning data and restore engine state; samples,
+            #    seasonal patterns and probe history hydrate in the background
             _LOGGER.info("[DEBUG] Loading learning data for entity: %s", entity_id)
             try:
-                learning_data_loaded = await offset_engine.async_load_learning_data()
+                learning_data_loaded = await offset_engine.async_load_learning_data(
+                    hydrate_in_background=True, hass=hass
+                )
                 if learning_data_loaded:
                     _LOGGER.debug("Learning data and engine state restored for entity: %s", entity_id)
                 else:
@@ -718,7 +760,9 @@ async def _async_setup_entity_persistence(hass: HomeAssistant, entry: ConfigEntr
             # 6. Set up periodic saving and store the unload callback for cleanup
             _LOGGER.info("[DEBUG] Setting up periodic save for entity: %s", entity_id)
             try:
-                unload_listener = await offset_engine.async_setup_periodic_save(hass)
+                unload_listener = await offset_engine.async_setup_periodic_save(
+                    hass, phase=writer.next_stagger_fraction()
+                )
                 hass.data[DOMAIN][entry.entry_id]["unload_listeners"].append(unload_listener)
                 _LOGGER.debug("Periodic save configured for entity: %s", entity_id)
             except Exception as exc:
@@ -809,6 +853,28 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         # Remove entry data from hass.data after successful platform unload
         hass.data[DOMAIN].pop(entry.entry_id, {})
 
+        # Drop the shared forecast cache and persistence writer with the last
+        # entry so a reload starts fresh; queued saves are written out first
+        try:
+            last_entry = not any(
+                other.entry_id in hass.data[DOMAIN]
+                for other in hass.config_entries.async_entries(DOMAIN)
+            )
+        except Exception as exc:
+            _LOGGER.warning("Error checking for remaining entries during unload: %s", exc)
+            last_entry = False
+
+        if last_entry:
+            _LOGGER.debug("Last entry unloaded, clearing shared forecast cache and persistence writer")
+            try:
+                async_remove_forecast_cache(hass)
+            except Exception as exc:
+                _LOGGER.warning("Error clearing shared forecast cache during unload: %s", exc)
+            try:
+                await async_remove_persistence_writer(hass)
+            except Exception as exc:
+                _LOGGER.warning("Error flushing persistence writer during unload: %s", exc)
+
     _LOGGER.info("Smart Climate Control unload completed for entry: %s", entry.entry_id)
     return unload_ok
 
@@ -892,6 +958,78 @@ async def handle_generate_dashboard(call: ServiceCall) -> None:
     )
 
 
+async def handle_predict_offsets(call: ServiceCall) -> ServiceResponse:
+    """Handle the predict_offsets service call.
+    
+    Evaluates a list of hypothetical conditions with the entity's
+    OffsetEngine.predict_batch() and returns the results without changing
+    any engine state.
+    """
+    hass = call.hass
+    climate_entity_id = call.data.get("climate_entity_id")
+    conditions = call.data.get("conditions", [])
+    _LOGGER.debug("Predicting %d offsets for entity: %s", len(conditions), climate_entity_id)
+
+    # Validate entity exists and belongs to this integration
+    entity_registry = er.async_get(hass)
+    entity_entry = entity_registry.async_get(climate_entity_id)
+    if not entity_entry:
+        raise ServiceValidationError(
+            f"Entity {climate_entity_id} not found"
+        )
+    if entity_entry.platform != DOMAIN:
+        raise ServiceValidationError(
+            f"Entity {climate_entity_id} is not a Smart Climate entity"
+        )
+
+    # Offset engines are keyed by the wrapped climate entity of the config entry
+    config_entry = hass.config_entries.async_get_entry(entity_entry.config_entry_id)
+    entry_data = hass.data.get(DOMAIN, {}).get(entity_entry.config_entry_id, {})
+    wrapped_entity_id = config_entry.data.get(CONF_CLIMATE_ENTITY) if config_entry else None
+    offset_engine = entry_data.get("offset_engines", {}).get(wrapped_entity_id)
+    if offset_engine is None:
+        raise ServiceValidationError(
+            f"No offset engine available for {climate_entity_id}"
+        )
+
+    now = datetime.now()
+    inputs = [
+        OffsetInput(
+            ac_internal_temp=condition["ac_internal_temp"],
+            room_temp=condition["room_temp"],
+            outdoor_temp=condition.get("outdoor_temp"),
+            mode=condition.get("mode", "none"),
+            power_consumption=condition.get("power_consumption"),
+            time_of_day=now.time(),
+            day_of_week=now.weekday(),
+            hvac_mode=condition.get("hvac_mode"),
+            indoor_humidity=condition.get("indoor_humidity"),
+            outdoor_humidity=condition.get("outdoor_humidity"),
+        )
+        for condition in conditions
+    ]
+
+    try:
+        results = offset_engine.predict_batch(inputs)
+    except Exception as exc:
+        _LOGGER.error("Failed to predict offsets for %s: %s", climate_entity_id, exc)
+        raise ServiceValidationError(
+            f"Failed to predict offsets: {exc}"
+        ) from exc
+
+    return {
+        "results": [
+            {
+                "offset": result.offset,
+                "clamped": result.clamped,
+                "reason": result.reason,
+                "confidence": result.confidence,
+            }
+            for result in results
+        ]
+    }
+
+
 async def _async_register_services(hass: HomeAssistant) -> None:
     """Register Smart Climate services."""
     if hass.services.has_service(DOMAIN, "generate_dashboard"):
@@ -916,6 +1054,45 @@ async def _async_register_services(hass: HomeAssistant) -> None:
         _LOGGER.error("Failed to register Smart Climate service: %s", exc, exc_info=True)
 
 
+async def _async_register_prediction_service(hass: HomeAssistant) -> None:
+    """Register the predict_offsets response service."""
+    if hass.services.has_service(DOMAIN, "predict_offsets"):
+        return  # Service already registered
+
+    # Define schema for predict_offsets service
+    predict_offsets_schema = vol.Schema({
+        vol.Required("climate_entity_id"): cv.entity_id,
+        vol.Required("conditions"): vol.All(
+            cv.ensure_list,
+            [
+                vol.Schema({
+                    vol.Required("ac_internal_temp"): vol.Coerce(float),
+                    vol.Required("room_temp"): vol.Coerce(float),
+                    vol.Optional("outdoor_temp"): vol.Coerce(float),
+                    vol.Optional("mode", default="none"): cv.string,
+                    vol.Optional("power_consumption"): vol.Coerce(float),
+                    vol.Optional("hvac_mode"): cv.string,
+                    vol.Optional("indoor_humidity"): vol.Coerce(float),
+                    vol.Optional("outdoor_humidity"): vol.Coerce(float),
+                })
+            ],
+        ),
+    })
+
+    try:
+        hass.services.async_register(
+            DOMAIN,
+            "predict_offsets",
+            handle_predict_offsets,
+            schema=predict_offsets_schema,
+            supports_response=SupportsResponse.ONLY,
+        )
+
+        _LOGGER.info("Smart Climate service 'predict_offsets' registered successfully")
+    except Exception as exc:
+        _LOGGER.error("Failed to register Smart Climate service: %s", exc, exc_info=True)
+
+
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Update listener for config entry options changes.
     
@@ -19,12 +19,14 @@ from homeassistant.exceptions import HomeAssistantError
 
 from .models import OffsetInput, OffsetResult, ModeAdjustments
 from .thermal_models import ThermalState
-from .const import DOMAIN, TEMP_DEVIATION_THRESHOLD, CONF_ADAPTIVE_DELAY, DEFAULT_ADAPTIVE_DELAY, CONF_PREDICTIVE, CONF_FORECAST_ENABLED, ACTIVE_HVAC_MODES, CONF_QUIET_MODE_ENABLED, DEFAULT_QUIET_MODE_ENABLED
+from .const import DOMAIN, TEMP_DEVIATION_THRESHOLD, CONF_ADAPTIVE_DELAY, DEFAULT_ADAPTIVE_DELAY, CONF_PREDICTIVE, CONF_FORECAST_ENABLED, ACTIVE_HVAC_MODES, CONF_QUIET_MODE_ENABLED, DEFAULT_QUIET_MODE_ENABLED, CONF_EVENT_DRIVEN_UPDATES, DEFAULT_EVENT_DRIVEN_UPDATES, CONF_EVENT_DEBOUNCE, DEFAULT_EVENT_DEBOUNCE, CONF_DIAGNOSTIC_ATTRIBUTES, DEFAULT_DIAGNOSTIC_ATTRIBUTES, CONF_ATTRIBUTE_REFRESH_INTERVAL, DEFAULT_ATTRIBUTE_REFRESH_INTERVAL
 from .delay_learner import DelayLearner
 from .forecast_engine import ForecastEngine
+from .forecast_cache import async_get_forecast_cache
 from .config_helpers import build_predictive_config
 from .quiet_mode_controller import QuietModeController
 from .compressor_state_analyzer import CompressorStateAnalyzer
+from .sample_store import SampleMetrics, sample_metrics_from_samples
 
 if TYPE_CHECKING:
     from .offset_engine import OffsetEngine
@@ -89,6 +91,15 @@ class SmartClimateEntity(ClimateEntity):
         self._last_total_offset = 0.0  # Track total offset for update logic
         self._manual_override = None
         
+        # Slow-changing state attributes, reused between state writes until stale
+        self._diagnostic_attributes = config.get(CONF_DIAGNOSTIC_ATTRIBUTES, DEFAULT_DIAGNOSTIC_ATTRIBUTES)
+        self._attribute_refresh_interval = config.get(
+            CONF_ATTRIBUTE_REFRESH_INTERVAL, DEFAULT_ATTRIBUTE_REFRESH_INTERVAL
+        )
+        self._slow_attributes: Optional[dict] = None
+        self._slow_attributes_token = None
+        self._slow_attributes_time = 0.0
+        
         # Track availability state changes
         self._was_unavailable = False
         self._last_availability_state = None  # Will be set on first availability check
@@ -779,7 +790,36 @@ class SmartClimateEntity(ClimateEntity):
     
     @property
     def extra_state_attributes(self):
-        """Return the state attributes."""
+        """Return the state attributes.
+        
+        Fast-changing attributes are rebuilt on every state write. The
+        slow-changing learning and diagnostic attributes are reused until
+        the attribute refresh interval elapsed or the offset engine's
+        learning generation changed.
+        """
+        attributes = self._build_fast_attributes()
+        attributes.update(self._get_slow_attributes())
+        
+        if not self._diagnostic_attributes:
+            return attributes
+        
+        # Event-driven update trigger counts and latency histograms
+        if self._config.get(CONF_EVENT_DRIVEN_UPDATES, DEFAULT_EVENT_DRIVEN_UPDATES):
+            try:
+                attributes["event_updates"] = self._coordinator.get_event_update_metrics()
+            except Exception as exc:
+                _LOGGER.debug("Error getting event update metrics: %s", exc)
+
+        # Update pipeline stage timings of the last coordinator update
+        stage_timings = getattr(self._coordinator.data, "stage_timings_ms", None)
+        if isinstance(stage_timings, dict):
+            attributes["update_stage_timings_ms"] = stage_timings
+            attributes["update_stage_cache_hits"] = self._coordinator.data.stage_cache_hits
+
+        return attributes
+    
+    def _build_fast_attributes(self) -> dict:
+        """Build the attributes that change with every coordinator update."""
         attributes = {}
         
         # Get predictive offset and strategy info
@@ -807,6 +847,95 @@ class SmartClimateEntity(ClimateEntity):
             attributes["quiet_mode_enabled"] = self._quiet_mode_enabled
             attributes["quiet_mode_suppressions"] = self._quiet_mode_controller.get_suppression_count()
         
+        # Add outlier detection data (Phase 2)
+        try:
+            # Add is_outlier status
+            attributes["is_outlier"] = self.outlier_detected
+            
+            # Add comprehensive outlier_statistics from coordinator data as per c_architecture.md Section 9.3
+            if self._coordinator is not None and hasattr(self._coordinator, 'data'):
+                coordinator_stats = getattr(self._coordinator.data, 'outlier_statistics', {})
+                
+                # Build comprehensive outlier statistics with all required keys
+                outlier_statistics = {
+                    "detected_outliers": coordinator_stats.get("detected_outliers", 0),
+                    "filtered_samples": coordinator_stats.get("filtered_samples", 0),
+                    "outlier_rate": coordinator_stats.get("outlier_rate", 0.0),
+                    "temperature_history_size": coordinator_stats.get("temperature_history_size", 0),
+                    "power_history_size": coordinator_stats.get("power_history_size", 0),
+                }
+                
+                # Ensure data types are correct
+                outlier_statistics["detected_outliers"] = int(outlier_statistics["detected_outliers"])
+                outlier_statistics["filtered_samples"] = int(outlier_statistics["filtered_samples"])
+                outlier_statistics["outlier_rate"] = float(outlier_statistics["outlier_rate"])
+                outlier_statistics["temperature_history_size"] = int(outlier_statistics["temperature_history_size"])
+                outlier_statistics["power_history_size"] = int(outlier_statistics["power_history_size"])
+                
+                attributes["outlier_statistics"] = outlier_statistics
+            else:
+                # Provide safe defaults when coordinator data not available
+                attributes["outlier_statistics"] = {
+                    "detected_outliers": 0,
+                    "filtered_samples": 0,
+                    "outlier_rate": 0.0,
+                    "temperature_history_size": 0,
+                    "power_history_size": 0,
+                }
+        except Exception as exc:
+            _LOGGER.warning("Error getting outlier detection attributes: %s", exc)
+            # Provide safe fallbacks on error with all required keys
+            attributes.update({
+                "is_outlier": False,
+                "outlier_statistics": {
+                    "detected_outliers": 0,
+                    "filtered_samples": 0,
+                    "outlier_rate": 0.0,
+                    "temperature_history_size": 0,
+                    "power_history_size": 0,
+                },
+            })
+        
+        return attributes
+    
+    def _get_slow_attributes(self) -> dict:
+        """Return the slow-changing attributes, recomputing them only when stale.
+        
+        An unchanged result keeps the previous dict, so consecutive state
+        writes carry identical attribute values.
+        """
+        now = time.monotonic()
+        token = self._get_attribute_generation()
+        if (
+            self._slow_attributes is not None
+            and token == self._slow_attributes_token
+            and now - self._slow_attributes_time < self._attribute_refresh_interval
+        ):
+            return self._slow_attributes
+        
+        attributes = self._build_slow_attributes()
+        if attributes != self._slow_attributes:
+            self._slow_attributes = attributes
+        self._slow_attributes_token = token
+        self._slow_attributes_time = now
+        return self._slow_attributes
+    
+    def _get_attribute_generation(self):
+        """Return the offset engine's learning generation token.
+        
+        Engines without a token get a fresh object, so their slow
+        attributes are recomputed on every state write.
+        """
+        get_token = getattr(self._offset_engine, "get_offset_cache_token", None)
+        token = get_token() if callable(get_token) else None
+        if not isinstance(token, tuple):
+            return object()
+        return token
+    
+    def _build_slow_attributes(self) -> dict:
+        """Build the learning and diagnostic attributes that change slowly."""
+        attributes = {}
+        
         # Phase 1: Core Intelligence Attributes (v1.3.0+)
         
         # 1. Adaptive Delay - Current adaptive feedback delay in seconds
@@ -898,6 +1027,18 @@ class SmartClimateEntity(ClimateEntity):
                 "hysteresis_cycle_count": 0,
             })
         
+        if not self._diagnostic_attributes:
+            return attributes
+        
+        # Shared forecast cache hit/miss counts and fetch latency
+        if self._forecast_engine and hasattr(self._forecast_engine, "get_cache_metrics"):
+            try:
+                cache_metrics = self._forecast_engine.get_cache_metrics()
+                if isinstance(cache_metrics, dict):
+                    attributes["forecast_cache"] = cache_metrics
+            except Exception as exc:
+                _LOGGER.debug("Error getting forecast cache metrics: %s", exc)
+        
         # Add performance analytics attributes (Phase 2)
         try:
             attributes.update({
@@ -970,55 +1111,6 @@ class SmartClimateEntity(ClimateEntity):
                 "r_squared": 0.0,
             })
         
-        # Add outlier detection data (Phase 2)
-        try:
-            # Add is_outlier status
-            attributes["is_outlier"] = self.outlier_detected
-            
-            # Add comprehensive outlier_statistics from coordinator data as per c_architecture.md Section 9.3
-            if self._coordinator is not None and hasattr(self._coordinator, 'data'):
-                coordinator_stats = getattr(self._coordinator.data, 'outlier_statistics', {})
-                
-                # Build comprehensive outlier statistics with all required keys
-                outlier_statistics = {
-                    "detected_outliers": coordinator_stats.get("detected_outliers", 0),
-                    "filtered_samples": coordinator_stats.get("filtered_samples", 0),
-                    "outlier_rate": coordinator_stats.get("outlier_rate", 0.0),
-                    "temperature_history_size": coordinator_stats.get("temperature_history_size", 0),
-                    "power_history_size": coordinator_stats.get("power_history_size", 0),
-                }
-                
-                # Ensure data types are correct
-                outlier_statistics["detected_outliers"] = int(outlier_statistics["detected_outliers"])
-                outlier_statistics["filtered_samples"] = int(outlier_statistics["filtered_samples"])
-                outlier_statistics["outlier_rate"] = float(outlier_statistics["outlier_rate"])
-                outlier_statistics["temperature_history_size"] = int(outlier_statistics["temperature_history_size"])
-                outlier_statistics["power_history_size"] = int(outlier_statistics["power_history_size"])
-                
-                attributes["outlier_statistics"] = outlier_statistics
-            else:
-                # Provide safe defaults when coordinator data not available
-                attributes["outlier_statistics"] = {
-                    "detected_outliers": 0,
-                    "filtered_samples": 0,
-                    "outlier_rate": 0.0,
-                    "temperature_history_size": 0,
-                    "power_history_size": 0,
-                }
-        except Exception as exc:
-            _LOGGER.warning("Error getting outlier detection attributes: %s", exc)
-            # Provide safe fallbacks on error with all required keys
-            attributes.update({
-                "is_outlier": False,
-                "outlier_statistics": {
-                    "detected_outliers": 0,
-                    "filtered_samples": 0,
-                    "outlier_rate": 0.0,
-                    "temperature_history_size": 0,
-                    "power_history_size": 0,
-                },
-            })
-        
         return attributes
 
     @property
@@ -2057,6 +2149,10 @@ class SmartClimateEntity(ClimateEntity):
             self._coordinator.async_add_listener(self._handle_coordinator_update)
         )
         
+        # Recompute on sensor and wrapped climate state changes in event-driven mode
+        if self._config.get(CONF_EVENT_DRIVEN_UPDATES, DEFAULT_EVENT_DRIVEN_UPDATES):
+            self.async_on_remove(self._coordinator.async_setup_event_triggers())
+        
         # Log full debug state for troubleshooting
         debug_info = self.debug_state()
         entity_id = getattr(self, 'entity_id', self.unique_id)
@@ -2260,7 +2356,12 @@ class SmartClimateEntity(ClimateEntity):
             # Check if we have a cached latency value
             if hasattr(self, '_last_prediction_latency_ms') and self._last_prediction_latency_ms is not None:
                 return float(self._last_prediction_latency_ms)
-            
+
+            # Last calculate_offset() duration measured by the offset engine
+            engine_latency = getattr(self._offset_engine, '_last_prediction_latency_ms', None)
+            if isinstance(engine_latency, (int, float)):
+                return round(float(engine_latency), 3)
+
             # Return 0.0 if no cached value (avoid expensive measurement on every call)
             return 0.0
         except Exception as exc:
@@ -2640,6 +2741,27 @@ class SmartClimateEntity(ClimateEntity):
     
     # Phase 6: Advanced Algorithm Metrics Methods
     
+    def _get_metrics_snapshot(self) -> SampleMetrics:
+        """Return the learner's algorithm metrics snapshot.
+        
+        The learner computes it in one pass over its samples and reuses it
+        until they change, so the attributes below share that computation
+        with the dashboard coordinator and algorithm sensors.
+        """
+        learner = getattr(self._offset_engine, '_learner', None)
+        if learner is None:
+            return SampleMetrics()
+        
+        snapshot = learner.get_metrics_snapshot() if hasattr(learner, 'get_metrics_snapshot') else None
+        if isinstance(snapshot, SampleMetrics):
+            return snapshot
+        
+        # Learners without a snapshot of their own: compute from the raw samples
+        return sample_metrics_from_samples(
+            getattr(learner, '_enhanced_samples', []),
+            getattr(learner, '_temp_correlation_data', []),
+        )
+    
     def _calculate_correlation_coefficient(self) -> float:
         """Calculate data correlation coefficient between temperature and offset.
         
@@ -2647,41 +2769,7 @@ class SmartClimateEntity(ClimateEntity):
             float: Correlation coefficient (-1.0 to 1.0)
         """
         try:
-            if (not hasattr(self._offset_engine, '_learner') or 
-                self._offset_engine._learner is None or
-                not hasattr(self._offset_engine._learner, '_temp_correlation_data')):
-                return 0.0
-            
-            temp_data = self._offset_engine._learner._temp_correlation_data
-            if len(temp_data) < 2:
-                return 0.0
-            
-            # Extract temperature and offset pairs
-            temperatures = [item["outdoor_temp"] for item in temp_data]
-            offsets = [item["offset"] for item in temp_data]
-            
-            # Calculate correlation coefficient
-            try:
-                import numpy as np
-                correlation_matrix = np.corrcoef(temperatures, offsets)
-                return float(correlation_matrix[0, 1])
-            except ImportError:
-                # Manual correlation calculation if numpy unavailable
-                n = len(temperatures)
-                if n < 2:
-                    return 0.0
-                
-                temp_mean = sum(temperatures) / n
-                offset_mean = sum(offsets) / n
-                
-                numerator = sum((t - temp_mean) * (o - offset_mean) for t, o in zip(temperatures, offsets))
-                temp_var = sum((t - temp_mean) ** 2 for t in temperatures)
-                offset_var = sum((o - offset_mean) ** 2 for o in offsets)
-                
-                denominator = (temp_var * offset_var) ** 0.5
-                
-                return numerator / denominator if denominator != 0 else 0.0
-                
+            return self._get_metrics_snapshot().correlation_coefficient
         except Exception as exc:
             _LOGGER.debug("Error calculating correlation coefficient: %s", exc)
             return 0.0
@@ -2693,21 +2781,7 @@ class SmartClimateEntity(ClimateEntity):
             float: Variance of predictions
         """
         try:
-            if (not hasattr(self._offset_engine, '_learner') or 
-                self._offset_engine._learner is None or
-                not hasattr(self._offset_engine._learner, '_enhanced_samples')):
-                return 0.0
-            
-            samples = self._offset_engine._learner._enhanced_samples
-            if len(samples) < 2:
-                return 0.0
-            
-            predictions = [sample.get("predicted", 0.0) for sample in samples]
-            
-            # Calculate variance using statistics module
-            import statistics
-            return statistics.variance(predictions)
-            
+            return self._get_metrics_snapshot().prediction_variance
         except Exception as exc:
             _LOGGER.debug("Error calculating prediction variance: %s", exc)
             return 0.0
@@ -2719,53 +2793,7 @@ class SmartClimateEntity(ClimateEntity):
             float: Entropy value (bits)
         """
         try:
-            if (not hasattr(self._offset_engine, '_learner') or 
-                self._offset_engine._learner is None or
-                not hasattr(self._offset_engine._learner, '_enhanced_samples')):
-                return 0.0
-            
-            samples = self._offset_engine._learner._enhanced_samples
-            if len(samples) < 2:
-                return 0.0
-            
-            predictions = [sample.get("predicted", 0.0) for sample in samples]
-            
-            # Create histogram for entropy calculation
-            # Bin predictions into discrete ranges for probability distribution
-            import statistics
-            import math
-            
-            if len(set(predictions)) == 1:
-                return 0.0  # No entropy for identical predictions
-            
-            # Create bins based on prediction range
-            min_pred = min(predictions)
-            max_pred = max(predictions)
-            range_pred = max_pred - min_pred
-            
-            if range_pred == 0:
-                return 0.0
-            
-            # Use 10 bins for entropy calculation
-            num_bins = min(10, len(predictions))
-            bin_size = range_pred / num_bins
-            
-            # Count predictions in each bin
-            bin_counts = [0] * num_bins
-            for pred in predictions:
-                bin_idx = min(int((pred - min_pred) / bin_size), num_bins - 1)
-                bin_counts[bin_idx] += 1
-            
-            # Calculate entropy
-            total_count = len(predictions)
-            entropy = 0.0
-            for count in bin_counts:
-                if count > 0:
-                    probability = count / total_count
-                    entropy -= probability * math.log2(probability)
-            
-            return entropy
-            
+            return self._get_metrics_snapshot().model_entropy
         except Exception as exc:
             _LOGGER.debug("Error calculating model entropy: %s", exc)
             return 0.0
@@ -2795,33 +2823,7 @@ class SmartClimateEntity(ClimateEntity):
             float: Momentum factor (0.0 to 1.0)
         """
         try:
-            if (not hasattr(self._offset_engine, '_learner') or 
-                self._offset_engine._learner is None or
-                not hasattr(self._offset_engine._learner, '_enhanced_samples')):
-                return 0.0
-            
-            samples = self._offset_engine._learner._enhanced_samples
-            if len(samples) < 3:
-                return 0.0
-            
-            # Calculate prediction errors to assess stability
-            errors = [abs(sample.get("predicted", 0.0) - sample.get("actual", 0.0)) for sample in samples]
-            
-            # Calculate coefficient of variation (std dev / mean) as stability measure
-            import statistics
-            mean_error = statistics.mean(errors)
-            if mean_error == 0:
-                return 1.0  # Perfect stability
-            
-            std_error = statistics.stdev(errors) if len(errors) > 1 else 0.0
-            cv = std_error / mean_error
-            
-            # Convert to momentum factor (lower CV = higher momentum)
-            # CV of 0 = momentum 1.0, CV of 1+ = momentum approaches 0
-            momentum = max(0.0, min(1.0, 1.0 / (1.0 + cv)))
-            
-            return momentum
-            
+            return self._get_metrics_snapshot().momentum_factor
         except Exception as exc:
             _LOGGER.debug("Error calculating momentum factor: %s", exc)
             return 0.0
@@ -2833,30 +2835,7 @@ class SmartClimateEntity(ClimateEntity):
             float: Regularization parameter
         """
         try:
-            if (not hasattr(self._offset_engine, '_learner') or 
-                self._offset_engine._learner is None or
-                not hasattr(self._offset_engine._learner, '_enhanced_samples')):
-                return 0.0
-            
-            samples = self._offset_engine._learner._enhanced_samples
-            if len(samples) < 2:
-                return 0.0
-            
-            # Calculate prediction variance
-            predictions = [sample.get("predicted", 0.0) for sample in samples]
-            
-            import statistics
-            variance = statistics.variance(predictions)
-            
-            # Higher variance requires stronger regularization
-            # Scale variance to reasonable regularization range (0.001 to 0.1)
-            base_regularization = 0.001
-            variance_factor = min(1.0, variance / 2.0)  # Normalize variance
-            
-            regularization = base_regularization + (variance_factor * 0.099)
-            
-            return regularization
-            
+            return self._get_metrics_snapshot().regularization_strength
         except Exception as exc:
             _LOGGER.debug("Error calculating regularization strength: %s", exc)
             return 0.0
@@ -2868,21 +2847,7 @@ class SmartClimateEntity(ClimateEntity):
             float: Mean squared error
         """
         try:
-            if (not hasattr(self._offset_engine, '_learner') or 
-                self._offset_engine._learner is None or
-                not hasattr(self._offset_engine._learner, '_enhanced_samples')):
-                return 0.0
-            
-            samples = self._offset_engine._learner._enhanced_samples
-            if len(samples) == 0:
-                return 0.0
-            
-            # Calculate MSE from prediction errors
-            squared_errors = [(sample.get("predicted", 0.0) - sample.get("actual", 0.0)) ** 2 for sample in samples]
-            
-            import statistics
-            return statistics.mean(squared_errors)
-            
+            return self._get_metrics_snapshot().mean_squared_error
         except Exception as exc:
             _LOGGER.debug("Error calculating mean squared error: %s", exc)
             return 0.0
@@ -2894,21 +2859,7 @@ class SmartClimateEntity(ClimateEntity):
             float: Mean absolute error
         """
         try:
-            if (not hasattr(self._offset_engine, '_learner') or 
-                self._offset_engine._learner is None or
-                not hasattr(self._offset_engine._learner, '_enhanced_samples')):
-                return 0.0
-            
-            samples = self._offset_engine._learner._enhanced_samples
-            if len(samples) == 0:
-                return 0.0
-            
-            # Calculate MAE from prediction errors
-            absolute_errors = [abs(sample.get("predicted", 0.0) - sample.get("actual", 0.0)) for sample in samples]
-            
-            import statistics
-            return statistics.mean(absolute_errors)
-            
+            return self._get_metrics_snapshot().mean_absolute_error
         except Exception as exc:
             _LOGGER.debug("Error calculating mean absolute error: %s", exc)
             return 0.0
@@ -2920,36 +2871,7 @@ class SmartClimateEntity(ClimateEntity):
             float: R² value (can be negative for poor fits)
         """
         try:
-            if (not hasattr(self._offset_engine, '_learner') or 
-                self._offset_engine._learner is None or
-                not hasattr(self._offset_engine._learner, '_enhanced_samples')):
-                return 0.0
-            
-            samples = self._offset_engine._learner._enhanced_samples
-            if len(samples) < 2:
-                return 0.0
-            
-            actual_values = [sample.get("actual", 0.0) for sample in samples]
-            predicted_values = [sample.get("predicted", 0.0) for sample in samples]
-            
-            # Calculate R²
-            import statistics
-            actual_mean = statistics.mean(actual_values)
-            
-            # Total sum of squares (variance in actual values)
-            ss_total = sum((actual - actual_mean) ** 2 for actual in actual_values)
-            
-            # Residual sum of squares (prediction errors)
-            ss_residual = sum((actual - predicted) ** 2 for actual, predicted in zip(actual_values, predicted_values))
-            
-            # R² = 1 - (SS_res / SS_tot)
-            if ss_total == 0:
-                return 1.0 if ss_residual == 0 else 0.0
-            
-            r_squared = 1.0 - (ss_residual / ss_total)
-            
-            return r_squared
-            
+            return self._get_metrics_snapshot().r_squared
         except Exception as exc:
             _LOGGER.debug("Error calculating R²: %s", exc)
             return 0.0
@@ -3272,7 +3194,7 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
         if CONF_PREDICTIVE in config:
             _LOGGER.info("Legacy predictive configuration found. Initializing ForecastEngine.")
             try:
-                forecast_engine = ForecastEngine(hass, config[CONF_PREDICTIVE])
+                forecast_engine = ForecastEngine(hass, config[CONF_PREDICTIVE], forecast_cache=async_get_forecast_cache(hass))
                 _LOGGER.debug("ForecastEngine created successfully from legacy config")
             except Exception as exc:
                 _LOGGER.error("Failed to initialize ForecastEngine: %s", exc)
@@ -3285,7 +3207,7 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
             
             if predictive_config:
                 try:
-                    forecast_engine = ForecastEngine(hass, predictive_config)
+                    forecast_engine = ForecastEngine(hass, predictive_config, forecast_cache=async_get_forecast_cache(hass))
                     _LOGGER.debug("ForecastEngine created successfully from flat config")
                 except Exception as exc:
                     _LOGGER.error("Failed to initialize ForecastEngine: %s", exc)
@@ -3329,7 +3251,9 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
             cycle_monitor=thermal_components.get("cycle_monitor"),
             comfort_band_controller=thermal_components.get("comfort_band_controller"),
             wrapped_entity_id=config["climate_entity"],
-            entity_id=climate_entity_id  # Pass the actual Smart Climate entity ID
+            entity_id=climate_entity_id,  # Pass the actual Smart Climate entity ID
+            event_driven=config.get(CONF_EVENT_DRIVEN_UPDATES, DEFAULT_EVENT_DRIVEN_UPDATES),
+            event_debounce=config.get(CONF_EVENT_DEBOUNCE, DEFAULT_EVENT_DEBOUNCE)
         )
         
         # Wire the forecast engine to the offset engine for dashboard data
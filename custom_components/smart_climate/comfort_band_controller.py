@@ -1,7 +1,7 @@
 """ABOUTME: Comfort band controller for thermal efficiency operating windows.
 ABOUTME: Calculates operating windows and AC run decisions with predictive cooling."""
 
-from typing import Optional, Tuple
+from typing import Optional, Sequence, Tuple
 from .thermal_model import PassiveThermalModel
 from .thermal_preferences import UserPreferences
 
@@ -64,7 +64,8 @@ class ComfortBandController:
         operating_window: Tuple[float, float],
         hvac_mode: Optional[str],
         outdoor_temp: Optional[float] = None,
-        prediction_minutes: Optional[int] = None
+        prediction_minutes: Optional[int] = None,
+        outdoor_forecast: Optional[Sequence[float]] = None
     ) -> bool:
         """
         Determine if AC should run based on current conditions and predictions.
@@ -79,6 +80,9 @@ class ComfortBandController:
             hvac_mode: "heat", "cool", "auto", or None
             outdoor_temp: Current outdoor temperature for predictions (optional)
             prediction_minutes: Minutes ahead to predict (optional)
+            outdoor_forecast: Hourly outdoor temperatures starting now (optional).
+                When given, the whole predicted trajectory is checked against
+                the window instead of only its end point.
             
         Returns:
             True if AC should run, False otherwise
@@ -109,12 +113,22 @@ class ComfortBandController:
             if confidence >= self._preferences.confidence_threshold:
                 # Predict future temperature
                 is_cooling_scenario = hvac_mode != "heat"  # Cooling for cool/auto/None
-                predicted_temp = self._thermal_model.predict_drift(
-                    current=current_temp,
-                    outdoor=outdoor_temp,
-                    minutes=prediction_minutes,
-                    is_cooling=is_cooling_scenario
-                )
+                if outdoor_forecast:
+                    # Extreme of the trajectory, one point per minute of the horizon
+                    curve = self._thermal_model.predict_drift_curve(
+                        current=current_temp,
+                        outdoor_series=outdoor_forecast,
+                        minutes_grid=range(prediction_minutes + 1),
+                        is_cooling=is_cooling_scenario
+                    )
+                    predicted_temp = float(curve.min() if hvac_mode == "heat" else curve.max())
+                else:
+                    predicted_temp = self._thermal_model.predict_drift(
+                        current=current_temp,
+                        outdoor=outdoor_temp,
+                        minutes=prediction_minutes,
+                        is_cooling=is_cooling_scenario
+                    )
                 
                 # Check if prediction would exceed window bounds
                 if hvac_mode == "heat":
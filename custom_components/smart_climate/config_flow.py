@@ -157,6 +157,34 @@ from .const import (
     # Entity availability waiting imports
     CONF_STARTUP_TIMEOUT,
     STARTUP_TIMEOUT_SEC,
+    # Event-driven coordinator updates
+    CONF_EVENT_DRIVEN_UPDATES,
+    CONF_EVENT_DEBOUNCE,
+    DEFAULT_EVENT_DRIVEN_UPDATES,
+    DEFAULT_EVENT_DEBOUNCE,
+    # Climate entity state attributes
+    CONF_DIAGNOSTIC_ATTRIBUTES,
+    CONF_ATTRIBUTE_REFRESH_INTERVAL,
+    DEFAULT_DIAGNOSTIC_ATTRIBUTES,
+    DEFAULT_ATTRIBUTE_REFRESH_INTERVAL,
+    # Compact telemetry imports
+    CONF_COMPACT_TELEMETRY,
+    CONF_TELEMETRY_INTERVALS,
+    DEFAULT_COMPACT_TELEMETRY,
+    DEFAULT_TELEMETRY_INTERVALS,
+    TELEMETRY_INTERVAL_OPTION_PREFIX,
+    MAX_TELEMETRY_INTERVAL,
+    # Latency instrumentation imports
+    CONF_LATENCY_INSTRUMENTATION,
+    DEFAULT_LATENCY_INSTRUMENTATION,
+    # Probe early stop imports
+    CONF_PROBE_EARLY_STOP,
+    CONF_PROBE_TAU_INTERVAL_WIDTH,
+    DEFAULT_PROBE_EARLY_STOP,
+    DEFAULT_PROBE_TAU_INTERVAL_WIDTH,
+    # Two-node thermal model imports
+    CONF_TWO_NODE_THERMAL_MODEL,
+    DEFAULT_TWO_NODE_THERMAL_MODEL,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -943,6 +971,60 @@ class SmartClimateOptionsFlow(config_entries.OptionsFlow):
                 
         return cleaned
 
+    def _get_telemetry_schema(self, current_config: dict, current_options: dict) -> Dict[Any, Any]:
+        """Return compact telemetry fields, one publish interval per sensor group."""
+        saved_intervals = current_options.get(CONF_TELEMETRY_INTERVALS, current_config.get(CONF_TELEMETRY_INTERVALS))
+        if not isinstance(saved_intervals, dict):
+            saved_intervals = {}
+        
+        schema = {
+            vol.Optional(
+                CONF_COMPACT_TELEMETRY,
+                default=current_options.get(CONF_COMPACT_TELEMETRY, current_config.get(CONF_COMPACT_TELEMETRY, DEFAULT_COMPACT_TELEMETRY))
+            ): selector.BooleanSelector(),
+        }
+        for group, default_interval in DEFAULT_TELEMETRY_INTERVALS.items():
+            schema[vol.Optional(
+                f"{TELEMETRY_INTERVAL_OPTION_PREFIX}{group}",
+                default=saved_intervals.get(group, default_interval)
+            )] = selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0,
+                    max=MAX_TELEMETRY_INTERVAL,
+                    step=30,
+                    unit_of_measurement="seconds",
+                    mode=selector.NumberSelectorMode.BOX,
+                )
+            )
+        return schema
+
+    def _collect_telemetry_intervals(self, user_input: Dict[str, Any]) -> Dict[str, str]:
+        """Fold the per-group interval fields into CONF_TELEMETRY_INTERVALS.
+        
+        Returns:
+            Form errors keyed by field; empty when all intervals are valid
+        """
+        errors = {}
+        intervals = {}
+        for group in DEFAULT_TELEMETRY_INTERVALS:
+            field = f"{TELEMETRY_INTERVAL_OPTION_PREFIX}{group}"
+            if field not in user_input:
+                continue
+            value = user_input.pop(field)
+            try:
+                interval = int(float(value))
+            except (TypeError, ValueError):
+                errors[field] = "invalid_telemetry_interval"
+                continue
+            if not 0 <= interval <= MAX_TELEMETRY_INTERVAL:
+                errors[field] = "invalid_telemetry_interval"
+                continue
+            intervals[group] = interval
+        
+        if intervals:
+            user_input[CONF_TELEMETRY_INTERVALS] = intervals
+        return errors
+
     def _get_advanced_schema(self) -> vol.Schema:
         """Return advanced settings schema for custom profile."""
         current_options = self.config_entry.options
@@ -988,11 +1070,15 @@ class SmartClimateOptionsFlow(config_entries.OptionsFlow):
 
     async def async_step_init(self, user_input: Optional[Dict[str, Any]] = None) -> FlowResult:
         """Handle options flow."""
+        errors = {}
         if user_input is not None:
             # Clean up empty string entity IDs to None
             cleaned_input = self._clean_entity_ids(user_input)
+            errors = self._collect_telemetry_intervals(cleaned_input)
             
-            if cleaned_input.get(CONF_LEARNING_PROFILE) == "custom":
+            if errors:
+                _LOGGER.debug("Invalid telemetry intervals in options: %s", errors)
+            elif cleaned_input.get(CONF_LEARNING_PROFILE) == "custom":
                 # Store basic settings and move to advanced
                 self._basic_settings = cleaned_input
                 return await self.async_step_advanced()
@@ -1059,6 +1145,22 @@ class SmartClimateOptionsFlow(config_entries.OptionsFlow):
                     mode=selector.NumberSelectorMode.BOX,
                 )
             ),
+            vol.Optional(
+                CONF_EVENT_DRIVEN_UPDATES,
+                default=current_options.get(CONF_EVENT_DRIVEN_UPDATES, current_config.get(CONF_EVENT_DRIVEN_UPDATES, DEFAULT_EVENT_DRIVEN_UPDATES))
+            ): selector.BooleanSelector(),
+            vol.Optional(
+                CONF_EVENT_DEBOUNCE,
+                default=current_options.get(CONF_EVENT_DEBOUNCE, current_config.get(CONF_EVENT_DEBOUNCE, DEFAULT_EVENT_DEBOUNCE))
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0.5,
+                    max=30.0,
+                    step=0.5,
+                    unit_of_measurement="seconds",
+                    mode=selector.NumberSelectorMode.BOX,
+                )
+            ),
             vol.Optional(
                 CONF_ML_ENABLED,
                 default=current_options.get(CONF_ML_ENABLED, current_config.get(CONF_ML_ENABLED, DEFAULT_ML_ENABLED))
@@ -1322,6 +1424,28 @@ class SmartClimateOptionsFlow(config_entries.OptionsFlow):
                 )
             ),
             
+            # Climate entity state attributes
+            vol.Optional(
+                CONF_DIAGNOSTIC_ATTRIBUTES,
+                default=current_options.get(CONF_DIAGNOSTIC_ATTRIBUTES, current_config.get(CONF_DIAGNOSTIC_ATTRIBUTES, DEFAULT_DIAGNOSTIC_ATTRIBUTES))
+            ): selector.BooleanSelector(),
+            vol.Optional(
+                CONF_ATTRIBUTE_REFRESH_INTERVAL,
+                default=current_options.get(CONF_ATTRIBUTE_REFRESH_INTERVAL, current_config.get(CONF_ATTRIBUTE_REFRESH_INTERVAL, DEFAULT_ATTRIBUTE_REFRESH_INTERVAL))
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0,
+                    max=600,
+                    step=10,
+                    unit_of_measurement="seconds",
+                    mode=selector.NumberSelectorMode.BOX,
+                )
+            ),
+            vol.Optional(
+                CONF_LATENCY_INSTRUMENTATION,
+                default=current_options.get(CONF_LATENCY_INSTRUMENTATION, current_config.get(CONF_LATENCY_INSTRUMENTATION, DEFAULT_LATENCY_INSTRUMENTATION))
+            ): selector.BooleanSelector(),
+            
             # Weather forecast configuration
             vol.Optional(
                 CONF_FORECAST_ENABLED,
@@ -1507,6 +1631,7 @@ class SmartClimateOptionsFlow(config_entries.OptionsFlow):
         
         # Combine the schemas
         combined_schema_dict = dict(existing_schema.schema)
+        combined_schema_dict.update(self._get_telemetry_schema(current_config, current_options))
         combined_schema_dict.update(probe_scheduler_schema.schema)
         data_schema = vol.Schema(combined_schema_dict)
         
@@ -1551,6 +1676,21 @@ class SmartClimateOptionsFlow(config_entries.OptionsFlow):
                         mode=selector.NumberSelectorMode.BOX,
                     )
                 ),
+                vol.Optional(
+                    CONF_PROBE_EARLY_STOP,
+                    default=current_options.get(CONF_PROBE_EARLY_STOP, current_config.get(CONF_PROBE_EARLY_STOP, DEFAULT_PROBE_EARLY_STOP))
+                ): selector.BooleanSelector(),
+                vol.Optional(
+                    CONF_PROBE_TAU_INTERVAL_WIDTH,
+                    default=current_options.get(CONF_PROBE_TAU_INTERVAL_WIDTH, current_config.get(CONF_PROBE_TAU_INTERVAL_WIDTH, DEFAULT_PROBE_TAU_INTERVAL_WIDTH))
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        min=0.05,
+                        max=0.5,
+                        step=0.01,
+                        mode=selector.NumberSelectorMode.BOX,
+                    )
+                ),
                 vol.Optional(
                     CONF_CALIBRATION_IDLE_MINUTES,
                     default=current_options.get(CONF_CALIBRATION_IDLE_MINUTES, current_config.get(CONF_CALIBRATION_IDLE_MINUTES, DEFAULT_CALIBRATION_IDLE_MINUTES))
@@ -1575,6 +1715,10 @@ class SmartClimateOptionsFlow(config_entries.OptionsFlow):
                         mode=selector.NumberSelectorMode.BOX,
                     )
                 ),
+                vol.Optional(
+                    CONF_TWO_NODE_THERMAL_MODEL,
+                    default=current_options.get(CONF_TWO_NODE_THERMAL_MODEL, current_config.get(CONF_TWO_NODE_THERMAL_MODEL, DEFAULT_TWO_NODE_THERMAL_MODEL))
+                ): selector.BooleanSelector(),
                 
                 # Passive learning configuration (v1.4.3+)
                 vol.Optional(
@@ -1614,6 +1758,7 @@ class SmartClimateOptionsFlow(config_entries.OptionsFlow):
         return self.async_show_form(
             step_id="init",
             data_schema=data_schema,
+            errors=errors,
             description_placeholders=self._get_description_placeholders()
         )
 
@@ -33,6 +33,8 @@ CONF_ENABLE_RETRY = "enable_retry"
 CONF_MAX_RETRY_ATTEMPTS = "max_retry_attempts"
 CONF_INITIAL_TIMEOUT = "initial_timeout"
 CONF_SAVE_INTERVAL = "save_interval"
+CONF_SAVE_DEBOUNCE = "save_debounce"
+CONF_SAVE_MAX_STALENESS = "save_max_staleness"
 CONF_ADAPTIVE_DELAY = "adaptive_delay"
 CONF_PREDICTIVE = "predictive"
 CONF_DELAY_LEARNING_TIMEOUT = "delay_learning_timeout"
@@ -134,6 +136,8 @@ DEFAULT_ENABLE_RETRY = True
 DEFAULT_MAX_RETRY_ATTEMPTS = 4
 DEFAULT_INITIAL_TIMEOUT = 60
 DEFAULT_SAVE_INTERVAL = 3600
+DEFAULT_SAVE_DEBOUNCE = 300  # Quiet period after the last sample before a coalesced save
+DEFAULT_SAVE_MAX_STALENESS = 1800  # Upper bound on how long new samples wait for a save
 DEFAULT_ADAPTIVE_DELAY = True
 DEFAULT_DELAY_LEARNING_TIMEOUT = 20
 
@@ -175,6 +179,48 @@ SERVICE_RESUME_ML = "resume_ml"
 # Temperature thresholds
 TEMP_DEVIATION_THRESHOLD = 0.5  # degrees Celsius
 
+# Learner sample index configuration
+CONF_LEARNING_SPATIAL_INDEX = "learning_spatial_index"
+CONF_LEARNING_MAX_HISTORY = "learning_max_history"
+DEFAULT_LEARNING_SPATIAL_INDEX = False  # Exact full-scan prediction by default
+DEFAULT_LEARNING_MAX_HISTORY = 1000  # Enhanced samples kept per entity
+CONF_LEARNING_CORRELATION_MODE = "learning_correlation_mode"
+DEFAULT_LEARNING_CORRELATION_MODE = "interpolate"  # or "local_linear"
+CONF_LEARNING_PACKED_SAMPLES = "learning_packed_samples"
+DEFAULT_LEARNING_PACKED_SAMPLES = False  # Save enhanced samples as JSON objects by default
+
+# Event-driven coordinator updates
+CONF_EVENT_DRIVEN_UPDATES = "event_driven_updates"
+CONF_EVENT_DEBOUNCE = "event_debounce"
+DEFAULT_EVENT_DRIVEN_UPDATES = False  # Fixed-interval polling by default
+DEFAULT_EVENT_DEBOUNCE = 2.0  # Seconds to collect state changes before a partial recompute
+EVENT_SAFETY_UPDATE_INTERVAL = 900  # Minimum full-refresh interval (seconds) in event-driven mode
+
+# Climate entity state attributes
+CONF_DIAGNOSTIC_ATTRIBUTES = "diagnostic_attributes"
+CONF_ATTRIBUTE_REFRESH_INTERVAL = "attribute_refresh_interval"
+DEFAULT_DIAGNOSTIC_ATTRIBUTES = True  # Publish algorithm/performance/health diagnostics as attributes
+DEFAULT_ATTRIBUTE_REFRESH_INTERVAL = 60  # Seconds before slow-changing attributes are recomputed
+
+# Compact telemetry for dashboard sensors (fewer recorder rows)
+CONF_COMPACT_TELEMETRY = "compact_telemetry"
+CONF_TELEMETRY_INTERVALS = "telemetry_intervals"
+DEFAULT_COMPACT_TELEMETRY = False  # Write every coordinator update by default
+DEFAULT_TELEMETRY_INTERVALS = {  # Minimum seconds between state writes per sensor group
+    "dashboard": 0,
+    "ac_learning": 0,
+    "thermal": 0,
+    "performance": 300,
+    "algorithm": 300,
+    "system_health": 600,
+}
+TELEMETRY_INTERVAL_OPTION_PREFIX = "telemetry_interval_"  # Options-flow field per sensor group
+MAX_TELEMETRY_INTERVAL = 3600  # Longest allowed publish interval (seconds)
+
+# Hot-path latency instrumentation of the offset engine
+CONF_LATENCY_INSTRUMENTATION = "latency_instrumentation"
+DEFAULT_LATENCY_INSTRUMENTATION = True  # Time calculate_offset, predictions, lookups and saves
+
 # ML input validation constants
 CONF_VALIDATION_OFFSET_MIN = "validation_offset_min"
 CONF_VALIDATION_OFFSET_MAX = "validation_offset_max"
@@ -250,6 +296,18 @@ DEFAULT_SHADOW_MODE = True  # Override - safe default for observation only
 INSIGHTS_UPDATE_INTERVAL = 3600  # 1 hour insights generation interval
 MAX_PROBE_DURATION = 7200  # 2 hours maximum probe duration
 
+# Early-stopping active probes once the online tau estimate is precise enough
+CONF_PROBE_EARLY_STOP = "probe_early_stop"
+CONF_PROBE_TAU_INTERVAL_WIDTH = "probe_tau_interval_width"
+DEFAULT_PROBE_EARLY_STOP = False  # Opt-in: probes keep their full duration by default
+DEFAULT_PROBE_TAU_INTERVAL_WIDTH = 0.15  # Interval half-width relative to tau
+PROBE_EARLY_STOP_MIN_SECONDS = 600  # Never stop a probe before 10 minutes
+PROBE_EARLY_STOP_MIN_READINGS = 10  # Readings required by the drift analysis
+
+# Two-node (air + thermal mass) drift model
+CONF_TWO_NODE_THERMAL_MODEL = "two_node_thermal_model"
+DEFAULT_TWO_NODE_THERMAL_MODEL = False
+
 # Thermal Model v1.5.3 Enhancement Constants
 # Enhanced thermal model supporting 75-probe history, exponential decay weighting,
 # and temperature-dependent tau calculation for improved seasonal adaptation
@@ -1,8 +1,10 @@
 """Update coordinator for Smart Climate Control integration."""
 
 import logging
+import time
+from dataclasses import dataclass
 from datetime import timedelta, datetime
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
@@ -14,7 +16,14 @@ from .errors import SmartClimateError
 from .outlier_detector import OutlierDetector
 from .dto import SystemHealthData
 from .thermal_models import ThermalState
-from .const import DOMAIN, SEASONAL_LEARNER_STORAGE_VERSION, POST_COOL_RISE_PERIOD_MINUTES, SEASONAL_SAVE_INTERVAL_MINUTES
+from .const import (
+    DOMAIN,
+    SEASONAL_LEARNER_STORAGE_VERSION,
+    POST_COOL_RISE_PERIOD_MINUTES,
+    SEASONAL_SAVE_INTERVAL_MINUTES,
+    DEFAULT_EVENT_DEBOUNCE,
+    EVENT_SAFETY_UPDATE_INTERVAL,
+)
 
 if TYPE_CHECKING:
     from .sensor_manager import SensorManager
@@ -30,6 +39,101 @@ if TYPE_CHECKING:
 
 _LOGGER = logging.getLogger(__name__)
 
+# Stages of a coordinator update
+STAGE_SNAPSHOT = "snapshot"
+STAGE_FORECAST = "forecast"
+STAGE_HUMIDITY = "humidity"
+STAGE_THERMAL = "thermal"
+STAGE_OFFSET = "offset"
+STAGE_OUTLIERS = "outliers"
+STAGE_CYCLES = "cycles"
+STAGE_THERMAL_EFFICIENCY = "thermal_efficiency"
+# Stages that can be skipped by an event-driven update (the snapshot always runs)
+UPDATE_STAGES: FrozenSet[str] = frozenset({
+    STAGE_FORECAST, STAGE_HUMIDITY, STAGE_THERMAL, STAGE_OFFSET, STAGE_OUTLIERS, STAGE_CYCLES,
+    STAGE_THERMAL_EFFICIENCY,
+})
+
+# Stages recomputed when a state change of the given source triggers an update.
+# The forecast only refreshes with the full (interval) update.
+TRIGGER_STAGES: Dict[str, FrozenSet[str]] = {
+    "room": frozenset({STAGE_THERMAL, STAGE_OFFSET, STAGE_OUTLIERS, STAGE_CYCLES, STAGE_THERMAL_EFFICIENCY}),
+    "outdoor": frozenset({STAGE_THERMAL, STAGE_OFFSET, STAGE_CYCLES, STAGE_THERMAL_EFFICIENCY}),
+    "power": frozenset({STAGE_THERMAL, STAGE_OFFSET, STAGE_OUTLIERS, STAGE_CYCLES, STAGE_THERMAL_EFFICIENCY}),
+    "indoor_humidity": frozenset({STAGE_HUMIDITY, STAGE_OFFSET}),
+    "outdoor_humidity": frozenset({STAGE_HUMIDITY, STAGE_OFFSET}),
+    "climate": frozenset({STAGE_THERMAL, STAGE_OFFSET, STAGE_CYCLES, STAGE_THERMAL_EFFICIENCY}),
+}
+
+
+@dataclass(frozen=True)
+class UpdateStage:
+    """One stage of the coordinator update pipeline.
+
+    The stage method takes the pipeline context (outputs of the earlier
+    stages) and returns a dict with the stage outputs. A memoized stage is
+    skipped, reusing its last outputs, while the fingerprint of its inputs
+    and of the optional state token is unchanged.
+    """
+    name: str
+    method: str
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    memoize: bool = False
+    state_token: Optional[str] = None  # Coordinator method returning extra fingerprint state
+
+
+# Only the offset stage is memoized. The other stages either depend on time
+# (forecast, humidity, thermal state machine, cycle monitor) or record the
+# readings as a side effect (outlier history, cycle detection).
+UPDATE_PIPELINE: Tuple[UpdateStage, ...] = (
+    UpdateStage(
+        STAGE_SNAPSHOT, "_stage_snapshot",
+        outputs=(
+            "room_temp", "outdoor_temp", "power", "indoor_humidity", "outdoor_humidity",
+            "ac_internal_temp", "hvac_mode", "hvac_action", "mode", "mode_adjustments",
+            "thermal_manager", "hour", "weekday",
+        ),
+    ),
+    UpdateStage(STAGE_FORECAST, "_stage_forecast"),
+    UpdateStage(STAGE_HUMIDITY, "_stage_humidity", outputs=("humidity_data",)),
+    UpdateStage(
+        STAGE_THERMAL, "_stage_thermal_state",
+        inputs=("room_temp", "outdoor_temp", "power", "hvac_mode", "hvac_action", "thermal_manager"),
+        outputs=("thermal_window", "learning_target"),
+    ),
+    UpdateStage(
+        STAGE_OFFSET, "_stage_offset",
+        inputs=(
+            "ac_internal_temp", "room_temp", "outdoor_temp", "mode", "power", "hvac_mode",
+            "indoor_humidity", "outdoor_humidity", "thermal_window", "hour", "weekday",
+        ),
+        outputs=("calculated_offset",),
+        memoize=True,
+        state_token="_offset_state_token",
+    ),
+    UpdateStage(
+        STAGE_OUTLIERS, "_stage_outliers",
+        inputs=("room_temp", "outdoor_temp", "power"),
+        outputs=("outliers", "outlier_count", "outlier_statistics"),
+    ),
+    UpdateStage(STAGE_CYCLES, "_stage_cycles", inputs=("room_temp", "outdoor_temp", "power")),
+    UpdateStage(
+        STAGE_THERMAL_EFFICIENCY, "_stage_thermal_efficiency",
+        inputs=("room_temp", "outdoor_temp", "hvac_mode", "thermal_window"),
+        outputs=("thermal_window", "should_ac_run", "cycle_health"),
+    ),
+)
+
+# Memoized stage outputs are recomputed at least this often (seconds)
+STAGE_MEMO_MAX_AGE = 600
+
+# Upper bounds (ms) of the trigger-to-update latency histogram buckets; the last bucket is open
+LATENCY_BUCKETS_MS = (100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+# Wrapped climate attributes whose changes trigger an event-driven update
+CLIMATE_TRIGGER_ATTRIBUTES = ("current_temperature", "hvac_action")
+
 
 class SmartClimateCoordinator(DataUpdateCoordinator[SmartClimateData]):
     """Coordinates updates for smart climate system."""
@@ -50,9 +154,18 @@ class SmartClimateCoordinator(DataUpdateCoordinator[SmartClimateData]):
         thermal_efficiency_enabled: bool = False,
         wrapped_entity_id: Optional[str] = None,
         entity_id: Optional[str] = None,  # Smart Climate entity ID for looking up ThermalManager
-        humidity_monitor: Optional["HumidityMonitor"] = None
+        humidity_monitor: Optional["HumidityMonitor"] = None,
+        event_driven: bool = False,
+        event_debounce: float = DEFAULT_EVENT_DEBOUNCE
     ):
-        """Initialize the coordinator."""
+        """Initialize the coordinator.
+        
+        With event_driven, sensor and wrapped climate state changes trigger a
+        debounced recompute of the affected stages, and the fixed interval is
+        stretched to at least EVENT_SAFETY_UPDATE_INTERVAL as a safety net.
+        """
+        if event_driven:
+            update_interval = max(update_interval, EVENT_SAFETY_UPDATE_INTERVAL)
         super().__init__(
             hass,
             _LOGGER,
@@ -116,6 +229,30 @@ class SmartClimateCoordinator(DataUpdateCoordinator[SmartClimateData]):
         # Initialize smart sleep mode wake-up
         self._wake_up_requested = False
         
+        # Event-driven updates: stages pending for the next debounced refresh
+        self._event_driven = event_driven
+        self._event_debounce = event_debounce
+        self._pending_stages: Set[str] = set()
+        self._pending_since: Dict[str, float] = {}  # First pending trigger per source
+        self._event_refresh_stages: Optional[FrozenSet[str]] = None
+        self._cancel_event_refresh: Optional[Callable[[], None]] = None
+        self._last_update_data: Optional[SmartClimateData] = None
+        self._stage_trigger_counts: Dict[str, int] = {stage: 0 for stage in UPDATE_STAGES}
+        self._source_trigger_counts: Dict[str, int] = {source: 0 for source in TRIGGER_STAGES}
+        self._latency_histograms: Dict[str, List[int]] = {}
+        self._last_event_latency_ms: Optional[float] = None
+        self._event_refresh_count = 0
+        self._full_refresh_count = 0
+        self._coalesced_trigger_count = 0
+        
+        # Update pipeline: last outputs, memo fingerprints and timings per stage
+        self._stage_outputs: Dict[str, Dict[str, Any]] = {}
+        self._stage_memo: Dict[str, Tuple[tuple, float]] = {}
+        self._stage_timings_ms: Dict[str, float] = {}
+        self._stage_cache_hits: Dict[str, int] = {
+            stage.name: 0 for stage in UPDATE_PIPELINE if stage.memoize
+        }
+        
         _LOGGER.debug("Seasonal learning cycle detection initialized in IDLE state")
     
     def _map_hvac_action_to_state(self, hvac_action: Optional[str], power: Optional[float]) -> str:
@@ -423,7 +560,157 @@ class SmartClimateCoordinator(DataUpdateCoordinator[SmartClimateData]):
         _LOGGER.debug("Forcing startup refresh for coordinator")
         self._is_startup = True
         await self.async_request_refresh()
-    
+
+    @property
+    def event_driven(self) -> bool:
+        """Return True if state changes trigger partial updates."""
+        return self._event_driven
+
+    def async_setup_event_triggers(self) -> Callable[[], None]:
+        """Start triggering updates from sensor and wrapped climate state changes.
+
+        Returns:
+            Function that stops the triggers and cancels a pending refresh
+        """
+        if not self._event_driven:
+            return lambda: None
+
+        from homeassistant.helpers.event import async_track_state_change_event
+
+        removers: List[Callable[[], None]] = [
+            self._sensor_manager.register_change_callback(self.async_trigger_update)
+        ]
+
+        if self._wrapped_entity_id:
+            def _climate_changed(event) -> None:
+                old_state = event.data.get("old_state")
+                new_state = event.data.get("new_state")
+                if old_state is None or new_state is None:
+                    self.async_trigger_update("climate")
+                    return
+                if old_state.state != new_state.state or any(
+                    old_state.attributes.get(attr) != new_state.attributes.get(attr)
+                    for attr in CLIMATE_TRIGGER_ATTRIBUTES
+                ):
+                    self.async_trigger_update("climate")
+
+            removers.append(
+                async_track_state_change_event(self.hass, self._wrapped_entity_id, _climate_changed)
+            )
+
+        _LOGGER.debug(
+            "Event-driven updates enabled (debounce %.1fs, safety interval %s)",
+            self._event_debounce, self.update_interval
+        )
+
+        def _remove_event_triggers() -> None:
+            for remove in removers:
+                remove()
+            if self._cancel_event_refresh is not None:
+                self._cancel_event_refresh()
+                self._cancel_event_refresh = None
+            self._pending_stages.clear()
+            self._pending_since.clear()
+
+        return _remove_event_triggers
+
+    def async_trigger_update(self, source: str) -> None:
+        """Schedule a debounced recompute of the stages affected by a state change.
+
+        The refresh runs event_debounce seconds after the first trigger;
+        triggers arriving meanwhile are merged into it.
+
+        Args:
+            source: "room", "outdoor", "power", "indoor_humidity",
+                "outdoor_humidity" or "climate"
+        """
+        stages = TRIGGER_STAGES.get(source)
+        if stages is None:
+            _LOGGER.debug("Ignoring update trigger from unknown source: %s", source)
+            return
+
+        self._source_trigger_counts[source] += 1
+        for stage in stages:
+            self._stage_trigger_counts[stage] += 1
+        self._pending_stages.update(stages)
+        self._pending_since.setdefault(source, time.monotonic())
+
+        if self._cancel_event_refresh is not None:
+            self._coalesced_trigger_count += 1
+            return
+
+        from homeassistant.helpers.event import async_call_later
+
+        self._cancel_event_refresh = async_call_later(
+            self.hass, self._event_debounce, self._async_event_refresh
+        )
+
+    async def _async_event_refresh(self, _now=None) -> None:
+        """Run the debounced partial refresh and record trigger latencies."""
+        self._cancel_event_refresh = None
+        if not self._pending_stages:
+            return
+
+        self._event_refresh_stages = frozenset(self._pending_stages)
+        pending_since = self._pending_since
+        self._pending_stages = set()
+        self._pending_since = {}
+        self._event_refresh_count += 1
+
+        try:
+            await self.async_refresh()
+        finally:
+            self._event_refresh_stages = None
+
+        finished = time.monotonic()
+        for source, since in pending_since.items():
+            self._record_latency(source, (finished - since) * 1000)
+
+    def _record_latency(self, source: str, latency_ms: float) -> None:
+        """Add a trigger-to-update latency to the source's histogram."""
+        histogram = self._latency_histograms.setdefault(source, [0] * (len(LATENCY_BUCKETS_MS) + 1))
+        for index, upper_bound in enumerate(LATENCY_BUCKETS_MS):
+            if latency_ms <= upper_bound:
+                histogram[index] += 1
+                break
+        else:
+            histogram[-1] += 1
+        self._last_event_latency_ms = latency_ms
+
+    def _consume_update_stages(self) -> FrozenSet[str]:
+        """Return the stages to run in this update.
+
+        Interval and manual refreshes run every stage. An event-driven refresh
+        runs the triggered stages plus the offset, provided a previous update
+        exists to reuse the other stages from.
+        """
+        stages = self._event_refresh_stages
+        self._event_refresh_stages = None
+        if stages is None or self._last_update_data is None:
+            self._full_refresh_count += 1
+            return UPDATE_STAGES
+        return stages | {STAGE_OFFSET}
+
+    def get_event_update_metrics(self) -> Dict[str, Any]:
+        """Return trigger counts and trigger-to-update latency histograms."""
+        return {
+            "event_driven": self._event_driven,
+            "debounce_s": self._event_debounce,
+            "event_refresh_count": self._event_refresh_count,
+            "full_refresh_count": self._full_refresh_count,
+            "coalesced_trigger_count": self._coalesced_trigger_count,
+            "stage_trigger_counts": dict(self._stage_trigger_counts),
+            "source_trigger_counts": dict(self._source_trigger_counts),
+            "latency_buckets_ms": list(LATENCY_BUCKETS_MS),
+            "latency_histograms": {
+                source: list(counts) for source, counts in self._latency_histograms.items()
+            },
+            "last_latency_ms": (
+                round(self._last_event_latency_ms, 1)
+                if self._last_event_latency_ms is not None else None
+            ),
+        }
+
     def _execute_outlier_detection(self, sensor_data: dict) -> dict:
         """Execute outlier detection on sensor data and return results."""
         if not self.outlier_detection_enabled or not self._outlier_detector:
@@ -494,44 +781,147 @@ class SmartClimateCoordinator(DataUpdateCoordinator[SmartClimateData]):
         }
     
     async def _async_update_data(self) -> SmartClimateData:
-        """Fetch latest data from all sources."""
+        """Fetch latest data from all sources.
+
+        Runs the stages of UPDATE_PIPELINE in order. Event-driven refreshes run
+        only the triggered stages and reuse the results of the other stages
+        from the previous update.
+        """
         try:
-            # Update forecast engine (it handles its own throttling)
-            if self._forecast_engine:
-                try:
-                    await self._forecast_engine.async_update()
-                    _LOGGER.debug("ForecastEngine updated successfully")
-                    
-                    # Check for smart sleep mode wake-up after forecast update
-                    self._check_weather_wake_up()
-                except Exception as exc:
-                    _LOGGER.warning("Error updating ForecastEngine: %s", exc)
-            # Gather sensor data
-            room_temp = self._sensor_manager.get_room_temperature()
-            outdoor_temp = self._sensor_manager.get_outdoor_temperature()
-            power = self._sensor_manager.get_power_consumption()
+            stages = self._consume_update_stages()
+            context = await self._run_update_pipeline(stages)
             
-            # Get humidity data
-            indoor_humidity = None
-            outdoor_humidity = None
-            if self._sensor_manager:
-                indoor_humidity = self._sensor_manager.get_indoor_humidity()
-                outdoor_humidity = self._sensor_manager.get_outdoor_humidity()
+            # Handle startup flag
+            startup_flag = self._is_startup
+            if startup_flag:
+                _LOGGER.info(
+                    "Coordinator performing startup calculation (offset=%.1f°C)",
+                    context["calculated_offset"]
+                )
+                self._is_startup = False  # Reset after first calculation
             
-            # Update humidity monitor if configured
-            humidity_data = None
-            if self._humidity_monitor:
-                try:
-                    humidity_data = await self._humidity_monitor.async_update()
-                    _LOGGER.debug("HumidityMonitor updated successfully")
-                except Exception as exc:
-                    _LOGGER.warning("Error updating HumidityMonitor: %s", exc)
+            # Determine Phase 2 state information
+            thermal_state = None
+            learning_active = False
             
-            # Get AC internal temperature from wrapped entity if available
-            ac_internal_temp = room_temp  # Default to room temp if unavailable
-            if hasattr(self, '_wrapped_entity_id') and self._wrapped_entity_id:
-                wrapped_state = self.hass.states.get(self._wrapped_entity_id)
-                if wrapped_state and wrapped_state.attributes:
+            thermal_manager = context["thermal_manager"]
+            if self.thermal_efficiency_enabled and thermal_manager:
+                thermal_state = thermal_manager.current_state.value
+                learning_active = not getattr(self._offset_engine, '_learning_paused', False)
+            
+            data = SmartClimateData(
+                room_temp=context["room_temp"],
+                outdoor_temp=context["outdoor_temp"],
+                power=context["power"],
+                calculated_offset=context["calculated_offset"],
+                mode_adjustments=context["mode_adjustments"],
+                is_startup_calculation=startup_flag,
+                outliers=context["outliers"],
+                outlier_count=context["outlier_count"],
+                outlier_statistics=context["outlier_statistics"],
+                thermal_window=context["thermal_window"],
+                should_ac_run=context["should_ac_run"],
+                cycle_health=context["cycle_health"],
+                thermal_efficiency_enabled=self.thermal_efficiency_enabled,
+                # Phase 2 fields
+                thermal_state=thermal_state,
+                learning_active=learning_active,
+                learning_target=context["learning_target"],
+                # Humidity monitoring data
+                humidity_data=context["humidity_data"],
+                # Pipeline diagnostics
+                stage_timings_ms=dict(self._stage_timings_ms),
+                stage_cache_hits=dict(self._stage_cache_hits),
+            )
+            self._last_update_data = data
+            return data
+            
+        except Exception as err:
+            _LOGGER.error("Error updating coordinator data: %s", err)
+            raise SmartClimateError(f"Failed to update coordinator data: {err}") from err
+    
+    async def _run_update_pipeline(self, stages: FrozenSet[str]) -> Dict[str, Any]:
+        """Run the update stages in order and return the merged outputs.
+
+        Every stage is timed; the timings of the last run are kept in
+        _stage_timings_ms.
+        """
+        context: Dict[str, Any] = {}
+        timings: Dict[str, float] = {}
+        now = time.monotonic()
+        for stage in UPDATE_PIPELINE:
+            started = time.perf_counter()
+            context.update(await self._run_stage(stage, context, stages, now))
+            timings[stage.name] = round((time.perf_counter() - started) * 1000, 3)
+        self._stage_timings_ms = timings
+        return context
+    
+    async def _run_stage(
+        self,
+        stage: UpdateStage,
+        context: Dict[str, Any],
+        stages: FrozenSet[str],
+        now: float,
+    ) -> Dict[str, Any]:
+        """Run one stage, or reuse its last outputs when it can be skipped."""
+        skippable = stage.name != STAGE_SNAPSHOT and stage.name in self._stage_outputs
+        if skippable and stage.name not in stages:
+            return self._stage_outputs[stage.name]
+        
+        fingerprint = self._stage_fingerprint(stage, context) if stage.memoize else None
+        if fingerprint is not None:
+            memo = self._stage_memo.get(stage.name)
+            if memo and memo[0] == fingerprint and now - memo[1] < STAGE_MEMO_MAX_AGE:
+                self._stage_cache_hits[stage.name] += 1
+                _LOGGER.debug("Stage %s inputs unchanged, reusing its outputs", stage.name)
+                return self._stage_outputs[stage.name]
+        
+        outputs = await getattr(self, stage.method)(context)
+        self._stage_outputs[stage.name] = outputs
+        if fingerprint is not None:
+            self._stage_memo[stage.name] = (fingerprint, now)
+        else:
+            self._stage_memo.pop(stage.name, None)
+        return outputs
+    
+    def _stage_fingerprint(self, stage: UpdateStage, context: Dict[str, Any]) -> Optional[tuple]:
+        """Return the input fingerprint of a stage, or None when it can't be memoized."""
+        token = None
+        if stage.state_token:
+            token = getattr(self, stage.state_token)()
+            if token is None:
+                return None
+        return tuple(context.get(key) for key in stage.inputs) + (token,)
+    
+    def _offset_state_token(self) -> Optional[tuple]:
+        """Return the offset engine state token, or None if the engine has none."""
+        get_token = getattr(self._offset_engine, "get_offset_cache_token", None)
+        token = get_token() if callable(get_token) else None
+        return token if isinstance(token, tuple) else None
+    
+    async def _stage_snapshot(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Read the sensors, the wrapped entity and the ThermalManager once."""
+        room_temp = self._sensor_manager.get_room_temperature()
+        outdoor_temp = self._sensor_manager.get_outdoor_temperature()
+        power = self._sensor_manager.get_power_consumption()
+        
+        # Get humidity data
+        indoor_humidity = None
+        outdoor_humidity = None
+        if self._sensor_manager:
+            indoor_humidity = self._sensor_manager.get_indoor_humidity()
+            outdoor_humidity = self._sensor_manager.get_outdoor_humidity()
+        
+        # Get AC internal temperature, HVAC mode and action from the wrapped entity
+        ac_internal_temp = room_temp  # Default to room temp if unavailable
+        hvac_mode = None
+        hvac_action = None
+        if hasattr(self, '_wrapped_entity_id') and self._wrapped_entity_id:
+            wrapped_state = self.hass.states.get(self._wrapped_entity_id)
+            if wrapped_state:
+                hvac_mode = wrapped_state.state
+                if wrapped_state.attributes:
+                    hvac_action = wrapped_state.attributes.get("hvac_action")
                     ac_temp = wrapped_state.attributes.get("current_temperature")
                     if ac_temp is not None and isinstance(ac_temp, (int, float)):
                         ac_internal_temp = float(ac_temp)
@@ -539,244 +929,281 @@ class SmartClimateCoordinator(DataUpdateCoordinator[SmartClimateData]):
                             "Got AC internal temperature: %.1f°C (room: %.1f°C)",
                             ac_internal_temp, room_temp or 0
                         )
-            
-            # Get mode adjustments
-            mode_adjustments = self._mode_manager.get_adjustments()
-            
-            # Get HVAC mode and action from wrapped entity
-            hvac_mode = None
-            hvac_action = None
-            if hasattr(self, '_wrapped_entity_id') and self._wrapped_entity_id:
-                wrapped_state = self.hass.states.get(self._wrapped_entity_id)
-                if wrapped_state:
-                    hvac_mode = wrapped_state.state
-                    hvac_action = wrapped_state.attributes.get("hvac_action") if wrapped_state.attributes else None
-            
-            # Calculate offset if we have room temperature
-            calculated_offset = 0.0
-            thermal_window = None
-            learning_target = None
-            
-            # Phase 2: ThermalManager state-aware protocol
-            # Get ThermalManager from hass.data for the correct entity
-            thermal_manager = self.get_thermal_manager(self._entity_id) if self._entity_id else None
-            if self.thermal_efficiency_enabled and thermal_manager and room_temp is not None:
-                try:
-                    # Update stability detector with current AC state and temperature
-                    if hasattr(thermal_manager, 'stability_detector') and thermal_manager.stability_detector:
-                        # Infer AC state if hvac_action not available
-                        ac_state = hvac_action if hvac_action else self._infer_ac_state_from_power(power)
-                        thermal_manager.stability_detector.update(ac_state, room_temp)
-                        _LOGGER.debug("Updated stability detector: ac_state=%s, temp=%.1f", ac_state, room_temp)
-                        
-                        # Feed HVAC state data for passive learning (Section 2.4)
-                        # Map hvac_action to HVAC state format expected by passive learning
-                        hvac_state = self._map_hvac_action_to_state(hvac_action, power)
-                        current_timestamp = dt_util.utcnow().timestamp()
-                        thermal_manager.stability_detector.add_reading(current_timestamp, room_temp, hvac_state)
-                        _LOGGER.debug("Fed HVAC state for passive learning: ts=%.1f, temp=%.1f°C, hvac=%s", 
-                                    current_timestamp, room_temp, hvac_state)
-                    
-                    # CRITICAL FIX: Update thermal state and check for transitions
-                    # This is the periodic check that was missing
-                    thermal_manager.update_state(
-                        current_temp=room_temp,
-                        outdoor_temp=outdoor_temp,
-                        hvac_mode=hvac_mode
-                    )
-                    
-                    # Get current setpoint (approximate from room temp for now)
-                    setpoint = room_temp  # TODO: Get actual setpoint from wrapped entity
-                    
-                    # Calculate operating window using ThermalManager
-                    thermal_window = thermal_manager.get_operating_window(
-                        setpoint=setpoint,
-                        outdoor_temp=outdoor_temp or 25.0,  # Default outdoor temp
-                        hvac_mode=hvac_mode or "cool"
-                    )
-                    
-                    # Control OffsetEngine learning based on current state
-                    current_state = thermal_manager.current_state
-                    if current_state == ThermalState.PRIMING:
-                        # Only pause learning during initial PRIMING phase (24-48 hours)
-                        # when the system is still gathering baseline data
-                        self._offset_engine.pause_learning()
-                        _LOGGER.debug("Learning paused for PRIMING state (initial baseline phase)")
-                    else:
-                        # Allow learning in all other states including DRIFTING
-                        # DRIFTING is when we need to learn thermal behavior!
-                        self._offset_engine.resume_learning()
-                        _LOGGER.debug("Learning enabled for %s state", current_state.value)
-                    
-                    # Get learning target for state-aware training
-                    learning_target = thermal_manager.get_learning_target(
-                        current=room_temp,
-                        window=thermal_window
-                    )
-                    
-                    _LOGGER.debug(
-                        "ThermalManager state: %s, window: (%.1f, %.1f), learning_target: %.1f",
-                        current_state.value, thermal_window[0], thermal_window[1], learning_target
-                    )
+        
+        # Local hour and weekday: the learned offset depends on the time patterns
+        now = datetime.now()
+        
+        return {
+            "room_temp": room_temp,
+            "outdoor_temp": outdoor_temp,
+            "power": power,
+            "indoor_humidity": indoor_humidity,
+            "outdoor_humidity": outdoor_humidity,
+            "ac_internal_temp": ac_internal_temp,
+            "hvac_mode": hvac_mode,
+            "hvac_action": hvac_action,
+            "mode": self._mode_manager.current_mode,
+            "mode_adjustments": self._mode_manager.get_adjustments(),
+            # Phase 2: ThermalManager from hass.data for the correct entity
+            "thermal_manager": self.get_thermal_manager(self._entity_id) if self._entity_id else None,
+            "hour": now.hour,
+            "weekday": now.weekday(),
+        }
+    
+    async def _stage_forecast(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Update the forecast engine (it handles its own throttling)."""
+        if self._forecast_engine:
+            try:
+                await self._forecast_engine.async_update()
+                _LOGGER.debug("ForecastEngine updated successfully")
+                
+                # Check for smart sleep mode wake-up after forecast update
+                self._check_weather_wake_up()
+            except Exception as exc:
+                _LOGGER.warning("Error updating ForecastEngine: %s", exc)
+        return {}
+    
+    async def _stage_humidity(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Update the humidity monitor if configured."""
+        humidity_data = None
+        if self._humidity_monitor:
+            try:
+                humidity_data = await self._humidity_monitor.async_update()
+                _LOGGER.debug("HumidityMonitor updated successfully")
+            except Exception as exc:
+                _LOGGER.warning("Error updating HumidityMonitor: %s", exc)
+        return {"humidity_data": humidity_data}
+    
+    async def _stage_thermal_state(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the ThermalManager state-aware protocol and get the operating window."""
+        room_temp = context["room_temp"]
+        outdoor_temp = context["outdoor_temp"]
+        power = context["power"]
+        hvac_mode = context["hvac_mode"]
+        hvac_action = context["hvac_action"]
+        thermal_manager = context["thermal_manager"]
+        thermal_window = None
+        learning_target = None
+        
+        if self.thermal_efficiency_enabled and thermal_manager and room_temp is not None:
+            try:
+                # Update stability detector with current AC state and temperature
+                if hasattr(thermal_manager, 'stability_detector') and thermal_manager.stability_detector:
+                    # Infer AC state if hvac_action not available
+                    ac_state = hvac_action if hvac_action else self._infer_ac_state_from_power(power)
+                    thermal_manager.stability_detector.update(ac_state, room_temp)
+                    _LOGGER.debug("Updated stability detector: ac_state=%s, temp=%.1f", ac_state, room_temp)
                     
-                except Exception as exc:
-                    _LOGGER.warning("Error in ThermalManager state logic: %s", exc)
-                    thermal_window = None
-                    learning_target = None
-            
-            if room_temp is not None:
-                # Create offset input with proper AC internal temp
-                now = datetime.now()
-                offset_input = OffsetInput(
-                    ac_internal_temp=ac_internal_temp,  # AC's internal sensor
-                    room_temp=room_temp,  # External room sensor
+                    # Feed HVAC state data for passive learning (Section 2.4)
+                    # Map hvac_action to HVAC state format expected by passive learning
+                    hvac_state = self._map_hvac_action_to_state(hvac_action, power)
+                    current_timestamp = dt_util.utcnow().timestamp()
+                    thermal_manager.stability_detector.add_reading(current_timestamp, room_temp, hvac_state)
+                    _LOGGER.debug("Fed HVAC state for passive learning: ts=%.1f, temp=%.1f°C, hvac=%s", 
+                                current_timestamp, room_temp, hvac_state)
+                
+                # CRITICAL FIX: Update thermal state and check for transitions
+                # This is the periodic check that was missing
+                thermal_manager.update_state(
+                    current_temp=room_temp,
                     outdoor_temp=outdoor_temp,
-                    mode=self._mode_manager.current_mode,
-                    power_consumption=power,
-                    time_of_day=now.time(),
-                    day_of_week=now.weekday(),
-                    hvac_mode=hvac_mode,
-                    indoor_humidity=indoor_humidity,  # Add humidity data
-                    outdoor_humidity=outdoor_humidity  # Add humidity data
+                    hvac_mode=hvac_mode
                 )
                 
-                # Pass thermal window to offset calculation (Phase 2 integration)
-                if thermal_window is not None:
-                    offset_result = self._offset_engine.calculate_offset(offset_input, thermal_window=thermal_window)
+                # Get current setpoint (approximate from room temp for now)
+                setpoint = room_temp  # TODO: Get actual setpoint from wrapped entity
+                
+                # Calculate operating window using ThermalManager
+                thermal_window = thermal_manager.get_operating_window(
+                    setpoint=setpoint,
+                    outdoor_temp=outdoor_temp or 25.0,  # Default outdoor temp
+                    hvac_mode=hvac_mode or "cool"
+                )
+                
+                # Control OffsetEngine learning based on current state
+                current_state = thermal_manager.current_state
+                if current_state == ThermalState.PRIMING:
+                    # Only pause learning during initial PRIMING phase (24-48 hours)
+                    # when the system is still gathering baseline data
+                    self._offset_engine.pause_learning()
+                    _LOGGER.debug("Learning paused for PRIMING state (initial baseline phase)")
                 else:
-                    offset_result = self._offset_engine.calculate_offset(offset_input)
-                    
-                calculated_offset = offset_result.offset
+                    # Allow learning in all other states including DRIFTING
+                    # DRIFTING is when we need to learn thermal behavior!
+                    self._offset_engine.resume_learning()
+                    _LOGGER.debug("Learning enabled for %s state", current_state.value)
+                
+                # Get learning target for state-aware training
+                learning_target = thermal_manager.get_learning_target(
+                    current=room_temp,
+                    window=thermal_window
+                )
                 
                 _LOGGER.debug(
-                    "Updated coordinator data: ac_internal=%.1f°C, room_temp=%.1f°C, "
-                    "outdoor_temp=%s, power=%s, offset=%.1f°C, reason=%s, thermal_window=%s",
-                    ac_internal_temp, room_temp, outdoor_temp, power, 
-                    calculated_offset, offset_result.reason, thermal_window
+                    "ThermalManager state: %s, window: (%.1f, %.1f), learning_target: %.1f",
+                    current_state.value, thermal_window[0], thermal_window[1], learning_target
                 )
+                
+            except Exception as exc:
+                _LOGGER.warning("Error in ThermalManager state logic: %s", exc)
+                thermal_window = None
+                learning_target = None
+        
+        return {"thermal_window": thermal_window, "learning_target": learning_target}
+    
+    async def _stage_offset(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Calculate the offset if we have room temperature."""
+        room_temp = context["room_temp"]
+        thermal_window = context["thermal_window"]
+        calculated_offset = 0.0
+        
+        if room_temp is not None:
+            # Create offset input with proper AC internal temp
+            now = datetime.now()
+            offset_input = OffsetInput(
+                ac_internal_temp=context["ac_internal_temp"],  # AC's internal sensor
+                room_temp=room_temp,  # External room sensor
+                outdoor_temp=context["outdoor_temp"],
+                mode=context["mode"],
+                power_consumption=context["power"],
+                time_of_day=now.time(),
+                day_of_week=now.weekday(),
+                hvac_mode=context["hvac_mode"],
+                indoor_humidity=context["indoor_humidity"],  # Add humidity data
+                outdoor_humidity=context["outdoor_humidity"]  # Add humidity data
+            )
+            
+            # Pass thermal window to offset calculation (Phase 2 integration)
+            if thermal_window is not None:
+                offset_result = self._offset_engine.calculate_offset(offset_input, thermal_window=thermal_window)
             else:
-                _LOGGER.warning("No room temperature available for offset calculation")
+                offset_result = self._offset_engine.calculate_offset(offset_input)
+                
+            calculated_offset = offset_result.offset
             
-            # Execute outlier detection
+            _LOGGER.debug(
+                "Updated coordinator data: ac_internal=%.1f°C, room_temp=%.1f°C, "
+                "outdoor_temp=%s, power=%s, offset=%.1f°C, reason=%s, thermal_window=%s",
+                context["ac_internal_temp"], room_temp, context["outdoor_temp"], context["power"],
+                calculated_offset, offset_result.reason, thermal_window
+            )
+        else:
+            _LOGGER.warning("No room temperature available for offset calculation")
+        
+        return {"calculated_offset": calculated_offset}
+    
+    async def _stage_outliers(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute outlier detection (adds the readings to the detector history)."""
+        return self._execute_outlier_detection({
+            "room_temp": context["room_temp"],
+            "outdoor_temp": context["outdoor_temp"],
+            "power": context["power"]
+        })
+    
+    async def _stage_cycles(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute seasonal learning cycle detection."""
+        if self._seasonal_learner:
             sensor_data = {
-                "room_temp": room_temp,
-                "outdoor_temp": outdoor_temp,
-                "power": power
+                "room_temp": context["room_temp"],
+                "outdoor_temp": context["outdoor_temp"],
+                "power": context["power"]
             }
-            outlier_results = self._execute_outlier_detection(sensor_data)
-            
-            # Execute seasonal learning cycle detection
-            if self._seasonal_learner:
-                hvac_action = self._get_hvac_action(sensor_data)
-                self._run_cycle_detection_state_machine(hvac_action, room_temp, outdoor_temp)
-            
-            # Execute thermal efficiency calculations (Phase 1 & Phase 2 integration)
-            should_ac_run = None
-            cycle_health = None
-            
-            if self.thermal_efficiency_enabled and room_temp is not None:
-                try:
-                    # If ThermalManager is available (Phase 2), use it for AC decisions
-                    if self._thermal_manager and thermal_window:
-                        setpoint = room_temp  # Approximate setpoint
-                        should_ac_run = self._thermal_manager.should_ac_run(
-                            current=room_temp,
-                            setpoint=setpoint,
-                            window=thermal_window
-                        )
-                        _LOGGER.debug("Using ThermalManager AC decision: %s", should_ac_run)
-                    
-                    # Otherwise fall back to Phase 1 comfort band controller
-                    elif self._comfort_band_controller:
-                        setpoint = room_temp  # Use room temp as approximate setpoint for now
-                        if thermal_window is None:
-                            thermal_window = self._comfort_band_controller.get_operating_window(
-                                setpoint=setpoint,
-                                outdoor_temp=outdoor_temp,
-                                hvac_mode=hvac_mode
-                            )
-                        
-                        # Determine if AC should run based on comfort band logic
-                        should_ac_run = self._comfort_band_controller.should_ac_run(
-                            current_temp=room_temp,
+            hvac_action = self._get_hvac_action(sensor_data)
+            self._run_cycle_detection_state_machine(
+                hvac_action, context["room_temp"], context["outdoor_temp"]
+            )
+        return {}
+    
+    def _get_outdoor_forecast(self, outdoor_temp: Optional[float]) -> Optional[List[float]]:
+        """Return hourly outdoor temperatures starting now for drift curves, if forecast data exists.
+
+        The current reading covers the time until the first forecast point.
+        """
+        if outdoor_temp is None or not self._forecast_engine:
+            return None
+        try:
+            upcoming = self._forecast_engine.get_hourly_outdoor_temperatures(hours=24)
+        except Exception as exc:
+            _LOGGER.debug("Outdoor forecast unavailable for drift prediction: %s", exc)
+            return None
+        if not isinstance(upcoming, list) or not upcoming:
+            return None
+        return [outdoor_temp] + upcoming
+    
+    async def _stage_thermal_efficiency(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute thermal efficiency calculations (Phase 1 & Phase 2 integration)."""
+        room_temp = context["room_temp"]
+        outdoor_temp = context["outdoor_temp"]
+        hvac_mode = context["hvac_mode"]
+        thermal_window = context["thermal_window"]
+        should_ac_run = None
+        cycle_health = None
+        
+        if self.thermal_efficiency_enabled and room_temp is not None:
+            try:
+                # If ThermalManager is available (Phase 2), use it for AC decisions
+                if self._thermal_manager and thermal_window:
+                    setpoint = room_temp  # Approximate setpoint
+                    should_ac_run = self._thermal_manager.should_ac_run(
+                        current=room_temp,
+                        setpoint=setpoint,
+                        window=thermal_window
+                    )
+                    _LOGGER.debug("Using ThermalManager AC decision: %s", should_ac_run)
+                
+                # Otherwise fall back to Phase 1 comfort band controller
+                elif self._comfort_band_controller:
+                    setpoint = room_temp  # Use room temp as approximate setpoint for now
+                    if thermal_window is None:
+                        thermal_window = self._comfort_band_controller.get_operating_window(
                             setpoint=setpoint,
-                            operating_window=thermal_window,
-                            hvac_mode=hvac_mode,
                             outdoor_temp=outdoor_temp,
-                            prediction_minutes=15  # 15-minute prediction window for Phase 1
+                            hvac_mode=hvac_mode
                         )
-                        _LOGGER.debug("Using ComfortBandController AC decision: %s", should_ac_run)
-                    
-                    # Get cycle health data (both Phase 1 & 2)
-                    if self._cycle_monitor:
-                        avg_on, avg_off = self._cycle_monitor.get_average_cycle_duration()
-                        cycle_health = {
-                            "can_turn_on": self._cycle_monitor.can_turn_on(),
-                            "can_turn_off": self._cycle_monitor.can_turn_off(),
-                            "needs_adjustment": self._cycle_monitor.needs_adjustment(),
-                            "avg_on_duration": avg_on,
-                            "avg_off_duration": avg_off
-                        }
                     
-                    _LOGGER.debug(
-                        "Thermal efficiency calculations: window=%s, should_run=%s, cycle_health=%s",
-                        thermal_window, should_ac_run, cycle_health["needs_adjustment"] if cycle_health else None
+                    # Determine if AC should run based on comfort band logic
+                    should_ac_run = self._comfort_band_controller.should_ac_run(
+                        current_temp=room_temp,
+                        setpoint=setpoint,
+                        operating_window=thermal_window,
+                        hvac_mode=hvac_mode,
+                        outdoor_temp=outdoor_temp,
+                        prediction_minutes=15,  # 15-minute prediction window for Phase 1
+                        outdoor_forecast=self._get_outdoor_forecast(outdoor_temp)
                     )
-                    
-                except Exception as exc:
-                    _LOGGER.warning("Error in thermal efficiency calculations: %s", exc)
-                    # Use safe defaults on error
-                    if thermal_window is None:
-                        thermal_window = (room_temp - 1.0, room_temp + 1.0) if room_temp else None
-                    should_ac_run = False
+                    _LOGGER.debug("Using ComfortBandController AC decision: %s", should_ac_run)
+                
+                # Get cycle health data (both Phase 1 & 2)
+                if self._cycle_monitor:
+                    avg_on, avg_off = self._cycle_monitor.get_average_cycle_duration()
                     cycle_health = {
-                        "can_turn_on": True,
-                        "can_turn_off": True, 
-                        "needs_adjustment": False,
-                        "avg_on_duration": 0.0,
-                        "avg_off_duration": 0.0
+                        "can_turn_on": self._cycle_monitor.can_turn_on(),
+                        "can_turn_off": self._cycle_monitor.can_turn_off(),
+                        "needs_adjustment": self._cycle_monitor.needs_adjustment(),
+                        "avg_on_duration": avg_on,
+                        "avg_off_duration": avg_off
                     }
-            
-            # Handle startup flag
-            startup_flag = self._is_startup
-            if startup_flag:
-                _LOGGER.info("Coordinator performing startup calculation (offset=%.1f°C)", calculated_offset)
-                self._is_startup = False  # Reset after first calculation
-            
-            # Determine Phase 2 state information
-            thermal_state = None
-            learning_active = False
-            
-            thermal_manager = self.get_thermal_manager(self._entity_id) if self._entity_id else None
-            if self.thermal_efficiency_enabled and thermal_manager:
-                thermal_state = thermal_manager.current_state.value
-                learning_active = not getattr(self._offset_engine, '_learning_paused', False)
-            
-            return SmartClimateData(
-                room_temp=room_temp,
-                outdoor_temp=outdoor_temp,
-                power=power,
-                calculated_offset=calculated_offset,
-                mode_adjustments=mode_adjustments,
-                is_startup_calculation=startup_flag,
-                outliers=outlier_results["outliers"],
-                outlier_count=outlier_results["outlier_count"],
-                outlier_statistics=outlier_results["outlier_statistics"],
-                thermal_window=thermal_window,
-                should_ac_run=should_ac_run,
-                cycle_health=cycle_health,
-                thermal_efficiency_enabled=self.thermal_efficiency_enabled,
-                # Phase 2 fields
-                thermal_state=thermal_state,
-                learning_active=learning_active,
-                learning_target=learning_target,
-                # Humidity monitoring data
-                humidity_data=humidity_data
-            )
-            
-        except Exception as err:
-            _LOGGER.error("Error updating coordinator data: %s", err)
-            raise SmartClimateError(f"Failed to update coordinator data: {err}") from err
+                
+                _LOGGER.debug(
+                    "Thermal efficiency calculations: window=%s, should_run=%s, cycle_health=%s",
+                    thermal_window, should_ac_run, cycle_health["needs_adjustment"] if cycle_health else None
+                )
+                
+            except Exception as exc:
+                _LOGGER.warning("Error in thermal efficiency calculations: %s", exc)
+                # Use safe defaults on error
+                if thermal_window is None:
+                    thermal_window = (room_temp - 1.0, room_temp + 1.0) if room_temp else None
+                should_ac_run = False
+                cycle_health = {
+                    "can_turn_on": True,
+                    "can_turn_off": True, 
+                    "needs_adjustment": False,
+                    "avg_on_duration": 0.0,
+                    "avg_off_duration": 0.0
+                }
+        
+        return {"thermal_window": thermal_window, "should_ac_run": should_ac_run, "cycle_health": cycle_health}
     
     def _get_system_health_data(self) -> SystemHealthData:
         """Get system health data including outlier detection information.
@@ -820,6 +1247,12 @@ class SmartClimateCoordinator(DataUpdateCoordinator[SmartClimateData]):
         return SystemHealthData(
             memory_usage_kb=base_health.memory_usage_kb,
             persistence_latency_ms=base_health.persistence_latency_ms,
+            persistence_queue_depth=base_health.persistence_queue_depth,
+            persistence_batch_latency_ms=base_health.persistence_batch_latency_ms,
+            restore_phase_one_ms=base_health.restore_phase_one_ms,
+            restore_phase_two_ms=base_health.restore_phase_two_ms,
+            restore_phase_two_max_step_ms=base_health.restore_phase_two_max_step_ms,
+            learning_hydrated=base_health.learning_hydrated,
             outlier_detection_active=outlier_detection_active,
             samples_per_day=base_health.samples_per_day,
             accuracy_improvement_rate=base_health.accuracy_improvement_rate,
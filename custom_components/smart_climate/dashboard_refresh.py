@@ -0,0 +1,67 @@
+"""ABOUTME: Adaptive refresh interval for the per-entity dashboard DataUpdateCoordinator.
+Refreshes quickly after learning activity and backs off exponentially while nothing changes."""
+
+import logging
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+# Interval right after activity, upper bound while idle, and growth per idle refresh
+DEFAULT_ACTIVE_INTERVAL = 15.0
+DEFAULT_IDLE_INTERVAL = 300.0
+DEFAULT_BACKOFF_FACTOR = 2.0
+
+_UNSET = object()
+
+
+class AdaptiveRefreshPolicy:
+    """Chooses the next dashboard refresh interval from an activity token.
+
+    The token (OffsetEngine.get_dashboard_token()) changes whenever a sample
+    is learned, a power transition or save happens, or the offset moves.
+    A changed token drops the interval back to the active interval; an
+    unchanged one multiplies it by the backoff factor up to the idle bound.
+    """
+
+    def __init__(
+        self,
+        active_interval: float = DEFAULT_ACTIVE_INTERVAL,
+        idle_interval: float = DEFAULT_IDLE_INTERVAL,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+    ) -> None:
+        """Initialize the policy at the active interval.
+
+        Args:
+            active_interval: Seconds until the refresh after activity
+            idle_interval: Maximum seconds between refreshes while idle
+            backoff_factor: Interval growth per refresh without activity
+        """
+        if active_interval <= 0 or idle_interval < active_interval:
+            raise ValueError("Intervals must satisfy 0 < active_interval <= idle_interval")
+        if backoff_factor < 1.0:
+            raise ValueError("Backoff factor must be at least 1.0")
+
+        self._active_interval = active_interval
+        self._idle_interval = idle_interval
+        self._backoff_factor = backoff_factor
+        self._interval = active_interval
+        self._last_token: Any = _UNSET
+
+    @property
+    def interval(self) -> float:
+        """Return the current refresh interval in seconds."""
+        return self._interval
+
+    def next_interval(self, token: Any) -> float:
+        """Record the activity token seen after a refresh and return the next interval."""
+        if self._last_token is _UNSET or token != self._last_token:
+            self._interval = self._active_interval
+        else:
+            self._interval = min(self._idle_interval, self._interval * self._backoff_factor)
+        self._last_token = token
+        return self._interval
+
+    def reset(self) -> None:
+        """Return to the active interval (e.g. when the engine reported a state change)."""
+        self._interval = self._active_interval
+        self._last_token = _UNSET
@@ -1,6 +1,16 @@
-"""Data persistence for Smart Climate Control learning data."""
+"""Data persistence for Smart Climate Control learning data.
+
+Learning data is stored as a compact JSON snapshot plus an append-only
+journal of changes since that snapshot. Each save appends only the delta
+(new samples, changed patterns); the journal is compacted into a new
+snapshot once it outgrows a fraction of the snapshot size.
+
+With a shared PersistenceWriter the whole save sequence of a store runs as
+one job in the writer's batched executor calls.
+"""
 
 import asyncio
+import copy
 import json
 import logging
 import os
@@ -8,17 +18,27 @@ import re
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from homeassistant.core import HomeAssistant
 
+if TYPE_CHECKING:
+    from .persistence_writer import PersistenceWriter
+
 _LOGGER = logging.getLogger(__name__)
 
 # Data format version
 DATA_FORMAT_VERSION = "1.0"
 
+# Compact the journal into a new snapshot once it exceeds this fraction of the snapshot size
+JOURNAL_COMPACTION_RATIO = 0.5
+
+# Write latency kinds reported by get_last_write_latency()
+WRITE_KIND_APPEND = "append"
+WRITE_KIND_COMPACTION = "compaction"
+
 
-def atomic_json_write(file_path: Path, data: Dict[str, Any]) -> None:
+def atomic_json_write(file_path: Path, data: Dict[str, Any], compact: bool = False) -> None:
     """
     Atomically write JSON data to a file.
 
@@ -28,6 +48,7 @@ def atomic_json_write(file_path: Path, data: Dict[str, Any]) -> None:
     Args:
         file_path: Target file path for the JSON data
         data: Dictionary to save as JSON
+        compact: Write without indentation or spaces (journal snapshots)
         
     Raises:
         IOError: If file operations fail
@@ -37,7 +58,10 @@ def atomic_json_write(file_path: Path, data: Dict[str, Any]) -> None:
     try:
         # Write to the temporary file
         with temp_path.open("w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+            if compact:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            else:
+                json.dump(data, f, indent=2, ensure_ascii=False)
             # Ensure data is written to the OS buffer
             f.flush()
             # Ensure data is written from the OS buffer to the disk
@@ -59,23 +83,167 @@ def atomic_json_write(file_path: Path, data: Dict[str, Any]) -> None:
         raise
 
 
+def append_journal_line(file_path: Path, line: str) -> int:
+    """Append one journal entry durably.
+
+    Args:
+        file_path: Journal file path
+        line: Serialized entry including the trailing newline
+
+    Returns:
+        Journal size in bytes after the append
+    """
+    with file_path.open("a", encoding="utf-8") as f:
+        f.write(line)
+        f.flush()
+        os.fsync(f.fileno())
+        return f.tell()
+
+
+def _json_key(key: Any) -> str:
+    """Return the key JSON uses for a dict key (e.g. 13 -> "13")."""
+    return key if isinstance(key, str) else json.dumps(key)
+
+
+def _appended_after_drop(old: List[Any], new: List[Any]) -> Optional[int]:
+    """Return how many leading items were dropped if new == old[drop:] + appended items.
+
+    Matches the learner's bounded histories, which only grow at the end and
+    are pruned from the front. Returns None if the lists do not overlap that way.
+    """
+    old_len = len(old)
+    if len(new) >= old_len and new[:old_len] == old:
+        return 0
+    if not new:
+        return None
+    first = new[0]
+    for drop in range(1, old_len):
+        if old[drop] == first and new[:old_len - drop] == old[drop:]:
+            return drop
+    return None
+
+
+def journal_diff(old: Any, new: Any, path: Optional[List[str]] = None) -> List[List[Any]]:
+    """Compute journal operations that turn ``old`` into ``new``.
+
+    ``old`` is the JSON form of the last persisted state. Dicts are diffed
+    per key, lists that only gained items at the end (after dropping some
+    from the front) become ``extend`` operations, everything else is ``set``.
+
+    Returns:
+        List of ``["set", path, value]``, ``["del", path]`` and
+        ``["extend", path, drop, items]`` operations
+    """
+    path = path or []
+    ops: List[List[Any]] = []
+    if isinstance(old, dict) and isinstance(new, dict):
+        new_keys = set()
+        for key, value in new.items():
+            json_key = _json_key(key)
+            new_keys.add(json_key)
+            if json_key in old:
+                ops.extend(journal_diff(old[json_key], value, path + [json_key]))
+            else:
+                ops.append(["set", path + [json_key], value])
+        for json_key in old:
+            if json_key not in new_keys:
+                ops.append(["del", path + [json_key]])
+    elif isinstance(old, list) and isinstance(new, (list, tuple)):
+        drop = _appended_after_drop(old, list(new))
+        if drop is None:
+            ops.append(["set", path, new])
+        elif drop or len(new) != len(old):
+            ops.append(["extend", path, drop, list(new[len(old) - drop:])])
+    elif type(old) is not type(new) or old != new:
+        ops.append(["set", path, new])
+    return ops
+
+
+def apply_journal_ops(state: Any, ops: List[List[Any]]) -> Any:
+    """Apply journal operations produced by journal_diff() to a JSON state.
+
+    Mutates ``state`` in place where possible.
+
+    Returns:
+        The updated state (a new object if the root itself was replaced)
+    """
+    root = {"": state}
+    for op in ops:
+        kind, path = op[0], [""] + list(op[1])
+        parent = root
+        for key in path[:-1]:
+            parent = parent[key]
+        key = path[-1]
+        if kind == "set":
+            parent[key] = op[2]
+        elif kind == "del":
+            parent.pop(key, None)
+        elif kind == "extend":
+            target = parent[key]
+            del target[:op[2]]
+            target.extend(op[3])
+        else:
+            raise ValueError(f"Unknown journal operation: {kind}")
+    return root[""]
+
+
+def _json_round_trip(data: Any) -> tuple:
+    """Serialize data compactly and parse it back.
+
+    Returns:
+        Tuple of (JSON form of data, serialized size in bytes)
+    """
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return json.loads(payload), len(payload.encode("utf-8"))
+
+
 class SmartClimateDataStore:
-    """Thread-safe data store for Smart Climate learning data persistence."""
+    """Thread-safe data store for Smart Climate learning data persistence.
+    
+    Data is kept as a snapshot file plus an append-only journal (``.journal``
+    next to it). Snapshots carry a ``journal_generation``; journal entries
+    from another generation (left over from an interrupted compaction) are
+    ignored on replay. Snapshots written before journaling have no
+    generation and are migrated by writing a new snapshot on the next save.
+    """
     
-    def __init__(self, hass: HomeAssistant, entity_id: str):
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entity_id: str,
+        compaction_ratio: float = JOURNAL_COMPACTION_RATIO,
+        writer: Optional["PersistenceWriter"] = None
+    ):
         """Initialize the data store for a specific climate entity.
         
         Args:
             hass: Home Assistant instance
             entity_id: Climate entity ID (e.g., "climate.living_room")
+            compaction_ratio: Journal size, as a fraction of the snapshot size,
+                above which the next save writes a new snapshot
+            writer: Shared writer that batches the blocking save work of all
+                entities; without one each save step is its own executor job
         """
         self._hass = hass
         self._entity_id = entity_id
+        self._writer = writer
         self._lock = asyncio.Lock()  # Prevents concurrent writes to the same file
         self._last_write_latency_ms = 0.0  # Track write latency for dashboard
+        self._last_append_latency_ms = 0.0
+        self._last_compaction_latency_ms = 0.0
+        self._compaction_ratio = compaction_ratio
         
-        # Calculate data file path
+        # Calculate data file paths
         self._data_file_path = self.get_data_file_path()
+        self._journal_file_path = self._data_file_path.with_suffix(".journal")
+        
+        # Journal state: JSON form of the persisted learning data (None until a
+        # snapshot is loaded or written, which forces the next save to compact)
+        self._journal_base: Optional[Any] = None
+        self._journal_generation: Optional[int] = None
+        self._journal_entries = 0
+        self._journal_size = 0
+        self._snapshot_size = 0
         
         _LOGGER.debug(
             "SmartClimateDataStore initialized for %s, file: %s",
@@ -150,71 +318,24 @@ class SmartClimateDataStore:
             return False
     
     async def async_save_learning_data(self, learning_data: Dict[str, Any]) -> None:
-        """Save learning data to JSON file safely and asynchronously.
+        """Save learning data safely and asynchronously.
         
-        Uses a safe atomic write pattern that preserves backup data:
-        1. Write to temporary file first
-        2. Validate temporary file 
-        3. Only overwrite backup after validation succeeds
-        4. Atomic move of temp file to primary
+        Appends the changes since the last save to the journal. A full
+        snapshot is written instead (compaction) when the persisted state is
+        unknown, e.g. on the first save or after migrating a pre-journal file,
+        or when the journal would exceed the compaction ratio.
         
         Args:
             learning_data: Dictionary containing learning patterns and statistics
         """
         async with self._lock:
             try:
-                # Prepare data structure with metadata
-                save_data = {
-                    "version": DATA_FORMAT_VERSION,
-                    "entity_id": self._entity_id,
-                    "last_updated": datetime.now().isoformat(),
-                    "learning_enabled": True,
-                    "learning_data": learning_data
-                }
-                
-                # Ensure directory exists
-                await self._hass.async_add_executor_job(self._ensure_data_directory)
-                
-                # Start timing for write latency measurement (after directory creation)
-                start_time = time.perf_counter()
-                
-                # SAFE ATOMIC WRITE PATTERN:
-                # Step 1: Write to temporary file first (do NOT touch backup yet)
-                temp_file = self._data_file_path.with_suffix(".json.tmp")
-                await self._hass.async_add_executor_job(
-                    atomic_json_write, temp_file, save_data
-                )
-                
-                # Step 2: Validate the temporary file
-                temp_file_valid = await self._hass.async_add_executor_job(
-                    self._validate_json_file, temp_file
-                )
-                
-                if not temp_file_valid:
-                    # Clean up invalid temp file
-                    await self._hass.async_add_executor_job(
-                        lambda: temp_file.unlink() if temp_file.exists() else None
-                    )
-                    raise IOError("Temporary file validation failed - data may be corrupted")
-                
-                # Step 3: NOW it's safe to create backup (temp file is validated)
-                await self._hass.async_add_executor_job(
-                    self._create_backup_if_needed, self._data_file_path
-                )
-                
-                # Step 4: Atomic move of validated temp file to primary location
-                await self._hass.async_add_executor_job(
-                    lambda: temp_file.rename(self._data_file_path)
-                )
-                
-                # Calculate and store write latency only on successful completion
-                end_time = time.perf_counter()
-                self._last_write_latency_ms = (end_time - start_time) * 1000.0
-                
-                _LOGGER.debug(
-                    "Saved learning data for %s (%d bytes) in %.2f ms",
-                    self._entity_id, self._data_file_path.stat().st_size, self._last_write_latency_ms
-                )
+                # Diff, serialization and file operations in one job, so
+                # nothing proportional to the data size runs on the event loop
+                if self._writer is not None:
+                    await self._writer.async_run(self._save_sync, learning_data)
+                else:
+                    await self._hass.async_add_executor_job(self._save_sync, learning_data)
                 
             except Exception as e:
                 # Clean up any temporary files that might have been created
@@ -234,6 +355,209 @@ class SmartClimateDataStore:
                     self._entity_id, e
                 )
     
+    def _plan_save(self, learning_data: Any) -> Tuple[Optional[str], Optional[str]]:
+        """Decide how to persist learning_data.
+        
+        Returns:
+            (WRITE_KIND_COMPACTION, None) to write a snapshot,
+            (WRITE_KIND_APPEND, journal line) to append, or (None, None) if
+            nothing changed since the last save
+        """
+        if self._journal_base is None:
+            return WRITE_KIND_COMPACTION, None
+        
+        ops = journal_diff(self._journal_base, learning_data)
+        if not ops:
+            _LOGGER.debug("Learning data for %s unchanged, nothing to journal", self._entity_id)
+            return None, None
+        
+        line = json.dumps(
+            {"generation": self._journal_generation, "ops": ops},
+            ensure_ascii=False, separators=(",", ":")
+        ) + "\n"
+        if self._journal_size + len(line.encode("utf-8")) > self._compaction_ratio * self._snapshot_size:
+            return WRITE_KIND_COMPACTION, None
+        return WRITE_KIND_APPEND, line
+    
+    def _save_sync(self, learning_data: Any) -> None:
+        """Run a complete save in the calling (executor) thread.
+        
+        Must be called with the lock held.
+        """
+        self._ensure_data_directory()
+        kind, line = self._plan_save(learning_data)
+        if kind == WRITE_KIND_COMPACTION:
+            self._write_snapshot_sync(learning_data)
+        elif kind == WRITE_KIND_APPEND:
+            self._append_journal_sync(line)
+    
+    async def async_compact_journal(self) -> bool:
+        """Fold the journal into a new snapshot now.
+        
+        Returns:
+            True if a snapshot was written, False if there is nothing to compact
+        """
+        async with self._lock:
+            if self._journal_base is None or self._journal_entries == 0:
+                return False
+            try:
+                if self._writer is not None:
+                    await self._writer.async_run(self._write_snapshot_sync, self._journal_base)
+                else:
+                    await self._hass.async_add_executor_job(self._write_snapshot_sync, self._journal_base)
+                return True
+            except Exception as e:
+                _LOGGER.error("Failed to compact learning data journal for %s: %s", self._entity_id, e)
+                return False
+    
+    def _begin_snapshot(self, learning_data: Any) -> Tuple[int, Dict[str, Any]]:
+        """Invalidate journal state and build the snapshot file contents.
+        
+        Returns:
+            Tuple of (new journal generation, data to write)
+        """
+        # Invalidate journal state until the new snapshot is in place
+        self._journal_base = None
+        generation = (self._journal_generation or 0) + 1
+        
+        # Prepare data structure with metadata
+        save_data = {
+            "version": DATA_FORMAT_VERSION,
+            "entity_id": self._entity_id,
+            "last_updated": datetime.now().isoformat(),
+            "learning_enabled": True,
+            "journal_generation": generation,
+            "learning_data": learning_data
+        }
+        return generation, save_data
+    
+    def _finish_snapshot(self, generation: int, latency_ms: float) -> None:
+        """Record a snapshot that is now in place (journal base is set separately)."""
+        self._last_write_latency_ms = latency_ms
+        self._last_compaction_latency_ms = latency_ms
+        self._journal_generation = generation
+        self._journal_entries = 0
+        self._journal_size = 0
+    
+    def _set_journal_base(self, learning_data: Any) -> None:
+        """Use the JSON form of a freshly written snapshot as the journal base."""
+        try:
+            self._journal_base, self._snapshot_size = _json_round_trip(learning_data)
+        except (TypeError, ValueError) as e:
+            # Not JSON serializable as-is; the next save writes a snapshot again
+            _LOGGER.debug("Journal disabled until next snapshot for %s: %s", self._entity_id, e)
+        
+        _LOGGER.debug(
+            "Saved learning data snapshot for %s (generation %d, %d bytes) in %.2f ms",
+            self._entity_id, self._journal_generation, self._snapshot_size, self._last_write_latency_ms
+        )
+    
+    def _write_snapshot_sync(self, learning_data: Any) -> None:
+        """Write a full snapshot and start a new, empty journal generation.
+        
+        Runs in the calling (executor) thread and uses a safe atomic write
+        pattern that preserves backup data:
+        1. Write to temporary file first
+        2. Validate temporary file 
+        3. Only overwrite backup after validation succeeds
+        4. Atomic move of temp file to primary
+        5. Remove the journal folded into the snapshot
+        
+        Must be called with the lock held.
+        """
+        generation, save_data = self._begin_snapshot(learning_data)
+        start_time = time.perf_counter()
+        
+        # Step 1: Write to temporary file first (do NOT touch backup yet)
+        temp_file = self._data_file_path.with_suffix(".json.tmp")
+        atomic_json_write(temp_file, save_data, True)
+        
+        # Step 2: Validate the temporary file
+        if not self._validate_json_file(temp_file):
+            temp_file.unlink(missing_ok=True)
+            raise IOError("Temporary file validation failed - data may be corrupted")
+        
+        # Step 3: NOW it's safe to create backup (temp file is validated)
+        self._create_backup_if_needed(self._data_file_path)
+        
+        # Step 4: Atomic move of validated temp file to primary location
+        temp_file.rename(self._data_file_path)
+        
+        # Step 5: The old journal is folded in; its entries carry the previous
+        # generation, so a crash before this point cannot replay them twice
+        self._journal_file_path.unlink(missing_ok=True)
+        
+        # Write latency is only recorded on successful completion
+        self._finish_snapshot(generation, (time.perf_counter() - start_time) * 1000.0)
+        self._set_journal_base(learning_data)
+    
+    def _finish_append(self, line: str, latency_ms: float) -> None:
+        """Record a journal entry that is now on disk."""
+        self._last_write_latency_ms = latency_ms
+        self._last_append_latency_ms = latency_ms
+        
+        self._journal_base = apply_journal_ops(self._journal_base, json.loads(line)["ops"])
+        self._journal_entries += 1
+        
+        _LOGGER.debug(
+            "Journaled learning data for %s (%d bytes, journal %d bytes / %d entries) in %.2f ms",
+            self._entity_id, len(line), self._journal_size, self._journal_entries,
+            self._last_write_latency_ms
+        )
+    
+    def _append_journal_sync(self, line: str) -> None:
+        """Append a journal entry in the calling (executor) thread.
+        
+        Must be called with the lock held.
+        """
+        start_time = time.perf_counter()
+        try:
+            self._journal_size = append_journal_line(self._journal_file_path, line)
+        except Exception:
+            # A partial line may have been written; compact on the next save
+            self._journal_base = None
+            raise
+        self._finish_append(line, (time.perf_counter() - start_time) * 1000.0)
+    
+    def _replay_journal(self, learning_data: Any, generation: int) -> tuple:
+        """Apply the journal entries of a snapshot generation to its learning data.
+        
+        Replay stops at the first unreadable entry (a write interrupted by a
+        crash); the caller then compacts on the next save so the damaged tail
+        is dropped.
+        
+        Returns:
+            Tuple of (learning data with valid entries applied, True if the
+            whole journal was readable)
+        """
+        self._journal_entries = 0
+        self._journal_size = 0
+        if not self._journal_file_path.exists():
+            return learning_data, True
+        
+        clean = True
+        with self._journal_file_path.open("r", encoding="utf-8") as f:
+            for raw_line in f:
+                try:
+                    entry = json.loads(raw_line)
+                    if entry.get("generation") != generation:
+                        continue  # Left over from before the last compaction
+                    learning_data = apply_journal_ops(learning_data, entry["ops"])
+                except (json.JSONDecodeError, KeyError, IndexError, TypeError, ValueError, AttributeError) as e:
+                    _LOGGER.warning(
+                        "Stopping journal replay for %s at a damaged entry: %s",
+                        self._entity_id, e
+                    )
+                    clean = False
+                    break
+                self._journal_entries += 1
+                self._journal_size += len(raw_line.encode("utf-8"))
+        
+        _LOGGER.debug(
+            "Replayed %d journal entries for %s", self._journal_entries, self._entity_id
+        )
+        return learning_data, clean
+    
     async def async_load_learning_data(self) -> Optional[Dict[str, Any]]:
         """Load learning data from JSON file safely and asynchronously.
         
@@ -279,9 +603,26 @@ class SmartClimateDataStore:
                     _LOGGER.warning("Missing or invalid learning_data in %s", self._data_file_path)
                     return None
                 
+                self._snapshot_size = self._data_file_path.stat().st_size
+                self._journal_base = None
+                generation = data.get("journal_generation")
+                if isinstance(generation, int):
+                    learning_data, clean = self._replay_journal(learning_data, generation)
+                    self._journal_generation = generation
+                    if clean:
+                        # Independent copy: the caller takes ownership of learning_data
+                        self._journal_base = copy.deepcopy(learning_data)
+                else:
+                    # Written before journaling: migrated by a snapshot on the next save
+                    self._journal_generation = None
+                    _LOGGER.info(
+                        "Learning data for %s will be migrated to the journaled format on next save",
+                        self._entity_id
+                    )
+                
                 _LOGGER.debug(
-                    "Loaded learning data for %s (%d bytes)",
-                    self._entity_id, self._data_file_path.stat().st_size
+                    "Loaded learning data for %s (%d bytes, %d journal entries)",
+                    self._entity_id, self._snapshot_size, self._journal_entries
                 )
                 
                 return learning_data
@@ -322,6 +663,12 @@ class SmartClimateDataStore:
                     backup_path.unlink()
                 
                 self._data_file_path.rename(backup_path)
+                
+                # Keep the journal with its snapshot backup
+                if self._journal_file_path.exists():
+                    self._journal_file_path.replace(
+                        self._journal_file_path.with_suffix(f"{self._journal_file_path.suffix}.deleted")
+                    )
                 _LOGGER.info(
                     "Learning data file deleted for %s (backed up to %s)",
                     self._entity_id, backup_path
@@ -337,14 +684,48 @@ class SmartClimateDataStore:
         # Use lock to prevent deletion during other operations
         async with self._lock:
             await self._hass.async_add_executor_job(_delete_sync)
+            self._journal_base = None
+            self._journal_generation = None
+            self._journal_entries = 0
+            self._journal_size = 0
     
-    def get_last_write_latency(self) -> float:
+    def get_last_write_latency(self, kind: Optional[str] = None) -> float:
         """Get the latency of the last write operation.
         
         This method provides the duration of the last successful write operation
         for dashboard monitoring purposes.
         
+        Args:
+            kind: WRITE_KIND_APPEND or WRITE_KIND_COMPACTION for the last write
+                of that kind; None for the last write of either kind
+        
         Returns:
             Last write latency in milliseconds (>= 0.0)
         """
-        return self._last_write_latency_ms
\ No newline at end of file
+        if kind == WRITE_KIND_APPEND:
+            return self._last_append_latency_ms
+        if kind == WRITE_KIND_COMPACTION:
+            return self._last_compaction_latency_ms
+        return self._last_write_latency_ms
+    
+    def get_journal_stats(self) -> Dict[str, Any]:
+        """Get journal size and write latency statistics.
+        
+        Returns:
+            Dictionary with snapshot generation, journal entries and sizes,
+            and the last append and compaction latencies in milliseconds
+        """
+        return {
+            "generation": self._journal_generation,
+            "journal_entries": self._journal_entries,
+            "journal_size_bytes": self._journal_size,
+            "snapshot_size_bytes": self._snapshot_size,
+            "append_latency_ms": self._last_append_latency_ms,
+            "compaction_latency_ms": self._last_compaction_latency_ms,
+        }
+    
+    def get_writer_metrics(self) -> Optional[Dict[str, Any]]:
+        """Return the shared writer's queue and batch metrics, or None without a writer."""
+        if self._writer is None:
+            return None
+        return self._writer.get_metrics()
@@ -287,6 +287,11 @@ class DelayLearner:
         Returns:
             Current temperature in Celsius, or None if unavailable
         """
+        # Share the sensor manager's parsed reading when it tracks the same sensor
+        sensor_manager = self._sensor_manager
+        if sensor_manager is not None and sensor_manager.room_sensor_id == self._room_sensor_entity_id:
+            return sensor_manager.get_room_temperature()
+        
         state = self._hass.states.get(self._room_sensor_entity_id)
         if state and state.state not in ("unknown", "unavailable"):
             try:
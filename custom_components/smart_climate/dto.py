@@ -37,7 +37,10 @@ class ACBehaviorData:
 class PerformanceData:
     """Performance metrics."""
     ema_coefficient: float = 0.0  # 0.0 to 1.0
-    prediction_latency_ms: float = 0.0
+    prediction_latency_ms: float = 0.0  # Median calculate_offset() duration
+    prediction_latency_p95_ms: float = 0.0
+    prediction_latency_p99_ms: float = 0.0
+    hot_path_latency_ms: Dict[str, Dict[str, float]] = field(default_factory=dict)  # p50/p95/p99/max/count per stage
     energy_efficiency_score: int = 0  # 0-100
     sensor_availability_score: float = 0.0  # Percentage (0-100)
 
@@ -47,6 +50,12 @@ class SystemHealthData:
     """System health metrics."""
     memory_usage_kb: float = 0.0
     persistence_latency_ms: float = 0.0
+    persistence_queue_depth: int = 0  # Save jobs waiting in the shared writer
+    persistence_batch_latency_ms: float = 0.0  # Last shared writer batch duration
+    restore_phase_one_ms: float = 0.0  # Startup restore of the hot state
+    restore_phase_two_ms: float = 0.0  # Hydration of samples, seasonal patterns and probe history
+    restore_phase_two_max_step_ms: float = 0.0  # Longest event loop block of one hydration step
+    learning_hydrated: bool = True  # False while phase two runs in the background
     outlier_detection_active: bool = False
     samples_per_day: float = 0.0
     accuracy_improvement_rate: float = 0.0  # Percentage per day
@@ -1,10 +1,27 @@
 """Base entity for Smart Climate integration."""
 
+import time
+from typing import Any, Mapping, Optional
+
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.components.sensor import SensorEntity
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    CONF_COMPACT_TELEMETRY,
+    CONF_TELEMETRY_INTERVALS,
+    DEFAULT_COMPACT_TELEMETRY,
+    DEFAULT_TELEMETRY_INTERVALS,
+)
+
+
+def get_entry_option(config_entry, key: str, default: Any) -> Any:
+    """Return a config entry option, falling back to entry data and then the default."""
+    for source in (getattr(config_entry, "options", None), getattr(config_entry, "data", None)):
+        if isinstance(source, Mapping) and key in source:
+            return source[key]
+    return default
 
 
 class SmartClimateBaseEntity(CoordinatorEntity):
@@ -38,6 +55,12 @@ def create_sensor_entity(base_cls=SensorEntity):
         
         _attr_has_entity_name = True
         
+        # Compact telemetry: sensor group for the publish interval, and the
+        # minimum change of a numeric value worth a state write (None derives
+        # it from the suggested display precision)
+        _telemetry_group = "dashboard"
+        _telemetry_deadband: Optional[float] = None
+        
         def __init__(
             self,
             coordinator,
@@ -65,6 +88,15 @@ def create_sensor_entity(base_cls=SensorEntity):
                 identifiers={(DOMAIN, f"{config_entry.unique_id}_{safe_entity_id}")},
                 name=climate_name,
             )
+            
+            # Compact telemetry publishing state
+            self._compact_telemetry = bool(
+                get_entry_option(config_entry, CONF_COMPACT_TELEMETRY, DEFAULT_COMPACT_TELEMETRY)
+            )
+            intervals = get_entry_option(config_entry, CONF_TELEMETRY_INTERVALS, None)
+            intervals = {**DEFAULT_TELEMETRY_INTERVALS, **(intervals if isinstance(intervals, Mapping) else {})}
+            self._telemetry_interval = float(intervals.get(self._telemetry_group, 0))
+            self._published_state = None  # (value, is_on, available, monotonic time) last written
         
         @property
         def should_poll(self) -> bool:
@@ -85,9 +117,56 @@ def create_sensor_entity(base_cls=SensorEntity):
                 )
             )
         
+        @property
+        def telemetry_deadband(self) -> float:
+            """Return the smallest numeric change published in compact telemetry mode."""
+            if self._telemetry_deadband is not None:
+                return self._telemetry_deadband
+            precision = getattr(self, "_attr_suggested_display_precision", None)
+            if isinstance(precision, int) and not isinstance(precision, bool):
+                return 10.0 ** -precision
+            return 0.0
+        
         def _handle_coordinator_update(self) -> None:
             """Handle updated data from the coordinator."""
+            if self._compact_telemetry and not self._should_publish():
+                return
             self.async_write_ha_state()
+        
+        def _should_publish(self) -> bool:
+            """Decide whether a coordinator update is worth a state write.
+            
+            Availability and on/off changes are always written. Otherwise the
+            sensor waits for its group's publish interval and then writes only
+            when the value moved by at least the deadband since the last write.
+            """
+            now = time.monotonic()
+            value = self.native_value
+            is_on = getattr(self, "is_on", None)
+            available = self.available
+            
+            if self._published_state is not None:
+                last_value, last_is_on, last_available, last_time = self._published_state
+                if available == last_available and is_on == last_is_on:
+                    if now - last_time < self._telemetry_interval:
+                        return False
+                    if not self._exceeds_deadband(last_value, value):
+                        return False
+            
+            self._published_state = (value, is_on, available, now)
+            return True
+        
+        def _exceeds_deadband(self, last_value: Any, value: Any) -> bool:
+            """Return True if value differs from last_value by at least the deadband."""
+            if value == last_value:
+                return False
+            numeric = (int, float)
+            if (
+                isinstance(value, bool) or isinstance(last_value, bool)
+                or not isinstance(value, numeric) or not isinstance(last_value, numeric)
+            ):
+                return True
+            return abs(value - last_value) >= self.telemetry_deadband
     
     return SmartClimateSensorEntity
 
@@ -0,0 +1,172 @@
+"""ABOUTME: Domain-wide weather forecast cache shared by all ForecastEngine instances.
+Fetches each weather entity and forecast type once per TTL and coalesces concurrent requests."""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .models import Forecast
+
+_LOGGER = logging.getLogger(__name__)
+
+# hass.data key of the shared cache (kept out of the per-entry hass.data[DOMAIN])
+DATA_FORECAST_CACHE = f"{DOMAIN}_forecast_cache"
+
+# How long a fetched forecast is served to every engine before it is refetched
+DEFAULT_FORECAST_TTL = timedelta(minutes=30)
+
+
+def parse_forecasts(raw_forecasts: List[Dict[str, Any]]) -> List[Forecast]:
+    """Parse weather.get_forecasts points into UTC Forecasts sorted by time.
+
+    Points with an unparsable datetime are skipped.
+    """
+    forecasts = []
+    for f in raw_forecasts:
+        parsed_dt = dt_util.parse_datetime(f["datetime"])
+        if parsed_dt:
+            # Ensure it's UTC aware for consistent time calculations
+            forecasts.append(
+                Forecast(
+                    datetime=dt_util.as_utc(parsed_dt),
+                    temperature=f["temperature"],
+                    condition=f.get("condition"),
+                )
+            )
+    forecasts.sort(key=lambda forecast: forecast.datetime)
+    return forecasts
+
+
+@dataclass(frozen=True)
+class CachedForecast:
+    """Parsed forecast of one weather entity, shared by all engines."""
+    fetched_at: datetime
+    forecasts: Tuple[Forecast, ...]  # Sorted by time
+
+
+class ForecastCache:
+    """Caches weather.get_forecasts responses per weather entity and forecast type.
+
+    Every climate entity pointing at the same weather entity shares one
+    fetch per TTL. Requests arriving while a fetch is running wait for it
+    instead of starting their own.
+    """
+
+    def __init__(self, hass: HomeAssistant, ttl: timedelta = DEFAULT_FORECAST_TTL):
+        """Initialize the cache.
+
+        Args:
+            hass: Home Assistant instance
+            ttl: How long a fetched forecast is served from the cache
+        """
+        self._hass = hass
+        self._ttl = ttl
+        self._entries: Dict[Tuple[str, str], CachedForecast] = {}
+        self._pending: Dict[Tuple[str, str], "asyncio.Future[CachedForecast]"] = {}
+
+        # Metrics
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._failed_fetches = 0
+        self._last_fetch_latency_ms = 0.0
+        self._max_fetch_latency_ms = 0.0
+        self._total_fetch_latency_ms = 0.0
+
+    async def async_get_forecast(
+        self, entity_id: str, forecast_type: str = "hourly"
+    ) -> CachedForecast:
+        """Return the forecast, fetching it when missing or older than the TTL.
+
+        Raises:
+            Exception: The fetch failed; failures are not cached
+        """
+        key = (entity_id, forecast_type)
+        entry = self._entries.get(key)
+        if entry is not None and dt_util.utcnow() - entry.fetched_at < self._ttl:
+            self._hits += 1
+            return entry
+
+        future = self._pending.get(key)
+        if future is None:
+            self._misses += 1
+            future = self._pending[key] = asyncio.ensure_future(self._async_fetch(key))
+        else:
+            self._coalesced += 1
+            _LOGGER.debug("Weather: Joining running %s forecast fetch for %s", forecast_type, entity_id)
+        # A cancelled caller must not cancel the fetch other callers wait for
+        return await asyncio.shield(future)
+
+    async def _async_fetch(self, key: Tuple[str, str]) -> CachedForecast:
+        """Call weather.get_forecasts, parse the response and cache it."""
+        entity_id, forecast_type = key
+        started = time.perf_counter()
+        try:
+            response = await self._hass.services.async_call(
+                "weather", "get_forecasts",
+                {"entity_id": entity_id, "type": forecast_type},
+                blocking=True, return_response=True,
+            )
+            forecasts = parse_forecasts(response.get(entity_id, {}).get("forecast", []))
+        except Exception:
+            self._failed_fetches += 1
+            raise
+        finally:
+            self._pending.pop(key, None)
+            latency_ms = (time.perf_counter() - started) * 1000
+            self._last_fetch_latency_ms = latency_ms
+            self._max_fetch_latency_ms = max(self._max_fetch_latency_ms, latency_ms)
+            self._total_fetch_latency_ms += latency_ms
+
+        _LOGGER.debug(
+            "Weather forecast: Cached %d %s points from %s in %.1f ms",
+            len(forecasts), forecast_type, entity_id, latency_ms
+        )
+        entry = self._entries[key] = CachedForecast(dt_util.utcnow(), tuple(forecasts))
+        return entry
+
+    def clear(self) -> None:
+        """Drop cached forecasts and cancel running fetches."""
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        self._entries.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return cache hit/miss counts and fetch latency."""
+        fetches = self._misses
+        return {
+            "entries": len(self._entries),
+            "hits": self._hits,
+            "misses": self._misses,
+            "coalesced": self._coalesced,
+            "failed_fetches": self._failed_fetches,
+            "hit_rate": round(
+                (self._hits + self._coalesced) / (self._hits + self._coalesced + fetches), 3
+            ) if fetches else 0.0,
+            "last_fetch_latency_ms": round(self._last_fetch_latency_ms, 1),
+            "max_fetch_latency_ms": round(self._max_fetch_latency_ms, 1),
+            "avg_fetch_latency_ms": round(self._total_fetch_latency_ms / fetches, 1) if fetches else 0.0,
+        }
+
+
+def async_get_forecast_cache(hass: HomeAssistant) -> ForecastCache:
+    """Return the domain's shared forecast cache, creating it on first use."""
+    cache = hass.data.get(DATA_FORECAST_CACHE)
+    if cache is None:
+        cache = hass.data[DATA_FORECAST_CACHE] = ForecastCache(hass)
+    return cache
+
+
+def async_remove_forecast_cache(hass: HomeAssistant) -> None:
+    """Clear and drop the domain's shared forecast cache, if it exists."""
+    cache = hass.data.pop(DATA_FORECAST_CACHE, None)
+    if cache is not None:
+        cache.clear()
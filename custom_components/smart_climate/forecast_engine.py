@@ -1,27 +1,81 @@
 """Weather forecast analysis engine for predictive temperature control."""
 
 import logging
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Callable, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, List, Optional, Tuple
 
 from homeassistant.core import HomeAssistant
 from homeassistant.util import dt as dt_util
 
+from .forecast_cache import parse_forecasts
+from .forecast_index import ForecastIndex, ForecastPredicate
 from .models import Forecast, ActiveStrategy, WeatherStrategy
 
+if TYPE_CHECKING:
+    from .forecast_cache import ForecastCache
+
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class StrategyType:
+    """A forecast strategy type evaluated on the ForecastIndex.
+
+    predicate builds a (cache key, checker) pair from a strategy config; equal
+    keys share one encoding of the forecast across strategies and updates.
+    """
+    predicate: Callable[[Dict[str, Any]], Tuple[Hashable, ForecastPredicate]]
+    lookahead_hours: float = 24
+    min_duration_hours: float = 1
+    pre_action_hours: float = 1
+
+
+def _heat_wave_predicate(config: Dict[str, Any]) -> Tuple[Hashable, ForecastPredicate]:
+    # Support both "temp_threshold_c" (new) and "temp_threshold" (legacy)
+    threshold = config.get("temp_threshold_c") or config.get("temp_threshold")
+    return ("temperature_at_least", threshold), lambda f: f.temperature >= threshold
+
+
+def _clear_sky_predicate(config: Dict[str, Any]) -> Tuple[Hashable, ForecastPredicate]:
+    condition = config["condition"]
+    return ("condition", condition), lambda f: f.condition == condition
+
+
+# Strategy types by "strategy_type"; extend with register_strategy_type()
+STRATEGY_TYPES: Dict[str, StrategyType] = {
+    "heat_wave": StrategyType(_heat_wave_predicate, lookahead_hours=48, min_duration_hours=5, pre_action_hours=4),
+    "clear_sky": StrategyType(_clear_sky_predicate, lookahead_hours=24, min_duration_hours=6, pre_action_hours=1),
+}
+
+
+def register_strategy_type(name: str, strategy_type: StrategyType) -> None:
+    """Register a strategy type so configs with this strategy_type are evaluated."""
+    STRATEGY_TYPES[name] = strategy_type
+
+
 class ForecastEngine:
     """Analyzes weather forecasts to calculate predictive temperature adjustments."""
 
-    def __init__(self, hass: HomeAssistant, config: Dict[str, Any]):
-        """Initialize the ForecastEngine."""
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config: Dict[str, Any],
+        forecast_cache: Optional["ForecastCache"] = None,
+    ):
+        """Initialize the ForecastEngine.
+        
+        With a forecast_cache, the forecast is fetched through the cache shared
+        by all engines instead of calling the weather service directly.
+        """
         self._hass = hass
+        self._forecast_cache = forecast_cache
         self._weather_entity = config.get("weather_entity")
         self._strategies = [s for s in config.get("strategies", []) if s.get("enabled", True)]
         
         self._forecast_data: List[Forecast] = []
+        self._forecast_index: Optional[ForecastIndex] = None
+        self._forecast_index_source: Optional[List[Forecast]] = None
         self._active_strategy: Optional[ActiveStrategy] = None
         self._last_update: Optional[datetime] = None
         self._update_interval = timedelta(minutes=30)
@@ -101,26 +155,17 @@ class ForecastEngine:
         """Fetch hourly forecast data from Home Assistant. Returns True on success."""
         try:
             _LOGGER.debug("Weather forecast: Fetching data from entity %s", self._weather_entity)
-            response = await self._hass.services.async_call(
-                "weather", "get_forecasts",
-                {"entity_id": self._weather_entity, "type": "hourly"},
-                blocking=True, return_response=True,
-            )
-            
-            raw_forecasts = response.get(self._weather_entity, {}).get("forecast", [])
-            self._forecast_data = []
-            for f in raw_forecasts:
-                parsed_dt = dt_util.parse_datetime(f["datetime"])
-                if parsed_dt:
-                    # Ensure it's UTC aware for consistent time calculations
-                    forecast_dt_utc = dt_util.as_utc(parsed_dt)
-                    self._forecast_data.append(
-                        Forecast(
-                            datetime=forecast_dt_utc,
-                            temperature=f["temperature"],
-                            condition=f.get("condition")
-                        )
-                    )
+            if self._forecast_cache is not None:
+                cached = await self._forecast_cache.async_get_forecast(self._weather_entity, "hourly")
+                self._forecast_data = list(cached.forecasts)
+            else:
+                response = await self._hass.services.async_call(
+                    "weather", "get_forecasts",
+                    {"entity_id": self._weather_entity, "type": "hourly"},
+                    blocking=True, return_response=True,
+                )
+                raw_forecasts = response.get(self._weather_entity, {}).get("forecast", [])
+                self._forecast_data = parse_forecasts(raw_forecasts)
             
             _LOGGER.debug("Weather forecast: Retrieved %d hourly forecast points from %s", 
                          len(self._forecast_data), self._weather_entity)
@@ -156,6 +201,8 @@ class ForecastEngine:
             
             if evaluator:
                 evaluator(strategy_config, now)
+            elif strategy_type in STRATEGY_TYPES:
+                self._evaluate_registered_strategy(strategy_type, strategy_config, now)
             else:
                 _LOGGER.warning("Weather: Unknown strategy type '%s' for strategy '%s'", 
                                strategy_type, strategy_name)
@@ -174,6 +221,17 @@ class ForecastEngine:
         if not self._active_strategy:
             _LOGGER.debug("Weather: No strategies activated - all conditions not met")
 
+    def _get_forecast_index(self) -> ForecastIndex:
+        """Return the index of the current forecast, rebuilding it when the data changed."""
+        if (
+            self._forecast_index is None
+            or self._forecast_index_source is not self._forecast_data
+            or len(self._forecast_index) != len(self._forecast_data)
+        ):
+            self._forecast_index = ForecastIndex(self._forecast_data)
+            self._forecast_index_source = self._forecast_data
+        return self._forecast_index
+
     def _find_consecutive_event(
         self, 
         forecasts: List[Forecast], 
@@ -224,31 +282,26 @@ class ForecastEngine:
                 _LOGGER.debug("Weather: Failed to check current weather temperature: %s", e)
         
         # Now check forecast for FUTURE heat waves only
-        # Get future forecasts only (exclude current/past)
-        future_forecasts = [f for f in self._forecast_data if f.datetime > now]
-        if not future_forecasts:
+        # Window of future forecasts only (exclude current/past)
+        index = self._get_forecast_index()
+        lo, hi = index.window(now, lookahead)
+        if lo >= len(index):
             _LOGGER.warning("Weather: No future forecast data available")
             return
         
-        relevant_forecasts = [f for f in future_forecasts 
-                              if f.datetime <= now + lookahead]
-        
         _LOGGER.debug(
             "Weather: Evaluating 'heat_wave' strategy - checking for temps >%.1f°C for %dh in next %dh",
             temp_threshold, min_duration, lookahead.total_seconds() / 3600
         )
         
         # Find consecutive event in FUTURE forecasts only
-        event_start_time = self._find_consecutive_event(
-            relevant_forecasts,
-            timedelta(hours=min_duration),
-            lambda f: f.temperature >= temp_threshold
-        )
+        key, checker = _heat_wave_predicate(config)
+        event_start_time = index.find_run(key, checker, lo, hi, timedelta(hours=min_duration))
         
         if not event_start_time:
             # Find the maximum temperature in the forecast period for logging
-            if relevant_forecasts:
-                max_temp = max(f.temperature for f in relevant_forecasts)
+            if hi > lo:
+                max_temp = max(f.temperature for f in index.points(lo, hi))
                 _LOGGER.debug(
                     "Weather: Heat wave strategy not activated - max temp %.1f°C < %.1f°C threshold",
                     max_temp, temp_threshold
@@ -314,32 +367,27 @@ class ForecastEngine:
                 _LOGGER.debug("Weather: Failed to check current weather state: %s", e)
         
         # Now check forecast for FUTURE events only
-        # Get future forecasts only (exclude current/past)
-        future_forecasts = [f for f in self._forecast_data if f.datetime > now]
-        if not future_forecasts:
+        # Window of future forecasts only (exclude current/past)
+        index = self._get_forecast_index()
+        lo, hi = index.window(now, lookahead)
+        if lo >= len(index):
             _LOGGER.warning("Weather: No future forecast data available")
             return
         
-        relevant_forecasts = [f for f in future_forecasts 
-                              if f.datetime <= now + lookahead]
-        
         _LOGGER.debug(
             "Weather: Evaluating 'clear_sky' strategy - checking for '%s' conditions for %dh in next %dh",
             target_condition, min_duration, lookahead.total_seconds() / 3600
         )
         
         # Find consecutive event in FUTURE forecasts only
-        event_start_time = self._find_consecutive_event(
-            relevant_forecasts,
-            timedelta(hours=min_duration),
-            lambda f: f.condition == target_condition
-        )
+        key, checker = _clear_sky_predicate(config)
+        event_start_time = index.find_run(key, checker, lo, hi, timedelta(hours=min_duration))
         
         if not event_start_time:
             # Count matching conditions for logging
-            if relevant_forecasts:
-                matching_count = sum(1 for f in relevant_forecasts if f.condition == target_condition)
-                total_count = len(relevant_forecasts)
+            if hi > lo:
+                matching_count = index.count(key, checker, lo, hi)
+                total_count = hi - lo
                 _LOGGER.debug(
                     "Weather: Clear sky strategy not activated - %d/%d forecast points match '%s' condition (%dh required)",
                     matching_count, total_count, target_condition, min_duration
@@ -397,6 +445,34 @@ class ForecastEngine:
                 hours_until_preaction
             )
 
+    def _evaluate_registered_strategy(self, strategy_type: str, config: Dict[str, Any], now: datetime) -> None:
+        """Evaluator for strategy types added with register_strategy_type()."""
+        spec = STRATEGY_TYPES[strategy_type]
+        lookahead = timedelta(hours=config.get("lookahead_hours", spec.lookahead_hours))
+        min_duration = config.get("min_duration_hours", spec.min_duration_hours)
+        pre_action_hours = config.get("pre_action_hours", spec.pre_action_hours)
+        
+        index = self._get_forecast_index()
+        lo, hi = index.window(now, lookahead)
+        key, checker = spec.predicate(config)
+        event_start_time = index.find_run((strategy_type, key), checker, lo, hi, timedelta(hours=min_duration))
+        if not event_start_time:
+            _LOGGER.debug("Weather: '%s' strategy not activated - no %dh event in forecast window",
+                          strategy_type, min_duration)
+            return
+        
+        hours_until_event = (event_start_time - now).total_seconds() / 3600
+        if now >= event_start_time - timedelta(hours=pre_action_hours):
+            self._active_strategy = ActiveStrategy(
+                name=config.get("name", strategy_type),
+                adjustment=config.get("adjustment", config.get("adjustment_c", 0.0)),
+                end_time=event_start_time,
+            )
+            self._active_strategy.reason = f"{strategy_type} event detected in {hours_until_event:.1f}h"
+        else:
+            _LOGGER.debug("Weather: '%s' event detected but pre-action not yet due (%.1fh until event)",
+                          strategy_type, hours_until_event)
+
     def get_weather_strategy(self) -> WeatherStrategy:
         """
         Get current weather strategy information for smart sleep mode wake-up.
@@ -455,6 +531,22 @@ class ForecastEngine:
                 adjustment=adjustment
             )
     
+    def get_hourly_outdoor_temperatures(
+        self, hours: int = 24, now: Optional[datetime] = None
+    ) -> List[float]:
+        """Return the forecast outdoor temperatures of the next `hours` hours in time order."""
+        if not self._forecast_data:
+            return []
+        index = self._get_forecast_index()
+        lo, hi = index.window(now or dt_util.utcnow(), timedelta(hours=hours))
+        return [f.temperature for f in index.points(lo, hi)]
+
+    def get_cache_metrics(self) -> Optional[Dict[str, Any]]:
+        """Return the shared forecast cache metrics, or None without a cache."""
+        if self._forecast_cache is None:
+            return None
+        return self._forecast_cache.get_metrics()
+    
     def _record_mode_change(self) -> None:
         """Record when mode changes occur for suppression logic."""
         self._last_mode_change_time = dt_util.utcnow()
@@ -0,0 +1,115 @@
+"""ABOUTME: Time-indexed view of a weather forecast for repeated strategy queries.
+Answers 'is there a run of N points matching a predicate within a window' via bisect and cached runs."""
+
+import math
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from .models import Forecast
+
+# Predicate over one forecast point, e.g. "temperature >= 30"
+ForecastPredicate = Callable[[Forecast], bool]
+
+
+class _PredicateRuns:
+    """Prefix counts and run-length encoding of one predicate over the forecast."""
+
+    def __init__(self, forecasts: Sequence[Forecast], checker: ForecastPredicate):
+        size = len(forecasts)
+        flags = [bool(checker(f)) for f in forecasts]
+
+        # prefix[i] = number of matching points before index i
+        self.prefix = [0] * (size + 1)
+        for i, flag in enumerate(flags):
+            self.prefix[i + 1] = self.prefix[i] + flag
+
+        # run_length[i] = matching points from i up to the next non-match
+        self.run_length = [0] * (size + 1)
+        for i in range(size - 1, -1, -1):
+            if flags[i]:
+                self.run_length[i] = self.run_length[i + 1] + 1
+
+        # Run-length encoding: (start, length) of each maximal run of matches
+        self.runs: List[Tuple[int, int]] = [
+            (i, self.run_length[i])
+            for i in range(size)
+            if flags[i] and (i == 0 or not flags[i - 1])
+        ]
+        self._qualifying: Dict[int, List[int]] = {}
+
+    def qualifying_starts(self, min_points: int) -> List[int]:
+        """Return the start indices of runs with at least min_points matches."""
+        starts = self._qualifying.get(min_points)
+        if starts is None:
+            starts = self._qualifying[min_points] = [
+                start for start, length in self.runs if length >= min_points
+            ]
+        return starts
+
+
+class ForecastIndex:
+    """Sorted forecast with per-predicate prefix counts and run encodings.
+
+    Built once per fetched forecast. Each predicate is encoded on first use
+    and shared by every strategy and evaluation that asks for the same key,
+    after which window lookups and run queries are O(log n).
+    """
+
+    def __init__(self, forecasts: Sequence[Forecast]):
+        """Index the forecast points, sorting them by time."""
+        self._forecasts: Tuple[Forecast, ...] = tuple(sorted(forecasts, key=lambda f: f.datetime))
+        self._times = [f.datetime for f in self._forecasts]
+        self._predicates: Dict[Hashable, _PredicateRuns] = {}
+
+    def __len__(self) -> int:
+        """Return the number of forecast points."""
+        return len(self._forecasts)
+
+    def window(self, now: datetime, lookahead: timedelta) -> Tuple[int, int]:
+        """Return the index range of points after now and up to now + lookahead."""
+        return bisect_right(self._times, now), bisect_right(self._times, now + lookahead)
+
+    def points(self, lo: int, hi: int) -> Tuple[Forecast, ...]:
+        """Return the forecast points in an index range."""
+        return self._forecasts[lo:hi]
+
+    def _runs(self, key: Hashable, checker: ForecastPredicate) -> _PredicateRuns:
+        """Return the encoding of a predicate, building it on first use."""
+        runs = self._predicates.get(key)
+        if runs is None:
+            runs = self._predicates[key] = _PredicateRuns(self._forecasts, checker)
+        return runs
+
+    def count(self, key: Hashable, checker: ForecastPredicate, lo: int, hi: int) -> int:
+        """Return how many points in [lo, hi) match the predicate."""
+        prefix = self._runs(key, checker).prefix
+        return prefix[hi] - prefix[lo] if hi > lo else 0
+
+    def find_run(
+        self,
+        key: Hashable,
+        checker: ForecastPredicate,
+        lo: int,
+        hi: int,
+        min_duration: timedelta,
+    ) -> Optional[datetime]:
+        """Return the start time of the first run of matches lasting min_duration.
+
+        Each forecast point counts as one hour, and runs are cut at the window
+        edges, matching ForecastEngine._find_consecutive_event() on the window.
+        """
+        if hi <= lo:
+            return None
+        runs = self._runs(key, checker)
+        min_points = max(1, math.ceil(min_duration.total_seconds() / 3600))
+
+        # A run already in progress at the window start is counted from lo
+        if min(runs.run_length[lo], hi - lo) >= min_points:
+            return self._times[lo]
+
+        starts = runs.qualifying_starts(min_points)
+        i = bisect_right(starts, lo)
+        if i < len(starts) and starts[i] + min_points <= hi:
+            return self._times[starts[i]]
+        return None
@@ -0,0 +1,115 @@
+"""ABOUTME: Low-overhead latency instrumentation for the OffsetEngine hot paths.
+Keeps the most recent durations per stage in fixed-size ring buffers and reports p50/p95/p99."""
+
+import time
+from typing import Dict, List, Optional
+
+# Instrumented stages of the offset calculation and persistence paths
+STAGE_CALCULATE_OFFSET = "calculate_offset"
+STAGE_FEATURE_ENRICHMENT = "feature_enrichment"
+STAGE_HYSTERESIS_DETECTION = "hysteresis_detection"
+STAGE_SEASONAL_LOOKUP = "seasonal_lookup"
+STAGE_PREDICT = "predict"
+STAGE_PERSISTENCE = "persistence"
+
+# Durations kept per stage; percentiles describe this most recent window
+DEFAULT_RESERVOIR_SIZE = 256
+
+PERCENTILES = (50, 95, 99)
+
+
+class LatencyReservoir:
+    """Ring buffer of the most recent durations of one stage."""
+
+    __slots__ = ("_samples", "_index", "_count", "_max_ms")
+
+    def __init__(self, size: int = DEFAULT_RESERVOIR_SIZE) -> None:
+        """Initialize an empty reservoir holding up to `size` durations."""
+        if size <= 0:
+            raise ValueError("Reservoir size must be positive")
+        self._samples: List[float] = [0.0] * size
+        self._index = 0
+        self._count = 0
+        self._max_ms = 0.0
+
+    @property
+    def count(self) -> int:
+        """Return the number of durations recorded since creation."""
+        return self._count
+
+    def add(self, latency_ms: float) -> None:
+        """Record one duration, overwriting the oldest once the buffer is full."""
+        self._samples[self._index] = latency_ms
+        self._index += 1
+        if self._index == len(self._samples):
+            self._index = 0
+        self._count += 1
+        if latency_ms > self._max_ms:
+            self._max_ms = latency_ms
+
+    def percentile(self, percent: float) -> float:
+        """Return the nearest-rank percentile of the buffered durations (0.0 when empty)."""
+        ordered = self._ordered()
+        return _nearest_rank(ordered, percent) if ordered else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        """Return p50/p95/p99 of the window, the all-time maximum and the count."""
+        ordered = self._ordered()
+        if not ordered:
+            return {}
+        summary = {f"p{percent}": round(_nearest_rank(ordered, percent), 3) for percent in PERCENTILES}
+        summary["max"] = round(self._max_ms, 3)
+        summary["count"] = self._count
+        return summary
+
+    def _ordered(self) -> List[float]:
+        """Return the buffered durations in ascending order."""
+        return sorted(self._samples[:min(self._count, len(self._samples))])
+
+
+def _nearest_rank(ordered: List[float], percent: float) -> float:
+    """Return the nearest-rank percentile of an ascending, non-empty list."""
+    rank = -(-len(ordered) * percent // 100)  # ceil without float rounding issues
+    return ordered[max(0, min(len(ordered), int(rank)) - 1)]
+
+
+class LatencyTracker:
+    """Per-stage latency reservoirs fed from time.perf_counter() start marks.
+
+    Callers keep the tracker in an Optional attribute and skip both the
+    clock read and the record call when it is None, so disabled
+    instrumentation costs a single None check per stage.
+    """
+
+    def __init__(self, reservoir_size: int = DEFAULT_RESERVOIR_SIZE) -> None:
+        """Initialize the tracker with empty reservoirs of the given size."""
+        if reservoir_size <= 0:
+            raise ValueError("Reservoir size must be positive")
+        self._reservoir_size = reservoir_size
+        self._stages: Dict[str, LatencyReservoir] = {}
+
+    def record(self, stage: str, started: float) -> float:
+        """Record the time elapsed since `started` for a stage and return it in ms."""
+        latency_ms = (time.perf_counter() - started) * 1000.0
+        reservoir = self._stages.get(stage)
+        if reservoir is None:
+            reservoir = self._stages[stage] = LatencyReservoir(self._reservoir_size)
+        reservoir.add(latency_ms)
+        return latency_ms
+
+    def percentile(self, stage: str, percent: float) -> float:
+        """Return a percentile of a stage's recent durations in ms (0.0 if never recorded)."""
+        reservoir = self._stages.get(stage)
+        return reservoir.percentile(percent) if reservoir is not None else 0.0
+
+    def get_stage(self, stage: str) -> Optional[LatencyReservoir]:
+        """Return the reservoir of a stage, or None if it was never recorded."""
+        return self._stages.get(stage)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Return the summary of every recorded stage."""
+        return {stage: reservoir.summary() for stage, reservoir in self._stages.items()}
+
+    def reset(self) -> None:
+        """Discard all recorded durations."""
+        self._stages.clear()
@@ -8,10 +8,27 @@ import logging
 import math
 import statistics
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Mapping, Optional, Any, Sequence
 from collections import deque
 from datetime import datetime
 
+from .sample_store import (
+    HAS_NUMPY,
+    CORRELATION_MODE_INTERPOLATE,
+    CORRELATION_MODE_LOCAL_LINEAR,
+    CORRELATION_MODES,
+    DEFAULT_CORRELATION_NEIGHBORS,
+    DEFAULT_MIN_INDEX_CANDIDATES,
+    EnhancedSampleStore,
+    OutdoorTemperatureIndex,
+    RunningSampleStatistics,
+    SampleMetrics,
+    compute_sample_metrics,
+    sample_metrics_from_samples,
+    theil_sen_line,
+)
+from .sample_codec import pack_samples, unpack_sample
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -42,20 +59,41 @@ class LightweightOffsetLearner:
     - Memory-efficient storage with configurable limits
     """
     
-    def __init__(self, max_history: int = 1000, learning_rate: float = 0.1):
+    def __init__(
+        self,
+        max_history: int = 1000,
+        learning_rate: float = 0.1,
+        use_spatial_index: bool = False,
+        min_index_candidates: int = DEFAULT_MIN_INDEX_CANDIDATES,
+        correlation_mode: str = CORRELATION_MODE_INTERPOLATE,
+        pack_samples: bool = False
+    ):
         """Initialize the lightweight learner.
         
         Args:
             max_history: Maximum number of data points to keep in memory
             learning_rate: Learning rate for exponential smoothing (0.0 to 1.0)
+            use_spatial_index: Score only samples near the current conditions
+                (grid index lookup) instead of every sample
+            min_index_candidates: Minimum indexed candidates before predict()
+                falls back to an exact full scan
+            correlation_mode: Temperature correlation prediction method,
+                "interpolate" (two nearest points) or "local_linear"
+                (robust line through the nearest points)
+            pack_samples: Persist enhanced samples as packed binary records
+                (version 1.3) instead of JSON objects
         """
         if not 0.0 < learning_rate <= 1.0:
             raise ValueError("Learning rate must be between 0.0 and 1.0")
         if max_history <= 0:
             raise ValueError("Max history must be positive")
+        if correlation_mode not in CORRELATION_MODES:
+            raise ValueError(f"Unsupported correlation mode: {correlation_mode}")
             
         self._max_history = max_history
         self._learning_rate = learning_rate
+        self._correlation_mode = correlation_mode
+        self._pack_samples = pack_samples
         
         # Time-of-day patterns (24 hours, 0-23)
         self._time_patterns: List[float] = [0.0] * 24
@@ -64,6 +102,10 @@ class LightweightOffsetLearner:
         # Temperature correlation data (limited by max_history)
         self._temp_correlation_data = deque(maxlen=max_history)
         
+        # Sorted outdoor_temp -> offset view of the deque for O(log n) neighbour lookup
+        self._temp_correlation_index = OutdoorTemperatureIndex()
+        self._temp_correlation_index_source = self._temp_correlation_data
+        
         # Power state patterns
         self._power_state_patterns: Dict[str, Dict[str, float]] = {}
         
@@ -73,11 +115,38 @@ class LightweightOffsetLearner:
         # Enhanced samples storage for hysteresis-aware learning
         self._enhanced_samples: List[Dict[str, Any]] = []
         
+        # Columnar mirror of _enhanced_samples for vectorized prediction
+        # (None when numpy is unavailable - predict() then uses the Python loop)
+        self._sample_store: Optional[EnhancedSampleStore] = (
+            EnhancedSampleStore(
+                max_history,
+                use_spatial_index=use_spatial_index,
+                min_index_candidates=min_index_candidates
+            )
+            if HAS_NUMPY else None
+        )
+        
+        # Running accuracy/diversity counters, updated on add and eviction
+        self._sample_stats = RunningSampleStatistics()
+        self._sample_store_source: Optional[List[Dict[str, Any]]] = self._enhanced_samples
+        
+        # Bumped on every change to the persisted state (dirty tracking for saves)
+        self._generation: int = 0
+        
+        # Algorithm metrics snapshot and the (generation, sample count) it was computed for
+        self._metrics_snapshot: Optional[SampleMetrics] = None
+        self._metrics_snapshot_key: Optional[tuple] = None
+        
         _LOGGER.debug(
-            "LightweightOffsetLearner initialized: max_history=%d, learning_rate=%.3f",
-            max_history, learning_rate
+            "LightweightOffsetLearner initialized: max_history=%d, learning_rate=%.3f, spatial_index=%s",
+            max_history, learning_rate, use_spatial_index
         )
     
+    @property
+    def generation(self) -> int:
+        """Counter that changes whenever the persisted learning state changes."""
+        return self._generation
+    
     def add_sample(
         self,
         predicted: float,
@@ -119,17 +188,27 @@ class LightweightOffsetLearner:
             "timestamp": datetime.now().isoformat()
         }
         
+        store_in_sync = self._is_sample_store_in_sync()
         self._enhanced_samples.append(sample)
         
         # Keep only recent samples to prevent memory bloat
         if len(self._enhanced_samples) > self._max_history:
             removed_count = len(self._enhanced_samples) - self._max_history
-            self._enhanced_samples = self._enhanced_samples[-self._max_history:]
+            if store_in_sync:
+                for evicted in self._enhanced_samples[:removed_count]:
+                    self._sample_stats.remove(evicted)
+            del self._enhanced_samples[:removed_count]
             _LOGGER.debug(
                 "Pruned %s old enhanced samples, keeping %s most recent", 
                 removed_count, self._max_history
             )
         
+        # Mirror into the columnar store; its ring buffer evicts the same oldest sample
+        if store_in_sync:
+            self._sample_stats.add(sample)
+            if self._sample_store is not None:
+                self._sample_store.append(sample)
+        
         # Update pattern structures - this was the critical missing piece!
         hour = datetime.now().hour
         power_state = self._determine_power_state(power)
@@ -170,6 +249,80 @@ class LightweightOffsetLearner:
             _LOGGER.debug("No enhanced samples available for prediction")
             return 0.0
         
+        if not self._sync_sample_store():
+            return self._predict_python(
+                ac_temp, room_temp, outdoor_temp, mode, power, hysteresis_state,
+                indoor_humidity, outdoor_humidity
+            )
+        
+        # Vectorized similarity-weighted prediction over the columnar store
+        weighted_prediction = self._sample_store.weighted_prediction(
+            ac_temp=ac_temp,
+            room_temp=room_temp,
+            outdoor_temp=outdoor_temp,
+            mode=mode,
+            power=power,
+            hysteresis_state=hysteresis_state,
+            indoor_humidity=indoor_humidity,
+            outdoor_humidity=outdoor_humidity
+        )
+        if weighted_prediction is None:
+            _LOGGER.debug("No similar samples found for prediction")
+            return 0.0
+        
+        _LOGGER.debug(
+            "Enhanced prediction: %.3f based on %d similar samples (hysteresis_state=%s)",
+            weighted_prediction, self._sample_store.last_scan_size, hysteresis_state
+        )
+        
+        return weighted_prediction
+    
+    def predict_batch(self, queries: Sequence[Mapping[str, Any]]) -> List[float]:
+        """Predict offsets for many conditions with one pass over the sample store.
+        
+        Args:
+            queries: Mappings of predict() keyword arguments (ac_temp, room_temp,
+                outdoor_temp, mode, power, hysteresis_state, indoor_humidity,
+                outdoor_humidity)
+            
+        Returns:
+            Predicted offset per query, in query order (0.0 without similar samples)
+        """
+        if not queries:
+            return []
+        if not self._enhanced_samples:
+            _LOGGER.debug("No enhanced samples available for batch prediction")
+            return [0.0] * len(queries)
+        
+        if not self._sync_sample_store():
+            return [self.predict(**query) for query in queries]
+        
+        predictions = self._sample_store.weighted_predictions(queries)
+        _LOGGER.debug(
+            "Batch prediction: %d queries scored against %d samples",
+            len(queries), self._sample_store.last_scan_size
+        )
+        return [0.0 if prediction is None else prediction for prediction in predictions]
+    
+    def _predict_python(
+        self,
+        ac_temp: float,
+        room_temp: float,
+        outdoor_temp: Optional[float],
+        mode: str,
+        power: Optional[float],
+        hysteresis_state: str,
+        indoor_humidity: Optional[float],
+        outdoor_humidity: Optional[float]
+    ) -> float:
+        """Predict offset with a per-sample Python loop.
+        
+        Fallback for installations without numpy; produces the same result
+        as the vectorized path in predict().
+        
+        Returns:
+            Predicted offset value
+        """
         # Calculate similarity-weighted prediction
         similarities = []
         weights = []
@@ -206,6 +359,61 @@ class LightweightOffsetLearner:
         
         return weighted_prediction
     
+    def get_metrics_snapshot(self) -> SampleMetrics:
+        """Return the algorithm metrics over the enhanced samples.
+        
+        Computed in one pass over the columnar store (or the sample list
+        without numpy) and reused until the learning state changes, so the
+        dashboard sensors and climate attributes share a single computation.
+        """
+        key = (self._generation, id(self._enhanced_samples), len(self._enhanced_samples))
+        if self._metrics_snapshot is not None and self._metrics_snapshot_key == key:
+            return self._metrics_snapshot
+        
+        if self._sync_sample_store():
+            snapshot = compute_sample_metrics(
+                self._sample_store.column("predicted"),
+                self._sample_store.column("actual"),
+                [item["outdoor_temp"] for item in self._temp_correlation_data],
+                [item["offset"] for item in self._temp_correlation_data],
+            )
+        else:
+            snapshot = sample_metrics_from_samples(self._enhanced_samples, self._temp_correlation_data)
+        
+        self._metrics_snapshot = snapshot
+        self._metrics_snapshot_key = key
+        return snapshot
+    
+    def _is_sample_store_in_sync(self) -> bool:
+        """Check whether the columnar store and running statistics mirror the enhanced samples."""
+        sample_total = len(self._enhanced_samples)
+        return (
+            self._sample_store_source is self._enhanced_samples
+            and self._sample_stats.count == sample_total
+            and (self._sample_store is None or len(self._sample_store) == sample_total)
+        )
+    
+    def _sync_sample_store(self) -> bool:
+        """Make sure the columnar store and running statistics mirror _enhanced_samples.
+        
+        Both are rebuilt when the sample list was replaced (e.g. by
+        load_patterns()) or changed length outside add_sample().
+        
+        Returns:
+            True if the vectorized store can be used, False if numpy is unavailable
+        """
+        if not self._is_sample_store_in_sync():
+            self._sample_stats.rebuild(self._enhanced_samples)
+            if self._sample_store is not None:
+                self._sample_store.rebuild(self._enhanced_samples)
+            self._sample_store_source = self._enhanced_samples
+            _LOGGER.debug(
+                "Rebuilt sample store and statistics from %d enhanced samples",
+                len(self._enhanced_samples)
+            )
+        
+        return self._sample_store is not None
+    
     def _calculate_similarity_with_hysteresis(
         self,
         ac_temp: float,
@@ -321,6 +529,7 @@ class LightweightOffsetLearner:
         
         old_sample_count = self._sample_count
         self._sample_count += 1
+        self._generation += 1
         
         # Update time-of-day pattern with exponential smoothing
         old_pattern = self._time_patterns[hour]
@@ -342,11 +551,7 @@ class LightweightOffsetLearner:
         
         # Update temperature correlation data if outdoor temp available
         if outdoor_temp is not None:
-            temp_data_before = len(self._temp_correlation_data)
-            self._temp_correlation_data.append({
-                "outdoor_temp": outdoor_temp,
-                "offset": offset
-            })
+            self._append_temp_correlation(outdoor_temp, offset)
             _LOGGER.debug(
                 "Added temperature correlation: outdoor_temp=%s, offset=%s (total: %s)",
                 outdoor_temp, offset, len(self._temp_correlation_data)
@@ -394,6 +599,7 @@ class LightweightOffsetLearner:
         self._time_patterns = [0.0] * 24
         self._time_pattern_counts = [0] * 24
         self._temp_correlation_data.clear()
+        self._temp_correlation_index.clear()
         self._power_state_patterns.clear()
         
         rebuilt_count = 0
@@ -581,25 +787,29 @@ class LightweightOffsetLearner:
             return None
         
         try:
-            # Extract temperatures and offsets
-            temps = [data["outdoor_temp"] for data in self._temp_correlation_data]
-            offsets = [data["offset"] for data in self._temp_correlation_data]
+            index = self._sync_temp_correlation_index()
             
-            # Calculate simple linear correlation
             # For simplicity, use linear interpolation/extrapolation
-            if len(set(temps)) < 2:
+            if index.has_single_temperature:
                 # All temperatures are the same, return average offset
-                return statistics.mean(offsets)
+                return index.mean_offset()
+            
+            if self._correlation_mode == CORRELATION_MODE_LOCAL_LINEAR:
+                # Robust line through the k nearest points
+                neighbors = index.nearest(outdoor_temp, DEFAULT_CORRELATION_NEIGHBORS)
+                line = theil_sen_line(neighbors)
+                if line is None:
+                    return statistics.mean(offset for _, offset in neighbors)
+                slope, intercept = line
+                return intercept + slope * outdoor_temp
             
             # Find two closest temperature points
-            temp_diffs = [(abs(temp - outdoor_temp), temp, offset) 
-                         for temp, offset in zip(temps, offsets)]
-            temp_diffs.sort()
+            nearest = index.nearest(outdoor_temp, 2)
             
-            if len(temp_diffs) >= 2:
+            if len(nearest) >= 2:
                 # Linear interpolation between two closest points
-                _, temp1, offset1 = temp_diffs[0]
-                _, temp2, offset2 = temp_diffs[1]
+                temp1, offset1 = nearest[0]
+                temp2, offset2 = nearest[1]
                 
                 if temp1 == temp2:
                     return (offset1 + offset2) / 2
@@ -610,12 +820,44 @@ class LightweightOffsetLearner:
                 return predicted
             else:
                 # Fall back to closest point
-                return temp_diffs[0][2]
+                return nearest[0][1]
                 
         except (ZeroDivisionError, ValueError) as exc:
             _LOGGER.warning("Error in temperature correlation prediction: %s", exc)
             return None
     
+    def _append_temp_correlation(self, outdoor_temp: float, offset: float) -> None:
+        """Append a correlation point, keeping the sorted index in step with the deque."""
+        data = self._temp_correlation_data
+        index_in_sync = self._is_temp_correlation_index_in_sync()
+        
+        # The deque silently drops its oldest entry when full; drop it from the index too
+        maxlen = getattr(data, "maxlen", None)
+        if index_in_sync and maxlen is not None and len(data) == maxlen:
+            evicted = data[0]
+            self._temp_correlation_index.remove(evicted["outdoor_temp"], evicted["offset"])
+        
+        data.append({
+            "outdoor_temp": outdoor_temp,
+            "offset": offset
+        })
+        if index_in_sync:
+            self._temp_correlation_index.add(outdoor_temp, offset)
+    
+    def _is_temp_correlation_index_in_sync(self) -> bool:
+        """Check whether the sorted index mirrors _temp_correlation_data."""
+        return (
+            self._temp_correlation_index_source is self._temp_correlation_data
+            and len(self._temp_correlation_index) == len(self._temp_correlation_data)
+        )
+    
+    def _sync_temp_correlation_index(self) -> OutdoorTemperatureIndex:
+        """Return the sorted index, rebuilding it if the correlation data was replaced."""
+        if not self._is_temp_correlation_index_in_sync():
+            self._temp_correlation_index.rebuild(self._temp_correlation_data)
+            self._temp_correlation_index_source = self._temp_correlation_data
+        return self._temp_correlation_index
+    
     def _determine_power_state(self, power: Optional[float]) -> Optional[str]:
         """Determine power state from power consumption value.
         
@@ -665,53 +907,33 @@ class LightweightOffsetLearner:
         if not self._enhanced_samples:
             return 0.0
         
-        # Analyze diversity in enhanced samples
-        ac_temps = set()
-        room_temps = set()
-        outdoor_temps = set()
-        modes = set()
-        power_values = set()
-        hysteresis_states = set()
-        
-        for sample in self._enhanced_samples:
-            # Round temperatures to 0.5°C bins for diversity calculation
-            ac_temps.add(round(sample["ac_temp"] * 2) / 2)
-            room_temps.add(round(sample["room_temp"] * 2) / 2)
-            
-            if sample.get("outdoor_temp") is not None:
-                outdoor_temps.add(round(sample["outdoor_temp"] * 2) / 2)
-            
-            modes.add(sample.get("mode", "unknown"))
-            
-            if sample.get("power") is not None:
-                # Round power to 100W bins
-                power_values.add(round(sample["power"] / 100) * 100)
-            
-            hysteresis_states.add(sample.get("hysteresis_state", "unknown"))
+        # Occupied 0.5°C / 100W bins are maintained incrementally by add_sample()
+        self._sync_sample_store()
+        stats = self._sample_stats
         
         # Calculate diversity scores
         diversity_factors = []
         
         # Temperature diversity (want at least 5 different values)
-        ac_temp_diversity = min(1.0, len(ac_temps) / 5.0)
-        room_temp_diversity = min(1.0, len(room_temps) / 5.0)
+        ac_temp_diversity = min(1.0, stats.distinct_ac_temps / 5.0)
+        room_temp_diversity = min(1.0, stats.distinct_room_temps / 5.0)
         diversity_factors.extend([ac_temp_diversity, room_temp_diversity])
         
-        if outdoor_temps:
-            outdoor_temp_diversity = min(1.0, len(outdoor_temps) / 8.0)
+        if stats.distinct_outdoor_temps:
+            outdoor_temp_diversity = min(1.0, stats.distinct_outdoor_temps / 8.0)
             diversity_factors.append(outdoor_temp_diversity)
         
         # Mode diversity (want at least 2 modes)
-        mode_diversity = min(1.0, len(modes) / 2.0)
+        mode_diversity = min(1.0, stats.distinct_modes / 2.0)
         diversity_factors.append(mode_diversity)
         
         # Power diversity (want at least 5 different power levels)
-        if power_values:
-            power_diversity = min(1.0, len(power_values) / 5.0)
+        if stats.distinct_power_levels:
+            power_diversity = min(1.0, stats.distinct_power_levels / 5.0)
             diversity_factors.append(power_diversity)
         
         # Hysteresis state diversity (want at least 2 states)
-        hysteresis_diversity = min(1.0, len(hysteresis_states) / 2.0)
+        hysteresis_diversity = min(1.0, stats.distinct_hysteresis_states / 2.0)
         diversity_factors.append(hysteresis_diversity)
         
         # Calculate overall diversity as average
@@ -756,20 +978,12 @@ class LightweightOffsetLearner:
             # No enhanced samples yet, return neutral confidence
             return 0.5
         
-        # Calculate RMSE from enhanced samples
-        errors = []
-        for sample in self._enhanced_samples:
-            predicted = sample.get("predicted", 0.0)
-            actual = sample.get("actual", 0.0)
-            error = abs(predicted - actual)
-            errors.append(error)
-        
-        if not errors:
+        # Mean absolute error over the sample window, maintained incrementally
+        self._sync_sample_store()
+        mae = self._sample_stats.mean_absolute_error
+        if mae is None:
             return 0.5
         
-        # Calculate mean absolute error
-        mae = statistics.mean(errors)
-        
         # Convert MAE to confidence score
         # MAE of 0 = confidence 1.0
         # MAE of 0.5 = confidence ~0.8
@@ -880,9 +1094,14 @@ class LightweightOffsetLearner:
         self._time_patterns = [0.0] * 24
         self._time_pattern_counts = [0] * 24
         self._temp_correlation_data.clear()
+        self._temp_correlation_index.clear()
         self._power_state_patterns.clear()
         self._enhanced_samples.clear()
+        self._sample_stats.clear()
+        if self._sample_store is not None:
+            self._sample_store.clear()
         self._sample_count = 0
+        self._generation += 1
         
         _LOGGER.info(
             "Learning patterns reset: cleared %s samples, %s hour patterns, %s power states, %s temp correlations, %s enhanced samples",
@@ -906,7 +1125,7 @@ class LightweightOffsetLearner:
                 )
                 self._sample_count = actual_count
         
-        return {
+        patterns = {
             "version": "1.2",  # Bumped version for humidity support
             "time_patterns": {
                 hour: offset for hour, offset in enumerate(self._time_patterns)
@@ -921,6 +1140,13 @@ class LightweightOffsetLearner:
             "enhanced_samples": self._enhanced_samples,
             "sample_count": self._sample_count
         }
+        
+        if self._pack_samples:
+            # Version 1.3: samples as base64 fixed-width records (see sample_codec)
+            patterns["version"] = "1.3"
+            patterns["enhanced_samples_packed"] = pack_samples(patterns.pop("enhanced_samples"))
+        
+        return patterns
     
     def load_patterns(self, patterns: Dict[str, Any]) -> None:
         """Load patterns from saved data.
@@ -932,9 +1158,9 @@ class LightweightOffsetLearner:
             ValueError: If pattern data is invalid or incompatible
             KeyError: If required fields are missing
         """
-        # Validate version (support 1.0, 1.1, and 1.2 for backward compatibility)
+        # Validate version (support 1.0 - 1.3 for backward compatibility)
         version = patterns.get("version")
-        if version not in ["1.0", "1.1", "1.2"]:
+        if version not in ["1.0", "1.1", "1.2", "1.3"]:
             raise ValueError(f"Unsupported pattern data version: {version}")
         
         # Validate and load time patterns
@@ -966,6 +1192,7 @@ class LightweightOffsetLearner:
                 "outdoor_temp": float(item["outdoor_temp"]),
                 "offset": float(item["offset"])
             })
+        self._temp_correlation_index.rebuild(self._temp_correlation_data)
         
         # Load power state patterns
         self._power_state_patterns = {}
@@ -978,11 +1205,21 @@ class LightweightOffsetLearner:
         
         # Load enhanced samples (version 1.1+ feature, optional for backward compatibility)
         self._enhanced_samples = []
-        if version in ["1.1", "1.2"] and "enhanced_samples" in patterns:
-            enhanced_samples = patterns["enhanced_samples"]
+        if version == "1.3" and "enhanced_samples_packed" in patterns:
+            enhanced_samples = patterns["enhanced_samples_packed"]
+        elif version in ["1.1", "1.2"]:
+            enhanced_samples = patterns.get("enhanced_samples")
+        else:
+            enhanced_samples = None
+        if enhanced_samples is not None:
             valid_samples_loaded = 0
             for sample in enhanced_samples:
                 try:
+                    if isinstance(sample, str):
+                        # Packed records decode to exactly the dict that was saved
+                        self._enhanced_samples.append(unpack_sample(sample))
+                        valid_samples_loaded += 1
+                        continue
                     # Validate and load enhanced sample with humidity migration
                     sample_data = {
                         "predicted": float(sample["predicted"]),
@@ -1017,7 +1254,7 @@ class LightweightOffsetLearner:
         
         # Synchronize sample count with actual enhanced samples if available
         # This fixes cases where the stored count doesn't match actual data
-        if version in ["1.1", "1.2"] and self._enhanced_samples:
+        if version in ["1.1", "1.2", "1.3"] and self._enhanced_samples:
             actual_sample_count = len(self._enhanced_samples)
             if stored_sample_count != actual_sample_count:
                 _LOGGER.warning(
@@ -1031,6 +1268,8 @@ class LightweightOffsetLearner:
             # For version 1.0 or when no enhanced samples, use stored count
             self._sample_count = stored_sample_count
         
+        self._generation += 1
+        
         hours_with_data = sum(1 for count in self._time_pattern_counts if count > 0)
         power_states_loaded = len(self._power_state_patterns)
         temp_correlations = len(self._temp_correlation_data)
@@ -2,7 +2,7 @@
 
 from dataclasses import dataclass
 from datetime import time, datetime
-from typing import Optional
+from typing import FrozenSet, Optional
 from enum import Enum
 
 
@@ -46,6 +46,42 @@ class ModeAdjustments:
     force_operation: bool = False  # Signal override for priority resolution
 
 
+@dataclass(frozen=True, slots=True)
+class SensorSnapshot:
+    """Sensor readings taken together and shared by all consumers.
+    
+    Readings are None when the sensor is not configured, missing or
+    unavailable. The *_updated fields hold the last_updated timestamp of
+    the state each reading was parsed from.
+    """
+    taken_at: datetime
+    room_temp: Optional[float] = None
+    outdoor_temp: Optional[float] = None
+    power: Optional[float] = None
+    indoor_humidity: Optional[float] = None
+    outdoor_humidity: Optional[float] = None
+    room_updated: Optional[datetime] = None
+    outdoor_updated: Optional[datetime] = None
+    power_updated: Optional[datetime] = None
+    indoor_humidity_updated: Optional[datetime] = None
+    outdoor_humidity_updated: Optional[datetime] = None
+    
+    @property
+    def available(self) -> FrozenSet[str]:
+        """Return the roles that have a reading."""
+        return frozenset(
+            role
+            for role, value in (
+                ("room", self.room_temp),
+                ("outdoor", self.outdoor_temp),
+                ("power", self.power),
+                ("indoor_humidity", self.indoor_humidity),
+                ("outdoor_humidity", self.outdoor_humidity),
+            )
+            if value is not None
+        )
+
+
 @dataclass
 class WeatherStrategy:
     """Describes recommended action based on weather forecast."""
@@ -86,6 +122,9 @@ class SmartClimateData:
         thermal_state: Current thermal state name (Phase 2)
         learning_active: Whether OffsetEngine learning is active (Phase 2)
         learning_target: Boundary target temperature for learning (Phase 2)
+        humidity_data: Latest humidity monitor data (if configured)
+        stage_timings_ms: Duration of each update pipeline stage in this update
+        stage_cache_hits: Number of updates that reused a memoized stage, per stage
     """
     room_temp: Optional[float]
     outdoor_temp: Optional[float]
@@ -107,6 +146,9 @@ class SmartClimateData:
     learning_target: Optional[float] = None
     # Humidity monitoring data
     humidity_data: Optional[dict] = None
+    # Update pipeline diagnostics
+    stage_timings_ms: Optional[dict] = None
+    stage_cache_hits: Optional[dict] = None
     
     def __post_init__(self):
         """Initialize default values for outlier fields."""
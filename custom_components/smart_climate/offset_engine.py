@@ -1,9 +1,11 @@
 """Offset calculation engine for Smart Climate Control."""
 
+import asyncio
 import logging
 import time
-from typing import Optional, Dict, List, Tuple, Callable, TYPE_CHECKING, Literal, Any
+from typing import Optional, Dict, List, Sequence, Tuple, Callable, TYPE_CHECKING, Literal, Any
 import statistics
+from dataclasses import replace
 from datetime import datetime
 from collections import deque
 import sys
@@ -11,6 +13,16 @@ import numpy as np
 
 from .models import OffsetInput, OffsetResult
 from .lightweight_learner import LightweightOffsetLearner as EnhancedLightweightOffsetLearner
+from .sample_store import SampleMetrics
+from .latency_tracker import (
+    LatencyTracker,
+    STAGE_CALCULATE_OFFSET,
+    STAGE_FEATURE_ENRICHMENT,
+    STAGE_HYSTERESIS_DETECTION,
+    STAGE_SEASONAL_LOOKUP,
+    STAGE_PREDICT,
+    STAGE_PERSISTENCE,
+)
 from .outlier_detector import OutlierDetector
 from .dto import (
     DashboardData,
@@ -40,6 +52,20 @@ from .const import (
     DEFAULT_VALIDATION_RATE_LIMIT_SECONDS,
     CONF_FORECAST_ENABLED,
     CONF_OUTDOOR_SENSOR,
+    CONF_LEARNING_SPATIAL_INDEX,
+    CONF_LEARNING_MAX_HISTORY,
+    CONF_LEARNING_CORRELATION_MODE,
+    CONF_LEARNING_PACKED_SAMPLES,
+    DEFAULT_LEARNING_SPATIAL_INDEX,
+    DEFAULT_LEARNING_MAX_HISTORY,
+    DEFAULT_LEARNING_CORRELATION_MODE,
+    DEFAULT_LEARNING_PACKED_SAMPLES,
+    CONF_SAVE_DEBOUNCE,
+    CONF_SAVE_MAX_STALENESS,
+    DEFAULT_SAVE_DEBOUNCE,
+    DEFAULT_SAVE_MAX_STALENESS,
+    CONF_LATENCY_INSTRUMENTATION,
+    DEFAULT_LATENCY_INSTRUMENTATION,
 )
 
 if TYPE_CHECKING:
@@ -65,6 +91,12 @@ CACHE_DUR_TRENDS = 1800     # 30 minutes for long-term trends
 CACHE_DUR_PERF = 60         # 1 minute for general performance
 CACHE_DUR_PERSISTENCE = 3600 # 1 hour (relies on event invalidation)
 
+# Persisted sections tracked for change-aware saves
+SAVE_SECTIONS = ("engine_state", "learner_data", "hysteresis_data", "seasonal_data", "thermal_data")
+
+# Thermal fields that change on every serialize() call without a real state change
+THERMAL_VOLATILE_FIELDS = (("metadata",), ("state", "last_transition"), ("model", "last_modified"))
+
 # HysteresisState defines the possible states of the AC cycle.
 HysteresisState = Literal[
     "learning_hysteresis",      # Not enough data to determine thresholds.
@@ -75,6 +107,34 @@ HysteresisState = Literal[
 ]
 
 
+def _thermal_fingerprint(thermal_data: Optional[Dict[str, Any]]) -> Any:
+    """Return thermal data without the fields that change on every serialize() call."""
+    if not isinstance(thermal_data, dict):
+        return thermal_data
+    fingerprint = dict(thermal_data)
+    for path in THERMAL_VOLATILE_FIELDS:
+        parent = fingerprint
+        for key in path[:-1]:
+            if not isinstance(parent.get(key), dict):
+                break
+            child = dict(parent[key])
+            parent[key] = child
+            parent = child
+        else:
+            parent.pop(path[-1], None)
+    return fingerprint
+
+
+def _split_thermal_data(
+    thermal_data: Optional[Dict[str, Any]]
+) -> Tuple[Optional[Dict[str, Any]], Optional[List[Any]]]:
+    """Split thermal data into the hot state and the probe history restored later."""
+    if not isinstance(thermal_data, dict) or "probe_history" not in thermal_data:
+        return thermal_data, None
+    hot_data = {key: value for key, value in thermal_data.items() if key != "probe_history"}
+    return hot_data, thermal_data["probe_history"]
+
+
 class HysteresisLearner:
     """Learns the operational temperature thresholds of an AC unit based on power transitions."""
 
@@ -95,6 +155,14 @@ class HysteresisLearner:
         self.learned_start_threshold: Optional[float] = None
         self.learned_stop_threshold: Optional[float] = None
 
+        # Bumped on every change to the persisted samples (dirty tracking for saves)
+        self._generation: int = 0
+
+    @property
+    def generation(self) -> int:
+        """Counter that changes whenever the persisted samples change."""
+        return self._generation
+
     @property
     def has_sufficient_data(self) -> bool:
         """
@@ -117,6 +185,7 @@ class HysteresisLearner:
             self._start_temps.append(room_temp)
         elif transition_type == 'stop':
             self._stop_temps.append(room_temp)
+        self._generation += 1
         
         # Update thresholds after recording new data
         self._update_thresholds()
@@ -193,6 +262,7 @@ class HysteresisLearner:
                 for temp in stop_temps:
                     if isinstance(temp, (int, float)):
                         self._stop_temps.append(float(temp))
+            self._generation += 1
             
             # Update thresholds after restoring data
             self._update_thresholds()
@@ -308,10 +378,41 @@ class OffsetEngine:
         
         # Save configuration and statistics
         self._save_interval = config.get(CONF_SAVE_INTERVAL, DEFAULT_SAVE_INTERVAL)
+        self._save_debounce = config.get(CONF_SAVE_DEBOUNCE, DEFAULT_SAVE_DEBOUNCE)
+        self._save_max_staleness = config.get(CONF_SAVE_MAX_STALENESS, DEFAULT_SAVE_MAX_STALENESS)
         self._save_count = 0
         self._failed_save_count = 0
+        self._skipped_save_count = 0
+        self._coalesced_save_count = 0
         self._last_save_time: Optional[datetime] = None
         
+        # Dirty tracking: change token and serialized form of each section at the last save.
+        # The engine generation changes when learners are replaced or learning is toggled.
+        self._engine_generation = 0
+        self._saved_tokens: Dict[str, Any] = {}
+        self._saved_sections: Dict[str, Any] = {}
+        
+        # Debounced save scheduling (hass is set by async_setup_periodic_save)
+        self._hass: Optional["HomeAssistant"] = None
+        self._cancel_pending_save: Optional[Callable[[], None]] = None
+        self._pending_save_since: Optional[float] = None
+        
+        # Two-phase restore: phase two (samples, seasonal patterns, probe history)
+        # may run in a background task after the hot state is restored
+        self._learning_hydrated = True
+        self._hydration_task: Optional[asyncio.Task] = None
+        self._restore_timings: Dict[str, float] = {
+            "phase_one_ms": 0.0, "phase_two_ms": 0.0, "phase_two_max_step_ms": 0.0
+        }
+        
+        # Hot-path latency instrumentation; None disables it without per-call clock reads
+        self._latency_tracker: Optional[LatencyTracker] = (
+            LatencyTracker()
+            if config.get(CONF_LATENCY_INSTRUMENTATION, DEFAULT_LATENCY_INSTRUMENTATION)
+            else None
+        )
+        self._last_prediction_latency_ms: Optional[float] = None
+        
         # ML input validation configuration
         self._validation_offset_min = config.get(CONF_VALIDATION_OFFSET_MIN, DEFAULT_VALIDATION_OFFSET_MIN)
         self._validation_offset_max = config.get(CONF_VALIDATION_OFFSET_MAX, DEFAULT_VALIDATION_OFFSET_MAX)
@@ -320,8 +421,15 @@ class OffsetEngine:
         self._validation_rate_limit_seconds = config.get(CONF_VALIDATION_RATE_LIMIT_SECONDS, DEFAULT_VALIDATION_RATE_LIMIT_SECONDS)
         self._last_sample_time: Optional[float] = None
         
+        # Kept for learners restored in the background (see _build_restored_learner)
+        self._learner_options: Dict[str, Any] = {
+            "max_history": config.get(CONF_LEARNING_MAX_HISTORY, DEFAULT_LEARNING_MAX_HISTORY),
+            "use_spatial_index": config.get(CONF_LEARNING_SPATIAL_INDEX, DEFAULT_LEARNING_SPATIAL_INDEX),
+            "correlation_mode": config.get(CONF_LEARNING_CORRELATION_MODE, DEFAULT_LEARNING_CORRELATION_MODE),
+            "pack_samples": config.get(CONF_LEARNING_PACKED_SAMPLES, DEFAULT_LEARNING_PACKED_SAMPLES),
+        }
         if self._enable_learning:
-            self._learner = EnhancedLightweightOffsetLearner()
+            self._learner = EnhancedLightweightOffsetLearner(**self._learner_options)
             _LOGGER.debug("Learning enabled - EnhancedLightweightOffsetLearner initialized")
         
         _LOGGER.debug(
@@ -362,6 +470,16 @@ class OffsetEngine:
         """Return the number of failed saves."""
         return self._failed_save_count
     
+    @property
+    def skipped_save_count(self) -> int:
+        """Return the number of scheduled saves skipped because nothing changed."""
+        return self._skipped_save_count
+    
+    @property
+    def coalesced_save_count(self) -> int:
+        """Return the number of save requests merged into an already pending save."""
+        return self._coalesced_save_count
+    
     @property
     def last_save_time(self) -> Optional[datetime]:
         """Return the timestamp of the last successful save."""
@@ -372,9 +490,14 @@ class OffsetEngine:
         """
         Determines if the system is in the initial calibration phase.
         During this phase, we use stable state offset caching.
+        
+        While learning data is restored in the background the learner's
+        sample count is not yet known, so offsets stay rule-based.
         """
         if not self._enable_learning or not self._learner:
             return False
+        if not self._learning_hydrated:
+            return False
         
         try:
             stats = self._learner.get_statistics()
@@ -643,6 +766,7 @@ class OffsetEngine:
                 self._learner = EnhancedLightweightOffsetLearner()
                 _LOGGER.info("EnhancedLightweightOffsetLearner initialized at runtime")
             self._enable_learning = True
+            self._engine_generation += 1
             _LOGGER.info("Offset learning has been enabled")
             _LOGGER.debug("Learning state changed: %s -> %s", old_state, self._enable_learning)
             self._notify_update_callbacks()
@@ -658,6 +782,7 @@ class OffsetEngine:
         old_state = self._enable_learning
         if self._enable_learning:
             self._enable_learning = False
+            self._engine_generation += 1
             _LOGGER.info("Offset learning has been disabled")
             _LOGGER.debug("Learning state changed: %s -> %s", old_state, self._enable_learning)
             self._notify_update_callbacks()
@@ -672,6 +797,12 @@ class OffsetEngine:
         """Reset all learning data and start fresh."""
         _LOGGER.info("Resetting all learning data for fresh start")
         
+        # Stop a background restore so it cannot bring the old data back
+        if self._hydration_task is not None:
+            self._hydration_task.cancel()
+            self._hydration_task = None
+            self._learning_hydrated = True
+        
         # Create a fresh learner instance with current thresholds
         if self._enable_learning:
             self._learner = EnhancedLightweightOffsetLearner()
@@ -680,6 +811,7 @@ class OffsetEngine:
         # Reset hysteresis learner
         self._hysteresis_learner = HysteresisLearner()
         self._last_power_state = None
+        self._engine_generation += 1
         _LOGGER.debug("Hysteresis learner reset with fresh instance")
         
         # Clear calibration phase cache
@@ -767,7 +899,12 @@ class OffsetEngine:
                 _LOGGER.debug("Seasonal: Attempting to enhance offset with seasonal learning")
                 
                 # Get seasonal hysteresis prediction
+                tracker = self._latency_tracker
+                if tracker:
+                    started = time.perf_counter()
                 seasonal_delta = self._seasonal_learner.get_relevant_hysteresis_delta(outdoor_temp)
+                if tracker:
+                    tracker.record(STAGE_SEASONAL_LOOKUP, started)
                 
                 if seasonal_delta is not None:
                     # Apply seasonal adjustment to the base offset
@@ -814,9 +951,27 @@ class OffsetEngine:
         Returns:
             OffsetResult with calculated offset and metadata
         """
+        tracker = self._latency_tracker
+        if tracker is None:
+            return self._calculate_offset(input_data, thermal_window)
+        
+        started = time.perf_counter()
+        try:
+            return self._calculate_offset(input_data, thermal_window)
+        finally:
+            self._last_prediction_latency_ms = tracker.record(STAGE_CALCULATE_OFFSET, started)
+    
+    def _calculate_offset(self, input_data: OffsetInput, thermal_window: Optional[Tuple[float, float]]) -> OffsetResult:
+        """Calculate the offset; calculate_offset() wraps this with latency instrumentation."""
+        tracker = self._latency_tracker
+        
         # Enrich features if feature_engineer available
         if self._feature_engineer:
+            if tracker:
+                started = time.perf_counter()
             input_data = self._feature_engineer.enrich_features(input_data)
+            if tracker:
+                tracker.record(STAGE_FEATURE_ENRICHMENT, started)
         
         # Store the input data for confidence calculation
         self._last_input_data = input_data
@@ -841,102 +996,26 @@ class OffsetEngine:
             # When room_temp > ac_internal_temp: AC thinks it's cooler than reality, needs negative offset to cool more
             # When room_temp < ac_internal_temp: AC thinks it's warmer than reality, needs positive offset to cool less
             
-            # Use seasonal offset calculation if available, otherwise basic calculation
-            if self._seasonal_features_enabled:
-                _LOGGER.debug("Using seasonal-enhanced offset calculation")
-                base_offset = self.calculate_seasonal_offset(
-                    input_data.room_temp, 
-                    input_data.ac_internal_temp, 
-                    input_data.outdoor_temp
-                )
-            else:
-                base_offset = input_data.ac_internal_temp - input_data.room_temp
-                _LOGGER.debug("Using basic offset calculation: %.2f°C", base_offset)
-            
-            # Apply mode-specific adjustments
-            mode_adjusted_offset = self._apply_mode_adjustments(base_offset, input_data)
-            
-            # Apply contextual adjustments
-            rule_based_offset = self._apply_contextual_adjustments(
-                mode_adjusted_offset, input_data
-            )
+            rule_based_offset = self._calculate_rule_based_offset(input_data)
             
             # Always run power transition detection
+            if tracker:
+                started = time.perf_counter()
             self._detect_power_transitions(input_data)
+            if tracker:
+                tracker.record(STAGE_HYSTERESIS_DETECTION, started)
             
             # Check if in calibration phase
             if self.is_in_calibration_phase:
-                samples_collected = 0
-                if self._learner:
-                    try:
-                        stats = self._learner.get_statistics()
-                        samples_collected = stats.samples_collected
-                    except Exception:
-                        pass
-                
-                # Determine if AC is in stable state (idle and temps converged)
-                # Note: At this point we've already verified temps are not None
-                if input_data.power_consumption is not None:
-                    # Power sensor available - use both power and temperature
-                    is_stable_state = (
-                        input_data.power_consumption < self._power_idle_threshold and
-                        abs(input_data.ac_internal_temp - input_data.room_temp) < 2.0
-                    )
-                else:
-                    # No power sensor - use temperature convergence only
-                    is_stable_state = abs(input_data.ac_internal_temp - input_data.room_temp) < 2.0
-                
-                if is_stable_state:
-                    # Calculate and cache the stable offset
-                    self._stable_calibration_offset = input_data.ac_internal_temp - input_data.room_temp
-                    final_offset, was_clamped = self._clamp_offset(self._stable_calibration_offset)
-                    self._stable_calibration_offset = final_offset  # Store clamped value
-                    
-                    reason = (
-                        f"Calibration (Stable): Updated offset to {final_offset:.1f}°C. "
-                        f"({samples_collected}/{MIN_SAMPLES_FOR_ACTIVE_CONTROL} samples)"
-                    )
-                    _LOGGER.info(reason)
-                    
-                elif self._stable_calibration_offset is not None:
-                    # AC is cooling - use cached stable offset
-                    final_offset = self._stable_calibration_offset
-                    reason = f"Calibration (Active): Using cached stable offset of {final_offset:.1f}°C."
-                    _LOGGER.debug(reason)
-                    
-                else:
-                    # First run with AC already cooling - temporary offset
-                    final_offset = input_data.ac_internal_temp - input_data.room_temp
-                    final_offset, was_clamped = self._clamp_offset(final_offset)
-                    reason = f"Calibration (Initial): No cached offset. Using temporary offset of {final_offset:.1f}°C."
-                    _LOGGER.info(reason)
+                result = self._calculate_calibration_result(input_data)
                 
                 # Store the last offset for dashboard data
-                self._last_offset = final_offset
+                self._last_offset = result.offset
                 
-                return OffsetResult(
-                    offset=final_offset,
-                    clamped=False,
-                    reason=reason,
-                    confidence=0.2  # Low confidence during calibration
-                )
+                return result
             
             # Get hysteresis state for enhanced learning
-            if not self._hysteresis_enabled:
-                # No power sensor configured
-                hysteresis_state = "no_power_sensor"
-            elif not self._hysteresis_learner.has_sufficient_data:
-                # Power sensor configured but still learning
-                hysteresis_state = "learning_hysteresis"
-            else:
-                # Power sensor configured with sufficient data
-                try:
-                    current_power_state = self._get_power_state(input_data.power_consumption or 0)
-                    hysteresis_state = self._hysteresis_learner.get_hysteresis_state(
-                        current_power_state, input_data.room_temp
-                    )
-                except Exception:
-                    hysteresis_state = "learning_hysteresis"  # Graceful fallback
+            hysteresis_state = self._get_hysteresis_state(input_data)
             
             # Try to use learning if enabled and sufficient data available
             final_offset = rule_based_offset
@@ -952,6 +1031,8 @@ class OffsetEngine:
                         sample_count
                     )
                     # Use enhanced predict method with hysteresis context and humidity data
+                    if tracker:
+                        started = time.perf_counter()
                     learned_offset = self._learner.predict(
                         ac_temp=input_data.ac_internal_temp,
                         room_temp=input_data.room_temp,
@@ -962,6 +1043,8 @@ class OffsetEngine:
                         indoor_humidity=input_data.indoor_humidity,
                         outdoor_humidity=input_data.outdoor_humidity
                     )
+                    if tracker:
+                        tracker.record(STAGE_PREDICT, started)
                     learning_confidence = 0.8  # High confidence for hysteresis-aware prediction
                     
                     # Calculate humidity contribution if humidity data is present
@@ -1067,6 +1150,236 @@ class OffsetEngine:
                 confidence=0.0
             )
     
+    def _calculate_rule_based_offset(self, input_data: OffsetInput) -> float:
+        """Calculate the rule-based offset (seasonal/basic, mode and contextual adjustments).
+        
+        Args:
+            input_data: OffsetInput with ac_internal_temp and room_temp available
+            
+        Returns:
+            Rule-based offset before learning and clamping
+        """
+        # Use seasonal offset calculation if available, otherwise basic calculation
+        if self._seasonal_features_enabled:
+            _LOGGER.debug("Using seasonal-enhanced offset calculation")
+            base_offset = self.calculate_seasonal_offset(
+                input_data.room_temp, 
+                input_data.ac_internal_temp, 
+                input_data.outdoor_temp
+            )
+        else:
+            base_offset = input_data.ac_internal_temp - input_data.room_temp
+            _LOGGER.debug("Using basic offset calculation: %.2f°C", base_offset)
+        
+        # Apply mode-specific adjustments
+        mode_adjusted_offset = self._apply_mode_adjustments(base_offset, input_data)
+        
+        # Apply contextual adjustments
+        return self._apply_contextual_adjustments(mode_adjusted_offset, input_data)
+    
+    def _calculate_calibration_result(self, input_data: OffsetInput, update_cache: bool = True) -> OffsetResult:
+        """Calculate the offset used during the calibration phase.
+        
+        Args:
+            input_data: OffsetInput with ac_internal_temp and room_temp available
+            update_cache: Whether a stable reading updates the cached calibration
+                offset (False for side-effect-free what-if predictions)
+            
+        Returns:
+            OffsetResult with low calibration confidence
+        """
+        samples_collected = 0
+        if self._learner:
+            try:
+                stats = self._learner.get_statistics()
+                samples_collected = stats.samples_collected
+            except Exception:
+                pass
+        
+        # Determine if AC is in stable state (idle and temps converged)
+        # Note: At this point we've already verified temps are not None
+        if input_data.power_consumption is not None:
+            # Power sensor available - use both power and temperature
+            is_stable_state = (
+                input_data.power_consumption < self._power_idle_threshold and
+                abs(input_data.ac_internal_temp - input_data.room_temp) < 2.0
+            )
+        else:
+            # No power sensor - use temperature convergence only
+            is_stable_state = abs(input_data.ac_internal_temp - input_data.room_temp) < 2.0
+        
+        log = _LOGGER.info if update_cache else _LOGGER.debug
+        if is_stable_state:
+            # Calculate the stable offset, caching the clamped value
+            final_offset, was_clamped = self._clamp_offset(
+                input_data.ac_internal_temp - input_data.room_temp
+            )
+            if update_cache and self._learning_hydrated:
+                self._stable_calibration_offset = final_offset
+            
+            reason = (
+                f"Calibration (Stable): Updated offset to {final_offset:.1f}°C. "
+                f"({samples_collected}/{MIN_SAMPLES_FOR_ACTIVE_CONTROL} samples)"
+            )
+            log(reason)
+            
+        elif self._stable_calibration_offset is not None:
+            # AC is cooling - use cached stable offset
+            final_offset = self._stable_calibration_offset
+            reason = f"Calibration (Active): Using cached stable offset of {final_offset:.1f}°C."
+            _LOGGER.debug(reason)
+            
+        else:
+            # First run with AC already cooling - temporary offset
+            final_offset = input_data.ac_internal_temp - input_data.room_temp
+            final_offset, was_clamped = self._clamp_offset(final_offset)
+            reason = f"Calibration (Initial): No cached offset. Using temporary offset of {final_offset:.1f}°C."
+            log(reason)
+        
+        return OffsetResult(
+            offset=final_offset,
+            clamped=False,
+            reason=reason,
+            confidence=0.2  # Low confidence during calibration
+        )
+    
+    def _get_hysteresis_state(self, input_data: OffsetInput) -> str:
+        """Return the hysteresis state used as learning context, without recording transitions."""
+        if not self._hysteresis_enabled:
+            # No power sensor configured
+            return "no_power_sensor"
+        if not self._hysteresis_learner.has_sufficient_data:
+            # Power sensor configured but still learning
+            return "learning_hysteresis"
+        # Power sensor configured with sufficient data
+        try:
+            current_power_state = self._get_power_state(input_data.power_consumption or 0)
+            return self._hysteresis_learner.get_hysteresis_state(
+                current_power_state, input_data.room_temp
+            )
+        except Exception:
+            return "learning_hysteresis"  # Graceful fallback
+    
+    def predict_batch(self, inputs: Sequence[OffsetInput]) -> List[OffsetResult]:
+        """Calculate offsets for many hypothetical conditions without side effects.
+        
+        Mirrors calculate_offset() for each input, but leaves the engine
+        untouched: the last input and offset, humidity contribution, cached
+        calibration offset and hysteresis transitions are not updated, and
+        the caller's inputs are not enriched in place. Learned predictions for
+        the whole batch (with and without humidity, for the humidity
+        contribution) are scored in one pass over the learner's samples.
+        
+        Args:
+            inputs: Conditions to evaluate, e.g. forecast points x setpoints
+            
+        Returns:
+            One OffsetResult per input, in input order
+        """
+        results: List[Optional[OffsetResult]] = [None] * len(inputs)
+        # (position, input_data, rule_based_offset, hysteresis_state)
+        pending: List[Tuple[int, OffsetInput, float, str]] = []
+        
+        for position, input_data in enumerate(inputs):
+            if self._feature_engineer:
+                input_data = self._feature_engineer.enrich_features(replace(input_data))
+            
+            if input_data.ac_internal_temp is None or input_data.room_temp is None:
+                results[position] = OffsetResult(
+                    offset=0.0,
+                    clamped=False,
+                    reason="Critical sensor unavailable - using safe fallback",
+                    confidence=0.0
+                )
+                continue
+            
+            try:
+                rule_based_offset = self._calculate_rule_based_offset(input_data)
+                if self.is_in_calibration_phase:
+                    results[position] = self._calculate_calibration_result(input_data, update_cache=False)
+                    continue
+                pending.append(
+                    (position, input_data, rule_based_offset, self._get_hysteresis_state(input_data))
+                )
+            except Exception as exc:
+                _LOGGER.error("Error calculating batch offset: %s", exc)
+                results[position] = OffsetResult(
+                    offset=0.0,
+                    clamped=False,
+                    reason="Error in calculation, using safe fallback",
+                    confidence=0.0
+                )
+        
+        learned_offsets: Optional[List[float]] = None
+        humidity_contributions: Dict[int, float] = {}
+        learning_error = None
+        if pending and self._enable_learning and self._learner and self._learner._enhanced_samples:
+            queries = [
+                {
+                    "ac_temp": input_data.ac_internal_temp,
+                    "room_temp": input_data.room_temp,
+                    "outdoor_temp": input_data.outdoor_temp,
+                    "mode": input_data.mode,
+                    "power": input_data.power_consumption,
+                    "hysteresis_state": hysteresis_state,
+                    "indoor_humidity": input_data.indoor_humidity,
+                    "outdoor_humidity": input_data.outdoor_humidity,
+                }
+                for _, input_data, _, hysteresis_state in pending
+            ]
+            # Humidity contribution: same query with humidity removed
+            humid_items = [
+                item for item, (_, input_data, _, _) in enumerate(pending)
+                if self._has_humidity_data(input_data)
+            ]
+            dry_queries = [
+                dict(queries[item], indoor_humidity=None, outdoor_humidity=None)
+                for item in humid_items
+            ]
+            try:
+                predictions = self._learner.predict_batch(queries + dry_queries)
+                learned_offsets = predictions[:len(queries)]
+                for item, dry_prediction in zip(humid_items, predictions[len(queries):]):
+                    humidity_contributions[item] = learned_offsets[item] - dry_prediction
+            except Exception as exc:
+                _LOGGER.warning("Batch learning prediction failed, using rule-based fallback: %s", exc)
+                learning_error = str(exc)
+        
+        learning_confidence = 0.8 if learned_offsets is not None else 0.0  # As in calculate_offset
+        for item, (position, input_data, rule_based_offset, _) in enumerate(pending):
+            learning_used = learned_offsets is not None
+            if learning_used:
+                final_offset = (
+                    (1 - learning_confidence) * rule_based_offset
+                    + learning_confidence * learned_offsets[item]
+                )
+            else:
+                final_offset = rule_based_offset
+            
+            clamped_offset, was_clamped = self._clamp_offset(final_offset)
+            results[position] = OffsetResult(
+                offset=clamped_offset,
+                clamped=was_clamped,
+                reason=self._generate_reason_with_learning(
+                    input_data,
+                    clamped_offset,
+                    was_clamped,
+                    learning_used,
+                    learning_confidence,
+                    learning_error,
+                    humidity_contribution=humidity_contributions.get(item, 0.0)
+                ),
+                confidence=self._calculate_confidence_with_learning(
+                    input_data, learning_used, learning_confidence
+                )
+            )
+        
+        _LOGGER.debug(
+            "Batch offset prediction complete: %d inputs, %d learning-enhanced",
+            len(inputs), len(pending) if learned_offsets is not None else 0
+        )
+        return results
+    
     def _apply_mode_adjustments(self, base_offset: float, input_data: OffsetInput) -> float:
         """Apply mode-specific adjustments to the base offset."""
         if input_data.mode == "away":
@@ -1336,6 +1649,11 @@ class OffsetEngine:
             # Learning disabled, silently ignore
             return
         
+        # Samples recorded now would be replaced by the background restore
+        if not self._learning_hydrated:
+            _LOGGER.debug("Learning data still being restored - skipping sample recording")
+            return
+        
         # Check if learning is paused (state-aware protocol)
         if self._learning_paused:
             _LOGGER.debug(
@@ -1442,6 +1760,7 @@ class OffsetEngine:
                 indoor_humidity=sanitized_indoor_humidity,
                 outdoor_humidity=sanitized_outdoor_humidity
             )
+            self.async_request_save()
             _LOGGER.debug(
                 "Recorded enhanced learning sample: predicted=%.2f, actual=%.2f, hysteresis_state=%s, source=%s, "
                 "indoor_humidity=%s, outdoor_humidity=%s",
@@ -1649,6 +1968,14 @@ class OffsetEngine:
             if "error" not in base_info:
                 base_info["error"] = f"Hysteresis: {exc}"
         
+        # Add save statistics
+        base_info.update({
+            "save_count": self._save_count,
+            "failed_save_count": self._failed_save_count,
+            "skipped_save_count": self._skipped_save_count,
+            "coalesced_save_count": self._coalesced_save_count,
+        })
+        
         return base_info
     
     def _calculate_humidity_contribution(self, input_data: OffsetInput, hysteresis_state: str) -> None:
@@ -1744,9 +2071,16 @@ class OffsetEngine:
         clamped: bool,
         learning_used: bool,
         learning_confidence: float,
-        learning_error: Optional[str] = None
+        learning_error: Optional[str] = None,
+        humidity_contribution: Optional[float] = None
     ) -> str:
-        """Generate human-readable reason including learning information."""
+        """Generate human-readable reason including learning information.
+        
+        humidity_contribution defaults to the contribution stored by the last
+        calculate_offset() call.
+        """
+        if humidity_contribution is None:
+            humidity_contribution = self._last_humidity_contribution
         if offset == 0.0:
             return "No offset needed - AC and room temperatures match"
         
@@ -1807,15 +2141,15 @@ class OffsetEngine:
         
         if humidity_parts:
             # Always show contribution in °C for transparency
-            contribution_sign = "+" if self._last_humidity_contribution > 0 else ""
-            contribution_text = f"humidity-adjusted ({contribution_sign}{self._last_humidity_contribution:.1f}°C from {', '.join(humidity_parts)})"
+            contribution_sign = "+" if humidity_contribution > 0 else ""
+            contribution_text = f"humidity-adjusted ({contribution_sign}{humidity_contribution:.1f}°C from {', '.join(humidity_parts)})"
             reasons.append(contribution_text)
             
             # Add debug logging for humidity contribution visibility
             _LOGGER.debug(
                 "Humidity contribution displayed: %s (raw contribution: %.3f°C)", 
                 contribution_text, 
-                self._last_humidity_contribution
+                humidity_contribution
             )
         elif (input_data.indoor_humidity is None and input_data.outdoor_humidity is None):
             # Mention when all humidity data is unavailable
@@ -1934,24 +2268,67 @@ class OffsetEngine:
         _LOGGER.debug("ForecastEngine configured for OffsetEngine: %s", 
                      "enabled" if forecast_engine else "disabled")
     
-    async def async_save_learning_data(self) -> None:
+    async def async_save_learning_data(self, only_if_dirty: bool = False) -> None:
         """Save learning data and engine state to persistent storage.
 
         This method serializes the current engine state (including whether
         learning is enabled) and the learner's data, saving it to disk
         to survive Home Assistant restarts. Learning data is preserved
         even when learning is disabled to prevent data loss.
+
+        Args:
+            only_if_dirty: Skip the save when no section changed since the last
+                successful save, and reuse the last serialized form of the
+                sections that did not change (used by scheduled saves)
         """
         if not hasattr(self, "_data_store") or self._data_store is None:
             _LOGGER.warning("No data store configured, cannot save learning data")
             self._failed_save_count += 1
             return
 
+        # Never overwrite the file with a partially restored learner
+        await self.async_wait_for_hydration()
+
+        tracker = self._latency_tracker
+        started = time.perf_counter() if tracker else 0.0
         try:
+            tokens = self._get_save_tokens()
+
+            # Collect thermal data if callback is provided
+            thermal_data = None
+            if self._get_thermal_data_cb:
+                try:
+                    thermal_data = self._get_thermal_data_cb()
+                    if thermal_data:
+                        _LOGGER.debug("Retrieved thermal data for persistence")
+                    else:
+                        _LOGGER.debug("Thermal data callback returned None")
+                    tokens["thermal_data"] = _thermal_fingerprint(thermal_data)
+                except Exception as exc:
+                    # Log error but continue - thermal failure doesn't block offset data save
+                    _LOGGER.debug("Failed to get thermal data: %s", exc)
+                    tokens["thermal_data"] = object()
+            else:
+                tokens["thermal_data"] = None
+
+            dirty = {
+                section for section in SAVE_SECTIONS
+                if section not in self._saved_tokens or tokens[section] != self._saved_tokens[section]
+            }
+            if only_if_dirty and not dirty:
+                self._skipped_save_count += 1
+                _LOGGER.debug("Skipping learning data save: nothing changed since the last save")
+                return
+            if not only_if_dirty:
+                dirty = set(SAVE_SECTIONS)
+
             # Prepare learner data if learner exists (regardless of enable_learning state)
             learner_data = None
             sample_count = 0
-            if self._learner:
+            if "learner_data" not in dirty:
+                learner_data = self._saved_sections.get("learner_data")
+                sample_count = learner_data.get("sample_count", 0) if learner_data else 0
+            elif self._learner:
                 learner_data = self._learner.serialize_for_persistence()
                 sample_count = learner_data.get("sample_count", 0)
                 _LOGGER.debug("Serializing learner data: %s samples, learning_enabled=%s", sample_count, self._enable_learning)
@@ -1959,19 +2336,24 @@ class OffsetEngine:
             # Prepare hysteresis data only if hysteresis is enabled
             hysteresis_data = None
             hysteresis_sample_count = 0
-            if self._hysteresis_enabled:
+            if "hysteresis_data" not in dirty:
+                hysteresis_data = self._saved_sections.get("hysteresis_data")
+            elif self._hysteresis_enabled:
                 hysteresis_data = self._hysteresis_learner.serialize_for_persistence()
+                _LOGGER.debug("Serializing hysteresis data: %s start samples, %s stop samples", 
+                            len(hysteresis_data.get("start_temps", [])), 
+                            len(hysteresis_data.get("stop_temps", [])))
+            if hysteresis_data:
                 hysteresis_sample_count = (
                     len(hysteresis_data.get("start_temps", [])) + 
                     len(hysteresis_data.get("stop_temps", []))
                 )
-                _LOGGER.debug("Serializing hysteresis data: %s start samples, %s stop samples", 
-                            len(hysteresis_data.get("start_temps", [])), 
-                            len(hysteresis_data.get("stop_temps", [])))
 
             # Collect seasonal data if seasonal learner exists
             seasonal_data = None
-            if self._seasonal_learner:
+            if "seasonal_data" not in dirty:
+                seasonal_data = self._saved_sections.get("seasonal_data")
+            elif self._seasonal_learner:
                 try:
                     seasonal_data = self._seasonal_learner.serialize_for_persistence()
                     pattern_count = seasonal_data.get("pattern_count", 0)
@@ -1979,19 +2361,7 @@ class OffsetEngine:
                 except Exception as exc:
                     # Log error but continue - seasonal failure doesn't block offset data save
                     _LOGGER.debug("Failed to get seasonal data: %s", exc)
-
-            # Collect thermal data if callback is provided
-            thermal_data = None
-            if self._get_thermal_data_cb:
-                try:
-                    thermal_data = self._get_thermal_data_cb()
-                    if thermal_data:
-                        _LOGGER.debug("Retrieved thermal data for persistence")
-                    else:
-                        _LOGGER.debug("Thermal data callback returned None")
-                except Exception as exc:
-                    # Log error but continue - thermal failure doesn't block offset data save
-                    _LOGGER.debug("Failed to get thermal data: %s", exc)
+                    tokens["seasonal_data"] = object()
 
             # Create a comprehensive state dictionary with v2.1 schema
             # NOTE: data_store wraps this with its own structure, so we pass the inner structure
@@ -2015,10 +2385,18 @@ class OffsetEngine:
 
             # Save to persistent storage (data_store will wrap with its own version 1.0 structure)
             await self._data_store.async_save_learning_data(persistent_data)
+            if tracker:
+                tracker.record(STAGE_PERSISTENCE, started)
             
             # Update save statistics on success
             self._save_count += 1
             self._last_save_time = datetime.now()
+            self._saved_tokens = tokens
+            self._saved_sections = {
+                "learner_data": learner_data,
+                "hysteresis_data": hysteresis_data,
+                "seasonal_data": seasonal_data,
+            }
             
             # Invalidate persistence latency cache after successful save
             self.invalidate_cache_key('persistence_latency')
@@ -2039,13 +2417,30 @@ class OffsetEngine:
             self._failed_save_count += 1
             _LOGGER.warning("Failed to save learning data: %s", exc)
     
-    async def async_load_learning_data(self) -> bool:
+    async def async_load_learning_data(
+        self,
+        hydrate_in_background: bool = False,
+        hass: Optional["HomeAssistant"] = None,
+    ) -> bool:
         """Load engine state and learning data from persistent storage.
 
         This method loads the previously saved state from disk. It first
         restores the engine's configuration (like enable_learning) and then,
         if applicable, restores the learner's state.
 
+        The restore runs in two phases. Phase one restores the small, hot
+        state: engine state, hysteresis thresholds and the thermal state with
+        its tau values. Phase two hydrates the enhanced samples, seasonal
+        patterns and probe history. With hydrate_in_background, phase two runs
+        in a background task and the engine serves rule-based and hysteresis
+        predictions until it completes.
+
+        Args:
+            hydrate_in_background: Defer phase two to a background task
+            hass: Home Assistant instance whose executor deserializes the
+                learner samples during background hydration; without it they
+                are deserialized on the event loop
+
         Returns:
             True if data was loaded and state was restored, False otherwise.
         """
@@ -2053,6 +2448,7 @@ class OffsetEngine:
             _LOGGER.warning("No data store configured, cannot load learning data")
             return False
 
+        phase_one_start = time.perf_counter()
         try:
             # Load from persistent storage
             _LOGGER.debug("Loading learning data from persistent storage")
@@ -2112,22 +2508,6 @@ class OffsetEngine:
                             self._learner = EnhancedLightweightOffsetLearner()
                             _LOGGER.debug("EnhancedLightweightOffsetLearner initialized during data load.")
 
-            # Load learner data if it exists, regardless of enable_learning state
-            # This preserves accumulated data even when learning is temporarily disabled
-            if learner_data:
-                # Ensure learner exists before restoring data
-                if not self._learner:
-                    self._learner = EnhancedLightweightOffsetLearner()
-
-                success = self._learner.restore_from_persistence(learner_data)
-                if success:
-                    _LOGGER.info("Learning data loaded successfully (learning currently %s).", 
-                                "enabled" if self._enable_learning else "disabled")
-                else:
-                    _LOGGER.warning("Failed to restore learner state from loaded data.")
-            else:
-                _LOGGER.debug("No learner data found in persistence.")
-
             # Load hysteresis data if available and hysteresis is enabled
             if self._hysteresis_enabled and hysteresis_data:
                 try:
@@ -2140,32 +2520,39 @@ class OffsetEngine:
             else:
                 _LOGGER.debug("Hysteresis is disabled, skipping hysteresis data load.")
 
-            # Load seasonal data if available and seasonal learner exists
-            if self._seasonal_learner and seasonal_data:
-                try:
-                    self._seasonal_learner.restore_from_persistence(seasonal_data)
-                    pattern_count = seasonal_data.get("pattern_count", 0)
-                    _LOGGER.info("Seasonal data loaded successfully: %d patterns", pattern_count)
-                except Exception as exc:
-                    _LOGGER.warning("Failed to restore seasonal data: %s", exc)
-            elif self._seasonal_learner:
-                _LOGGER.debug("Seasonal learner exists, but no seasonal data found in persistence.")
-            else:
-                _LOGGER.debug("No seasonal learner configured, skipping seasonal data load.")
+            # Phase two: learner samples, then the (small) seasonal patterns
+            # and probe history steps
+            hydration_steps: List[Callable[[], None]] = [
+                lambda: self._restore_seasonal_data(seasonal_data),
+            ]
+            probe_history = None
+            if hydrate_in_background:
+                # Restore the thermal state and tau values now, the probe history later
+                thermal_data, probe_history = _split_thermal_data(thermal_data)
+                if probe_history is not None:
+                    hydration_steps.append(
+                        lambda: self._restore_thermal_data({"probe_history": probe_history})
+                    )
+            self._restore_thermal_data(thermal_data)
 
-            # Restore thermal data if callback is provided and thermal data exists
-            if self._restore_thermal_data_cb and thermal_data:
-                try:
-                    self._restore_thermal_data_cb(thermal_data)
-                    _LOGGER.debug("Thermal data restored successfully")
-                except Exception as exc:
-                    # Log error but continue - thermal restore failure doesn't block load
-                    _LOGGER.debug("Failed to restore thermal data: %s", exc)
-            elif thermal_data:
-                _LOGGER.debug("Thermal data found but no restore callback provided")
+            self._engine_generation += 1  # Learner state was replaced from disk
+            self._restore_timings["phase_one_ms"] = (time.perf_counter() - phase_one_start) * 1000
+
+            if hydrate_in_background and (learner_data or seasonal_data or probe_history is not None):
+                self._learning_hydrated = False
+                self._hydration_task = asyncio.create_task(
+                    self._async_hydrate_learning_data(learner_data, hydration_steps, hass)
+                )
+                _LOGGER.debug(
+                    "Hot learning state restored in %.1f ms, hydrating samples in the background",
+                    self._restore_timings["phase_one_ms"]
+                )
             else:
-                _LOGGER.debug("No thermal data found in persistence")
+                self._run_hydration_steps(
+                    [lambda: self._restore_learner_data(learner_data)] + hydration_steps
+                )
 
+            self.invalidate_cache_key("system_health")
             self._notify_update_callbacks()  # Notify listeners of the restored state
             return True
 
@@ -2173,17 +2560,180 @@ class OffsetEngine:
             _LOGGER.error("Failed to load learning data: %s", exc)
             return False
     
-    async def async_setup_periodic_save(self, hass: "HomeAssistant", save_interval: Optional[int] = None) -> Callable:
+    def _restore_learner_data(self, learner_data: Optional[Dict[str, Any]]) -> None:
+        """Restore learner samples and patterns (restore phase two)."""
+        # Load learner data if it exists, regardless of enable_learning state
+        # This preserves accumulated data even when learning is temporarily disabled
+        if learner_data:
+            # Ensure learner exists before restoring data
+            if not self._learner:
+                self._learner = EnhancedLightweightOffsetLearner()
+
+            success = self._learner.restore_from_persistence(learner_data)
+            if success:
+                _LOGGER.info("Learning data loaded successfully (learning currently %s).", 
+                            "enabled" if self._enable_learning else "disabled")
+            else:
+                _LOGGER.warning("Failed to restore learner state from loaded data.")
+        else:
+            _LOGGER.debug("No learner data found in persistence.")
+
+    def _build_restored_learner(
+        self, learner_data: Dict[str, Any]
+    ) -> Optional[EnhancedLightweightOffsetLearner]:
+        """Deserialize learner data into a new learner, or None if it is invalid.
+
+        Runs in the executor during background hydration: it only reads the
+        learner options and leaves the engine's learner untouched.
+        """
+        learner = EnhancedLightweightOffsetLearner(**self._learner_options)
+        return learner if learner.restore_from_persistence(learner_data) else None
+
+    def _install_restored_learner(self, learner: Optional[EnhancedLightweightOffsetLearner]) -> None:
+        """Replace the learner with one built by _build_restored_learner()."""
+        if learner is None:
+            _LOGGER.warning("Failed to restore learner state from loaded data.")
+            return
+        self._learner = learner
+        _LOGGER.info("Learning data loaded successfully (learning currently %s).",
+                     "enabled" if self._enable_learning else "disabled")
+
+    def _restore_seasonal_data(self, seasonal_data: Optional[Dict[str, Any]]) -> None:
+        """Restore seasonal hysteresis patterns (restore phase two)."""
+        # Load seasonal data if available and seasonal learner exists
+        if self._seasonal_learner and seasonal_data:
+            try:
+                self._seasonal_learner.restore_from_persistence(seasonal_data)
+                pattern_count = seasonal_data.get("pattern_count", 0)
+                _LOGGER.info("Seasonal data loaded successfully: %d patterns", pattern_count)
+            except Exception as exc:
+                _LOGGER.warning("Failed to restore seasonal data: %s", exc)
+        elif self._seasonal_learner:
+            _LOGGER.debug("Seasonal learner exists, but no seasonal data found in persistence.")
+        else:
+            _LOGGER.debug("No seasonal learner configured, skipping seasonal data load.")
+
+    def _restore_thermal_data(self, thermal_data: Optional[Dict[str, Any]]) -> None:
+        """Hand thermal data to the restore callback."""
+        # Restore thermal data if callback is provided and thermal data exists
+        if self._restore_thermal_data_cb and thermal_data:
+            try:
+                self._restore_thermal_data_cb(thermal_data)
+                _LOGGER.debug("Thermal data restored successfully")
+            except Exception as exc:
+                # Log error but continue - thermal restore failure doesn't block load
+                _LOGGER.debug("Failed to restore thermal data: %s", exc)
+        elif thermal_data:
+            _LOGGER.debug("Thermal data found but no restore callback provided")
+        else:
+            _LOGGER.debug("No thermal data found in persistence")
+
+    def _run_hydration_steps(self, steps: List[Callable[[], None]]) -> None:
+        """Run restore phase two in place and record its duration."""
+        longest = 0.0
+        start = time.perf_counter()
+        for step in steps:
+            step_start = time.perf_counter()
+            step()
+            longest = max(longest, time.perf_counter() - step_start)
+        self._restore_timings["phase_two_ms"] = (time.perf_counter() - start) * 1000
+        self._restore_timings["phase_two_max_step_ms"] = longest * 1000
+
+    async def _async_hydrate_learning_data(
+        self,
+        learner_data: Optional[Dict[str, Any]],
+        steps: List[Callable[[], None]],
+        hass: Optional["HomeAssistant"] = None,
+    ) -> None:
+        """Run restore phase two in the background.
+
+        The learner samples, the bulk of the data, are deserialized into a
+        new learner in the executor (when hass is given) and swapped in on
+        the event loop. The remaining steps run on the loop, yielding between
+        them. phase_two_ms is the time spent restoring, not the time the task
+        waited; phase_two_max_step_ms is the longest a single step blocked
+        the event loop.
+        """
+        elapsed = 0.0
+        longest_blocking = 0.0
+        try:
+            if learner_data:
+                await asyncio.sleep(0)
+                start = time.perf_counter()
+                learner = None
+                try:
+                    if hass is not None:
+                        learner = await hass.async_add_executor_job(
+                            self._build_restored_learner, learner_data
+                        )
+                    else:
+                        learner = self._build_restored_learner(learner_data)
+                except Exception as exc:
+                    _LOGGER.warning("Failed to hydrate learning data: %s", exc)
+                install_start = start if hass is None else time.perf_counter()
+                self._install_restored_learner(learner)
+                end = time.perf_counter()
+                elapsed += end - start
+                longest_blocking = end - install_start
+            for step in steps:
+                await asyncio.sleep(0)
+                start = time.perf_counter()
+                try:
+                    step()
+                except Exception as exc:
+                    _LOGGER.warning("Failed to hydrate learning data: %s", exc)
+                duration = time.perf_counter() - start
+                elapsed += duration
+                longest_blocking = max(longest_blocking, duration)
+        finally:
+            self._restore_timings["phase_two_ms"] = elapsed * 1000
+            self._restore_timings["phase_two_max_step_ms"] = longest_blocking * 1000
+            if self._hydration_task is asyncio.current_task():  # Not superseded by a reset
+                self._learning_hydrated = True
+                self._hydration_task = None
+            self._engine_generation += 1
+            self.invalidate_cache_key("system_health")
+
+        _LOGGER.debug(
+            "Learning data hydrated in %.1f ms (longest event loop block %.1f ms)",
+            elapsed * 1000, longest_blocking * 1000
+        )
+        self._notify_update_callbacks()
+
+    async def async_wait_for_hydration(self) -> None:
+        """Wait until a background restore (phase two) has finished."""
+        task = self._hydration_task
+        if task is not None and not task.done():
+            await asyncio.wait({task})  # Neither propagates nor causes the task's cancellation
+
+    @property
+    def is_learning_hydrated(self) -> bool:
+        """Return False while learning data is still being restored in the background."""
+        return self._learning_hydrated
+
+    @property
+    def restore_timings(self) -> Dict[str, float]:
+        """Return the duration of both restore phases and the longest phase two step in milliseconds."""
+        return dict(self._restore_timings)
+    
+    async def async_setup_periodic_save(
+        self,
+        hass: "HomeAssistant",
+        save_interval: Optional[int] = None,
+        phase: float = 0.0
+    ) -> Callable:
         """Set up periodic saving of learning data.
         
         Args:
             hass: Home Assistant instance
             save_interval: Optional save interval in seconds. If not provided, uses configured interval.
+            phase: Fraction of the interval (0.0-1.0) to delay the start of the
+                periodic saves by, so entities do not all save at the same moment
             
         Returns:
             Function to cancel the periodic saving
         """
-        from homeassistant.helpers.event import async_track_time_interval
+        from homeassistant.helpers.event import async_call_later, async_track_time_interval
         from datetime import timedelta
         
         if not self._enable_learning:
@@ -2192,26 +2742,136 @@ class OffsetEngine:
         
         # Use provided save_interval or fall back to configured interval
         interval = save_interval if save_interval is not None else self._save_interval
+        self._hass = hass
         
         async def _periodic_save(_now=None):
-            """Periodic save callback."""
-            await self.async_save_learning_data()
+            """Periodic save callback, skipped when nothing changed."""
+            await self.async_save_learning_data(only_if_dirty=True)
         
-        # Set up periodic save with configurable interval
-        remove_listener = async_track_time_interval(
-            hass, _periodic_save, timedelta(seconds=interval)
-        )
+        # Set up periodic save with configurable interval, optionally shifted by the phase
+        listeners: Dict[str, Callable[[], None]] = {}
+        
+        def _start_periodic_save() -> None:
+            listeners["interval"] = async_track_time_interval(
+                hass, _periodic_save, timedelta(seconds=interval)
+            )
+        
+        async def _start_after_phase(_now=None) -> None:
+            listeners.pop("start", None)
+            _start_periodic_save()
+        
+        start_delay = (phase % 1.0) * interval
+        if start_delay > 0:
+            listeners["start"] = async_call_later(hass, start_delay, _start_after_phase)
+        else:
+            _start_periodic_save()
         
         _LOGGER.info(
             "Periodic learning data save configured (every %s seconds / %s minutes)",
             interval, interval / 60
         )
-        return remove_listener
+        if start_delay > 0:
+            _LOGGER.debug("Periodic learning data saves start in %.0f seconds", start_delay)
+        
+        def _remove_periodic_save() -> None:
+            """Stop periodic saving and drop any pending debounced save."""
+            for remove_listener in listeners.values():
+                remove_listener()
+            listeners.clear()
+            self._cancel_scheduled_save()
+            self._hass = None
+        
+        return _remove_periodic_save
     
     async def _trigger_save_callback(self) -> None:
         """Trigger a save operation (used for testing and state changes)."""
         await self.async_save_learning_data()
     
+    def _get_save_tokens(self) -> Dict[str, Any]:
+        """Return the change token of each learning section.
+        
+        A section is dirty when its token differs from the one recorded at the
+        last successful save. Components without a generation counter get a
+        fresh object and are therefore always dirty.
+        """
+        def component_token(component: Any) -> Any:
+            if component is None:
+                return (self._engine_generation, None)
+            generation = getattr(component, "generation", None)
+            if not isinstance(generation, int):
+                return object()
+            return (self._engine_generation, generation)
+        
+        return {
+            "engine_state": (self._engine_generation, self._enable_learning),
+            "learner_data": component_token(self._learner),
+            "hysteresis_data": component_token(
+                self._hysteresis_learner if self._hysteresis_enabled else None
+            ),
+            "seasonal_data": component_token(self._seasonal_learner),
+        }
+
+    def get_offset_cache_token(self) -> Tuple[Any, ...]:
+        """Return a token of the state calculate_offset() depends on.
+
+        While the token and the input are unchanged, calculate_offset() returns
+        the same result, so callers may reuse it. Components without a
+        generation counter make the token unequal to every other token.
+        """
+        return tuple(self._get_save_tokens().values()) + (self._learning_hydrated,)
+
+    def get_dashboard_token(self) -> Tuple[Any, ...]:
+        """Return a token that changes whenever the dashboard data would change.
+
+        Extends the offset cache token with save counters, the last power
+        state and the last calculated offset, so the dashboard coordinator
+        can back off while the token stays the same.
+        """
+        return self.get_offset_cache_token() + (
+            self._save_count,
+            self._failed_save_count,
+            self._last_power_state,
+            round(self._last_offset, 2),
+        )
+
+    def async_request_save(self) -> None:
+        """Schedule a save after new learning data, coalescing bursts of requests.
+        
+        The save runs once no further request arrived for the debounce window,
+        but never later than the maximum staleness after the first pending
+        request. Does nothing until async_setup_periodic_save() provided hass.
+        """
+        if self._hass is None:
+            return
+        
+        from homeassistant.helpers.event import async_call_later
+        
+        now = time.monotonic()
+        if self._cancel_pending_save is not None:
+            self._cancel_pending_save()
+            self._coalesced_save_count += 1
+        else:
+            self._pending_save_since = now
+        
+        delay = min(
+            self._save_debounce,
+            max(0.0, self._pending_save_since + self._save_max_staleness - now)
+        )
+        self._cancel_pending_save = async_call_later(self._hass, delay, self._async_debounced_save)
+    
+    async def _async_debounced_save(self, _now=None) -> None:
+        """Run the save scheduled by async_request_save()."""
+        self._cancel_pending_save = None
+        self._pending_save_since = None
+        await self.async_save_learning_data(only_if_dirty=True)
+    
+    def _cancel_scheduled_save(self) -> None:
+        """Cancel a pending debounced save, if any."""
+        if self._cancel_pending_save is not None:
+            self._cancel_pending_save()
+            self._cancel_pending_save = None
+            self._pending_save_since = None
+    
     def invalidate_cache_key(self, key: str) -> None:
         """Public method to invalidate a specific cache key."""
         if key in self._dashboard_cache:
@@ -2300,6 +2960,9 @@ class OffsetEngine:
         return PerformanceData(
             ema_coefficient=self._get_ema_coefficient(),
             prediction_latency_ms=self._measure_prediction_latency(),
+            prediction_latency_p95_ms=self._get_latency_percentile(STAGE_CALCULATE_OFFSET, 95),
+            prediction_latency_p99_ms=self._get_latency_percentile(STAGE_CALCULATE_OFFSET, 99),
+            hot_path_latency_ms=self.get_latency_metrics(),
             energy_efficiency_score=self._calculate_energy_efficiency_score(),
             sensor_availability_score=self._calculate_sensor_availability()
         )
@@ -2328,9 +2991,17 @@ class OffsetEngine:
             'convergence', self._analyze_convergence_trend, CACHE_DUR_TRENDS, default_value="unknown"
         )
         
+        writer_metrics = self._get_persistence_writer_metrics()
+        
         return SystemHealthData(
             memory_usage_kb=mem_usage,
             persistence_latency_ms=persistence_latency,
+            persistence_queue_depth=writer_metrics.get("queue_depth", 0),
+            persistence_batch_latency_ms=writer_metrics.get("last_batch_latency_ms", 0.0),
+            restore_phase_one_ms=round(self._restore_timings["phase_one_ms"], 2),
+            restore_phase_two_ms=round(self._restore_timings["phase_two_ms"], 2),
+            restore_phase_two_max_step_ms=round(self._restore_timings["phase_two_max_step_ms"], 2),
+            learning_hydrated=self._learning_hydrated,
             outlier_detection_active=self._is_outlier_detection_active(),
             samples_per_day=self._calculate_samples_per_day(),
             accuracy_improvement_rate=accuracy_rate,
@@ -2355,6 +3026,16 @@ class OffsetEngine:
         )
     
     # Helper methods for computing metrics
+    def _get_persistence_writer_metrics(self) -> Dict[str, Any]:
+        """Get the shared persistence writer metrics (empty without a writer)."""
+        data_store = getattr(self, "_data_store", None)
+        try:
+            metrics = data_store.get_writer_metrics() if data_store is not None else None
+        except Exception as exc:
+            _LOGGER.debug("Failed to get persistence writer metrics: %s", exc)
+            return {}
+        return metrics if isinstance(metrics, dict) else {}
+    
     def _get_temperature_window(self) -> Optional[str]:
         """Get the temperature window string."""
         if self._hysteresis_enabled and self._hysteresis_learner.has_sufficient_data:
@@ -2388,13 +3069,23 @@ class OffsetEngine:
         return 0.2  # Default EMA coefficient
     
     def _measure_prediction_latency(self) -> float:
-        """Measure the latency of ML predictions."""
-        if not self._enable_learning or not self._learner:
+        """Return the median of the recent calculate_offset() durations in ms."""
+        return self._get_latency_percentile(STAGE_CALCULATE_OFFSET, 50)
+    
+    def _get_latency_percentile(self, stage: str, percent: float) -> float:
+        """Return a percentile of a hot path's recent durations in ms (0.0 when not instrumented)."""
+        if self._latency_tracker is None:
             return 0.0
+        return round(self._latency_tracker.percentile(stage, percent), 3)
+    
+    def get_latency_metrics(self) -> Dict[str, Dict[str, float]]:
+        """Return p50/p95/p99, maximum and count of each instrumented hot path.
         
-        # TODO: Implement actual latency measurement
-        # For now, return a placeholder value
-        return 1.0  # ms
+        Empty when latency instrumentation is disabled.
+        """
+        if self._latency_tracker is None:
+            return {}
+        return self._latency_tracker.snapshot()
     
     def _calculate_energy_efficiency_score(self) -> int:
         """Calculate energy efficiency score (0-100)."""
@@ -2619,57 +3310,29 @@ class OffsetEngine:
         except:
             return "unknown"
     
+    def get_metrics_snapshot(self) -> SampleMetrics:
+        """Return the learner's algorithm metrics snapshot (empty without a learner)."""
+        if not self._enable_learning or not self._learner:
+            return SampleMetrics()
+        return self._learner.get_metrics_snapshot()
+    
     def _compute_algorithm_metrics(self) -> AlgorithmMetrics:
-        """Compute algorithm performance metrics."""
-        metrics = AlgorithmMetrics()
-        
+        """Compute algorithm performance metrics from the shared metrics snapshot."""
         if not self._enable_learning or not self._learner:
-            return metrics
-        
-        try:
-            # Get basic statistics from learner
-            stats = self._learner.get_statistics()
-            
-            # Correlation coefficient (placeholder based on accuracy)
-            # In a real implementation, this would calculate actual correlation
-            metrics.correlation_coefficient = (stats.avg_accuracy * 2.0) - 1.0  # Map 0-1 to -1 to 1
-            
-            # Prediction variance (placeholder)
-            # In reality, would calculate variance of predictions
-            if stats.samples_collected > 10:
-                metrics.prediction_variance = 0.05 * (1.0 - stats.avg_accuracy)
-            
-            # Model entropy (placeholder)
-            # Would represent uncertainty in the model
-            metrics.model_entropy = -stats.avg_accuracy * 0.693 if stats.avg_accuracy > 0 else 0
-            
-            # Learning rate (placeholder)
-            # Could be extracted from actual ML model
-            metrics.learning_rate = 0.001
-            
-            # Momentum factor (placeholder)
-            # Could be from optimizer settings
-            metrics.momentum_factor = 0.9
-            
-            # Regularization strength (placeholder)
-            metrics.regularization_strength = 0.001
-            
-            # Mean squared error (placeholder based on accuracy)
-            # Would be actual MSE from predictions
-            metrics.mean_squared_error = (1.0 - stats.avg_accuracy) * 0.1
-            
-            # Mean absolute error (placeholder)
-            # Would be actual MAE from predictions
-            metrics.mean_absolute_error = (1.0 - stats.avg_accuracy) * 0.2
-            
-            # R-squared (placeholder based on accuracy)
-            # Would represent model fit quality
-            metrics.r_squared = stats.avg_accuracy * 0.9
-            
-        except Exception as e:
-            _LOGGER.warning("Failed to compute algorithm metrics: %s", e)
-        
-        return metrics
+            return AlgorithmMetrics()
+        
+        snapshot = self.get_metrics_snapshot()
+        return AlgorithmMetrics(
+            correlation_coefficient=snapshot.correlation_coefficient,
+            prediction_variance=snapshot.prediction_variance,
+            model_entropy=snapshot.model_entropy,
+            learning_rate=float(self._learner._learning_rate),
+            momentum_factor=snapshot.momentum_factor,
+            regularization_strength=snapshot.regularization_strength,
+            mean_squared_error=snapshot.mean_squared_error,
+            mean_absolute_error=snapshot.mean_absolute_error,
+            r_squared=snapshot.r_squared,
+        )
     
     async def async_get_dashboard_data(self) -> Dict[str, Any]:
         """Aggregates all data for the dashboard with performance tracking."""
@@ -2681,6 +3344,8 @@ class OffsetEngine:
         save_diagnostics = {
             "save_count": self._save_count,
             "failed_save_count": self._failed_save_count,
+            "skipped_save_count": self._skipped_save_count,
+            "coalesced_save_count": self._coalesced_save_count,
             "last_save_time": self._last_save_time.isoformat() if self._last_save_time else None,
         }
         calibration_info = {
@@ -2720,9 +3385,9 @@ class OffsetEngine:
             ),
             diagnostics=self._compute_diagnostics(start_time),
             
-            # Algorithm metrics
+            # Algorithm metrics (the learner memoizes the snapshot until its samples change)
             algorithm_metrics=self._get_cached_or_recompute(
-                'algorithm_metrics', self._compute_algorithm_metrics, CACHE_DUR_PERF, AlgorithmMetrics()
+                'algorithm_metrics', self._compute_algorithm_metrics, 0, AlgorithmMetrics()
             )
         )
         
@@ -0,0 +1,207 @@
+"""ABOUTME: Domain-wide persistence writer shared by all Smart Climate data stores.
+Queues blocking save jobs from every entity and runs each batch in a single executor job."""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# hass.data key of the shared writer. It is kept out of hass.data[DOMAIN],
+# whose values are all per-entry dicts iterated by the thermal lookups.
+DATA_PERSISTENCE_WRITER = f"{DOMAIN}_persistence_writer"
+
+# Seconds to collect save jobs before a batch is handed to the executor
+DEFAULT_BATCH_WINDOW = 0.1
+
+# Golden ratio conjugate: successive multiples mod 1 spread evenly over [0, 1)
+_STAGGER_STEP = 0.6180339887498949
+
+_Job = Tuple[Callable[..., Any], Tuple[Any, ...], "asyncio.Future[Any]"]
+
+
+def _run_batch(jobs: List[Tuple[Callable[..., Any], Tuple[Any, ...]]]) -> List[Tuple[bool, Any]]:
+    """Run queued jobs in order, isolating failures.
+
+    Returns:
+        One (succeeded, result or exception) tuple per job
+    """
+    results: List[Tuple[bool, Any]] = []
+    for func, args in jobs:
+        try:
+            results.append((True, func(*args)))
+        except Exception as exc:  # Reported to the job's caller
+            results.append((False, exc))
+    return results
+
+
+class PersistenceWriter:
+    """Batches blocking persistence work from all climate entities.
+
+    Data stores submit their complete save sequence (serialize, write,
+    validate, backup, rename) as one callable. Jobs submitted within the
+    batch window run back to back in one executor job, so N entities saving
+    together cost one executor round-trip instead of several per entity.
+    """
+
+    def __init__(self, hass: HomeAssistant, batch_window: float = DEFAULT_BATCH_WINDOW):
+        """Initialize the writer.
+
+        Args:
+            hass: Home Assistant instance
+            batch_window: Seconds to wait for more jobs before running a batch
+        """
+        self._hass = hass
+        self._batch_window = batch_window
+        self._queue: List[_Job] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        # One batch at a time, so a flush also waits for a batch in progress
+        self._batch_lock = asyncio.Lock()
+        self._stagger_slots = 0
+        self._remove_stop_listener: Optional[Callable[[], None]] = None
+
+        # Metrics
+        self._max_queue_depth = 0
+        self._batch_count = 0
+        self._job_count = 0
+        self._failed_job_count = 0
+        self._last_batch_size = 0
+        self._last_batch_latency_ms = 0.0
+        self._max_batch_latency_ms = 0.0
+        self._total_batch_latency_ms = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of jobs waiting for the next batch."""
+        return len(self._queue)
+
+    async def async_run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Queue a blocking job for the next batch and wait for its result.
+
+        Raises:
+            Exception: Whatever the job raised
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._queue.append((func, args, future))
+        self._max_queue_depth = max(self._max_queue_depth, len(self._queue))
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._async_flush_after_window())
+        return await future
+
+    async def _async_flush_after_window(self) -> None:
+        """Wait for the batch window, then run everything queued."""
+        try:
+            await asyncio.sleep(self._batch_window)
+            await self._async_run_queued()
+        finally:
+            self._flush_task = None
+
+    async def async_flush(self) -> None:
+        """Run all queued jobs now (e.g. on shutdown).
+
+        Also waits for a batch that is already running in the executor, so
+        every save submitted before the call is on disk when it returns.
+        """
+        await self._async_run_queued()
+
+    async def _async_run_queued(self) -> None:
+        """Run queued jobs in executor batches until the queue is empty."""
+        async with self._batch_lock:
+            await self._async_run_batches()
+
+    async def _async_run_batches(self) -> None:
+        """Run queued jobs in executor batches; called with the batch lock held."""
+        while self._queue:
+            batch, self._queue = self._queue, []
+            start_time = time.perf_counter()
+            try:
+                results = await self._hass.async_add_executor_job(
+                    _run_batch, [(func, args) for func, args, _ in batch]
+                )
+            except Exception as exc:
+                results = [(False, exc)] * len(batch)
+            latency_ms = (time.perf_counter() - start_time) * 1000.0
+
+            self._batch_count += 1
+            self._job_count += len(batch)
+            self._last_batch_size = len(batch)
+            self._last_batch_latency_ms = latency_ms
+            self._max_batch_latency_ms = max(self._max_batch_latency_ms, latency_ms)
+            self._total_batch_latency_ms += latency_ms
+
+            for (_, _, future), (succeeded, value) in zip(batch, results):
+                if not succeeded:
+                    self._failed_job_count += 1
+                if future.done():
+                    continue  # Caller was cancelled
+                if succeeded:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+
+            _LOGGER.debug(
+                "Persistence batch of %d jobs completed in %.2f ms", len(batch), latency_ms
+            )
+
+    def next_stagger_fraction(self) -> float:
+        """Return the phase, as a fraction of the save interval, for the next periodic saver.
+
+        Successive callers get evenly spread phases however many entities
+        there are, so their periodic saves do not fire together.
+        """
+        fraction = (self._stagger_slots * _STAGGER_STEP) % 1.0
+        self._stagger_slots += 1
+        return fraction
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return queue and batch metrics."""
+        return {
+            "queue_depth": len(self._queue),
+            "max_queue_depth": self._max_queue_depth,
+            "batch_count": self._batch_count,
+            "job_count": self._job_count,
+            "failed_job_count": self._failed_job_count,
+            "last_batch_size": self._last_batch_size,
+            "last_batch_latency_ms": round(self._last_batch_latency_ms, 2),
+            "max_batch_latency_ms": round(self._max_batch_latency_ms, 2),
+            "avg_batch_latency_ms": round(
+                self._total_batch_latency_ms / self._batch_count if self._batch_count else 0.0, 2
+            ),
+        }
+
+
+def async_get_persistence_writer(hass: HomeAssistant) -> PersistenceWriter:
+    """Return the domain's shared writer, creating it on first use.
+
+    A new writer flushes its queue when Home Assistant stops, so saves still
+    waiting for the batch window are not lost on shutdown.
+    """
+    writer = hass.data.get(DATA_PERSISTENCE_WRITER)
+    if writer is None:
+        writer = hass.data[DATA_PERSISTENCE_WRITER] = PersistenceWriter(hass)
+
+        async def _async_flush_on_stop(_event: Event) -> None:
+            writer._remove_stop_listener = None  # Fired listeners are already removed
+            await writer.async_flush()
+
+        writer._remove_stop_listener = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STOP, _async_flush_on_stop
+        )
+    return writer
+
+
+async def async_remove_persistence_writer(hass: HomeAssistant) -> None:
+    """Flush and drop the domain's shared writer, if it exists."""
+    writer = hass.data.pop(DATA_PERSISTENCE_WRITER, None)
+    if writer is None:
+        return
+    if writer._remove_stop_listener is not None:
+        writer._remove_stop_listener()
+        writer._remove_stop_listener = None
+    await writer.async_flush()
@@ -11,6 +11,7 @@ from homeassistant.core import HomeAssistant
 from custom_components.smart_climate.thermal_models import ProbeResult
 from custom_components.smart_climate.thermal_preferences import UserPreferences
 from custom_components.smart_climate.thermal_model import PassiveThermalModel
+from custom_components.smart_climate.thermal_utils import ExponentialFit, fit_exponential_drift
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -346,6 +347,16 @@ class ProbeManager:
                 outdoor_temp=probe_data.get('outdoor_temp')
             )
             
+            # Let models that learn from whole traces see the probe drift
+            if probe_data['temperatures'] and hasattr(self._thermal_model, 'observe_drift'):
+                try:
+                    self._thermal_model.observe_drift(
+                        [(timestamp.timestamp(), temp) for timestamp, temp in probe_data['temperatures']],
+                        probe_data.get('outdoor_temp')
+                    )
+                except Exception as e:
+                    _LOGGER.debug("Could not learn drift modes from probe %s: %s", probe_id, e)
+            
             # Update thermal model
             if result.confidence > 0.1 and result.tau_value > 0:
                 # Determine if cooling or warming based on temperature change
@@ -494,7 +505,10 @@ class ProbeManager:
         """
         Calculate thermal time constant from temperature data.
         
-        Uses exponential curve fitting to determine tau value.
+        Fits T(t) = T_final + (T_initial - T_final) * exp(-t/tau) by robust
+        least squares. Fit quality is R² discounted by the width of the tau
+        confidence interval. Probes with too few readings for the fit fall
+        back to the 63.2% crossing estimate.
         
         Args:
             temperatures: List of (timestamp, temperature) tuples
@@ -506,10 +520,57 @@ class ProbeManager:
         if len(temperatures) < 2 or start_temp is None:
             return 0.0, 0.0
         
+        if abs(temperatures[-1][1] - start_temp) < 0.1:
+            return 0.0, 0.0
+        
+        fit = self._fit_tau(temperatures)
+        if fit is not None:
+            _LOGGER.debug(
+                "Probe tau fit: tau=%.1f min (%.1f-%.1f), T_final=%.2f, rmse=%.3f, "
+                "r2=%.3f, rejected=%d",
+                fit.tau, fit.tau_interval[0], fit.tau_interval[1], fit.t_final,
+                fit.rmse, fit.r_squared, fit.rejected_count
+            )
+            return float(fit.tau), fit.fit_quality
+        
+        return self._estimate_tau_from_crossing(temperatures, start_temp)
+    
+    def _fit_tau(self, temperatures: List[Tuple[datetime, float]]) -> Optional[ExponentialFit]:
+        """
+        Fit the exponential drift curve to probe readings, with times in minutes.
+        
+        Args:
+            temperatures: List of (timestamp, temperature) tuples
+            
+        Returns:
+            ExponentialFit, or None if the readings cannot be fitted
+        """
         try:
-            # Simple tau estimation using half-life approach
-            # Find time to reach halfway to target temperature
+            start_time = temperatures[0][0]
+            minutes = [(timestamp - start_time).total_seconds() / 60 for timestamp, _ in temperatures]
+            return fit_exponential_drift(minutes, [temp for _, temp in temperatures])
+        except Exception as e:
+            _LOGGER.debug("Exponential tau fit failed: %s", e)
+            return None
+    
+    def _estimate_tau_from_crossing(
+        self,
+        temperatures: List[Tuple[datetime, float]],
+        start_temp: float
+    ) -> Tuple[float, float]:
+        """
+        Estimate tau from the time the drift crossed 63.2% of its total change.
+        
+        Used when there are too few readings for the least-squares fit.
+        
+        Args:
+            temperatures: List of (timestamp, temperature) tuples
+            start_temp: Starting temperature
             
+        Returns:
+            Tuple of (tau_value, fit_quality)
+        """
+        try:
             target_temp = temperatures[-1][1]  # Final temperature as target
             temp_change = target_temp - start_temp
             
@@ -0,0 +1,158 @@
+"""ABOUTME: Packed fixed-width encoding of the offset learner's enhanced samples.
+Each sample becomes one base64 struct record (epoch timestamp, enum codes, float32/float64 values)
+that decodes back to a dict equal to the original; samples that cannot round-trip stay dicts."""
+
+import base64
+import binascii
+import math
+import struct
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+
+# Numeric sample fields in record order; None is stored as NaN
+FLOAT_FIELDS = (
+    "predicted",
+    "actual",
+    "ac_temp",
+    "room_temp",
+    "outdoor_temp",
+    "power",
+    "indoor_humidity",
+    "outdoor_humidity",
+)
+
+# Fields that must be present as floats (the learner's load validation requires them)
+REQUIRED_FLOAT_FIELDS = ("predicted", "actual", "ac_temp", "room_temp")
+
+# All fields of an enhanced sample as written by add_sample()
+SAMPLE_FIELDS = frozenset(FLOAT_FIELDS + ("mode", "hysteresis_state", "timestamp"))
+
+# Enum code tables. Append only: codes are stored on disk.
+SAMPLE_MODES = (
+    "none", "away", "sleep", "boost",
+    "cool", "heat", "heat_cool", "auto", "dry", "fan_only", "off",
+)
+SAMPLE_HYSTERESIS_STATES = (
+    "no_power_sensor",
+    "learning_hysteresis",
+    "active_phase",
+    "idle_above_start_threshold",
+    "idle_below_stop_threshold",
+    "idle_stable_zone",
+)
+
+_MODE_CODES = {mode: code for code, mode in enumerate(SAMPLE_MODES)}
+_HYSTERESIS_CODES = {state: code for code, state in enumerate(SAMPLE_HYSTERESIS_STATES)}
+
+# Record layout: flags, timestamp (µs since epoch, naive), mode code, hysteresis code, values.
+# Values use float32 when all of them survive the narrowing unchanged, float64 otherwise.
+FLAG_FLOAT64 = 0x01
+_HEADER = "<BqBB"
+_RECORD_FLOAT32 = struct.Struct(_HEADER + "8f")
+_RECORD_FLOAT64 = struct.Struct(_HEADER + "8d")
+_VALUES_FLOAT32 = struct.Struct("<8f")
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_NO_TIMESTAMP = -(2 ** 63)  # Sentinel for samples saved with an empty timestamp
+
+PackedSample = Union[str, Dict[str, Any]]
+
+
+def pack_sample(sample: Mapping[str, Any]) -> Optional[str]:
+    """Encode one enhanced sample as a base64 fixed-width record.
+
+    Returns:
+        The encoded record, or None if the sample would not decode to an
+        equal dict (extra keys, non-float values, unknown enum values,
+        timezone-aware or non-canonical timestamps)
+    """
+    if sample.keys() != SAMPLE_FIELDS:
+        return None
+
+    values = []
+    for field in FLOAT_FIELDS:
+        value = sample[field]
+        if value is None and field not in REQUIRED_FLOAT_FIELDS:
+            values.append(math.nan)
+        elif type(value) is float and not math.isnan(value):
+            values.append(value)
+        else:
+            return None
+
+    mode_code = _MODE_CODES.get(sample["mode"])
+    hysteresis_code = _HYSTERESIS_CODES.get(sample["hysteresis_state"])
+    timestamp = _encode_timestamp(sample["timestamp"])
+    if mode_code is None or hysteresis_code is None or timestamp is None:
+        return None
+
+    try:
+        narrowed = _VALUES_FLOAT32.unpack(_VALUES_FLOAT32.pack(*values))
+        lossless = all(a == b or (a != a and b != b) for a, b in zip(values, narrowed))
+    except OverflowError:
+        lossless = False
+
+    if lossless:
+        record = _RECORD_FLOAT32.pack(0, timestamp, mode_code, hysteresis_code, *values)
+    else:
+        record = _RECORD_FLOAT64.pack(FLAG_FLOAT64, timestamp, mode_code, hysteresis_code, *values)
+    return base64.b64encode(record).decode("ascii")
+
+
+def unpack_sample(encoded: str) -> Dict[str, Any]:
+    """Decode a record produced by pack_sample() back to the sample dict.
+
+    Raises:
+        ValueError: If the record is malformed
+    """
+    try:
+        record = base64.b64decode(encoded, validate=True)
+        layout = _RECORD_FLOAT64 if record[:1] == bytes((FLAG_FLOAT64,)) else _RECORD_FLOAT32
+        _, timestamp, mode_code, hysteresis_code, *values = layout.unpack(record)
+        mode = SAMPLE_MODES[mode_code]
+        hysteresis_state = SAMPLE_HYSTERESIS_STATES[hysteresis_code]
+    except (binascii.Error, struct.error, IndexError, TypeError) as exc:
+        raise ValueError(f"Invalid packed sample: {exc}") from exc
+
+    sample: Dict[str, Any] = {
+        field: None if value != value else value
+        for field, value in zip(FLOAT_FIELDS, values)
+    }
+    sample["mode"] = mode
+    sample["hysteresis_state"] = hysteresis_state
+    sample["timestamp"] = (
+        "" if timestamp == _NO_TIMESTAMP else (_EPOCH + timestamp * _MICROSECOND).isoformat()
+    )
+    return sample
+
+
+def pack_samples(samples: Sequence[Mapping[str, Any]]) -> List[PackedSample]:
+    """Encode samples for persistence, keeping unpackable samples as dicts."""
+    packed: List[PackedSample] = []
+    for sample in samples:
+        encoded = pack_sample(sample)
+        packed.append(encoded if encoded is not None else dict(sample))
+    return packed
+
+
+def unpack_samples(packed: Sequence[PackedSample]) -> List[Dict[str, Any]]:
+    """Decode a list produced by pack_samples(); dict entries are passed through."""
+    return [unpack_sample(item) if isinstance(item, str) else item for item in packed]
+
+
+def _encode_timestamp(timestamp: Any) -> Optional[int]:
+    """Return microseconds since the epoch for a canonical naive ISO timestamp.
+
+    Returns None if the string would not be reproduced exactly by isoformat().
+    """
+    if timestamp == "":
+        return _NO_TIMESTAMP
+    if not isinstance(timestamp, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(timestamp)
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None or parsed.isoformat() != timestamp:
+        return None
+    return (parsed - _EPOCH) // _MICROSECOND
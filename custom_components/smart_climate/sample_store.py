@@ -0,0 +1,987 @@
+"""ABOUTME: Columnar ring buffer for the offset learner's enhanced samples.
+Keeps sample features in parallel NumPy arrays so similarity scoring runs as one vectorized pass,
+plus running accuracy/diversity statistics maintained incrementally on add and eviction, a
+sorted outdoor-temperature index for correlation lookups and the algorithm metrics snapshot
+read by the dashboard sensors."""
+
+import heapq
+import logging
+import math
+import statistics
+from bisect import bisect_left, insort
+from collections import Counter
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only on installs without numpy
+    np = None
+
+_LOGGER = logging.getLogger(__name__)
+
+# True when the vectorized store can be used; the learner falls back to its
+# pure Python similarity loop otherwise.
+HAS_NUMPY = np is not None
+
+# Similarity windows (linear decay ranges) used by the learner's geometric mean
+AC_TEMP_RANGE = 5.0
+ROOM_TEMP_RANGE = 5.0
+OUTDOOR_TEMP_RANGE = 10.0
+POWER_RANGE = 500.0
+INDOOR_HUMIDITY_RANGE = 20.0
+OUTDOOR_HUMIDITY_RANGE = 30.0
+
+# Floor applied to every similarity factor to prevent zero products
+MIN_SIMILARITY_FACTOR = 0.01
+
+# Categorical similarity factors
+MODE_MISMATCH_FACTOR = 0.3
+HYSTERESIS_MISMATCH_FACTOR = 0.2
+
+# Code used for categorical values that were never stored
+UNKNOWN_CODE = -1
+
+# Spatial index: minimum candidates before falling back to a full scan
+DEFAULT_MIN_INDEX_CANDIDATES = 50
+
+# Batch scoring: upper bound on query x sample matrix cells scored at once
+BATCH_CHUNK_CELLS = 1_000_000
+
+# Temperature correlation modes
+CORRELATION_MODE_INTERPOLATE = "interpolate"  # Linear interpolation between the two nearest points
+CORRELATION_MODE_LOCAL_LINEAR = "local_linear"  # Robust (Theil-Sen) line through the k nearest points
+CORRELATION_MODES = (CORRELATION_MODE_INTERPOLATE, CORRELATION_MODE_LOCAL_LINEAR)
+DEFAULT_CORRELATION_NEIGHBORS = 8
+
+# Algorithm metrics: histogram bins for model entropy and regularization scaling
+ENTROPY_MAX_BINS = 10
+BASE_REGULARIZATION = 0.001
+REGULARIZATION_SPAN = 0.099
+
+
+class SpatialSampleIndex:
+    """Bucketed grid over (ac_temp, room_temp, outdoor_temp) for candidate lookup.
+
+    Cells are as wide as the similarity windows, so every sample inside a
+    query's linear-decay windows lies in the query cell or a direct
+    neighbour. Cells are partitioned by mode and hysteresis state codes;
+    samples without an outdoor temperature live in a separate ``None`` bucket.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        # (mode, hysteresis, ac_cell, room_cell) -> {outdoor_cell: slots}
+        self._cells: Dict[Tuple[int, int, int, int], Dict[Optional[int], Set[int]]] = {}
+        self._slot_keys: Dict[int, Tuple[Tuple[int, int, int, int], Optional[int]]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of indexed slots."""
+        return len(self._slot_keys)
+
+    def clear(self) -> None:
+        """Remove all slots from the index."""
+        self._cells.clear()
+        self._slot_keys.clear()
+
+    def add(
+        self,
+        slot: int,
+        mode_code: int,
+        hysteresis_code: int,
+        ac_temp: float,
+        room_temp: float,
+        outdoor_temp: float,
+    ) -> None:
+        """Index a slot; ``outdoor_temp`` may be NaN for missing values."""
+        partition = (
+            mode_code,
+            hysteresis_code,
+            math.floor(ac_temp / AC_TEMP_RANGE),
+            math.floor(room_temp / ROOM_TEMP_RANGE),
+        )
+        outdoor_cell = None if math.isnan(outdoor_temp) else math.floor(outdoor_temp / OUTDOOR_TEMP_RANGE)
+        self._cells.setdefault(partition, {}).setdefault(outdoor_cell, set()).add(slot)
+        self._slot_keys[slot] = (partition, outdoor_cell)
+
+    def remove(self, slot: int) -> None:
+        """Remove a slot from the index if present."""
+        key = self._slot_keys.pop(slot, None)
+        if key is None:
+            return
+        partition, outdoor_cell = key
+        buckets = self._cells[partition]
+        bucket = buckets[outdoor_cell]
+        bucket.discard(slot)
+        if not bucket:
+            del buckets[outdoor_cell]
+            if not buckets:
+                del self._cells[partition]
+
+    def candidates(
+        self,
+        mode_code: int,
+        hysteresis_code: int,
+        ac_temp: float,
+        room_temp: float,
+        outdoor_temp: Optional[float],
+    ) -> List[int]:
+        """Return slots in the query's partition and neighbouring cells.
+
+        When the query has no outdoor temperature every outdoor bucket
+        matches, since the outdoor factor is skipped for such queries.
+        """
+        ac_cell = math.floor(ac_temp / AC_TEMP_RANGE)
+        room_cell = math.floor(room_temp / ROOM_TEMP_RANGE)
+        outdoor_cells = None
+        if outdoor_temp is not None:
+            outdoor_cell = math.floor(outdoor_temp / OUTDOOR_TEMP_RANGE)
+            outdoor_cells = (outdoor_cell - 1, outdoor_cell, outdoor_cell + 1, None)
+
+        slots: List[int] = []
+        for ac_offset in (-1, 0, 1):
+            for room_offset in (-1, 0, 1):
+                buckets = self._cells.get(
+                    (mode_code, hysteresis_code, ac_cell + ac_offset, room_cell + room_offset)
+                )
+                if not buckets:
+                    continue
+                if outdoor_cells is None:
+                    for bucket in buckets.values():
+                        slots.extend(bucket)
+                else:
+                    for cell in outdoor_cells:
+                        bucket = buckets.get(cell)
+                        if bucket:
+                            slots.extend(bucket)
+        return slots
+
+
+class EnhancedSampleStore:
+    """Columnar, fixed-capacity ring buffer of enhanced learning samples.
+
+    Float features are held in parallel float64 arrays with NaN marking
+    missing values; mode and hysteresis state are stored as small integer
+    codes. Once full, each append overwrites the oldest slot, matching the
+    learner's "keep the most recent max_history samples" pruning.
+
+    With ``use_spatial_index`` enabled, predictions score only samples in
+    the query's mode/hysteresis partition and neighbouring grid cells,
+    falling back to an exact full scan when fewer than
+    ``min_index_candidates`` are found. Samples outside the windows still
+    carry the floored factors in a full scan, so indexed predictions are
+    an approximation that favours the closest conditions.
+    """
+
+    FLOAT_COLUMNS = (
+        "predicted",
+        "actual",
+        "ac_temp",
+        "room_temp",
+        "outdoor_temp",
+        "power",
+        "indoor_humidity",
+        "outdoor_humidity",
+    )
+
+    def __init__(
+        self,
+        capacity: int,
+        use_spatial_index: bool = False,
+        min_index_candidates: int = DEFAULT_MIN_INDEX_CANDIDATES,
+    ) -> None:
+        """Initialize an empty store.
+
+        Args:
+            capacity: Maximum number of samples kept before the oldest is overwritten
+            use_spatial_index: Score only nearby candidates found via a grid index
+            min_index_candidates: Candidate count below which a full scan is used
+        """
+        if not HAS_NUMPY:
+            raise RuntimeError("EnhancedSampleStore requires numpy")
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive")
+
+        self._base_capacity = capacity
+        self._capacity = capacity
+        self._size = 0
+        self._next = 0  # Slot the next append writes to
+
+        self._columns: Dict[str, Any] = {}
+        self._mode_codes = None
+        self._hysteresis_codes = None
+        self._allocate(capacity)
+
+        # String <-> code tables for categorical columns
+        self._mode_table: Dict[Any, int] = {}
+        self._hysteresis_table: Dict[Any, int] = {}
+
+        self._index: Optional[SpatialSampleIndex] = (
+            SpatialSampleIndex() if use_spatial_index else None
+        )
+        self._min_index_candidates = min_index_candidates
+        self._last_scan_size = 0
+
+    def _allocate(self, capacity: int) -> None:
+        """Allocate empty column arrays for the given capacity."""
+        self._columns = {
+            name: np.full(capacity, np.nan, dtype=np.float64)
+            for name in self.FLOAT_COLUMNS
+        }
+        self._mode_codes = np.full(capacity, UNKNOWN_CODE, dtype=np.int16)
+        self._hysteresis_codes = np.full(capacity, UNKNOWN_CODE, dtype=np.int16)
+
+    @property
+    def capacity(self) -> int:
+        """Return the maximum number of samples held."""
+        return self._capacity
+
+    def __len__(self) -> int:
+        """Return the number of samples currently held."""
+        return self._size
+
+    @property
+    def index(self) -> Optional[SpatialSampleIndex]:
+        """Return the spatial index, or None when disabled."""
+        return self._index
+
+    @property
+    def last_scan_size(self) -> int:
+        """Return how many samples the last weighted_prediction() scored."""
+        return self._last_scan_size
+
+    def column(self, name: str):
+        """Return a read-only view of the valid part of a float column.
+
+        Slot order is storage order, not insertion order, once the buffer wraps.
+        """
+        view = self._columns[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    def clear(self) -> None:
+        """Remove all samples and forget categorical codes."""
+        self._allocate(self._capacity)
+        self._size = 0
+        self._next = 0
+        self._mode_table.clear()
+        self._hysteresis_table.clear()
+        if self._index is not None:
+            self._index.clear()
+
+    def rebuild(self, samples: Iterable[Mapping[str, Any]]) -> None:
+        """Replace the store contents with the given samples.
+
+        The capacity grows if more samples are supplied than fit, so the
+        store always mirrors the full sequence it was rebuilt from, and
+        returns to the configured capacity on later rebuilds.
+
+        Args:
+            samples: Enhanced sample dictionaries in insertion order
+        """
+        samples = list(samples)
+        self._capacity = max(self._base_capacity, len(samples))
+        self.clear()
+        for sample in samples:
+            self.append(sample)
+
+    def append(self, sample: Mapping[str, Any]) -> Optional[int]:
+        """Append a sample, overwriting the oldest one when full.
+
+        Args:
+            sample: Enhanced sample dictionary as produced by the learner
+
+        Returns:
+            The slot that was overwritten, or None if nothing was evicted
+        """
+        slot = self._next
+        evicted = slot if self._size == self._capacity else None
+        if evicted is not None and self._index is not None:
+            self._index.remove(slot)
+
+        columns = self._columns
+        columns["predicted"][slot] = _to_float(sample.get("predicted", 0.0))
+        columns["actual"][slot] = float(sample["actual"])
+        columns["ac_temp"][slot] = float(sample["ac_temp"])
+        columns["room_temp"][slot] = float(sample["room_temp"])
+        columns["outdoor_temp"][slot] = _to_float(sample.get("outdoor_temp"))
+        columns["power"][slot] = _to_float(sample.get("power"))
+        columns["indoor_humidity"][slot] = _to_float(sample.get("indoor_humidity"))
+        columns["outdoor_humidity"][slot] = _to_float(sample.get("outdoor_humidity"))
+        self._mode_codes[slot] = _encode(self._mode_table, sample.get("mode"))
+        self._hysteresis_codes[slot] = _encode(
+            self._hysteresis_table, sample.get("hysteresis_state", "no_power_sensor")
+        )
+
+        if self._index is not None:
+            self._index.add(
+                slot,
+                int(self._mode_codes[slot]),
+                int(self._hysteresis_codes[slot]),
+                columns["ac_temp"][slot],
+                columns["room_temp"][slot],
+                columns["outdoor_temp"][slot],
+            )
+
+        self._next = (slot + 1) % self._capacity
+        if evicted is None:
+            self._size += 1
+        return evicted
+
+    def similarity_weights(
+        self,
+        ac_temp: float,
+        room_temp: float,
+        outdoor_temp: Optional[float] = None,
+        mode: str = "cool",
+        power: Optional[float] = None,
+        hysteresis_state: str = "no_power_sensor",
+        indoor_humidity: Optional[float] = None,
+        outdoor_humidity: Optional[float] = None,
+        slots=None,
+    ):
+        """Calculate the geometric-mean similarity of stored samples.
+
+        Produces the same values as the learner's per-sample
+        ``_calculate_similarity_with_hysteresis``: factors are floored,
+        multiplied in the same order and optional factors only count when
+        both the query and the sample have a value.
+
+        Args:
+            slots: Optional integer array of slots to score; all valid slots if None
+
+        Returns:
+            float64 array of similarity scores, one per scored slot
+        """
+        selection = slice(0, self._size) if slots is None else slots
+        cols = self._columns
+
+        product = np.maximum(
+            1.0 - np.abs(ac_temp - cols["ac_temp"][selection]) / AC_TEMP_RANGE,
+            MIN_SIMILARITY_FACTOR,
+        )
+        product *= np.maximum(
+            1.0 - np.abs(room_temp - cols["room_temp"][selection]) / ROOM_TEMP_RANGE,
+            MIN_SIMILARITY_FACTOR,
+        )
+        factor_count = np.full(len(product), 2, dtype=np.int64)
+
+        if outdoor_temp is not None:
+            self._apply_optional_factor(
+                product, factor_count, cols["outdoor_temp"][selection], outdoor_temp, OUTDOOR_TEMP_RANGE
+            )
+
+        mode_code = self._mode_table.get(mode, UNKNOWN_CODE)
+        product *= np.where(self._mode_codes[selection] == mode_code, 1.0, MODE_MISMATCH_FACTOR)
+        factor_count += 1
+
+        if power is not None:
+            self._apply_optional_factor(
+                product, factor_count, cols["power"][selection], power, POWER_RANGE
+            )
+        if indoor_humidity is not None:
+            self._apply_optional_factor(
+                product, factor_count, cols["indoor_humidity"][selection], indoor_humidity, INDOOR_HUMIDITY_RANGE
+            )
+        if outdoor_humidity is not None:
+            self._apply_optional_factor(
+                product, factor_count, cols["outdoor_humidity"][selection], outdoor_humidity, OUTDOOR_HUMIDITY_RANGE
+            )
+
+        # Hysteresis state counts twice (double weight), applied as two factors
+        hysteresis_code = self._hysteresis_table.get(hysteresis_state, UNKNOWN_CODE)
+        hysteresis_factor = np.where(
+            self._hysteresis_codes[selection] == hysteresis_code, 1.0, HYSTERESIS_MISMATCH_FACTOR
+        )
+        product *= hysteresis_factor
+        product *= hysteresis_factor
+        factor_count += 2
+
+        return product ** (1.0 / factor_count)
+
+    def candidate_slots(self, **query: Any):
+        """Return index candidates for a query, or None to request a full scan.
+
+        None is returned when the index is disabled or finds fewer than
+        ``min_index_candidates`` samples (exact fallback).
+        """
+        if self._index is None:
+            return None
+        candidates = self._index.candidates(
+            self._mode_table.get(query.get("mode", "cool"), UNKNOWN_CODE),
+            self._hysteresis_table.get(query.get("hysteresis_state", "no_power_sensor"), UNKNOWN_CODE),
+            query["ac_temp"],
+            query["room_temp"],
+            query.get("outdoor_temp"),
+        )
+        if len(candidates) < self._min_index_candidates:
+            return None
+        return np.fromiter(candidates, dtype=np.intp, count=len(candidates))
+
+    def weighted_prediction(self, **query: Any) -> Optional[float]:
+        """Return the similarity-weighted mean of stored actual offsets.
+
+        Args:
+            **query: Current conditions, as accepted by ``similarity_weights``
+
+        Returns:
+            Weighted prediction, or None if the store is empty
+        """
+        if self._size == 0:
+            return None
+        slots = self.candidate_slots(**query)
+        weights = self.similarity_weights(slots=slots, **query)
+        self._last_scan_size = len(weights)
+        total_weight = weights.sum()
+        if total_weight == 0.0:
+            return None
+        actual = self._columns["actual"][slice(0, self._size) if slots is None else slots]
+        return float(np.dot(weights, actual) / total_weight)
+
+    def weighted_predictions(self, queries: Sequence[Mapping[str, Any]]) -> List[Optional[float]]:
+        """Return weighted predictions for many queries in one vectorized pass.
+
+        Queries are scored as a (queries x samples) similarity matrix, in
+        chunks of at most ``BATCH_CHUNK_CELLS`` cells. With the spatial index
+        enabled each query needs its own candidate set, so they are scored
+        one at a time through ``weighted_prediction``.
+
+        Args:
+            queries: Condition mappings, as accepted by ``similarity_weights``
+
+        Returns:
+            One prediction per query; None where no sample carries weight
+        """
+        if not queries:
+            return []
+        if self._size == 0:
+            return [None] * len(queries)
+        if self._index is not None:
+            return [self.weighted_prediction(**query) for query in queries]
+
+        actual = self._columns["actual"][: self._size]
+        rows_per_chunk = max(1, BATCH_CHUNK_CELLS // self._size)
+        predictions: List[Optional[float]] = []
+        for start in range(0, len(queries), rows_per_chunk):
+            weights = self._similarity_matrix(queries[start:start + rows_per_chunk])
+            totals = weights.sum(axis=1)
+            weighted = weights @ actual
+            for total, value in zip(totals, weighted):
+                predictions.append(float(value / total) if total != 0.0 else None)
+        self._last_scan_size = self._size
+        return predictions
+
+    def _similarity_matrix(self, queries: Sequence[Mapping[str, Any]]):
+        """Score every stored sample against every query.
+
+        Broadcasts query columns against the sample columns with the same
+        factor order as ``similarity_weights``, so each row matches the
+        single-query result.
+        """
+        size = self._size
+        cols = self._columns
+
+        def query_column(key: str, default: Any = None):
+            return np.array(
+                [_to_float(query.get(key, default)) for query in queries], dtype=np.float64
+            )[:, np.newaxis]
+
+        product = np.maximum(
+            1.0 - np.abs(query_column("ac_temp") - cols["ac_temp"][:size]) / AC_TEMP_RANGE,
+            MIN_SIMILARITY_FACTOR,
+        )
+        product *= np.maximum(
+            1.0 - np.abs(query_column("room_temp") - cols["room_temp"][:size]) / ROOM_TEMP_RANGE,
+            MIN_SIMILARITY_FACTOR,
+        )
+        factor_count = np.full(product.shape, 2, dtype=np.int64)
+
+        self._apply_optional_matrix_factor(
+            product, factor_count, cols["outdoor_temp"][:size], query_column("outdoor_temp"), OUTDOOR_TEMP_RANGE
+        )
+
+        mode_codes = np.array(
+            [self._mode_table.get(query.get("mode", "cool"), UNKNOWN_CODE) for query in queries]
+        )[:, np.newaxis]
+        product *= np.where(self._mode_codes[:size] == mode_codes, 1.0, MODE_MISMATCH_FACTOR)
+        factor_count += 1
+
+        self._apply_optional_matrix_factor(
+            product, factor_count, cols["power"][:size], query_column("power"), POWER_RANGE
+        )
+        self._apply_optional_matrix_factor(
+            product, factor_count, cols["indoor_humidity"][:size], query_column("indoor_humidity"),
+            INDOOR_HUMIDITY_RANGE,
+        )
+        self._apply_optional_matrix_factor(
+            product, factor_count, cols["outdoor_humidity"][:size], query_column("outdoor_humidity"),
+            OUTDOOR_HUMIDITY_RANGE,
+        )
+
+        hysteresis_codes = np.array(
+            [
+                self._hysteresis_table.get(query.get("hysteresis_state", "no_power_sensor"), UNKNOWN_CODE)
+                for query in queries
+            ]
+        )[:, np.newaxis]
+        hysteresis_factor = np.where(
+            self._hysteresis_codes[:size] == hysteresis_codes, 1.0, HYSTERESIS_MISMATCH_FACTOR
+        )
+        product *= hysteresis_factor
+        product *= hysteresis_factor
+        factor_count += 2
+
+        return product ** (1.0 / factor_count)
+
+    @staticmethod
+    def _apply_optional_matrix_factor(product, factor_count, values, query_values, value_range: float) -> None:
+        """Multiply in a linear-decay factor where both the query and the sample have a value."""
+        present = ~np.isnan(query_values) & ~np.isnan(values)
+        factor = np.maximum(1.0 - np.abs(query_values - values) / value_range, MIN_SIMILARITY_FACTOR)
+        product *= np.where(present, factor, 1.0)
+        factor_count += present
+
+    @staticmethod
+    def _apply_optional_factor(product, factor_count, values, query_value: float, value_range: float) -> None:
+        """Multiply in a linear-decay factor where the sample has a value."""
+        present = ~np.isnan(values)
+        factor = np.maximum(1.0 - np.abs(query_value - values) / value_range, MIN_SIMILARITY_FACTOR)
+        product *= np.where(present, factor, 1.0)
+        factor_count += present
+
+
+class RunningSampleStatistics:
+    """Incremental accuracy and condition-diversity counters for enhanced samples.
+
+    Updated on every add and eviction so the learner's confidence factors
+    are O(1) to read instead of rescanning all samples. Bins match the
+    learner's diversity calculation: 0.5°C for temperatures, 100W for power.
+    Pure Python, so it works with or without numpy.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self.count = 0
+        self._abs_error_sum = 0.0
+        self._ac_temp_bins: Counter = Counter()
+        self._room_temp_bins: Counter = Counter()
+        self._outdoor_temp_bins: Counter = Counter()
+        self._power_bins: Counter = Counter()
+        self._mode_counts: Counter = Counter()
+        self._hysteresis_counts: Counter = Counter()
+
+    def clear(self) -> None:
+        """Reset all counters."""
+        self.count = 0
+        self._abs_error_sum = 0.0
+        for counter in self._counters():
+            counter.clear()
+
+    def rebuild(self, samples: Iterable[Mapping[str, Any]]) -> None:
+        """Recompute all counters from the given samples."""
+        self.clear()
+        for sample in samples:
+            self.add(sample)
+
+    def add(self, sample: Mapping[str, Any]) -> None:
+        """Account for a sample entering the window."""
+        self._update(sample, 1)
+
+    def remove(self, sample: Mapping[str, Any]) -> None:
+        """Account for a sample leaving the window (eviction)."""
+        self._update(sample, -1)
+        if self.count == 0:
+            # Drop accumulated floating point residue once the window is empty
+            self._abs_error_sum = 0.0
+
+    @property
+    def mean_absolute_error(self) -> Optional[float]:
+        """Return the MAE of predicted vs actual over the window, or None if empty."""
+        if self.count == 0:
+            return None
+        return max(0.0, self._abs_error_sum) / self.count
+
+    @property
+    def distinct_ac_temps(self) -> int:
+        """Return the number of occupied 0.5°C AC temperature bins."""
+        return len(self._ac_temp_bins)
+
+    @property
+    def distinct_room_temps(self) -> int:
+        """Return the number of occupied 0.5°C room temperature bins."""
+        return len(self._room_temp_bins)
+
+    @property
+    def distinct_outdoor_temps(self) -> int:
+        """Return the number of occupied 0.5°C outdoor temperature bins."""
+        return len(self._outdoor_temp_bins)
+
+    @property
+    def distinct_power_levels(self) -> int:
+        """Return the number of occupied 100W power bins."""
+        return len(self._power_bins)
+
+    @property
+    def distinct_modes(self) -> int:
+        """Return the number of distinct modes seen."""
+        return len(self._mode_counts)
+
+    @property
+    def distinct_hysteresis_states(self) -> int:
+        """Return the number of distinct hysteresis states seen."""
+        return len(self._hysteresis_counts)
+
+    @property
+    def mode_counts(self) -> Dict[Any, int]:
+        """Return sample counts per mode."""
+        return dict(self._mode_counts)
+
+    @property
+    def hysteresis_counts(self) -> Dict[Any, int]:
+        """Return sample counts per hysteresis state."""
+        return dict(self._hysteresis_counts)
+
+    def _counters(self) -> Tuple[Counter, ...]:
+        """Return all bin counters."""
+        return (
+            self._ac_temp_bins,
+            self._room_temp_bins,
+            self._outdoor_temp_bins,
+            self._power_bins,
+            self._mode_counts,
+            self._hysteresis_counts,
+        )
+
+    def _update(self, sample: Mapping[str, Any], delta: int) -> None:
+        """Apply a +1 (add) or -1 (remove) update for one sample."""
+        self.count += delta
+        predicted = sample.get("predicted", 0.0)
+        actual = sample.get("actual", 0.0)
+        self._abs_error_sum += delta * abs(predicted - actual)
+
+        ac_temp = sample.get("ac_temp")
+        if ac_temp is not None:
+            _bump(self._ac_temp_bins, round(ac_temp * 2) / 2, delta)
+        room_temp = sample.get("room_temp")
+        if room_temp is not None:
+            _bump(self._room_temp_bins, round(room_temp * 2) / 2, delta)
+        outdoor_temp = sample.get("outdoor_temp")
+        if outdoor_temp is not None:
+            _bump(self._outdoor_temp_bins, round(outdoor_temp * 2) / 2, delta)
+        power = sample.get("power")
+        if power is not None:
+            _bump(self._power_bins, round(power / 100) * 100, delta)
+        _bump(self._mode_counts, sample.get("mode", "unknown"), delta)
+        _bump(self._hysteresis_counts, sample.get("hysteresis_state", "unknown"), delta)
+
+
+class OutdoorTemperatureIndex:
+    """Sorted (outdoor_temp, offset) view of the learner's temperature correlation data.
+
+    Maintained with bisect on every append and eviction so the nearest
+    points to a query temperature are found in O(log n) instead of sorting
+    all points per prediction. Neighbours are returned in the learner's
+    original order: by distance, then temperature, then offset.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._entries: List[Tuple[float, float]] = []
+
+    def __len__(self) -> int:
+        """Return the number of indexed points."""
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Remove all points."""
+        self._entries.clear()
+
+    def rebuild(self, data: Iterable[Mapping[str, Any]]) -> None:
+        """Re-index from correlation entries with outdoor_temp and offset keys."""
+        self._entries = sorted((item["outdoor_temp"], item["offset"]) for item in data)
+
+    def add(self, outdoor_temp: float, offset: float) -> None:
+        """Insert a point keeping the view sorted."""
+        insort(self._entries, (outdoor_temp, offset))
+
+    def remove(self, outdoor_temp: float, offset: float) -> None:
+        """Remove one matching point (used when the deque evicts its oldest entry)."""
+        position = bisect_left(self._entries, (outdoor_temp, offset))
+        if position < len(self._entries) and self._entries[position] == (outdoor_temp, offset):
+            del self._entries[position]
+
+    @property
+    def has_single_temperature(self) -> bool:
+        """Return True if all indexed points share one outdoor temperature."""
+        return bool(self._entries) and self._entries[0][0] == self._entries[-1][0]
+
+    def mean_offset(self) -> float:
+        """Return the mean offset of all points."""
+        return statistics.mean(offset for _, offset in self._entries)
+
+    def nearest(self, outdoor_temp: float, count: int) -> List[Tuple[float, float]]:
+        """Return the `count` points closest to a temperature.
+
+        Ordered as sorting (|Δt|, temp, offset) tuples would order them.
+        """
+        split = bisect_left(self._entries, (outdoor_temp, -math.inf))
+        return list(islice(
+            heapq.merge(
+                self._below(split),
+                self._above(split),
+                key=lambda entry: (abs(entry[0] - outdoor_temp), entry[0], entry[1]),
+            ),
+            count,
+        ))
+
+    def _above(self, split: int) -> Iterator[Tuple[float, float]]:
+        """Yield points from the split upwards, already in ascending order."""
+        entries = self._entries
+        for position in range(split, len(entries)):
+            yield entries[position]
+
+    def _below(self, split: int) -> Iterator[Tuple[float, float]]:
+        """Yield points below the split, nearest temperature group first.
+
+        Each equal-temperature group is yielded in ascending offset order.
+        """
+        entries = self._entries
+        end = split
+        while end > 0:
+            group_start = bisect_left(entries, (entries[end - 1][0], -math.inf), 0, end)
+            for position in range(group_start, end):
+                yield entries[position]
+            end = group_start
+
+
+@dataclass(frozen=True)
+class SampleMetrics:
+    """Algorithm metrics over the learner's enhanced samples.
+
+    Computed once per learner generation and shared by the dashboard
+    coordinator, the climate entity attributes and the algorithm sensors.
+    """
+    sample_count: int = 0
+    correlation_coefficient: float = 0.0
+    prediction_variance: float = 0.0
+    model_entropy: float = 0.0
+    momentum_factor: float = 0.0
+    regularization_strength: float = 0.0
+    mean_squared_error: float = 0.0
+    mean_absolute_error: float = 0.0
+    r_squared: float = 0.0
+
+
+def compute_sample_metrics(
+    predicted: Sequence[float],
+    actual: Sequence[float],
+    outdoor_temps: Sequence[float] = (),
+    offsets: Sequence[float] = (),
+) -> SampleMetrics:
+    """Compute all algorithm metrics in a single pass over the sample columns.
+
+    Args:
+        predicted: Predicted offset per sample (NaN or None treated as 0.0)
+        actual: Actual offset per sample
+        outdoor_temps: Outdoor temperatures of the temperature correlation data
+        offsets: Offsets paired with outdoor_temps
+
+    Returns:
+        SampleMetrics; each metric is 0.0 when there are too few samples for it
+    """
+    if HAS_NUMPY:
+        return _compute_sample_metrics_numpy(predicted, actual, outdoor_temps, offsets)
+    return _compute_sample_metrics_python(predicted, actual, outdoor_temps, offsets)
+
+
+def sample_metrics_from_samples(
+    samples: Sequence[Mapping[str, Any]],
+    correlation_data: Iterable[Mapping[str, Any]] = (),
+) -> SampleMetrics:
+    """Compute SampleMetrics from enhanced sample and correlation dictionaries."""
+    correlation_data = list(correlation_data)
+    return compute_sample_metrics(
+        [sample.get("predicted", 0.0) for sample in samples],
+        [sample.get("actual", 0.0) for sample in samples],
+        [item["outdoor_temp"] for item in correlation_data],
+        [item["offset"] for item in correlation_data],
+    )
+
+
+def _compute_sample_metrics_numpy(predicted, actual, outdoor_temps, offsets) -> SampleMetrics:
+    """Vectorized SampleMetrics computation."""
+    predicted = np.nan_to_num(np.asarray(predicted, dtype=np.float64), nan=0.0)
+    actual = np.asarray(actual, dtype=np.float64)
+    count = len(predicted)
+    metrics: Dict[str, float] = {}
+
+    if count > 0:
+        residuals = predicted - actual
+        abs_errors = np.abs(residuals)
+        metrics["mean_squared_error"] = float(np.mean(residuals * residuals))
+        metrics["mean_absolute_error"] = float(np.mean(abs_errors))
+
+    if count >= 2:
+        variance = float(np.var(predicted, ddof=1))
+        metrics["prediction_variance"] = variance
+        metrics["regularization_strength"] = _regularization_strength(variance)
+        metrics["model_entropy"] = _entropy_numpy(predicted)
+
+        ss_total = float(np.sum((actual - np.mean(actual)) ** 2))
+        ss_residual = float(np.sum(residuals * residuals))
+        metrics["r_squared"] = _r_squared(ss_total, ss_residual)
+
+    if count >= 3:
+        mean_error = float(np.mean(abs_errors))
+        std_error = float(np.std(abs_errors, ddof=1))
+        metrics["momentum_factor"] = _momentum_factor(mean_error, std_error)
+
+    if len(outdoor_temps) >= 2:
+        temps = np.asarray(outdoor_temps, dtype=np.float64)
+        temp_offsets = np.asarray(offsets, dtype=np.float64)
+        temp_dev = temps - temps.mean()
+        offset_dev = temp_offsets - temp_offsets.mean()
+        denominator = math.sqrt(float(np.sum(temp_dev * temp_dev)) * float(np.sum(offset_dev * offset_dev)))
+        if denominator != 0:
+            metrics["correlation_coefficient"] = float(np.sum(temp_dev * offset_dev)) / denominator
+
+    return SampleMetrics(sample_count=count, **metrics)
+
+
+def _compute_sample_metrics_python(predicted, actual, outdoor_temps, offsets) -> SampleMetrics:
+    """Pure Python SampleMetrics computation for installs without numpy."""
+    predicted = [0.0 if p is None or p != p else float(p) for p in predicted]
+    actual = [float(a) for a in actual]
+    count = len(predicted)
+    metrics: Dict[str, float] = {}
+
+    if count > 0:
+        residuals = [p - a for p, a in zip(predicted, actual)]
+        abs_errors = [abs(r) for r in residuals]
+        ss_residual = sum(r * r for r in residuals)
+        metrics["mean_squared_error"] = ss_residual / count
+        metrics["mean_absolute_error"] = statistics.mean(abs_errors)
+
+    if count >= 2:
+        variance = statistics.variance(predicted)
+        metrics["prediction_variance"] = variance
+        metrics["regularization_strength"] = _regularization_strength(variance)
+        metrics["model_entropy"] = _entropy_python(predicted)
+
+        actual_mean = statistics.mean(actual)
+        ss_total = sum((a - actual_mean) ** 2 for a in actual)
+        metrics["r_squared"] = _r_squared(ss_total, ss_residual)
+
+    if count >= 3:
+        metrics["momentum_factor"] = _momentum_factor(
+            statistics.mean(abs_errors), statistics.stdev(abs_errors)
+        )
+
+    if len(outdoor_temps) >= 2:
+        temp_mean = statistics.mean(outdoor_temps)
+        offset_mean = statistics.mean(offsets)
+        numerator = sum((t - temp_mean) * (o - offset_mean) for t, o in zip(outdoor_temps, offsets))
+        temp_var = sum((t - temp_mean) ** 2 for t in outdoor_temps)
+        offset_var = sum((o - offset_mean) ** 2 for o in offsets)
+        denominator = (temp_var * offset_var) ** 0.5
+        if denominator != 0:
+            metrics["correlation_coefficient"] = numerator / denominator
+
+    return SampleMetrics(sample_count=count, **metrics)
+
+
+def _entropy_numpy(predicted) -> float:
+    """Return the Shannon entropy (bits) of a histogram of the predictions."""
+    min_pred = float(predicted.min())
+    range_pred = float(predicted.max()) - min_pred
+    if range_pred == 0:
+        return 0.0
+    num_bins = min(ENTROPY_MAX_BINS, len(predicted))
+    bin_size = range_pred / num_bins
+    bins = np.minimum(((predicted - min_pred) / bin_size).astype(np.int64), num_bins - 1)
+    counts = np.bincount(bins, minlength=num_bins)
+    probabilities = counts[counts > 0] / len(predicted)
+    return float(-np.sum(probabilities * np.log2(probabilities)))
+
+
+def _entropy_python(predicted: List[float]) -> float:
+    """Pure Python counterpart of _entropy_numpy()."""
+    min_pred = min(predicted)
+    range_pred = max(predicted) - min_pred
+    if range_pred == 0:
+        return 0.0
+    num_bins = min(ENTROPY_MAX_BINS, len(predicted))
+    bin_size = range_pred / num_bins
+    bin_counts = [0] * num_bins
+    for pred in predicted:
+        bin_counts[min(int((pred - min_pred) / bin_size), num_bins - 1)] += 1
+    entropy = 0.0
+    for count in bin_counts:
+        if count > 0:
+            probability = count / len(predicted)
+            entropy -= probability * math.log2(probability)
+    return entropy
+
+
+def _regularization_strength(variance: float) -> float:
+    """Scale prediction variance into the 0.001-0.1 regularization range."""
+    return BASE_REGULARIZATION + min(1.0, variance / 2.0) * REGULARIZATION_SPAN
+
+
+def _r_squared(ss_total: float, ss_residual: float) -> float:
+    """Return the coefficient of determination (1.0 for a perfect constant fit)."""
+    if ss_total == 0:
+        return 1.0 if ss_residual == 0 else 0.0
+    return 1.0 - ss_residual / ss_total
+
+
+def _momentum_factor(mean_error: float, std_error: float) -> float:
+    """Map the coefficient of variation of absolute errors to a 0-1 stability factor."""
+    if mean_error == 0:
+        return 1.0
+    return max(0.0, min(1.0, 1.0 / (1.0 + std_error / mean_error)))
+
+
+def theil_sen_line(points: List[Tuple[float, float]]) -> Optional[Tuple[float, float]]:
+    """Fit a robust line through (x, y) points using the Theil-Sen estimator.
+
+    Returns:
+        (slope, intercept), or None if all x values are equal
+    """
+    slopes = [
+        (y2 - y1) / (x2 - x1)
+        for i, (x1, y1) in enumerate(points)
+        for x2, y2 in points[i + 1:]
+        if x2 != x1
+    ]
+    if not slopes:
+        return None
+    slope = statistics.median(slopes)
+    intercept = statistics.median(y - slope * x for x, y in points)
+    return slope, intercept
+
+
+def _bump(counter: Counter, key: Any, delta: int) -> None:
+    """Adjust a counter entry, deleting it when it drops to zero."""
+    value = counter[key] + delta
+    if value > 0:
+        counter[key] = value
+    else:
+        del counter[key]
+
+
+def _to_float(value: Any) -> float:
+    """Convert an optional numeric value to float, mapping None to NaN."""
+    if value is None:
+        return float("nan")
+    return float(value)
+
+
+def _encode(table: Dict[Any, int], value: Any) -> int:
+    """Return the code for a categorical value, assigning a new one if needed."""
+    code = table.get(value)
+    if code is None:
+        code = len(table)
+        table[value] = code
+    return code
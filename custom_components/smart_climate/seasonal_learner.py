@@ -8,12 +8,15 @@ import logging
 import statistics
 import time
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
 from homeassistant.core import HomeAssistant
 
 from .models import HvacCycleData
 
+if TYPE_CHECKING:
+    from .sensor_manager import SensorManager
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -34,20 +37,31 @@ class LearnedPattern:
 class SeasonalHysteresisLearner:
     """Enhanced HysteresisLearner with seasonal adaptation using outdoor temperature context."""
     
-    def __init__(self, hass: HomeAssistant, outdoor_sensor_id: Optional[str]):
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        outdoor_sensor_id: Optional[str],
+        sensor_manager: Optional["SensorManager"] = None,
+    ):
         """Initialize the seasonal hysteresis learner.
         
         Args:
             hass: Home Assistant instance
             outdoor_sensor_id: Entity ID of outdoor temperature sensor (optional)
+            sensor_manager: Optional shared SensorManager; its readings are used
+                when it tracks the same outdoor sensor
         """
         self._hass = hass
         self._outdoor_sensor_id = outdoor_sensor_id
+        self._sensor_manager = sensor_manager
         self._patterns: List[LearnedPattern] = []
         self._data_retention_days = 45
         self._outdoor_temp_bucket_size = 5.0  # degrees C/F for pattern matching
         self._min_samples_for_bucket = 3
         
+        # Bumped on every change to the persisted patterns (dirty tracking for saves)
+        self._generation = 0
+        
         # Storage is now handled by OffsetEngine via callbacks
         # No longer using separate Store instance
         
@@ -84,6 +98,7 @@ class SeasonalHysteresisLearner:
         )
         
         self._patterns.append(pattern)
+        self._generation += 1
         
         # Prune old patterns
         self._prune_old_patterns()
@@ -123,6 +138,7 @@ class SeasonalHysteresisLearner:
         )
         
         self._patterns.append(pattern)
+        self._generation += 1
         
         # Prune old patterns
         self._prune_old_patterns()
@@ -235,6 +251,10 @@ class SeasonalHysteresisLearner:
         if self._outdoor_sensor_id is None:
             return None
         
+        sensor_manager = self._sensor_manager
+        if sensor_manager is not None and sensor_manager.outdoor_sensor_id == self._outdoor_sensor_id:
+            return sensor_manager.get_outdoor_temperature()
+        
         state = self._hass.states.get(self._outdoor_sensor_id)
         if state is None:
             _LOGGER.debug("Outdoor temperature sensor not found: %s", self._outdoor_sensor_id)
@@ -264,6 +284,7 @@ class SeasonalHysteresisLearner:
         
         pruned_count = old_count - len(self._patterns)
         if pruned_count > 0:
+            self._generation += 1
             _LOGGER.debug(
                 "Pruned %d old patterns (older than %d days), %d patterns remaining",
                 pruned_count, self._data_retention_days, len(self._patterns)
@@ -340,6 +361,8 @@ class SeasonalHysteresisLearner:
                     pattern_dict, exc
                 )
         
+        self._generation += 1
+        
         # Prune old patterns after loading
         self._prune_old_patterns()
         
@@ -352,6 +375,11 @@ class SeasonalHysteresisLearner:
     # Removed async_save() and async_load() methods
     # Storage is now handled by OffsetEngine via serialize_for_persistence() and restore_from_persistence()
     
+    @property
+    def generation(self) -> int:
+        """Counter that changes whenever the persisted patterns change."""
+        return self._generation
+    
     def get_pattern_count(self) -> int:
         """Get the number of learned patterns.
         
@@ -113,6 +113,18 @@ _LOGGER = logging.getLogger(__name__)
 # Minimum samples required for calibration completion
 MIN_SAMPLES_FOR_CALIBRATION = 10
 
+# Thermal persistence diagnostics (§10.8.1) are shown in the UI but kept out of
+# the recorder; thermal_data_age_hours alone changes on nearly every write
+THERMAL_PERSISTENCE_ATTRIBUTES = frozenset({
+    "thermal_data_last_saved",
+    "thermal_data_age_hours",
+    "thermal_state_restored",
+    "corruption_recovery_count",
+    "probe_history_count",
+    "tau_values_modified",
+    "thermal_persistence_version",
+})
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -439,6 +451,8 @@ class AccuracyCurrentSensor(SmartClimateDashboardSensor):
 class CalibrationStatusSensor(SmartClimateDashboardSensor):
     """Sensor for calibration phase status."""
     
+    _unrecorded_attributes = THERMAL_PERSISTENCE_ATTRIBUTES | {"last_sample"}
+    
     def __init__(
         self,
         coordinator,
@@ -504,6 +518,8 @@ class CalibrationStatusSensor(SmartClimateDashboardSensor):
 class HysteresisStateSensor(SmartClimateDashboardSensor):
     """Sensor for human-readable AC hysteresis state."""
     
+    _unrecorded_attributes = THERMAL_PERSISTENCE_ATTRIBUTES | {"start_samples", "stop_samples"}
+    
     def __init__(
         self,
         coordinator,
@@ -879,6 +895,8 @@ class SeasonalContributionSensor(SmartClimateDashboardSensor):
 class OutlierCountSensor(SmartClimateDashboardSensor):
     """Sensor for total count of outliers detected."""
     
+    _unrecorded_attributes = THERMAL_PERSISTENCE_ATTRIBUTES | {"last_detection_time"}
+    
     def __init__(
         self,
         coordinator,
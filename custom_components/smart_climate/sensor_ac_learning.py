@@ -23,7 +23,8 @@ _LOGGER = logging.getLogger(__name__)
 
 class SmartClimateDashboardSensor(SmartClimateSensorEntity):
     """Base class for Smart Climate dashboard sensors."""
-    pass
+    
+    _telemetry_group = "ac_learning"
     
     @property
     def should_poll(self) -> bool:
@@ -43,10 +44,6 @@ class SmartClimateDashboardSensor(SmartClimateSensorEntity):
                 self._handle_coordinator_update, self.entity_id
             )
         )
-    
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self.async_write_ha_state()
 
 
 class TemperatureWindowSensor(SmartClimateDashboardSensor):
@@ -18,7 +18,8 @@ _LOGGER = logging.getLogger(__name__)
 
 class SmartClimateDashboardSensor(SmartClimateSensorEntity):
     """Base class for Smart Climate dashboard sensors."""
-    pass
+    
+    _telemetry_group = "algorithm"
 
 
 class CorrelationCoefficientSensor(SmartClimateDashboardSensor):
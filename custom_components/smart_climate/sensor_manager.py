@@ -2,11 +2,15 @@
 Manages sensor state tracking and provides callbacks for state changes."""
 
 import logging
-from typing import Callable, Optional, List
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, List, Tuple
 
 from homeassistant.core import HomeAssistant, State
 from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
 from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util import dt as dt_util
+
+from .models import SensorSnapshot
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -40,19 +44,116 @@ class SensorManager:
         self._indoor_humidity_sensor_id = indoor_humidity_sensor_id
         self._outdoor_humidity_sensor_id = outdoor_humidity_sensor_id
         self._update_callbacks: List[Callable] = []
+        self._change_callbacks: List[Callable[[str], None]] = []
         self._remove_listeners: List[Callable] = []
         
+        # Parsed value per entity, keyed by the state's last_updated and raw value
+        self._parsed_states: Dict[str, Tuple[Any, str, float]] = {}
+        # Shared snapshot, kept while listening until a tracked sensor changes
+        self._snapshot: Optional[SensorSnapshot] = None
+        
+        # Role of each tracked entity, passed to change callbacks
+        self._sensor_roles: Dict[str, str] = {
+            entity_id: role
+            for role, entity_id in (
+                ("outdoor_humidity", outdoor_humidity_sensor_id),
+                ("indoor_humidity", indoor_humidity_sensor_id),
+                ("power", power_sensor_id),
+                ("outdoor", outdoor_sensor_id),
+                ("room", room_sensor_id),
+            )
+            if entity_id is not None
+        }
+        
         _LOGGER.debug(
             "SensorManager initialized with room=%s, outdoor=%s, power=%s, indoor_humidity=%s, outdoor_humidity=%s",
             room_sensor_id, outdoor_sensor_id, power_sensor_id, indoor_humidity_sensor_id, outdoor_humidity_sensor_id
         )
     
+    @property
+    def room_sensor_id(self) -> str:
+        """Return the entity ID of the room temperature sensor."""
+        return self._room_sensor_id
+    
+    @property
+    def outdoor_sensor_id(self) -> Optional[str]:
+        """Return the entity ID of the outdoor temperature sensor."""
+        return self._outdoor_sensor_id
+    
+    def get_snapshot(self) -> SensorSnapshot:
+        """Return the readings of all sensors as one consistent snapshot.
+        
+        While the state listeners run, the snapshot is shared by all callers
+        until a tracked sensor changes. Without listeners a change would go
+        unnoticed, so every call takes a fresh snapshot.
+        
+        Returns:
+            SensorSnapshot with the current readings
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self._take_snapshot()
+            if self._remove_listeners:
+                self._snapshot = snapshot
+        return snapshot
+    
+    def _take_snapshot(self) -> SensorSnapshot:
+        """Read every configured sensor once."""
+        room_temp = self._read_room_temperature()
+        outdoor_temp = self._read_outdoor_temperature()
+        power = self._read_power_consumption()
+        indoor_humidity = self._read_indoor_humidity()
+        outdoor_humidity = self._read_outdoor_humidity()
+        return SensorSnapshot(
+            taken_at=dt_util.utcnow(),
+            room_temp=room_temp,
+            outdoor_temp=outdoor_temp,
+            power=power,
+            indoor_humidity=indoor_humidity,
+            outdoor_humidity=outdoor_humidity,
+            room_updated=self._last_parsed_update(self._room_sensor_id, room_temp),
+            outdoor_updated=self._last_parsed_update(self._outdoor_sensor_id, outdoor_temp),
+            power_updated=self._last_parsed_update(self._power_sensor_id, power),
+            indoor_humidity_updated=self._last_parsed_update(
+                self._indoor_humidity_sensor_id, indoor_humidity
+            ),
+            outdoor_humidity_updated=self._last_parsed_update(
+                self._outdoor_humidity_sensor_id, outdoor_humidity
+            ),
+        )
+    
+    def _last_parsed_update(self, entity_id: Optional[str], value: Optional[float]) -> Optional[datetime]:
+        """Return last_updated of the state a reading was parsed from."""
+        if value is None or entity_id is None:
+            return None
+        cached = self._parsed_states.get(entity_id)
+        return cached[0] if cached else None
+    
+    def _parse_state(self, entity_id: str, state: State) -> float:
+        """Parse a numeric state, reusing the result while the state is unchanged.
+        
+        Raises:
+            ValueError, TypeError: The state is not numeric
+        """
+        cached = self._parsed_states.get(entity_id)
+        if cached is not None and cached[0] == state.last_updated and cached[1] == state.state:
+            return cached[2]
+        value = float(state.state)
+        self._parsed_states[entity_id] = (state.last_updated, state.state, value)
+        return value
+    
     def get_room_temperature(self) -> Optional[float]:
         """Get current room temperature from sensor.
         
         Returns:
             Temperature in degrees Celsius, or None if unavailable
         """
+        if self._remove_listeners:
+            return self.get_snapshot().room_temp
+        return self._read_room_temperature()
+    
+    def _read_room_temperature(self) -> Optional[float]:
+        """Read the sensor state, parsing it only when it changed."""
         try:
             state = self._hass.states.get(self._room_sensor_id)
             if state is None:
@@ -63,7 +164,7 @@ class SensorManager:
                 _LOGGER.debug("Room sensor unavailable: %s", self._room_sensor_id)
                 return None
             
-            temperature = float(state.state)
+            temperature = self._parse_state(self._room_sensor_id, state)
             return temperature
             
         except (ValueError, TypeError) as exc:
@@ -85,6 +186,12 @@ class SensorManager:
         Returns:
             Temperature in degrees Celsius, or None if unavailable or not configured
         """
+        if self._remove_listeners:
+            return self.get_snapshot().outdoor_temp
+        return self._read_outdoor_temperature()
+    
+    def _read_outdoor_temperature(self) -> Optional[float]:
+        """Read the sensor state, parsing it only when it changed."""
         if self._outdoor_sensor_id is None:
             return None
         
@@ -98,7 +205,7 @@ class SensorManager:
                 _LOGGER.debug("Outdoor sensor unavailable: %s", self._outdoor_sensor_id)
                 return None
             
-            temperature = float(state.state)
+            temperature = self._parse_state(self._outdoor_sensor_id, state)
             return temperature
             
         except (ValueError, TypeError) as exc:
@@ -120,6 +227,12 @@ class SensorManager:
         Returns:
             Power consumption in watts, or None if unavailable or not configured
         """
+        if self._remove_listeners:
+            return self.get_snapshot().power
+        return self._read_power_consumption()
+    
+    def _read_power_consumption(self) -> Optional[float]:
+        """Read the sensor state, parsing it only when it changed."""
         if self._power_sensor_id is None:
             return None
         
@@ -133,7 +246,7 @@ class SensorManager:
                 _LOGGER.debug("Power sensor unavailable: %s", self._power_sensor_id)
                 return None
             
-            power = float(state.state)
+            power = self._parse_state(self._power_sensor_id, state)
             _LOGGER.debug("Power consumption: %.1f W", power)
             return power
             
@@ -156,6 +269,12 @@ class SensorManager:
         Returns:
             Humidity percentage, or None if unavailable or not configured
         """
+        if self._remove_listeners:
+            return self.get_snapshot().indoor_humidity
+        return self._read_indoor_humidity()
+    
+    def _read_indoor_humidity(self) -> Optional[float]:
+        """Read the sensor state, parsing it only when it changed."""
         if self._indoor_humidity_sensor_id is None:
             _LOGGER.debug("Indoor humidity sensor ID is None - not configured")
             return None
@@ -170,7 +289,7 @@ class SensorManager:
                 _LOGGER.debug("Indoor humidity sensor unavailable: %s (state: %s)", self._indoor_humidity_sensor_id, state.state)
                 return None
             
-            humidity = float(state.state)
+            humidity = self._parse_state(self._indoor_humidity_sensor_id, state)
             _LOGGER.debug("Indoor humidity retrieved: %.2f%% from %s", humidity, self._indoor_humidity_sensor_id)
             return humidity
             
@@ -193,6 +312,12 @@ class SensorManager:
         Returns:
             Humidity percentage, or None if unavailable or not configured
         """
+        if self._remove_listeners:
+            return self.get_snapshot().outdoor_humidity
+        return self._read_outdoor_humidity()
+    
+    def _read_outdoor_humidity(self) -> Optional[float]:
+        """Read the sensor state, parsing it only when it changed."""
         if self._outdoor_humidity_sensor_id is None:
             _LOGGER.debug("Outdoor humidity sensor ID is None - not configured")
             return None
@@ -207,7 +332,7 @@ class SensorManager:
                 _LOGGER.debug("Outdoor humidity sensor unavailable: %s (state: %s)", self._outdoor_humidity_sensor_id, state.state)
                 return None
             
-            humidity = float(state.state)
+            humidity = self._parse_state(self._outdoor_humidity_sensor_id, state)
             _LOGGER.debug("Outdoor humidity retrieved: %.2f%% from %s", humidity, self._outdoor_humidity_sensor_id)
             return humidity
             
@@ -234,6 +359,26 @@ class SensorManager:
             self._update_callbacks.append(callback)
             _LOGGER.debug("Registered sensor update callback: %s", callback)
     
+    def register_change_callback(self, callback: Callable[[str], None]) -> Callable[[], None]:
+        """Register callback receiving the role of the sensor that changed.
+        
+        Roles are "room", "outdoor", "power", "indoor_humidity" and
+        "outdoor_humidity".
+        
+        Args:
+            callback: Function called with the role on each state change
+            
+        Returns:
+            Function that unregisters the callback
+        """
+        self._change_callbacks.append(callback)
+        
+        def _unregister() -> None:
+            if callback in self._change_callbacks:
+                self._change_callbacks.remove(callback)
+        
+        return _unregister
+    
     async def start_listening(self) -> None:
         """Start listening to sensor state changes."""
         _LOGGER.debug("Starting sensor state listeners")
@@ -300,8 +445,9 @@ class SensorManager:
             except Exception as exc:
                 _LOGGER.warning("Error removing sensor listener: %s", exc)
         
-        # Clear the listeners list
+        # Clear the listeners list; the snapshot can no longer be kept current
         self._remove_listeners.clear()
+        self._snapshot = None
         
         _LOGGER.info("Stopped all sensor listeners")
     
@@ -317,6 +463,7 @@ class SensorManager:
         entity_id = event.data.get('entity_id')
         old_state = event.data.get('old_state')
         new_state = event.data.get('new_state')
+        self._snapshot = None  # Take a new snapshot on the next read
         
         _LOGGER.debug(
             "Sensor state changed: %s from %s to %s",
@@ -334,4 +481,19 @@ class SensorManager:
                 _LOGGER.error(
                     "Error calling sensor update callback %s: %s",
                     callback, exc
-                )
\ No newline at end of file
+                )
+        
+        # Notify change callbacks only when the reading itself changed
+        role = self._sensor_roles.get(entity_id)
+        if role is None or not self._change_callbacks:
+            return
+        if old_state is not None and new_state is not None and old_state.state == new_state.state:
+            return
+        for callback in list(self._change_callbacks):
+            try:
+                callback(role)
+            except Exception as exc:
+                _LOGGER.error(
+                    "Error calling sensor change callback %s: %s",
+                    callback, exc
+                )
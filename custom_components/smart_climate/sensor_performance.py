@@ -1,6 +1,6 @@
 """Performance analytics sensors for Smart Climate."""
 
-from typing import Optional
+from typing import Any, Dict, Optional
 from homeassistant.components.sensor import (
     SensorEntity,
     SensorEntityDescription,
@@ -21,7 +21,8 @@ from .entity import SmartClimateSensorEntity
 
 class SmartClimateDashboardSensor(SmartClimateSensorEntity):
     """Base class for Smart Climate dashboard sensors."""
-    pass
+    
+    _telemetry_group = "performance"
     
     @property
     def should_poll(self) -> bool:
@@ -42,10 +43,6 @@ class SmartClimateDashboardSensor(SmartClimateSensorEntity):
             )
         )
     
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self.async_write_ha_state()
-    
     def get_coordinator_value(self, key_path: tuple, value_processor=None):
         """Helper method to get value from coordinator data with key path and optional processing."""
         if self.coordinator.data is None:
@@ -75,6 +72,9 @@ class SmartClimateDashboardSensor(SmartClimateSensorEntity):
 class PredictionLatencySensor(SmartClimateDashboardSensor):
     """Sensor for prediction latency in milliseconds."""
     
+    # Per-stage latency breakdown changes every refresh and is only useful live
+    _unrecorded_attributes = frozenset({"hot_path_latency_ms"})
+    
     def __init__(self, coordinator, base_entity_id: str, config_entry: ConfigEntry):
         """Initialize the sensor."""
         super().__init__(coordinator, base_entity_id, "prediction_latency", config_entry)
@@ -93,6 +93,22 @@ class PredictionLatencySensor(SmartClimateDashboardSensor):
             lambda x: round(float(x), 1) if x is not None else None
         )
         return value
+    
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return tail latencies and the per-stage hot path breakdown."""
+        performance = self.get_coordinator_value(("performance",))
+        if not isinstance(performance, dict):
+            return {}
+        return {
+            key: performance[key]
+            for key in (
+                "prediction_latency_p95_ms",
+                "prediction_latency_p99_ms",
+                "hot_path_latency_ms",
+            )
+            if key in performance
+        }
 
 
 class EnergyEfficiencySensor(SmartClimateDashboardSensor):
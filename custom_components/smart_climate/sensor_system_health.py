@@ -6,7 +6,8 @@ provide insights into the integration's operational status.
 
 Sensors included:
 1. MemoryUsageSensor - Memory consumption in KiB
-2. PersistenceLatencySensor - Database write latency in milliseconds
+2. PersistenceLatencySensor - Database write latency in milliseconds, with writer
+   queue and startup restore timings as attributes
 3. SamplesPerDaySensor - Learning sample collection rate
 4. ConvergenceTrendSensor - ML model convergence status with caching
 5. OutlierDetectionSensor - Outlier detection system status
@@ -24,7 +25,7 @@ Key Features:
 """
 
 import logging
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from homeassistant.components.sensor import (
     SensorEntity,
@@ -45,7 +46,8 @@ _LOGGER = logging.getLogger(__name__)
 
 class SmartClimateDashboardSensor(SmartClimateSensorEntity):
     """Base class for Smart Climate dashboard sensors."""
-    pass
+    
+    _telemetry_group = "system_health"
 
 
 class MemoryUsageSensor(SmartClimateDashboardSensor):
@@ -111,6 +113,29 @@ class PersistenceLatencySensor(SmartClimateDashboardSensor):
         except (AttributeError, TypeError):
             return None
 
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return shared writer and startup restore metrics."""
+        if not self.coordinator.data:
+            return {}
+
+        try:
+            system_health = self.coordinator.data.get("system_health", {})
+            return {
+                key: system_health[key]
+                for key in (
+                    "persistence_queue_depth",
+                    "persistence_batch_latency_ms",
+                    "restore_phase_one_ms",
+                    "restore_phase_two_ms",
+                    "restore_phase_two_max_step_ms",
+                    "learning_hydrated",
+                )
+                if key in system_health
+            }
+        except (AttributeError, TypeError):
+            return {}
+
 
 class OutlierDetectionSensor(SmartClimateDashboardSensor):
     """Sensor for outlier detection status (binary sensor showing on/off text)."""
@@ -50,6 +50,8 @@ _LOGGER = logging.getLogger(__name__)
 class SmartClimateThermalSensor(SmartClimateSensorEntity):
     """Base class for Smart Climate thermal sensors."""
     
+    _telemetry_group = "thermal"
+    
     def _get_thermal_components(self) -> Optional[Dict[str, Any]]:
         """Get thermal components for this entity from hass.data."""
         try:
@@ -497,6 +499,9 @@ class AdjustedComfortBandSensor(SmartClimateThermalSensor):
 class LastProbeResultSensor(SmartClimateThermalSensor):
     """Sensor for last probe result status (disabled by default)."""
     
+    # Probe details stay visible in the UI; history keeps tau and confidence
+    _unrecorded_attributes = frozenset({"duration_seconds", "fit_quality", "aborted", "time_saved_seconds"})
+    
     def __init__(
         self,
         coordinator,
@@ -510,6 +515,15 @@ class LastProbeResultSensor(SmartClimateThermalSensor):
         self._attr_entity_category = EntityCategory.DIAGNOSTIC
         self._attr_entity_registry_enabled_default = False
     
+    @staticmethod
+    def _get_last_probe_result(thermal_components: Dict[str, Any]) -> Any:
+        """Return the last probe result from the probe manager, else the thermal manager."""
+        probe_manager = thermal_components.get("probe_manager")
+        if probe_manager and hasattr(probe_manager, 'get_last_probe_result'):
+            return probe_manager.get_last_probe_result()
+        thermal_manager = thermal_components.get("thermal_manager")
+        return getattr(thermal_manager, 'last_probe_result', None) if thermal_manager else None
+    
     @property
     def native_value(self) -> Optional[str]:
         """Return the last probe result status."""
@@ -522,24 +536,21 @@ class LastProbeResultSensor(SmartClimateThermalSensor):
             if not probe_manager:
                 return "No Probe Manager"
             
-            # Get the most recent probe result
-            # This would need to be implemented in probe_manager
-            if hasattr(probe_manager, 'get_last_probe_result'):
-                last_result = probe_manager.get_last_probe_result()
-                if last_result:
-                    if hasattr(last_result, 'aborted') and last_result.aborted:
-                        return "Aborted"
-                    elif hasattr(last_result, 'confidence'):
-                        if last_result.confidence > 0.8:
-                            return "Success"
-                        elif last_result.confidence > 0.5:
-                            return "Partial"
-                        else:
-                            return "Poor Quality"
+            last_result = self._get_last_probe_result(thermal_components)
+            if last_result:
+                if hasattr(last_result, 'aborted') and last_result.aborted:
+                    return "Aborted"
+                elif hasattr(last_result, 'confidence'):
+                    if last_result.confidence > 0.8:
+                        return "Success"
+                    elif last_result.confidence > 0.5:
+                        return "Partial"
                     else:
-                        return "Unknown"
+                        return "Poor Quality"
                 else:
-                    return "No Results"
+                    return "Unknown"
+            if hasattr(probe_manager, 'get_last_probe_result') or thermal_components.get("thermal_manager"):
+                return "No Results"
             return "Not Available"
         except (AttributeError, TypeError):
             return "Error"
@@ -552,11 +563,7 @@ class LastProbeResultSensor(SmartClimateThermalSensor):
             return {}
         
         try:
-            probe_manager = thermal_components.get("probe_manager")
-            if not probe_manager or not hasattr(probe_manager, 'get_last_probe_result'):
-                return {}
-            
-            last_result = probe_manager.get_last_probe_result()
+            last_result = self._get_last_probe_result(thermal_components)
             if not last_result:
                 return {}
             
@@ -573,6 +580,12 @@ class LastProbeResultSensor(SmartClimateThermalSensor):
             if hasattr(last_result, 'aborted'):
                 attributes['aborted'] = last_result.aborted
             
+            # Probe time saved by stopping on a converged tau estimate
+            thermal_manager = thermal_components.get("thermal_manager")
+            time_saved = getattr(thermal_manager, 'last_probe_time_saved_seconds', None)
+            if isinstance(time_saved, (int, float)):
+                attributes['time_saved_seconds'] = round(float(time_saved))
+            
             return attributes
         except (AttributeError, TypeError):
             return {}
@@ -3,13 +3,14 @@ Coordinates thermal states, operating window calculations, and AC control decisi
 
 import logging
 from abc import ABC, abstractmethod
-from typing import Dict, Tuple, Optional, Any, Callable
+from typing import Dict, List, Tuple, Optional, Any, Callable
 from datetime import datetime, timedelta, timezone, time
 from homeassistant.core import HomeAssistant
 
-from .thermal_models import ThermalState, ThermalConstants
+from .thermal_models import ThermalState, ThermalConstants, ProbeResult
 from .thermal_preferences import UserPreferences
 from .thermal_model import PassiveThermalModel
+from .thermal_two_node import TwoNodeThermalModel
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -106,6 +107,9 @@ class ThermalManager:
         self._setpoint = 24.0  # Default setpoint
         self._last_transition: Optional[datetime] = None
         self._last_probe_time: Optional[datetime] = None  # Track when last probe occurred
+        self.last_probe_result: Optional[ProbeResult] = None  # Set by ProbeState on completion
+        self.last_probe_time_saved_seconds: float = 0.0  # Probe time saved by early stopping
+        self._last_outdoor_temp: Optional[float] = None  # Asymptote for drift traces
         
         # ProbeScheduler integration for intelligent probe scheduling (v1.5.3-beta)
         self.probe_scheduler = probe_scheduler
@@ -504,7 +508,7 @@ class ThermalManager:
                 _LOGGER.debug("Serializing enhanced priming data: phase=%s, drift_state=%s, drift_attempted=%s",
                             priming_data['current_phase'], priming_data['controlled_drift_state'], priming_data['controlled_drift_attempted'])
 
-        return {
+        data = {
             "version": "2.1",  # Updated for probe scheduler support
             "state": {
                 "current_state": self._current_state.value,
@@ -532,6 +536,12 @@ class ThermalManager:
             }
         }
 
+        # Two-node drift statistics; without them the model relearns from scratch
+        if isinstance(self._model, TwoNodeThermalModel):
+            data["two_node_model"] = self._model.serialize_two_node_state()
+
+        return data
+
     def _restore_probe_scheduler_config(self, config_data: Dict[str, Any]) -> None:
         """Restore probe scheduler configuration.
         
@@ -877,6 +887,11 @@ class ThermalManager:
                     _LOGGER.debug("Invalid confidence %.2f, model will calculate", confidence)
                     self._corruption_recovery_count += 1
 
+            # Restore two-node drift statistics (optional, absent for single-tau models)
+            if "two_node_model" in data and isinstance(self._model, TwoNodeThermalModel):
+                if not self._model.restore_two_node_state(data["two_node_model"]):
+                    self._corruption_recovery_count += 1
+
             # Restore probe scheduler configuration (v2.1+ feature)
             if "probe_scheduler_config" in data:
                 self._restore_probe_scheduler_config(data["probe_scheduler_config"])
@@ -937,6 +952,9 @@ class ThermalManager:
         _LOGGER.debug("ThermalManager.update_state() called - current state: %s", self._current_state.value)
         
         try:
+            if outdoor_temp is not None:
+                self._last_outdoor_temp = outdoor_temp
+            
             # Log current conditions for debugging
             current_time = datetime.now()
             _LOGGER.debug("Thermal state check - state: %s, last_transition: %s",
@@ -1071,6 +1089,7 @@ class ThermalManager:
                 return
                 
             _LOGGER.debug("Found drift event with %d data points for passive analysis", len(drift_data))
+            self.observe_drift_event(drift_data, outdoor_temp)
             
             # Analyze drift data using thermal_utils with outdoor temperature
             from .thermal_utils import analyze_drift_data
@@ -1109,6 +1128,27 @@ class ThermalManager:
         except Exception as e:
             _LOGGER.error("Error in passive learning handler: %s", e)
 
+    def observe_drift_event(
+        self,
+        drift_data: List[Tuple[float, float]],
+        outdoor_temp: Optional[float] = None
+    ) -> None:
+        """Pass a drift trace to thermal models that learn from whole traces.
+        
+        Args:
+            drift_data: (timestamp seconds, temperature) readings with the HVAC off
+            outdoor_temp: Outdoor temperature during the drift; defaults to the last known
+        """
+        observe = getattr(self._model, 'observe_drift', None)
+        if observe is None:
+            return
+        if outdoor_temp is None:
+            outdoor_temp = self._last_outdoor_temp
+        try:
+            observe(drift_data, outdoor_temp)
+        except Exception as e:
+            _LOGGER.debug("Could not learn drift modes from drift event: %s", e)
+
     def update_temperature(self, temperature: float, ac_state: str) -> None:
         """Update stability detector with current temperature and AC state.
         
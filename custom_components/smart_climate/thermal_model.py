@@ -2,11 +2,20 @@
 # ABOUTME: Implements exponential temperature drift using dual tau constants
 
 import math
-from typing import List, Optional
+from array import array
+from bisect import bisect_right
+from typing import Iterable, List, Optional, Sequence, Tuple
 from dataclasses import dataclass, field
-from collections import deque
+from collections import OrderedDict, deque
 from datetime import datetime, timezone
 
+import numpy as np
+
+SECONDS_PER_DAY = 86400.0
+
+# Drift curves kept for reuse; a control tick asks for a handful at most
+DRIFT_CURVE_CACHE_SIZE = 16
+
 
 @dataclass(frozen=True)
 class ProbeResult:
@@ -33,6 +42,178 @@ class ProbeResult:
     outdoor_temp: Optional[float] = field(default=None)
 
 
+class ProbeHistoryStats:
+    """Incrementally maintained aggregates over the probe history.
+
+    Mirrors the probe deque in fixed-size arrays holding epoch timestamps,
+    confidence weights, tau values and outdoor temperature bins, so
+    appends and evictions never touch datetimes.
+
+    The decay-weighted sums are kept relative to the newest probe time.
+    Decay factors out of every term as D ** (elapsed_days), so moving the
+    reference forward rescales both sums by one multiplier. The weighted
+    tau is their ratio, where the common factor for "now" cancels.
+    """
+
+    def __init__(
+        self,
+        capacity: Optional[int],
+        decay_rate: float,
+        bin_edges: Sequence[float],
+    ) -> None:
+        """Initialize empty aggregates.
+
+        Args:
+            capacity: Maximum entries before the oldest is evicted (None for unbounded)
+            decay_rate: Daily decay multiplier applied to probe weights
+            bin_edges: Outdoor temperature bin boundaries used for diversity
+        """
+        self._capacity = capacity
+        self._log_decay_per_second = math.log(decay_rate) / SECONDS_PER_DAY
+        self._bin_edges = list(bin_edges)
+        self._total_bins = len(self._bin_edges) + 1
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop all entries and reset the sums."""
+        self._epochs = array("d")
+        self._weights = array("d")
+        self._taus = array("d")
+        self._bins = array("i")  # -1 when outdoor_temp is unknown
+        self._timestamps: List[datetime] = []
+        self._head = 0  # Slot of the oldest entry once the ring is full
+        self._reference: Optional[float] = None
+        self._weighted_tau_sum = 0.0
+        self._weight_sum = 0.0
+        self._evictions_since_resum = 0
+        self._bin_counts = [0] * self._total_bins
+        self._covered_bins = 0
+        self._latest_slot: Optional[int] = None
+
+    @property
+    def count(self) -> int:
+        """Return the number of entries held."""
+        return len(self._epochs)
+
+    def bin_index(self, temperature: float) -> int:
+        """Return the outdoor temperature bin of a temperature."""
+        return bisect_right(self._bin_edges, temperature)
+
+    def rebuild(self, probes: Iterable) -> None:
+        """Recompute every aggregate from an iterable of probes in history order."""
+        self.clear()
+        for probe in probes:
+            self.append(probe)
+
+    def append(self, probe) -> None:
+        """Add a probe, evicting the oldest entry when at capacity."""
+        epoch = probe.timestamp.timestamp()
+        weight = probe.confidence if probe.confidence is not None else 1.0
+        tau = probe.tau_value
+        bin_index = self.bin_index(probe.outdoor_temp) if probe.outdoor_temp is not None else -1
+
+        if self._capacity is not None and self.count >= self._capacity:
+            if self._capacity <= 0:
+                return
+            slot = self._head
+            self._remove_slot(slot)
+            self._epochs[slot] = epoch
+            self._weights[slot] = weight
+            self._taus[slot] = tau
+            self._bins[slot] = bin_index
+            self._timestamps[slot] = probe.timestamp
+            self._head = (slot + 1) % self._capacity
+        else:
+            slot = self.count
+            self._epochs.append(epoch)
+            self._weights.append(weight)
+            self._taus.append(tau)
+            self._bins.append(bin_index)
+            self._timestamps.append(probe.timestamp)
+
+        self._add_to_sums(epoch, weight, tau)
+        if bin_index >= 0:
+            self._bin_counts[bin_index] += 1
+            if self._bin_counts[bin_index] == 1:
+                self._covered_bins += 1
+        if self._latest_slot is None or epoch >= self._epochs[self._latest_slot]:
+            self._latest_slot = slot
+
+        # Subtracting evicted terms accumulates rounding error; resumming
+        # once per capacity evictions keeps it bounded at amortized O(1)
+        if self._evictions_since_resum >= (self._capacity or 0) > 0:
+            self._resum()
+
+    def weighted_tau(self) -> Optional[float]:
+        """Return the decay and confidence weighted mean tau, or None without weight."""
+        if self._weight_sum <= 0.0:
+            return None
+        return self._weighted_tau_sum / self._weight_sum
+
+    def diversity_score(self) -> float:
+        """Return the fraction of outdoor temperature bins covered."""
+        return self._covered_bins / self._total_bins
+
+    def latest_timestamp(self) -> Optional[datetime]:
+        """Return the newest probe timestamp, or None when empty."""
+        if self._latest_slot is None:
+            return None
+        return self._timestamps[self._latest_slot]
+
+    def _add_to_sums(self, epoch: float, weight: float, tau: float) -> None:
+        """Add one term, moving the reference forward when the probe is newer."""
+        if self._reference is None:
+            self._reference = epoch
+        elif epoch > self._reference:
+            shift = math.exp(self._log_decay_per_second * (epoch - self._reference))
+            self._weighted_tau_sum *= shift
+            self._weight_sum *= shift
+            self._reference = epoch
+        term = weight * math.exp(self._log_decay_per_second * (self._reference - epoch))
+        self._weighted_tau_sum += tau * term
+        self._weight_sum += term
+
+    def _remove_slot(self, slot: int) -> None:
+        """Take the entry in a slot out of the sums and bin counts."""
+        term = self._weights[slot] * math.exp(
+            self._log_decay_per_second * (self._reference - self._epochs[slot])
+        )
+        self._weighted_tau_sum -= self._taus[slot] * term
+        self._weight_sum -= term
+        self._evictions_since_resum += 1
+        if self._weight_sum <= term * 1e-6:
+            # Cancellation left only rounding noise; resum after this append
+            self._evictions_since_resum = self._capacity or 0
+
+        bin_index = self._bins[slot]
+        if bin_index >= 0:
+            self._bin_counts[bin_index] -= 1
+            if self._bin_counts[bin_index] == 0:
+                self._covered_bins -= 1
+
+        if self._latest_slot == slot:
+            self._latest_slot = None
+            newest = None
+            for index, epoch in enumerate(self._epochs):
+                if index != slot and (newest is None or epoch >= newest):
+                    newest = epoch
+                    self._latest_slot = index
+
+    def _resum(self) -> None:
+        """Recompute the weighted sums from the stored arrays."""
+        reference = max(self._epochs)
+        weighted_tau_sum = 0.0
+        weight_sum = 0.0
+        for epoch, weight, tau in zip(self._epochs, self._weights, self._taus):
+            term = weight * math.exp(self._log_decay_per_second * (reference - epoch))
+            weighted_tau_sum += tau * term
+            weight_sum += term
+        self._reference = reference
+        self._weighted_tau_sum = weighted_tau_sum
+        self._weight_sum = weight_sum
+        self._evictions_since_resum = 0
+
+
 class PassiveThermalModel:
     """
     Passive thermal model using RC circuit physics.
@@ -51,12 +232,26 @@ class PassiveThermalModel:
             tau_cooling: Time constant for cooling (minutes)
             tau_warming: Time constant for warming (minutes)
         """
-        from .const import MAX_PROBE_HISTORY_SIZE
+        from .const import MAX_PROBE_HISTORY_SIZE, DECAY_RATE_PER_DAY
+        # Import here to avoid circular imports
+        from .probe_scheduler import OUTDOOR_TEMP_BINS
         
         self._tau_cooling = tau_cooling
         self._tau_warming = tau_warming
         self._probe_history: deque = deque(maxlen=MAX_PROBE_HISTORY_SIZE)
         self._tau_last_modified: Optional[datetime] = None
+        self._decay_rate = DECAY_RATE_PER_DAY
+        self._temp_bins = list(OUTDOOR_TEMP_BINS)
+        self._probe_stats = ProbeHistoryStats(
+            MAX_PROBE_HISTORY_SIZE, self._decay_rate, self._temp_bins
+        )
+        # Identity of the history the stats mirror; other components
+        # replace or mutate _probe_history directly, so this is checked
+        # before every read and triggers a rebuild on mismatch
+        self._stats_source = None
+        self._stats_first = None
+        self._stats_last = None
+        self._drift_curve_cache: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
         
     def predict_drift(
         self, 
@@ -102,11 +297,106 @@ class PassiveThermalModel:
         temperature_change = (outdoor - current) * decay_factor
         
         return current + temperature_change
+
+    def predict_drift_curve(
+        self,
+        current: float,
+        outdoor_series: Sequence[float],
+        minutes_grid: Sequence[float],
+        is_cooling: bool,
+        step_minutes: float = 60.0,
+    ) -> np.ndarray:
+        """
+        Predict the passive drift trajectory under a time-varying outdoor forecast.
+        
+        The outdoor temperature is held constant over each forecast step
+        (hourly by default) and the RC model is integrated piecewise: within
+        step k starting at temperature T_k,
+        T(t) = O_k + (T_k - O_k) * exp(-(t - t_k)/tau). Times past the end of
+        the series keep the last outdoor value. With a constant series the
+        result equals predict_drift() at every grid point.
+        
+        Results are cached on (drift modes, inputs), so repeated calls within
+        a control tick return the same read-only array.
+        
+        Args:
+            current: Current indoor temperature (°C)
+            outdoor_series: Outdoor temperatures, one per step starting now (°C)
+            minutes_grid: Minutes from now at which to evaluate the trajectory
+            is_cooling: True if cooling scenario, False if warming
+            step_minutes: Duration of each outdoor series step in minutes
+            
+        Returns:
+            Predicted indoor temperatures, one per grid point (°C)
+            
+        Raises:
+            ValueError: If the series is empty, the step is not positive or
+                any grid time is negative
+        """
+        modes = self._drift_modes(is_cooling)
+        key = (
+            modes,
+            float(current),
+            tuple(float(value) for value in outdoor_series),
+            tuple(float(value) for value in minutes_grid),
+            float(step_minutes),
+        )
+        cached = self._drift_curve_cache.get(key)
+        if cached is not None:
+            self._drift_curve_cache.move_to_end(key)
+            return cached
+
+        outdoor = np.asarray(key[2], dtype=float)
+        minutes = np.asarray(key[3], dtype=float)
+        if outdoor.size == 0:
+            raise ValueError("Outdoor series cannot be empty")
+        if step_minutes <= 0:
+            raise ValueError("Step duration must be positive")
+        if minutes.size and minutes.min() < 0:
+            raise ValueError("Time duration cannot be negative")
+
+        curve = sum(
+            weight * self._piecewise_drift(tau, current, outdoor, minutes, step_minutes)
+            for tau, weight in modes
+        )
+        curve.setflags(write=False)
+
+        self._drift_curve_cache[key] = curve
+        if len(self._drift_curve_cache) > DRIFT_CURVE_CACHE_SIZE:
+            self._drift_curve_cache.popitem(last=False)
+        return curve
+
+    def _drift_modes(self, is_cooling: bool) -> Tuple[Tuple[float, float], ...]:
+        """Return the (tau, weight) drift modes used for predictions; weights sum to 1."""
+        tau = self._tau_cooling if is_cooling else self._tau_warming
+        return ((tau, 1.0),)
+
+    @staticmethod
+    def _piecewise_drift(
+        tau: float,
+        current: float,
+        outdoor: np.ndarray,
+        minutes: np.ndarray,
+        step_minutes: float,
+    ) -> np.ndarray:
+        """Integrate one first-order drift mode over a piecewise constant outdoor series."""
+        # Temperatures at step boundaries: T_{k+1} = a*T_k + (1 - a)*O_k,
+        # unrolled as T_k = a^k*T_0 + (1 - a)*sum_{j<k} a^(k-1-j)*O_j
+        steps = outdoor.size
+        step_decay = math.exp(-step_minutes / tau)
+        index = np.arange(steps)
+        lag = index[:, None] - index[None, :] - 1
+        weights = np.where(lag >= 0, step_decay ** np.maximum(lag, 0), 0.0)
+        boundaries = step_decay ** index * current + (1.0 - step_decay) * weights @ outdoor
+
+        # Evaluate each grid time from the boundary of its step
+        step_index = np.minimum((minutes // step_minutes).astype(int), steps - 1)
+        offset = minutes - step_index * step_minutes
+        segment_outdoor = outdoor[step_index]
+        return segment_outdoor + (boundaries[step_index] - segment_outdoor) * np.exp(-offset / tau)
     
     def get_confidence(self) -> float:
         """Confidence based on count AND diversity."""
-        import math
-        
         if not self._probe_history:
             return 0.0
             
@@ -126,25 +416,11 @@ class PassiveThermalModel:
         Returns:
             Diversity score as ratio of covered bins to total bins (0.0-1.0)
         """
-        # Import here to avoid circular imports
-        from .probe_scheduler import OUTDOOR_TEMP_BINS
-        
         if not self._probe_history:
             return 0.0
             
-        # Count unique temperature bins represented in probe history
-        covered_bins = set()
-        
-        for probe in self._probe_history:
-            if probe.outdoor_temp is not None:
-                bin_index = self._get_temperature_bin_index(probe.outdoor_temp)
-                covered_bins.add(bin_index)
-        
-        # Total possible bins (including below first and above last)
-        total_bins = len(OUTDOOR_TEMP_BINS) + 1
-        
-        # Return ratio of covered bins to total bins
-        return len(covered_bins) / total_bins if total_bins > 0 else 0.0
+        # Covered bins are counted incrementally as probes enter and leave
+        return self._synced_probe_stats().diversity_score()
     
     def _get_temperature_bin_index(self, temperature: float) -> int:
         """Get temperature bin index for given temperature.
@@ -155,20 +431,8 @@ class PassiveThermalModel:
         Returns:
             Bin index (0-based)
         """
-        # Import here to avoid circular imports
-        from .probe_scheduler import OUTDOOR_TEMP_BINS
-        
-        # Below first bin
-        if temperature < OUTDOOR_TEMP_BINS[0]:
-            return 0
-        
-        # Find appropriate bin
-        for i, boundary in enumerate(OUTDOOR_TEMP_BINS):
-            if temperature < boundary:
-                return i
-                
-        # Above last bin
-        return len(OUTDOOR_TEMP_BINS)
+        # Below the first boundary is bin 0, above the last is len(bins)
+        return bisect_right(self._temp_bins, temperature)
 
     
     def get_probe_count(self) -> int:
@@ -195,7 +459,7 @@ class PassiveThermalModel:
         """
         if not self._probe_history:
             return None
-        return max(probe.timestamp for probe in self._probe_history)
+        return self._synced_probe_stats().latest_timestamp()
     
     def add_probe_result(self, probe_result: ProbeResult) -> None:
         """Add probe result to history (for testing/external integration).
@@ -209,7 +473,7 @@ class PassiveThermalModel:
         if not isinstance(probe_result, ProbeResult):
             raise TypeError(f"Expected ProbeResult, got {type(probe_result)}")
         
-        self._probe_history.append(probe_result)
+        self._append_probe(probe_result)
         
         # Update last modified timestamp when probe added
         self._tau_last_modified = datetime.now(timezone.utc)
@@ -223,39 +487,54 @@ class PassiveThermalModel:
             Datetime when tau values were last modified, or None if never modified
         """
         return self._tau_last_modified
+
+    def _synced_probe_stats(self) -> ProbeHistoryStats:
+        """Return the probe aggregates, rebuilding them if the history changed externally."""
+        history = self._probe_history
+        stats = self._probe_stats
+        in_sync = (
+            history is self._stats_source
+            and len(history) == stats.count
+            and (not history or (history[0] is self._stats_first and history[-1] is self._stats_last))
+        )
+        if not in_sync:
+            capacity = getattr(history, "maxlen", None)
+            if capacity != stats._capacity:
+                stats = self._probe_stats = ProbeHistoryStats(
+                    capacity, self._decay_rate, self._temp_bins
+                )
+            stats.rebuild(history)
+            self._mark_stats_synced()
+        return stats
+
+    def _mark_stats_synced(self) -> None:
+        """Remember which history the aggregates currently mirror."""
+        history = self._probe_history
+        self._stats_source = history
+        self._stats_first = history[0] if history else None
+        self._stats_last = history[-1] if history else None
+
+    def _append_probe(self, probe_result: ProbeResult) -> None:
+        """Append a probe to history and update the aggregates in O(1)."""
+        stats = self._synced_probe_stats()
+        self._probe_history.append(probe_result)
+        stats.append(probe_result)
+        self._mark_stats_synced()
     
     def _calculate_weighted_tau(self, is_cooling: bool) -> float:
-        """Calculate weighted tau using exponential decay based on probe age."""
-        from datetime import datetime, timezone
-        from .const import DECAY_RATE_PER_DAY
-        
+        """Calculate weighted tau using exponential decay based on probe age.
+
+        Every probe weight shares the factor DECAY_RATE_PER_DAY ** days_since_newest,
+        so the weighted mean does not depend on the current time and is read
+        from sums maintained as probes are added.
+        """
         if not self._probe_history:
             return self._tau_cooling if is_cooling else self._tau_warming
         
-        now = datetime.now(timezone.utc)
-        total_weighted_value = 0.0
-        total_weight = 0.0
-        
-        for probe in self._probe_history:
-            # Calculate age in days
-            age_days = (now - probe.timestamp).total_seconds() / 86400
-            
-            # Apply exponential decay
-            time_weight = DECAY_RATE_PER_DAY ** age_days
-            
-            # Apply confidence weight (default to 1.0 if None)
-            confidence_weight = probe.confidence if probe.confidence is not None else 1.0
-            
-            # Combined weight
-            final_weight = time_weight * confidence_weight
-            
-            total_weighted_value += probe.tau_value * final_weight
-            total_weight += final_weight
-        
-        if total_weight > 0:
-            return total_weighted_value / total_weight
-        else:
+        weighted_tau = self._synced_probe_stats().weighted_tau()
+        if weighted_tau is None:
             return self._tau_cooling if is_cooling else self._tau_warming
+        return weighted_tau
 
     def update_tau(self, probe_result: ProbeResult, is_cooling: bool) -> None:
         """
@@ -274,7 +553,7 @@ class PassiveThermalModel:
         original_tau_warming = self._tau_warming
         
         # Add to probe history (deque automatically handles maxlen=75)
-        self._probe_history.append(probe_result)
+        self._append_probe(probe_result)
         
         # Calculate new tau using exponential decay weighting
         new_tau = self._calculate_weighted_tau(is_cooling)
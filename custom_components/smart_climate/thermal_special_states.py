@@ -8,6 +8,14 @@ from typing import Optional, Dict, Any, List, Tuple, TYPE_CHECKING, Literal
 from .thermal_models import ThermalState, ProbeResult, ThermalConstants
 from .thermal_states import StateHandler
 from . import thermal_utils
+from .const import (
+    CONF_PROBE_EARLY_STOP,
+    CONF_PROBE_TAU_INTERVAL_WIDTH,
+    DEFAULT_PROBE_EARLY_STOP,
+    DEFAULT_PROBE_TAU_INTERVAL_WIDTH,
+    PROBE_EARLY_STOP_MIN_SECONDS,
+    PROBE_EARLY_STOP_MIN_READINGS,
+)
 
 if TYPE_CHECKING:
     from .thermal_manager import ThermalManager
@@ -35,6 +43,20 @@ def _trigger_persistence(context: "ThermalManager") -> None:
             _LOGGER.warning("Could not trigger persistence callback: %s", e)
 
 
+def _observe_drift(context: "ThermalManager", drift_data: List[Tuple[float, float]]) -> None:
+    """Helper function to pass a drift trace to trace-learning thermal models.
+    
+    Args:
+        context: ThermalManager instance
+        drift_data: (timestamp seconds, temperature) readings with the HVAC off
+    """
+    if hasattr(context, 'observe_drift_event'):
+        try:
+            context.observe_drift_event(drift_data)
+        except Exception as e:
+            _LOGGER.debug("Could not pass drift trace to thermal model: %s", e)
+
+
 class PrimingState(StateHandler):
     """Handler for PRIMING thermal state.
     
@@ -230,6 +252,7 @@ class PrimingState(StateHandler):
                 if drift_data:
                     _LOGGER.info("Found micro-drift event during PRIMING passive phase: %d points, %.1f minutes",
                                len(drift_data), (drift_data[-1][0] - drift_data[0][0]) / 60.0)
+                    _observe_drift(context, drift_data)
                     
                     # Analyze with lower confidence threshold for passive learning
                     probe_result = thermal_utils.analyze_drift_data(drift_data, is_passive=True)
@@ -248,6 +271,7 @@ class PrimingState(StateHandler):
                     if drift_data:
                         _LOGGER.debug("Found regular drift event during PRIMING passive phase: %d points, %.1f minutes",
                                     len(drift_data), (drift_data[-1][0] - drift_data[0][0]) / 60.0)
+                        _observe_drift(context, drift_data)
                         
                         # Analyze with lower confidence threshold for passive learning
                         probe_result = thermal_utils.analyze_drift_data(drift_data, is_passive=True)
@@ -663,6 +687,8 @@ class ProbeState(StateHandler):
     - Sends phone notifications during active learning
     - Supports abort capability returning to previous state
     - Transitions to CALIBRATING when probe completes successfully
+    - Stops before the minimum duration once the online tau estimate's
+      confidence interval is narrow enough (opt-in via probe_early_stop)
     """
     
     def __init__(self):
@@ -671,6 +697,7 @@ class ProbeState(StateHandler):
         self._probe_start_temp: Optional[float] = None
         self._previous_state: ThermalState = ThermalState.DRIFTING
         self._temperature_history: List[Tuple[float, float]] = []  # (timestamp, temperature)
+        self._tau_estimator = thermal_utils.OnlineTauEstimator()  # Times in minutes since probe start
 
     def execute(self, context: "ThermalManager", current_temp: float, operating_window: tuple[float, float]) -> Optional[ThermalState]:
         """Execute probing state logic and check for transitions.
@@ -707,6 +734,7 @@ class ProbeState(StateHandler):
             
             # Check if probe has run for minimum duration
             elapsed_time = (current_time - self._probe_start_time).total_seconds()
+            self._tau_estimator.add(elapsed_time / 60.0, current_temp)
             min_probe_duration = 1800  # 30 minutes default
             
             try:
@@ -715,8 +743,11 @@ class ProbeState(StateHandler):
             except (AttributeError, TypeError):
                 pass
             
+            # Stop early once the streaming tau estimate has converged
+            early_stop = elapsed_time < min_probe_duration and self._is_tau_converged(context, elapsed_time)
+            
             # Check if sufficient time has elapsed for meaningful data
-            if elapsed_time >= min_probe_duration:
+            if elapsed_time >= min_probe_duration or early_stop:
                 # Analyze temperature data using thermal_utils
                 probe_result = thermal_utils.analyze_drift_data(self._temperature_history)
                 
@@ -724,6 +755,14 @@ class ProbeState(StateHandler):
                     _LOGGER.info("Probe analysis successful after %.1f minutes: tau=%.1f, confidence=%.3f",
                                elapsed_time / 60.0, probe_result.tau_value, probe_result.confidence)
                     
+                    time_saved = max(0.0, min_probe_duration - elapsed_time)
+                    if early_stop:
+                        _LOGGER.info("Probe stopped early on converged tau estimate, saved %.1f minutes",
+                                   time_saved / 60.0)
+                    if hasattr(context, 'last_probe_time_saved_seconds'):
+                        context.last_probe_time_saved_seconds = time_saved
+                    _observe_drift(context, self._temperature_history)
+                    
                     # Update thermal model with probe result
                     if hasattr(context, '_model') and context._model:
                         # Determine cooling vs warming mode
@@ -743,6 +782,9 @@ class ProbeState(StateHandler):
                         context.last_probe_result = probe_result
                     
                     return ThermalState.CALIBRATING
+                elif early_stop:
+                    _LOGGER.debug("Early probe analysis failed with %d data points, continuing probe",
+                                  len(self._temperature_history))
                 else:
                     _LOGGER.warning("Probe analysis failed with %d data points, extending probe duration",
                                   len(self._temperature_history))
@@ -757,6 +799,30 @@ class ProbeState(StateHandler):
             _LOGGER.error("Error in ProbeState execute: %s", e)
             return self._previous_state  # Fail safe to previous state
 
+    def _is_tau_converged(self, context: "ThermalManager", elapsed_time: float) -> bool:
+        """Check whether the online tau estimate is precise enough to end the probe.
+        
+        Args:
+            context: ThermalManager instance providing the configuration
+            elapsed_time: Seconds since the probe started
+            
+        Returns:
+            True if early stopping is enabled and the tau interval is narrow enough
+        """
+        config = getattr(context, '_config', None)
+        if not isinstance(config, dict):
+            config = {}
+        if not config.get(CONF_PROBE_EARLY_STOP, DEFAULT_PROBE_EARLY_STOP):
+            return False
+        if (elapsed_time < PROBE_EARLY_STOP_MIN_SECONDS
+                or self._tau_estimator.count < PROBE_EARLY_STOP_MIN_READINGS):
+            return False
+        
+        max_width = config.get(CONF_PROBE_TAU_INTERVAL_WIDTH, DEFAULT_PROBE_TAU_INTERVAL_WIDTH)
+        width = self._tau_estimator.relative_interval_width()
+        _LOGGER.debug("Online tau interval width %.3f (stop at %.3f)", width, max_width)
+        return width <= max_width
+
     def is_within_probe_drift(self, context: "ThermalManager") -> bool:
         """Check if current temperature is within allowed probe drift.
         
@@ -840,6 +906,7 @@ class ProbeState(StateHandler):
         self._probe_start_time = datetime.now()
         self._probe_start_temp = getattr(context, 'current_temp', None)
         self._temperature_history = []  # Reset temperature history for new probe
+        self._tau_estimator = thermal_utils.OnlineTauEstimator()
         
         # Send notification about probe start if service available
         try:
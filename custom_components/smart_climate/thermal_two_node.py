@@ -0,0 +1,367 @@
+"""ABOUTME: Optional second-order (air + thermal mass) passive drift model.
+Learns fast and slow drift modes online from drift traces and keeps the single-tau model until both are supported."""
+
+import base64
+import binascii
+import logging
+import math
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .thermal_model import PassiveThermalModel
+from .thermal_utils import MIN_RESIDUAL_SCALE
+
+_LOGGER = logging.getLogger(__name__)
+
+# Candidate drift time constants in minutes (log-spaced)
+TAU_GRID_BOUNDS = (3.0, 720.0)
+TAU_GRID_SIZE = 64
+# The slow mode must be this much slower than the fast one to be told apart
+MIN_TAU_RATIO = 2.0
+# Weight kept by earlier traces when a new one arrives (~14 trace half-life)
+TRACE_FORGETTING_FACTOR = 0.95
+MIN_TRACE_POINTS = 8
+MIN_TRACE_MINUTES = 10.0
+# Traces required before the two-mode model can replace the single tau
+MIN_TWO_NODE_TRACES = 3
+# Fast-mode shares outside this range are indistinguishable from one mode
+FAST_FRACTION_BOUNDS = (0.05, 0.95)
+# Ridge on the amplitude solve; nearly collinear mode pairs stay finite
+AMPLITUDE_RIDGE = 1e-9
+# Version of the persisted estimator statistics
+ESTIMATOR_STATE_VERSION = 1
+
+TwoNodeParameters = Tuple[float, float, float]
+
+
+class TwoNodeDriftEstimator:
+    """Recursive estimator of the fast (air) and slow (mass) drift modes.
+
+    With the outdoor temperature as asymptote, a passive drift trace follows
+    T(t) - T_out = c_fast*exp(-t/tau_fast) + c_slow*exp(-t/tau_slow). For a
+    fixed (tau_fast, tau_slow) pair the trace is linear in the amplitudes, so
+    every pair of a log-spaced grid is solved for one trace in a single
+    batched pass. The trace's concentrated log-likelihood n*log(SSE) is
+    accumulated per pair with exponential forgetting, together with the same
+    statistic for a single mode and the fast-mode share c_fast/(c_fast+c_slow).
+
+    Traces without an outdoor temperature are fitted with a free asymptote.
+    They refine the time constants but not the fast-mode share.
+    """
+
+    def __init__(
+        self,
+        tau_bounds: Tuple[float, float] = TAU_GRID_BOUNDS,
+        grid_size: int = TAU_GRID_SIZE,
+        forgetting_factor: float = TRACE_FORGETTING_FACTOR,
+    ) -> None:
+        """Initialize the estimator with an empty history.
+
+        Args:
+            tau_bounds: Smallest and largest candidate time constant (minutes)
+            grid_size: Number of log-spaced candidate time constants
+            forgetting_factor: Weight kept by earlier traces per new trace (0-1]
+        """
+        if not 0.0 < forgetting_factor <= 1.0:
+            raise ValueError("Forgetting factor must be in (0, 1]")
+        self._taus = np.geomspace(tau_bounds[0], tau_bounds[1], grid_size)
+        fast, slow = np.triu_indices(grid_size, k=1)
+        distinct = self._taus[slow] >= MIN_TAU_RATIO * self._taus[fast]
+        self._fast = fast[distinct]
+        self._slow = slow[distinct]
+        self._forgetting = forgetting_factor
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all observed traces."""
+        self._single_deviance = np.zeros(self._taus.size)
+        self._pair_deviance = np.zeros(self._fast.size)
+        self._fraction_sum = np.zeros(self._fast.size)
+        self._fraction_weight = 0.0
+        self._points = 0.0
+        self._traces = 0.0
+        self._trace_count = 0
+
+    @property
+    def trace_count(self) -> int:
+        """Return the number of traces used since the last reset."""
+        return self._trace_count
+
+    def update(
+        self,
+        times_minutes: Sequence[float],
+        temps: Sequence[float],
+        outdoor_temp: Optional[float] = None,
+    ) -> bool:
+        """Add one passive drift trace.
+
+        Args:
+            times_minutes: Reading times in minutes (any origin)
+            temps: Indoor temperatures (°C)
+            outdoor_temp: Outdoor temperature during the trace (°C), if known
+
+        Returns:
+            True if the trace was long enough to be used
+        """
+        times = np.asarray(times_minutes, dtype=float)
+        values = np.asarray(temps, dtype=float)
+        if times.shape != values.shape:
+            return False
+        valid = np.isfinite(times) & np.isfinite(values)
+        times, values = times[valid], values[valid]
+        if times.size < MIN_TRACE_POINTS:
+            return False
+        order = np.argsort(times)
+        times = times[order] - times[order[0]]
+        values = values[order]
+        if times[-1] < MIN_TRACE_MINUTES:
+            return False
+
+        basis = np.exp(-times[None, :] / self._taus[:, None])
+        anchored = outdoor_temp is not None and math.isfinite(outdoor_temp)
+        if anchored:
+            target = values - outdoor_temp
+        else:
+            # A free asymptote is projected out by centering
+            target = values - values.mean()
+            basis = basis - basis.mean(axis=1, keepdims=True)
+
+        gram = basis @ basis.T
+        projection = basis @ target
+        target_energy = float(target @ target)
+        count = times.size
+        noise_floor = count * MIN_RESIDUAL_SCALE ** 2
+
+        diagonal = np.diag(gram)
+        single_sse = target_energy - projection ** 2 / np.maximum(diagonal, 1e-12)
+
+        fast_energy = diagonal[self._fast]
+        slow_energy = diagonal[self._slow]
+        cross = gram[self._fast, self._slow]
+        ridge = AMPLITUDE_RIDGE * (fast_energy + slow_energy)
+        fast_energy = fast_energy + ridge
+        slow_energy = slow_energy + ridge
+        fast_projection = projection[self._fast]
+        slow_projection = projection[self._slow]
+        determinant = fast_energy * slow_energy - cross * cross
+        fast_amplitude = (slow_energy * fast_projection - cross * slow_projection) / determinant
+        slow_amplitude = (fast_energy * slow_projection - cross * fast_projection) / determinant
+        pair_sse = target_energy - (fast_amplitude * fast_projection + slow_amplitude * slow_projection)
+
+        forgetting = self._forgetting
+        self._single_deviance = forgetting * self._single_deviance + count * np.log(
+            np.maximum(single_sse, 0.0) + noise_floor
+        )
+        self._pair_deviance = forgetting * self._pair_deviance + count * np.log(
+            np.maximum(pair_sse, 0.0) + noise_floor
+        )
+        self._fraction_sum *= forgetting
+        self._fraction_weight *= forgetting
+        if anchored:
+            total = fast_amplitude + slow_amplitude
+            safe_total = np.where(np.abs(total) > 1e-9, total, 1.0)
+            fraction = np.where(np.abs(total) > 1e-9, fast_amplitude / safe_total, 0.5)
+            self._fraction_sum += count * np.clip(fraction, 0.0, 1.0)
+            self._fraction_weight += count
+        self._points = forgetting * self._points + count
+        self._traces = forgetting * self._traces + 1.0
+        self._trace_count += 1
+        return True
+
+    def serialize_for_persistence(self) -> Dict[str, Any]:
+        """Serialize the accumulated statistics.
+
+        The per-pair arrays are stored as base64 little-endian float64 so a
+        restore reproduces the estimate exactly.
+        """
+        return {
+            "version": ESTIMATOR_STATE_VERSION,
+            "tau_bounds": [float(self._taus[0]), float(self._taus[-1])],
+            "grid_size": int(self._taus.size),
+            "single_deviance": _encode_array(self._single_deviance),
+            "pair_deviance": _encode_array(self._pair_deviance),
+            "fraction_sum": _encode_array(self._fraction_sum),
+            "fraction_weight": float(self._fraction_weight),
+            "points": float(self._points),
+            "traces": float(self._traces),
+            "trace_count": int(self._trace_count),
+        }
+
+    def restore_from_persistence(self, data: Dict[str, Any]) -> bool:
+        """Restore statistics saved by serialize_for_persistence().
+
+        Data from another version or tau grid is rejected and the estimator
+        keeps an empty history.
+
+        Returns:
+            True if the statistics were restored
+        """
+        try:
+            if data.get("version") != ESTIMATOR_STATE_VERSION:
+                raise ValueError(f"unsupported version {data.get('version')}")
+            if int(data["grid_size"]) != self._taus.size or not np.allclose(
+                data["tau_bounds"], [self._taus[0], self._taus[-1]]
+            ):
+                raise ValueError("tau grid changed")
+            single = _decode_array(data["single_deviance"], self._taus.size)
+            pair = _decode_array(data["pair_deviance"], self._fast.size)
+            fraction_sum = _decode_array(data["fraction_sum"], self._fast.size)
+            scalars = [float(data[key]) for key in ("fraction_weight", "points", "traces")]
+            trace_count = int(data["trace_count"])
+            if not all(math.isfinite(value) and value >= 0.0 for value in scalars) or trace_count < 0:
+                raise ValueError("invalid trace weights")
+        except (KeyError, TypeError, ValueError, AttributeError) as exc:
+            _LOGGER.debug("Discarding saved two-node drift statistics: %s", exc)
+            self.reset()
+            return False
+
+        self._single_deviance, self._pair_deviance, self._fraction_sum = single, pair, fraction_sum
+        self._fraction_weight, self._points, self._traces = scalars
+        self._trace_count = trace_count
+        return True
+
+    def estimate(self) -> Optional[TwoNodeParameters]:
+        """Return (tau_fast, tau_slow, fast_fraction), or None while one mode suffices.
+
+        The second mode is accepted when its likelihood gain beats the BIC
+        penalty of one shared time constant plus one amplitude per trace.
+        """
+        if self._trace_count < MIN_TWO_NODE_TRACES:
+            return None
+        best = int(np.argmin(self._pair_deviance))
+        improvement = float(self._single_deviance.min() - self._pair_deviance[best])
+        penalty = (1.0 + self._traces) * math.log(max(self._points, 2.0))
+        if improvement <= penalty or self._fraction_weight <= 0.0:
+            return None
+        fraction = float(self._fraction_sum[best] / self._fraction_weight)
+        if not FAST_FRACTION_BOUNDS[0] <= fraction <= FAST_FRACTION_BOUNDS[1]:
+            return None
+        return float(self._taus[self._fast[best]]), float(self._taus[self._slow[best]]), fraction
+
+
+def _encode_array(values: np.ndarray) -> str:
+    """Encode a float array as base64 little-endian float64."""
+    return base64.b64encode(np.asarray(values, dtype="<f8").tobytes()).decode("ascii")
+
+
+def _decode_array(encoded: str, size: int) -> np.ndarray:
+    """Decode an array written by _encode_array, checking its size and values."""
+    try:
+        raw = base64.b64decode(encoded, validate=True)
+    except (binascii.Error, TypeError) as exc:
+        raise ValueError(f"invalid array encoding: {exc}") from exc
+    if len(raw) != size * 8:
+        raise ValueError(f"expected {size} values, got {len(raw) / 8:g}")
+    values = np.frombuffer(raw, dtype="<f8").astype(float)
+    if not np.all(np.isfinite(values)):
+        raise ValueError("non-finite values")
+    return values
+
+
+class TwoNodeThermalModel(PassiveThermalModel):
+    """PassiveThermalModel with a second, slow drift mode for heavy thermal mass.
+
+    An air node coupled to the outdoors and to a thermal mass node drifts
+    as the sum of two exponential modes: the air settling towards the mass
+    (fast) and both settling towards outdoor (slow). Predictions use
+    T(t) = T_out + (T_now - T_out) * (w*exp(-t/tau_fast) + (1 - w)*exp(-t/tau_slow)),
+    where the fast-mode share w is learned from traces starting when the
+    HVAC stops, the same situation predictions are made for.
+
+    Both modes describe the building, so they are shared by cooling and
+    warming drifts. Until the estimator supports two modes, every
+    prediction comes from the single-tau model, whose learning is unchanged.
+    """
+
+    def __init__(self, tau_cooling: float = 90.0, tau_warming: float = 150.0):
+        """Initialize the model; see PassiveThermalModel for the arguments."""
+        super().__init__(tau_cooling=tau_cooling, tau_warming=tau_warming)
+        self._drift_estimator = TwoNodeDriftEstimator()
+        self._two_node_parameters: Optional[TwoNodeParameters] = None
+
+    @property
+    def two_node_parameters(self) -> Optional[TwoNodeParameters]:
+        """Return (tau_fast, tau_slow, fast_fraction) when active, else None."""
+        return self._two_node_parameters
+
+    def observe_drift(
+        self,
+        drift_data: Sequence[Tuple[float, float]],
+        outdoor_temp: Optional[float] = None,
+    ) -> bool:
+        """Learn from a passive drift trace.
+
+        Args:
+            drift_data: (timestamp seconds, temperature) readings with the HVAC off
+            outdoor_temp: Outdoor temperature during the drift (°C), if known
+
+        Returns:
+            True if the trace was used
+        """
+        if not drift_data:
+            return False
+        times = [timestamp / 60.0 for timestamp, _ in drift_data]
+        temps = [temp for _, temp in drift_data]
+        if not self._drift_estimator.update(times, temps, outdoor_temp):
+            return False
+
+        parameters = self._drift_estimator.estimate()
+        if parameters != self._two_node_parameters:
+            if parameters is None:
+                _LOGGER.debug("Two-node drift model inactive, using single tau")
+            else:
+                _LOGGER.debug(
+                    "Two-node drift model: tau_fast=%.1f, tau_slow=%.1f, fast_fraction=%.2f",
+                    *parameters
+                )
+        self._two_node_parameters = parameters
+        return True
+
+    def serialize_two_node_state(self) -> Dict[str, Any]:
+        """Return the drift estimator statistics for persistence."""
+        return self._drift_estimator.serialize_for_persistence()
+
+    def restore_two_node_state(self, data: Dict[str, Any]) -> bool:
+        """Restore the drift estimator and the modes it supports.
+
+        Returns:
+            True if the statistics were restored
+        """
+        restored = self._drift_estimator.restore_from_persistence(data)
+        self._two_node_parameters = self._drift_estimator.estimate()
+        if restored:
+            _LOGGER.debug(
+                "Restored two-node drift statistics from %d traces (active: %s)",
+                self._drift_estimator.trace_count, self._two_node_parameters is not None
+            )
+        return restored
+
+    def predict_drift(
+        self,
+        current: float,
+        outdoor: float,
+        minutes: int,
+        is_cooling: bool
+    ) -> float:
+        """Predict temperature after passive drift; see PassiveThermalModel.predict_drift()."""
+        if self._two_node_parameters is None:
+            return super().predict_drift(current, outdoor, minutes, is_cooling)
+        if minutes < 0:
+            raise ValueError("Time duration cannot be negative")
+        if minutes == 0:
+            return current
+
+        tau_fast, tau_slow, fast_fraction = self._two_node_parameters
+        remaining = (
+            fast_fraction * math.exp(-minutes / tau_fast)
+            + (1.0 - fast_fraction) * math.exp(-minutes / tau_slow)
+        )
+        return outdoor + (current - outdoor) * remaining
+
+    def _drift_modes(self, is_cooling: bool) -> Tuple[Tuple[float, float], ...]:
+        """Return both drift modes once learned, else the single tau."""
+        if self._two_node_parameters is None:
+            return super()._drift_modes(is_cooling)
+        tau_fast, tau_slow, fast_fraction = self._two_node_parameters
+        return ((tau_fast, fast_fraction), (tau_slow, 1.0 - fast_fraction))
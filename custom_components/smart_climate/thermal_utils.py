@@ -1,11 +1,29 @@
 """ABOUTME: Mathematical utilities for thermal curve fitting and analysis.
 Provides exponential decay modeling and drift data analysis for passive thermal learning."""
 
+import math
 import numpy as np
-from typing import List, Tuple, Optional
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple, Optional
 
 from .thermal_models import ProbeResult
 
+# Least-squares exponential fit: minimum points, default tau bounds (same unit as the
+# times passed in), Huber tuning constant, outlier cutoff in robust standard deviations
+# and the normal quantile of the reported tau interval
+MIN_FIT_POINTS = 4
+DEFAULT_TAU_BOUNDS = (1.0, 1440.0)
+HUBER_K = 1.345
+OUTLIER_THRESHOLD = 3.5
+TAU_INTERVAL_Z = 1.96
+MIN_RESIDUAL_SCALE = 0.01  # °C; keeps weights finite for noise-free data
+MAX_FIT_ITERATIONS = 50
+
+# Online tau estimation: log-spaced tau candidates and the chi-square(1) 99% quantile
+# that bounds the profile-likelihood interval (conservative, since callers stop on it)
+ONLINE_TAU_GRID_SIZE = 160
+PROFILE_CHI2_99 = 6.635
+
 
 def exponential_decay(t: float, T_final: float, T_initial: float, tau: float) -> float:
     """Calculate temperature at time t using exponential decay model.
@@ -137,4 +155,318 @@ def analyze_drift_data(
         # Curve fitting failed or invalid data
         # For debugging: could log the specific error
         # print(f"Curve fitting error: {type(e).__name__}: {e}")
-        return None
\ No newline at end of file
+        return None
+
+
+@dataclass(frozen=True)
+class ExponentialFit:
+    """Result of fitting T(t) = T_final + (T_initial - T_final) * exp(-t/tau).
+
+    Times and tau share the unit of the times passed to fit_exponential_drift().
+    The tau interval is an approximate 95% interval from the parameter covariance.
+    """
+    tau: float
+    t_final: float
+    t_initial: float
+    rmse: float
+    r_squared: float
+    tau_interval: Tuple[float, float]
+    inlier_count: int
+    rejected_count: int
+
+    @property
+    def relative_interval_width(self) -> float:
+        """Half-width of the tau interval relative to tau (inf when undetermined)."""
+        low, high = self.tau_interval
+        if not math.isfinite(high) or self.tau <= 0:
+            return math.inf
+        return (high - low) / (2.0 * self.tau)
+
+    @property
+    def fit_quality(self) -> float:
+        """Return 0.0-1.0: R² discounted by the relative width of the tau interval."""
+        return max(0.0, min(1.0, self.r_squared)) * max(0.0, 1.0 - self.relative_interval_width)
+
+
+def fit_exponential_drift(
+    times: Sequence[float],
+    temps: Sequence[float],
+    tau_bounds: Tuple[float, float] = DEFAULT_TAU_BOUNDS,
+    outlier_threshold: float = OUTLIER_THRESHOLD,
+) -> Optional[ExponentialFit]:
+    """Fit an exponential drift curve with robust nonlinear least squares.
+
+    Starts from a log-linear guess, then runs Levenberg-Marquardt on
+    (T_final, T_initial - T_final, ln tau) with Huber weights recomputed
+    from the median absolute deviation of the residuals each iteration.
+    Points further than `outlier_threshold` robust standard deviations from
+    the curve are rejected and the fit is repeated once on the inliers.
+
+    Args:
+        times: Sample times, any unit (tau is returned in the same unit)
+        temps: Temperatures at those times (°C)
+        tau_bounds: Allowed (min, max) tau
+        outlier_threshold: Rejection cutoff in robust standard deviations
+
+    Returns:
+        ExponentialFit, or None with too few points, no drift or no convergence
+    """
+    t = np.asarray(times, dtype=float)
+    y = np.asarray(temps, dtype=float)
+    if t.shape != y.shape or t.size < MIN_FIT_POINTS:
+        return None
+    finite = np.isfinite(t) & np.isfinite(y)
+    t, y = t[finite], y[finite]
+    if t.size < MIN_FIT_POINTS:
+        return None
+    order = np.argsort(t, kind="stable")
+    t, y = t[order] - t[order][0], y[order]
+    if t[-1] <= 0 or np.ptp(y) == 0:
+        return None
+
+    log_bounds = (math.log(tau_bounds[0]), math.log(tau_bounds[1]))
+    params = _log_linear_guess(t, y, tau_bounds)
+    params = _robust_levenberg_marquardt(t, y, params, log_bounds)
+    if params is None:
+        return None
+
+    inliers = np.ones(t.size, dtype=bool)
+    residuals = y - _drift_curve(t, params)
+    scale = max(_robust_scale(residuals), MIN_RESIDUAL_SCALE)
+    outliers = np.abs(residuals) > outlier_threshold * scale
+    if outliers.any() and t.size - outliers.sum() >= MIN_FIT_POINTS:
+        inliers = ~outliers
+        refit = _robust_levenberg_marquardt(t[inliers], y[inliers], params, log_bounds)
+        if refit is None:
+            return None
+        params = refit
+
+    return _summarize_fit(t[inliers], y[inliers], params, int(t.size - inliers.sum()))
+
+
+def _drift_curve(t: np.ndarray, params: np.ndarray) -> np.ndarray:
+    """Evaluate T_final + amplitude * exp(-t/tau) for params (T_final, amplitude, ln tau)."""
+    return params[0] + params[1] * np.exp(-t / math.exp(params[2]))
+
+
+def _drift_jacobian(t: np.ndarray, params: np.ndarray) -> np.ndarray:
+    """Return the Jacobian of the drift curve with respect to (T_final, amplitude, ln tau)."""
+    tau = math.exp(params[2])
+    decay = np.exp(-t / tau)
+    return np.column_stack((np.ones_like(t), decay, params[1] * decay * t / tau))
+
+
+def _robust_scale(residuals: np.ndarray) -> float:
+    """Return the MAD-based estimate of the residual standard deviation."""
+    return float(1.4826 * np.median(np.abs(residuals - np.median(residuals))))
+
+
+def _log_linear_guess(t: np.ndarray, y: np.ndarray, tau_bounds: Tuple[float, float]) -> np.ndarray:
+    """Initial parameters from a straight-line fit of ln|T_final - T(t)| against t.
+
+    T_final is guessed slightly beyond the last reading in the drift
+    direction, since a probe usually ends before the curve flattens.
+    """
+    drift = y[-1] - y[0]
+    direction = 1.0 if drift >= 0 else -1.0
+    t_final = y[-1] + direction * max(0.05, 0.1 * abs(drift))
+    gap = direction * (t_final - y)
+    usable = gap > 1e-6
+    tau = t[-1] / 3.0
+    if usable.sum() >= 2:
+        slope = np.polyfit(t[usable], np.log(gap[usable]), 1)[0]
+        if slope < 0:
+            tau = -1.0 / slope
+    tau = min(max(tau, tau_bounds[0]), tau_bounds[1])
+
+    # Linear least squares for T_final and amplitude at the guessed tau
+    design = np.column_stack((np.ones_like(t), np.exp(-t / tau)))
+    (t_final, amplitude), *_ = np.linalg.lstsq(design, y, rcond=None)
+    return np.array([t_final, amplitude, math.log(tau)])
+
+
+def _robust_levenberg_marquardt(
+    t: np.ndarray, y: np.ndarray, params: np.ndarray, log_bounds: Tuple[float, float]
+) -> Optional[np.ndarray]:
+    """Refine params by Levenberg-Marquardt on the Huber-weighted squared residuals."""
+    params = params.copy()
+    damping = 1e-3
+
+    def weighted_loss(candidate: np.ndarray, weights: np.ndarray) -> float:
+        residuals = y - _drift_curve(t, candidate)
+        return float(np.sum(weights * residuals * residuals))
+
+    for _ in range(MAX_FIT_ITERATIONS):
+        residuals = y - _drift_curve(t, params)
+        delta = HUBER_K * max(_robust_scale(residuals), MIN_RESIDUAL_SCALE)
+        absolute = np.abs(residuals)
+        weights = np.where(absolute <= delta, 1.0, delta / np.maximum(absolute, 1e-12))
+
+        jacobian = _drift_jacobian(t, params)
+        weighted_jacobian = jacobian * weights[:, None]
+        normal = jacobian.T @ weighted_jacobian
+        gradient = weighted_jacobian.T @ residuals
+        current_loss = float(np.sum(weights * residuals * residuals))
+
+        improved = False
+        while damping < 1e10:
+            try:
+                step = np.linalg.solve(normal + damping * np.diag(np.diag(normal) + 1e-12), gradient)
+            except np.linalg.LinAlgError:
+                damping *= 10.0
+                continue
+            candidate = params + step
+            candidate[2] = min(max(candidate[2], log_bounds[0]), log_bounds[1])
+            if weighted_loss(candidate, weights) <= current_loss:
+                step = candidate - params
+                params = candidate
+                damping = max(damping / 10.0, 1e-9)
+                improved = True
+                break
+            damping *= 10.0
+
+        if not improved or np.all(np.abs(step) <= 1e-8 * (np.abs(params) + 1e-8)):
+            break
+
+    return params if np.all(np.isfinite(params)) else None
+
+
+def _summarize_fit(t: np.ndarray, y: np.ndarray, params: np.ndarray, rejected: int) -> ExponentialFit:
+    """Build the fit result with RMSE, R² and the tau interval from the covariance."""
+    residuals = y - _drift_curve(t, params)
+    ss_res = float(np.sum(residuals * residuals))
+    ss_tot = float(np.sum((y - y.mean()) ** 2))
+    r_squared = 1.0 - ss_res / ss_tot if ss_tot > 0 else 0.0
+    tau = math.exp(params[2])
+
+    interval = (0.0, math.inf)
+    dof = t.size - 3
+    if dof > 0:
+        jacobian = _drift_jacobian(t, params)
+        try:
+            covariance = np.linalg.inv(jacobian.T @ jacobian) * (ss_res / dof)
+            log_tau_error = math.sqrt(max(float(covariance[2, 2]), 0.0))
+            interval = (
+                math.exp(params[2] - TAU_INTERVAL_Z * log_tau_error),
+                math.exp(params[2] + TAU_INTERVAL_Z * log_tau_error),
+            )
+        except (np.linalg.LinAlgError, OverflowError):
+            pass
+
+    return ExponentialFit(
+        tau=tau,
+        t_final=float(params[0]),
+        t_initial=float(params[0] + params[1]),
+        rmse=math.sqrt(ss_res / t.size),
+        r_squared=r_squared,
+        tau_interval=interval,
+        inlier_count=int(t.size),
+        rejected_count=rejected,
+    )
+
+
+class OnlineTauEstimator:
+    """Streaming tau estimate with a profile-likelihood confidence interval.
+
+    For a fixed tau the drift curve is linear in T_final and the amplitude,
+    so each reading updates per-candidate sums of 1, e, e², y, y·e and y²
+    (e = exp(-t/tau)) over a log-spaced tau grid. The residual sum of
+    squares of every candidate then follows in closed form, giving the best
+    tau and the candidates whose fit is not significantly worse, without
+    refitting the stored readings.
+    """
+
+    def __init__(
+        self,
+        tau_bounds: Tuple[float, float] = DEFAULT_TAU_BOUNDS,
+        grid_size: int = ONLINE_TAU_GRID_SIZE,
+    ) -> None:
+        """Initialize the estimator.
+
+        Args:
+            tau_bounds: (min, max) tau candidates, in the unit of the reading times
+            grid_size: Number of log-spaced tau candidates
+        """
+        self._taus = np.geomspace(tau_bounds[0], tau_bounds[1], grid_size)
+        self._sums = np.zeros((6, grid_size))
+        self._origin: Optional[Tuple[float, float]] = None
+        self._count = 0
+
+    @property
+    def count(self) -> int:
+        """Return the number of readings added."""
+        return self._count
+
+    def add(self, time: float, temp: float) -> None:
+        """Add one reading; times must not decrease."""
+        if self._origin is None:
+            self._origin = (time, temp)
+        elapsed = time - self._origin[0]
+        value = temp - self._origin[1]  # Centered for numerical stability
+        decay = np.exp(-elapsed / self._taus)
+        self._sums[0] += 1.0
+        self._sums[1] += decay
+        self._sums[2] += decay * decay
+        self._sums[3] += value
+        self._sums[4] += value * decay
+        self._sums[5] += value * value
+        self._count += 1
+
+    def estimate(self) -> Optional[Tuple[float, Tuple[float, float]]]:
+        """Return (tau, (low, high)), or None with fewer than MIN_FIT_POINTS readings.
+
+        The interval is inf-bounded on a side where it reaches the grid edge.
+        """
+        if self._count < MIN_FIT_POINTS:
+            return None
+        sse = self._residual_sums()
+        best = int(np.argmin(sse))
+        if not np.isfinite(sse[best]):
+            return None
+
+        threshold = sse[best] * (1.0 + PROFILE_CHI2_99 / (self._count - 3)) + 1e-12
+        low = best
+        while low > 0 and sse[low - 1] <= threshold:
+            low -= 1
+        high = best
+        while high < sse.size - 1 and sse[high + 1] <= threshold:
+            high += 1
+
+        tau = self._refine_minimum(sse, best)
+        # Widen by one grid step: the true minimum lies between grid points
+        low_tau = float(self._taus[low - 1]) if low > 0 else 0.0
+        high_tau = float(self._taus[high + 1]) if high < sse.size - 1 else math.inf
+        return tau, (low_tau, high_tau)
+
+    def relative_interval_width(self) -> float:
+        """Return the interval half-width relative to tau (inf while undetermined)."""
+        estimate = self.estimate()
+        if estimate is None:
+            return math.inf
+        tau, (low, high) = estimate
+        if low <= 0.0 or not math.isfinite(high):
+            return math.inf
+        return (high - low) / (2.0 * tau)
+
+    def _residual_sums(self) -> np.ndarray:
+        """Return the least-squares residual sum of squares of every tau candidate."""
+        n, s_e, s_ee, s_y, s_ye, s_yy = self._sums
+        det = n * s_ee - s_e * s_e
+        valid = det > 1e-12 * np.maximum(n * s_ee, 1e-300)
+        safe_det = np.where(valid, det, 1.0)
+        offset = (s_ee * s_y - s_e * s_ye) / safe_det
+        amplitude = (n * s_ye - s_e * s_y) / safe_det
+        sse = s_yy - offset * s_y - amplitude * s_ye
+        return np.where(valid, np.maximum(sse, 0.0), np.inf)
+
+    def _refine_minimum(self, sse: np.ndarray, best: int) -> float:
+        """Interpolate the minimum on log tau with a parabola through the neighbours."""
+        if best == 0 or best == sse.size - 1 or not np.all(np.isfinite(sse[best - 1:best + 2])):
+            return float(self._taus[best])
+        left, centre, right = sse[best - 1], sse[best], sse[best + 1]
+        curvature = left - 2.0 * centre + right
+        if curvature <= 0:
+            return float(self._taus[best])
+        shift = 0.5 * (left - right) / curvature  # In grid steps, within (-0.5, 0.5)
+        log_step = math.log(self._taus[1] / self._taus[0])
+        return float(self._taus[best] * math.exp(shift * log_step))
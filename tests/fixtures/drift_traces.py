@@ -0,0 +1,78 @@
+"""
+ABOUTME: Passive drift trace fixtures for thermal model benchmarks.
+Simulates an air + thermal mass room through cooling runs and records the HVAC-off drift like the stability detector.
+"""
+
+import random
+from dataclasses import dataclass
+from typing import List, Tuple
+
+SIMULATION_STEP_MINUTES = 0.05
+SENSOR_RESOLUTION = 0.1
+
+
+@dataclass
+class DriftTrace:
+    """One recorded HVAC-off drift period."""
+    outdoor_temp: float
+    readings: List[Tuple[float, float]]  # (timestamp seconds, temperature)
+
+
+def simulate_drift_traces(
+    count: int,
+    seed: int = 0,
+    air_outdoor_minutes: float = 60.0,
+    air_mass_minutes: float = 8.0,
+    mass_ratio: float = 5.0,
+    sample_minutes: float = 1.0,
+    noise: float = 0.03,
+) -> List[DriftTrace]:
+    """
+    Simulate drift traces of a two-node RC room.
+
+    The air node exchanges heat with outdoor (time constant
+    air_outdoor_minutes) and with a mass node (air_mass_minutes); the mass
+    holds mass_ratio times the air's heat capacity. Each trace follows a
+    20-60 minute cooling run and records 60-120 minutes of drift, rounded
+    to the sensor resolution after Gaussian noise.
+
+    Args:
+        count: Number of traces
+        seed: Random seed
+        air_outdoor_minutes: Air to outdoor RC time constant
+        air_mass_minutes: Air to mass RC time constant
+        mass_ratio: Mass heat capacity relative to the air
+        sample_minutes: Minutes between recorded readings
+        noise: Sensor noise standard deviation (°C)
+
+    Returns:
+        List of DriftTrace
+    """
+    rng = random.Random(seed)
+    dt = SIMULATION_STEP_MINUTES
+    sample_every = int(round(sample_minutes / dt))
+    traces = []
+    timestamp = 1_700_000_000.0
+
+    def step(air, mass, outdoor, cooling):
+        air_rate = (outdoor - air) / air_outdoor_minutes + (mass - air) / air_mass_minutes - cooling
+        mass_rate = (air - mass) / (air_mass_minutes * mass_ratio)
+        return air + dt * air_rate, mass + dt * mass_rate
+
+    for _ in range(count):
+        outdoor = rng.uniform(26.0, 34.0)
+        air = mass = outdoor - rng.uniform(1.0, 3.0)
+        for _ in range(int(rng.uniform(20.0, 60.0) / dt)):
+            air, mass = step(air, mass, outdoor, cooling=0.15)
+
+        readings = []
+        steps = int(rng.uniform(60.0, 120.0) / dt)
+        for index in range(steps + 1):
+            if index % sample_every == 0:
+                reading = round((air + rng.gauss(0.0, noise)) / SENSOR_RESOLUTION) * SENSOR_RESOLUTION
+                readings.append((timestamp + index * dt * 60.0, reading))
+            air, mass = step(air, mass, outdoor, cooling=0.0)
+        traces.append(DriftTrace(outdoor_temp=outdoor, readings=readings))
+        timestamp += 6 * 3600.0
+
+    return traces
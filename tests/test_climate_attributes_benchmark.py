@@ -0,0 +1,130 @@
+"""ABOUTME: Benchmark of SmartClimateEntity state attribute size and build time per state write.
+Compares rebuilding every attribute on each write with the throttled slow group and compact mode."""
+
+import json
+import random
+import time
+from unittest.mock import Mock, patch
+
+from custom_components.smart_climate.climate import SmartClimateEntity
+from custom_components.smart_climate.const import (
+    CONF_ATTRIBUTE_REFRESH_INTERVAL,
+    CONF_DIAGNOSTIC_ATTRIBUTES,
+)
+from custom_components.smart_climate.offset_engine import OffsetEngine
+
+WRITES = 200
+
+
+def _trained_engine(sample_count=500):
+    """Create an OffsetEngine whose learner holds random samples."""
+    engine = OffsetEngine({"enable_learning": True, "max_offset": 5.0})
+    rng = random.Random(5)
+    for _ in range(sample_count):
+        engine._learner.add_sample(
+            predicted=rng.uniform(-2.0, 2.0),
+            actual=rng.uniform(-2.0, 2.0),
+            ac_temp=rng.uniform(20.0, 28.0),
+            room_temp=rng.uniform(20.0, 28.0),
+            outdoor_temp=rng.uniform(15.0, 35.0),
+            mode="none",
+        )
+    return engine
+
+
+def _make_entity(engine, **config):
+    """Create a SmartClimateEntity around the given engine."""
+    coordinator = Mock()
+    coordinator.data = None
+    hass = Mock()
+    hass.states.get = Mock(return_value=Mock(state="cool", attributes={}))
+    return SmartClimateEntity(
+        hass=hass,
+        config={"entity_id": "climate.test", **config},
+        wrapped_entity_id="climate.real_ac",
+        room_sensor_id="sensor.room_temp",
+        offset_engine=engine,
+        sensor_manager=Mock(),
+        mode_manager=Mock(),
+        temperature_controller=Mock(),
+        coordinator=coordinator,
+    )
+
+
+def _write_states(entity, writes=WRITES):
+    """Return (serialized attribute bytes, ms per write) over `writes` state writes."""
+    start = time.perf_counter()
+    for _ in range(writes):
+        serialized = json.dumps(entity.extra_state_attributes, default=str)
+    elapsed = time.perf_counter() - start
+    return len(serialized), elapsed * 1000 / writes
+
+
+def test_attribute_write_benchmark():
+    """Throttled and compact attributes are cheaper per write than rebuilding everything."""
+    engine = _trained_engine()
+    baseline = _make_entity(engine, **{CONF_ATTRIBUTE_REFRESH_INTERVAL: 0})
+    throttled = _make_entity(engine)
+    compact = _make_entity(engine, **{CONF_DIAGNOSTIC_ATTRIBUTES: False})
+
+    baseline_size, baseline_ms = _write_states(baseline)
+    throttled_size, throttled_ms = _write_states(throttled)
+    compact_size, compact_ms = _write_states(compact)
+
+    print(
+        f"\nper write: rebuild={baseline_size}B/{baseline_ms:.3f}ms "
+        f"throttled={throttled_size}B/{throttled_ms:.3f}ms "
+        f"compact={compact_size}B/{compact_ms:.3f}ms"
+    )
+
+    assert throttled.extra_state_attributes.keys() == baseline.extra_state_attributes.keys()
+    assert compact_size < baseline_size
+
+
+def test_slow_attributes_built_once_between_learning_changes():
+    """The slow group is rebuilt only when the learning generation changes."""
+    engine = _trained_engine(sample_count=50)
+    entity = _make_entity(engine)
+
+    with patch.object(
+        entity, "_build_slow_attributes", wraps=entity._build_slow_attributes
+    ) as build:
+        for _ in range(20):
+            entity.extra_state_attributes
+        assert build.call_count == 1
+
+        engine._learner.add_sample(
+            predicted=0.5, actual=0.7, ac_temp=24.0, room_temp=25.0, outdoor_temp=30.0, mode="none"
+        )
+        entity.extra_state_attributes
+        assert build.call_count == 2
+
+
+def test_slow_attributes_rebuilt_after_refresh_interval():
+    """Unchanged learning state still refreshes the slow group once it is stale."""
+    engine = _trained_engine(sample_count=50)
+    entity = _make_entity(engine, **{CONF_ATTRIBUTE_REFRESH_INTERVAL: 60})
+
+    clock = [1000.0]
+    with patch(
+        "custom_components.smart_climate.climate.time.monotonic", side_effect=lambda: clock[0]
+    ), patch.object(
+        entity, "_build_slow_attributes", wraps=entity._build_slow_attributes
+    ) as build:
+        for now in (1000.0, 1030.0, 1061.0):
+            clock[0] = now
+            entity.extra_state_attributes
+
+    assert build.call_count == 2
+
+
+def test_compact_mode_omits_diagnostic_attributes():
+    """Disabling diagnostic attributes drops the algorithm, performance and health groups."""
+    entity = _make_entity(_trained_engine(sample_count=20), **{CONF_DIAGNOSTIC_ATTRIBUTES: False})
+
+    attributes = entity.extra_state_attributes
+
+    assert "reactive_offset" in attributes
+    assert "adaptive_delay" in attributes
+    for key in ("r_squared", "memory_usage_kb", "prediction_latency_ms", "forecast_cache"):
+        assert key not in attributes
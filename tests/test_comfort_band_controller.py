@@ -510,4 +510,23 @@ class TestIntegration:
         # Should still return valid bounds
         assert min_temp < max_temp
         assert min_temp > 10.0  # Reasonable lower bound
-        assert max_temp < 30.0  # Reasonable upper bound
\ No newline at end of file
+        assert max_temp < 30.0  # Reasonable upper bound
+
+def test_should_ac_run_checks_forecast_trajectory(balanced_preferences):
+    """With an outdoor forecast the whole trajectory is checked, not just the end point."""
+    model = PassiveThermalModel(tau_cooling=90.0, tau_warming=150.0)
+    model.get_confidence = Mock(return_value=0.8)
+    controller = ComfortBandController(thermal_model=model, preferences=balanced_preferences)
+    window = (21.0, 24.0)
+
+    # A mild current reading predicts no overshoot within two hours
+    assert controller.should_ac_run(
+        current_temp=23.0, setpoint=22.5, operating_window=window, hvac_mode="cool",
+        outdoor_temp=24.0, prediction_minutes=120
+    ) is False
+
+    # The hourly forecast warms up sharply in the second hour
+    assert controller.should_ac_run(
+        current_temp=23.0, setpoint=22.5, operating_window=window, hvac_mode="cool",
+        outdoor_temp=24.0, prediction_minutes=120, outdoor_forecast=[24.0, 34.0]
+    ) is True
@@ -0,0 +1,164 @@
+"""ABOUTME: Tests for compact telemetry publishing of the dashboard sensors.
+Covers deadbands, per-group publish intervals, unrecorded attributes and simulated recorder growth per day."""
+
+import json
+import math
+from unittest.mock import Mock, patch
+
+import pytest
+
+from custom_components.smart_climate.const import (
+    CONF_COMPACT_TELEMETRY,
+    CONF_TELEMETRY_INTERVALS,
+)
+from custom_components.smart_climate.sensor import (
+    HysteresisStateSensor,
+    OffsetCurrentSensor,
+    THERMAL_PERSISTENCE_ATTRIBUTES,
+)
+from custom_components.smart_climate.sensor_algorithm import MeanAbsoluteErrorSensor
+
+TICKS_PER_DAY = 24 * 3600 // 30  # Coordinator refreshes every 30 seconds
+
+
+def _config_entry(**options):
+    """Create a config entry mock with the given options."""
+    entry = Mock()
+    entry.unique_id = "test_unique_id"
+    entry.title = "Test Smart Climate"
+    entry.data = {}
+    entry.options = options
+    return entry
+
+
+def _coordinator():
+    """Create a coordinator mock with empty dashboard data."""
+    coordinator = Mock()
+    coordinator.last_update_success = True
+    coordinator.data = {"learning_info": {}, "algorithm_metrics": {}}
+    return coordinator
+
+
+def _tick_data(tick):
+    """Dashboard data for a coordinator refresh: slow drift plus sub-display-precision noise."""
+    noise = 0.0004 * math.sin(tick * 1.7)
+    return {
+        "calculated_offset": round(1.5 + 0.3 * math.sin(tick / 400.0), 2) + noise,
+        "learning_info": {"hysteresis_state": "idle_stable_zone" if (tick // 120) % 2 else "active_phase"},
+        "algorithm_metrics": {"mean_absolute_error": 0.2 + 0.05 * math.sin(tick / 900.0) + noise},
+    }
+
+
+def _recorded_bytes(sensor):
+    """Approximate recorder row size: state plus the attributes it keeps."""
+    unrecorded = getattr(type(sensor), "_unrecorded_attributes", frozenset())
+    attributes = {
+        key: value for key, value in (getattr(sensor, "extra_state_attributes", None) or {}).items()
+        if key not in unrecorded
+    }
+    return len(str(sensor.native_value)) + len(json.dumps(attributes, default=str))
+
+
+def _simulate_day(**options):
+    """Feed a day of coordinator refreshes to three sensors; return (writes, recorded bytes)."""
+    coordinator = _coordinator()
+    entry = _config_entry(**options)
+    sensors = [
+        OffsetCurrentSensor(coordinator, "climate.test_ac", entry),
+        HysteresisStateSensor(coordinator, "climate.test_ac", entry),
+        MeanAbsoluteErrorSensor(coordinator, "climate.test_ac", entry),
+    ]
+    written = {"writes": 0, "bytes": 0}
+    for sensor in sensors:
+        def write(sensor=sensor):
+            written["writes"] += 1
+            written["bytes"] += _recorded_bytes(sensor)
+        sensor.async_write_ha_state = write
+
+    clock = [0.0]
+    with patch("custom_components.smart_climate.entity.time.monotonic", side_effect=lambda: clock[0]):
+        for tick in range(TICKS_PER_DAY):
+            clock[0] = tick * 30.0
+            coordinator.data = _tick_data(tick)
+            for sensor in sensors:
+                sensor._handle_coordinator_update()
+    return written["writes"], written["bytes"]
+
+
+def test_compact_telemetry_reduces_daily_recorder_growth():
+    """A simulated day writes fewer rows and bytes in compact mode."""
+    full_writes, full_bytes = _simulate_day()
+    compact_writes, compact_bytes = _simulate_day(**{CONF_COMPACT_TELEMETRY: True})
+
+    print(
+        f"\nper day: full={full_writes} writes/{full_bytes / 1024:.0f}KiB "
+        f"compact={compact_writes} writes/{compact_bytes / 1024:.0f}KiB"
+    )
+
+    assert full_writes == 3 * TICKS_PER_DAY
+    assert compact_writes < full_writes * 0.5
+    assert compact_bytes < full_bytes * 0.5
+
+
+def test_deadband_follows_display_precision():
+    """Numeric changes below one display step are not written."""
+    coordinator = _coordinator()
+    sensor = OffsetCurrentSensor(coordinator, "climate.test_ac", _config_entry(**{CONF_COMPACT_TELEMETRY: True}))
+    sensor.async_write_ha_state = Mock()
+
+    for value in (1.50, 1.53, 1.58, 1.61):
+        coordinator.data = {"calculated_offset": value}
+        sensor._handle_coordinator_update()
+
+    assert sensor.telemetry_deadband == pytest.approx(0.1)
+    assert sensor.async_write_ha_state.call_count == 2  # 1.50, then 1.61
+
+
+def test_group_interval_is_configurable():
+    """A sensor group's publish interval comes from the telemetry_intervals option."""
+    coordinator = _coordinator()
+    entry = _config_entry(**{CONF_COMPACT_TELEMETRY: True, CONF_TELEMETRY_INTERVALS: {"algorithm": 60}})
+    sensor = MeanAbsoluteErrorSensor(coordinator, "climate.test_ac", entry)
+    sensor.async_write_ha_state = Mock()
+
+    clock = [0.0]
+    with patch("custom_components.smart_climate.entity.time.monotonic", side_effect=lambda: clock[0]):
+        for now, value in ((0.0, 0.2), (30.0, 0.5), (60.0, 0.5)):
+            clock[0] = now
+            coordinator.data = {"algorithm_metrics": {"mean_absolute_error": value}}
+            sensor._handle_coordinator_update()
+
+    assert sensor._telemetry_interval == 60.0
+    assert sensor.async_write_ha_state.call_count == 2
+
+
+def test_availability_change_always_written():
+    """Becoming unavailable is written even inside the publish interval."""
+    coordinator = _coordinator()
+    sensor = MeanAbsoluteErrorSensor(coordinator, "climate.test_ac", _config_entry(**{CONF_COMPACT_TELEMETRY: True}))
+    sensor.async_write_ha_state = Mock()
+
+    sensor._handle_coordinator_update()
+    coordinator.last_update_success = False
+    sensor._handle_coordinator_update()
+
+    assert sensor.async_write_ha_state.call_count == 2
+
+
+def test_default_mode_writes_every_update():
+    """Without compact telemetry every coordinator update is written."""
+    coordinator = _coordinator()
+    sensor = OffsetCurrentSensor(coordinator, "climate.test_ac", _config_entry())
+    sensor.async_write_ha_state = Mock()
+
+    for _ in range(5):
+        sensor._handle_coordinator_update()
+
+    assert sensor.async_write_ha_state.call_count == 5
+
+
+def test_bulky_attributes_not_recorded():
+    """Thermal persistence diagnostics are excluded from the recorder."""
+    assert THERMAL_PERSISTENCE_ATTRIBUTES <= HysteresisStateSensor._unrecorded_attributes
+    assert "thermal_data_age_hours" in HysteresisStateSensor._unrecorded_attributes
+    assert "ready" not in HysteresisStateSensor._unrecorded_attributes
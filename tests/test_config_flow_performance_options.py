@@ -0,0 +1,216 @@
+"""ABOUTME: Tests for the performance, telemetry and thermal model tuning settings in the options flow.
+Checks that the fields are offered with their defaults and that saved values are kept."""
+
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from custom_components.smart_climate.config_flow import SmartClimateOptionsFlow
+from custom_components.smart_climate.const import (
+    CONF_CLIMATE_ENTITY,
+    CONF_ROOM_SENSOR,
+    CONF_EVENT_DRIVEN_UPDATES,
+    CONF_EVENT_DEBOUNCE,
+    DEFAULT_EVENT_DRIVEN_UPDATES,
+    DEFAULT_EVENT_DEBOUNCE,
+    CONF_DIAGNOSTIC_ATTRIBUTES,
+    CONF_ATTRIBUTE_REFRESH_INTERVAL,
+    DEFAULT_DIAGNOSTIC_ATTRIBUTES,
+    DEFAULT_ATTRIBUTE_REFRESH_INTERVAL,
+    CONF_COMPACT_TELEMETRY,
+    CONF_TELEMETRY_INTERVALS,
+    DEFAULT_COMPACT_TELEMETRY,
+    DEFAULT_TELEMETRY_INTERVALS,
+    TELEMETRY_INTERVAL_OPTION_PREFIX,
+    CONF_LATENCY_INSTRUMENTATION,
+    DEFAULT_LATENCY_INSTRUMENTATION,
+    CONF_THERMAL_EFFICIENCY_ENABLED,
+    CONF_PROBE_EARLY_STOP,
+    CONF_PROBE_TAU_INTERVAL_WIDTH,
+    DEFAULT_PROBE_EARLY_STOP,
+    DEFAULT_PROBE_TAU_INTERVAL_WIDTH,
+    CONF_TWO_NODE_THERMAL_MODEL,
+    DEFAULT_TWO_NODE_THERMAL_MODEL,
+)
+
+
+def _options_flow(options=None):
+    """Create an options flow for an entry with the given options."""
+    config_entry = Mock()
+    config_entry.data = {
+        CONF_CLIMATE_ENTITY: "climate.test",
+        CONF_ROOM_SENSOR: "sensor.test_temp",
+    }
+    config_entry.options = options or {}
+
+    flow = SmartClimateOptionsFlow()
+    flow.hass = Mock()
+    flow.hass.states.async_all.return_value = []
+    flow.hass.states.async_entity_ids.return_value = []
+    flow.config_entry = config_entry
+    flow.async_show_form = Mock(side_effect=lambda **kwargs: {"type": "form", **kwargs})
+    flow.async_create_entry = Mock(side_effect=lambda **kwargs: {"type": "create_entry", **kwargs})
+    return flow
+
+
+def _schema_defaults(flow):
+    """Return {option key: default} of the options form."""
+    result = asyncio.run(flow.async_step_init())
+    return {str(key): key.default() for key in result["data_schema"].schema}
+
+
+class TestEventDrivenUpdateOptions:
+    """Test the event-driven coordinator update settings."""
+
+    def test_fields_offered_with_defaults(self):
+        """The toggle and debounce are in the form with their defaults."""
+        defaults = _schema_defaults(_options_flow())
+
+        assert defaults[CONF_EVENT_DRIVEN_UPDATES] is DEFAULT_EVENT_DRIVEN_UPDATES
+        assert defaults[CONF_EVENT_DEBOUNCE] == DEFAULT_EVENT_DEBOUNCE
+
+    def test_saved_values_are_defaults(self):
+        """Previously saved values are shown as the defaults."""
+        defaults = _schema_defaults(
+            _options_flow({CONF_EVENT_DRIVEN_UPDATES: True, CONF_EVENT_DEBOUNCE: 5.0})
+        )
+
+        assert defaults[CONF_EVENT_DRIVEN_UPDATES] is True
+        assert defaults[CONF_EVENT_DEBOUNCE] == 5.0
+
+
+class TestClimateAttributeOptions:
+    """Test the climate entity attribute settings."""
+
+    def test_fields_offered_with_defaults(self):
+        """Diagnostic attributes and the refresh interval are in the form."""
+        defaults = _schema_defaults(_options_flow())
+
+        assert defaults[CONF_DIAGNOSTIC_ATTRIBUTES] is DEFAULT_DIAGNOSTIC_ATTRIBUTES
+        assert defaults[CONF_ATTRIBUTE_REFRESH_INTERVAL] == DEFAULT_ATTRIBUTE_REFRESH_INTERVAL
+
+    def test_saved_values_are_defaults(self):
+        """Previously saved values are shown as the defaults."""
+        defaults = _schema_defaults(
+            _options_flow({CONF_DIAGNOSTIC_ATTRIBUTES: False, CONF_ATTRIBUTE_REFRESH_INTERVAL: 0})
+        )
+
+        assert defaults[CONF_DIAGNOSTIC_ATTRIBUTES] is False
+        assert defaults[CONF_ATTRIBUTE_REFRESH_INTERVAL] == 0
+
+
+class TestCompactTelemetryOptions:
+    """Test the compact telemetry toggle and per-group publish intervals."""
+
+    def test_fields_offered_with_defaults(self):
+        """The toggle and one interval per sensor group are in the form."""
+        defaults = _schema_defaults(_options_flow())
+
+        assert defaults[CONF_COMPACT_TELEMETRY] is DEFAULT_COMPACT_TELEMETRY
+        for group, interval in DEFAULT_TELEMETRY_INTERVALS.items():
+            assert defaults[f"{TELEMETRY_INTERVAL_OPTION_PREFIX}{group}"] == interval
+        assert CONF_TELEMETRY_INTERVALS not in defaults
+
+    def test_saved_intervals_are_defaults(self):
+        """Saved intervals are shown; groups missing from them use the defaults."""
+        defaults = _schema_defaults(
+            _options_flow({CONF_COMPACT_TELEMETRY: True, CONF_TELEMETRY_INTERVALS: {"thermal": 120}})
+        )
+
+        assert defaults[CONF_COMPACT_TELEMETRY] is True
+        assert defaults[f"{TELEMETRY_INTERVAL_OPTION_PREFIX}thermal"] == 120
+        assert defaults[f"{TELEMETRY_INTERVAL_OPTION_PREFIX}system_health"] == 600
+
+    def test_intervals_saved_as_one_mapping(self):
+        """Submitted group intervals are stored under CONF_TELEMETRY_INTERVALS."""
+        flow = _options_flow()
+        user_input = {
+            "learning_profile": "balanced",
+            CONF_COMPACT_TELEMETRY: True,
+            f"{TELEMETRY_INTERVAL_OPTION_PREFIX}thermal": 90.0,
+            f"{TELEMETRY_INTERVAL_OPTION_PREFIX}algorithm": 600.0,
+        }
+
+        result = asyncio.run(flow.async_step_init(user_input))
+
+        assert result["type"] == "create_entry"
+        assert result["data"][CONF_COMPACT_TELEMETRY] is True
+        assert result["data"][CONF_TELEMETRY_INTERVALS] == {"thermal": 90, "algorithm": 600}
+        assert not any(key.startswith(TELEMETRY_INTERVAL_OPTION_PREFIX) for key in result["data"])
+
+    @pytest.mark.parametrize("value", [-30, 7200, "often"])
+    def test_invalid_interval_shows_error(self, value):
+        """Out-of-range or non-numeric intervals re-show the form with an error."""
+        flow = _options_flow()
+        field = f"{TELEMETRY_INTERVAL_OPTION_PREFIX}performance"
+
+        result = asyncio.run(flow.async_step_init({"learning_profile": "balanced", field: value}))
+
+        assert result["type"] == "form"
+        assert result["errors"] == {field: "invalid_telemetry_interval"}
+        flow.async_create_entry.assert_not_called()
+
+
+class TestLatencyInstrumentationOption:
+    """Test the offset engine latency instrumentation toggle."""
+
+    def test_field_offered_with_default(self):
+        """The toggle is in the form with its default."""
+        defaults = _schema_defaults(_options_flow())
+
+        assert defaults[CONF_LATENCY_INSTRUMENTATION] is DEFAULT_LATENCY_INSTRUMENTATION
+
+    def test_saved_value_is_default(self):
+        """A disabled toggle stays disabled when the form is reopened."""
+        defaults = _schema_defaults(_options_flow({CONF_LATENCY_INSTRUMENTATION: False}))
+
+        assert defaults[CONF_LATENCY_INSTRUMENTATION] is False
+
+
+class TestProbeEarlyStopOptions:
+    """Test the active probe early stop settings."""
+
+    def test_fields_offered_with_thermal_efficiency(self):
+        """The toggle and convergence width are thermal efficiency options."""
+        defaults = _schema_defaults(_options_flow({CONF_THERMAL_EFFICIENCY_ENABLED: True}))
+
+        assert defaults[CONF_PROBE_EARLY_STOP] is DEFAULT_PROBE_EARLY_STOP
+        assert defaults[CONF_PROBE_TAU_INTERVAL_WIDTH] == DEFAULT_PROBE_TAU_INTERVAL_WIDTH
+
+    def test_saved_values_are_defaults(self):
+        """Previously saved values are shown as the defaults."""
+        defaults = _schema_defaults(_options_flow({
+            CONF_THERMAL_EFFICIENCY_ENABLED: True,
+            CONF_PROBE_EARLY_STOP: False,
+            CONF_PROBE_TAU_INTERVAL_WIDTH: 0.1,
+        }))
+
+        assert defaults[CONF_PROBE_EARLY_STOP] is False
+        assert defaults[CONF_PROBE_TAU_INTERVAL_WIDTH] == 0.1
+
+    def test_hidden_without_thermal_efficiency(self):
+        """Without thermal efficiency there are no probes to configure."""
+        defaults = _schema_defaults(_options_flow())
+
+        assert CONF_PROBE_EARLY_STOP not in defaults
+        assert CONF_PROBE_TAU_INTERVAL_WIDTH not in defaults
+
+
+class TestTwoNodeThermalModelOption:
+    """Test the two-node thermal model toggle."""
+
+    def test_field_offered_with_thermal_efficiency(self):
+        """The toggle is a thermal efficiency option, off by default."""
+        defaults = _schema_defaults(_options_flow({CONF_THERMAL_EFFICIENCY_ENABLED: True}))
+
+        assert defaults[CONF_TWO_NODE_THERMAL_MODEL] is DEFAULT_TWO_NODE_THERMAL_MODEL
+
+    def test_saved_value_is_default(self):
+        """An enabled model stays enabled when the form is reopened."""
+        defaults = _schema_defaults(_options_flow({
+            CONF_THERMAL_EFFICIENCY_ENABLED: True,
+            CONF_TWO_NODE_THERMAL_MODEL: True,
+        }))
+
+        assert defaults[CONF_TWO_NODE_THERMAL_MODEL] is True
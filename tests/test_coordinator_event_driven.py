@@ -0,0 +1,268 @@
+"""ABOUTME: Tests for event-driven coordinator updates.
+Covers debounced triggers, partial stage recomputes, latency histograms and sensor change roles."""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from custom_components.smart_climate.coordinator import (
+    LATENCY_BUCKETS_MS,
+    STAGE_HUMIDITY,
+    STAGE_OFFSET,
+    STAGE_OUTLIERS,
+    STAGE_THERMAL,
+    SmartClimateCoordinator,
+)
+from custom_components.smart_climate.models import ModeAdjustments, OffsetResult
+from custom_components.smart_climate.sensor_manager import SensorManager
+
+
+def _coordinator(**kwargs):
+    """Create an event-driven coordinator with mocked dependencies."""
+    hass = Mock()
+    hass.states.get.return_value = None
+    sensor_manager = Mock()
+    sensor_manager.get_room_temperature.return_value = 24.0
+    sensor_manager.get_outdoor_temperature.return_value = 30.0
+    sensor_manager.get_power_consumption.return_value = 800.0
+    sensor_manager.get_indoor_humidity.return_value = 50.0
+    sensor_manager.get_outdoor_humidity.return_value = None
+    offset_engine = Mock()
+    offset_engine.calculate_offset.return_value = OffsetResult(
+        offset=1.0, clamped=False, reason="test", confidence=0.5
+    )
+    mode_manager = Mock()
+    mode_manager.current_mode = "none"
+    mode_manager.get_adjustments.return_value = ModeAdjustments(
+        temperature_override=None, offset_adjustment=0.0, update_interval_override=None, boost_offset=0.0
+    )
+    forecast_engine = Mock()
+    forecast_engine.async_update = AsyncMock()
+    humidity_monitor = Mock()
+    humidity_monitor.async_update = AsyncMock(return_value={"indoor_humidity": 50.0})
+
+    coordinator = SmartClimateCoordinator(
+        hass=hass,
+        update_interval=180,
+        sensor_manager=sensor_manager,
+        offset_engine=offset_engine,
+        mode_manager=mode_manager,
+        forecast_engine=forecast_engine,
+        outlier_detection_config={},
+        wrapped_entity_id="climate.ac",
+        humidity_monitor=humidity_monitor,
+        event_driven=True,
+        event_debounce=2.0,
+        **kwargs,
+    )
+    coordinator.hass = hass
+    coordinator.async_refresh = AsyncMock(side_effect=coordinator._async_update_data)
+    return coordinator
+
+
+class TestEventTriggers:
+    """Test debounced trigger scheduling."""
+
+    def test_triggers_are_coalesced_into_one_refresh(self):
+        """Triggers within the debounce window share one scheduled refresh."""
+        coordinator = _coordinator()
+
+        with patch("homeassistant.helpers.event.async_call_later", return_value=Mock()) as mock_later:
+            coordinator.async_trigger_update("room")
+            coordinator.async_trigger_update("power")
+            coordinator.async_trigger_update("room")
+
+        mock_later.assert_called_once()
+        assert mock_later.call_args[0][1] == 2.0
+        metrics = coordinator.get_event_update_metrics()
+        assert metrics["coalesced_trigger_count"] == 2
+        assert metrics["source_trigger_counts"]["room"] == 2
+        assert metrics["stage_trigger_counts"][STAGE_OUTLIERS] == 3
+        assert metrics["stage_trigger_counts"][STAGE_HUMIDITY] == 0
+
+    def test_unknown_source_is_ignored(self):
+        """Unknown sources neither count nor schedule a refresh."""
+        coordinator = _coordinator()
+
+        with patch("homeassistant.helpers.event.async_call_later") as mock_later:
+            coordinator.async_trigger_update("doorbell")
+
+        mock_later.assert_not_called()
+        assert sum(coordinator.get_event_update_metrics()["stage_trigger_counts"].values()) == 0
+
+
+class TestPartialRecompute:
+    """Test that event refreshes only run the affected stages."""
+
+    @staticmethod
+    async def _run_event_refresh(coordinator, *sources):
+        with patch("homeassistant.helpers.event.async_call_later", return_value=Mock()) as mock_later:
+            for source in sources:
+                coordinator.async_trigger_update(source)
+        await mock_later.call_args[0][2](None)
+
+    @pytest.mark.asyncio
+    async def test_first_event_refresh_without_previous_data_is_full(self):
+        """Without a previous update there is nothing to reuse, so all stages run."""
+        coordinator = _coordinator()
+
+        await self._run_event_refresh(coordinator, "outdoor")
+
+        coordinator._forecast_engine.async_update.assert_awaited_once()
+        coordinator._humidity_monitor.async_update.assert_awaited_once()
+        assert coordinator.get_event_update_metrics()["full_refresh_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_outdoor_change_skips_forecast_humidity_and_outliers(self):
+        """An outdoor change recomputes thermal, offset and cycles and reuses the rest."""
+        coordinator = _coordinator()
+        first = await coordinator._async_update_data()
+        history_size = coordinator._outlier_detector.get_history_size()
+
+        await self._run_event_refresh(coordinator, "outdoor")
+
+        coordinator._forecast_engine.async_update.assert_awaited_once()
+        coordinator._humidity_monitor.async_update.assert_awaited_once()
+        assert coordinator._outlier_detector.get_history_size() == history_size
+        assert coordinator._offset_engine.calculate_offset.call_count == 2
+        data = coordinator._last_update_data
+        assert data is not first
+        assert data.humidity_data == first.humidity_data
+        assert data.outlier_statistics == first.outlier_statistics
+
+    @pytest.mark.asyncio
+    async def test_room_change_runs_outlier_detection(self):
+        """A room change adds the reading to the outlier detector."""
+        coordinator = _coordinator()
+        await coordinator._async_update_data()
+        history_size = coordinator._outlier_detector.get_history_size()
+
+        await self._run_event_refresh(coordinator, "room")
+
+        assert coordinator._outlier_detector.get_history_size() > history_size
+        coordinator._humidity_monitor.async_update.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_humidity_change_runs_humidity_stage(self):
+        """A humidity change refreshes the humidity monitor and the offset only."""
+        coordinator = _coordinator()
+        await coordinator._async_update_data()
+
+        assert coordinator._consume_update_stages() is not None  # Full refresh again
+        coordinator._event_refresh_stages = frozenset({STAGE_HUMIDITY})
+        assert coordinator._consume_update_stages() == {STAGE_HUMIDITY, STAGE_OFFSET}
+
+        await self._run_event_refresh(coordinator, "indoor_humidity")
+
+        assert coordinator._humidity_monitor.async_update.await_count == 2
+        coordinator._forecast_engine.async_update.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_latency_histogram_records_each_source(self):
+        """Each triggering source gets one latency sample per refresh."""
+        coordinator = _coordinator()
+        await coordinator._async_update_data()
+
+        await self._run_event_refresh(coordinator, "room", "power", "room")
+
+        metrics = coordinator.get_event_update_metrics()
+        assert metrics["event_refresh_count"] == 1
+        assert set(metrics["latency_histograms"]) == {"room", "power"}
+        assert sum(metrics["latency_histograms"]["room"]) == 1
+        assert len(metrics["latency_histograms"]["room"]) == len(LATENCY_BUCKETS_MS) + 1
+        assert metrics["last_latency_ms"] is not None
+
+    def test_latency_buckets(self):
+        """Latencies fall into the first bucket whose bound they do not exceed."""
+        coordinator = _coordinator()
+
+        coordinator._record_latency("room", 50.0)
+        coordinator._record_latency("room", 250.0)
+        coordinator._record_latency("room", 60000.0)
+
+        histogram = coordinator.get_event_update_metrics()["latency_histograms"]["room"]
+        assert histogram[0] == 1
+        assert histogram[1] == 1
+        assert histogram[-1] == 1
+
+
+class TestEventTriggerSetup:
+    """Test wiring of sensor and climate state changes."""
+
+    @staticmethod
+    def _event(old_state, new_state, entity_id="climate.ac"):
+        event = Mock()
+        event.data = {"entity_id": entity_id, "old_state": old_state, "new_state": new_state}
+        return event
+
+    @staticmethod
+    def _state(state, **attributes):
+        return Mock(state=state, attributes=attributes)
+
+    def test_climate_changes_filtered_by_relevant_attributes(self):
+        """Only hvac mode, hvac action and current temperature changes trigger."""
+        coordinator = _coordinator()
+        coordinator.async_trigger_update = Mock()
+
+        with patch("homeassistant.helpers.event.async_track_state_change_event") as mock_track:
+            remove = coordinator.async_setup_event_triggers()
+        handler = mock_track.call_args[0][2]
+
+        handler(self._event(self._state("cool", temperature=22), self._state("cool", temperature=21)))
+        coordinator.async_trigger_update.assert_not_called()
+
+        handler(self._event(self._state("cool", hvac_action="idle"), self._state("cool", hvac_action="cooling")))
+        coordinator.async_trigger_update.assert_called_once_with("climate")
+
+        remove()
+        mock_track.return_value.assert_called_once()
+        coordinator._sensor_manager.register_change_callback.return_value.assert_called_once()
+
+    def test_remove_cancels_pending_refresh(self):
+        """Removing the triggers cancels a scheduled refresh."""
+        coordinator = _coordinator()
+        cancel = Mock()
+        with patch("homeassistant.helpers.event.async_track_state_change_event"):
+            remove = coordinator.async_setup_event_triggers()
+        with patch("homeassistant.helpers.event.async_call_later", return_value=cancel):
+            coordinator.async_trigger_update("room")
+
+        remove()
+
+        cancel.assert_called_once()
+        assert coordinator._cancel_event_refresh is None
+
+    def test_polling_mode_has_no_triggers(self):
+        """Without event-driven mode nothing is registered."""
+        coordinator = SmartClimateCoordinator(
+            hass=Mock(), update_interval=180, sensor_manager=Mock(),
+            offset_engine=Mock(), mode_manager=Mock(),
+        )
+
+        coordinator.async_setup_event_triggers()()
+
+        coordinator._sensor_manager.register_change_callback.assert_not_called()
+
+
+class TestSensorChangeCallbacks:
+    """Test SensorManager change callbacks carrying the sensor role."""
+
+    @pytest.mark.asyncio
+    async def test_role_passed_and_unchanged_readings_skipped(self):
+        """Callbacks get the role; attribute-only changes are not reported."""
+        manager = SensorManager(Mock(), "sensor.room", outdoor_sensor_id="sensor.outdoor", power_sensor_id="sensor.power")
+        callback = Mock()
+        unregister = manager.register_change_callback(callback)
+
+        event = Mock()
+        event.data = {"entity_id": "sensor.power", "old_state": Mock(state="10"), "new_state": Mock(state="800")}
+        await manager._async_sensor_state_changed(event)
+        event.data = {"entity_id": "sensor.room", "old_state": Mock(state="24.0"), "new_state": Mock(state="24.0")}
+        await manager._async_sensor_state_changed(event)
+
+        callback.assert_called_once_with("power")
+
+        unregister()
+        event.data = {"entity_id": "sensor.outdoor", "old_state": None, "new_state": Mock(state="30")}
+        await manager._async_sensor_state_changed(event)
+        callback.assert_called_once()
@@ -0,0 +1,186 @@
+"""ABOUTME: Tests for the staged coordinator update pipeline.
+Covers single reads per update, offset stage memoization and published stage timings."""
+
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import pytest
+
+from custom_components.smart_climate.coordinator import (
+    STAGE_MEMO_MAX_AGE,
+    STAGE_OFFSET,
+    STAGE_SNAPSHOT,
+    UPDATE_PIPELINE,
+    SmartClimateCoordinator,
+)
+from custom_components.smart_climate.models import ModeAdjustments, OffsetResult
+
+
+def _coordinator(**kwargs):
+    """Create a coordinator with mocked dependencies and a cache-aware offset engine."""
+    hass = Mock()
+    hass.data = {}
+    hass.states.get.return_value = Mock(
+        state="cool", attributes={"current_temperature": 22.0, "hvac_action": "cooling"}
+    )
+    sensor_manager = Mock()
+    sensor_manager.get_room_temperature.return_value = 24.0
+    sensor_manager.get_outdoor_temperature.return_value = 30.0
+    sensor_manager.get_power_consumption.return_value = 800.0
+    sensor_manager.get_indoor_humidity.return_value = 50.0
+    sensor_manager.get_outdoor_humidity.return_value = None
+    offset_engine = Mock()
+    offset_engine.calculate_offset.return_value = OffsetResult(
+        offset=1.0, clamped=False, reason="test", confidence=0.5
+    )
+    offset_engine.get_offset_cache_token.return_value = (1, 1)
+    mode_manager = Mock()
+    mode_manager.current_mode = "none"
+    mode_manager.get_adjustments.return_value = ModeAdjustments(
+        temperature_override=None, offset_adjustment=0.0, update_interval_override=None, boost_offset=0.0
+    )
+
+    coordinator = SmartClimateCoordinator(
+        hass=hass,
+        update_interval=180,
+        sensor_manager=sensor_manager,
+        offset_engine=offset_engine,
+        mode_manager=mode_manager,
+        outlier_detection_config={},
+        wrapped_entity_id="climate.ac",
+        entity_id="climate.smart_ac",
+        **kwargs,
+    )
+    coordinator.hass = hass
+    return coordinator
+
+
+class TestPipelineReads:
+    """Test that shared inputs are read once per update."""
+
+    @pytest.mark.asyncio
+    async def test_wrapped_state_and_thermal_manager_read_once(self):
+        """The snapshot stage reads the wrapped entity and ThermalManager once."""
+        coordinator = _coordinator()
+
+        with patch.object(coordinator, "get_thermal_manager", return_value=None) as mock_get:
+            data = await coordinator._async_update_data()
+
+        coordinator.hass.states.get.assert_called_once_with("climate.ac")
+        mock_get.assert_called_once_with("climate.smart_ac")
+        args = coordinator._offset_engine.calculate_offset.call_args[0][0]
+        assert args.ac_internal_temp == 22.0
+        assert args.hvac_mode == "cool"
+        assert data.calculated_offset == 1.0
+
+    def test_stages_declare_inputs_produced_earlier(self):
+        """Every stage input is an output of an earlier stage."""
+        produced = set()
+        for stage in UPDATE_PIPELINE:
+            assert set(stage.inputs) <= produced, stage.name
+            produced.update(stage.outputs)
+        assert UPDATE_PIPELINE[0].name == STAGE_SNAPSHOT
+
+
+class TestOffsetMemoization:
+    """Test that the offset stage is skipped while its inputs are unchanged."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_inputs_reuse_offset(self):
+        """A second update with the same readings and engine state skips the calculation."""
+        coordinator = _coordinator()
+
+        await coordinator._async_update_data()
+        data = await coordinator._async_update_data()
+
+        coordinator._offset_engine.calculate_offset.assert_called_once()
+        assert data.calculated_offset == 1.0
+        assert data.stage_cache_hits[STAGE_OFFSET] == 1
+
+    @pytest.mark.asyncio
+    async def test_changed_reading_recalculates(self):
+        """A new room temperature changes the fingerprint."""
+        coordinator = _coordinator()
+
+        await coordinator._async_update_data()
+        coordinator._sensor_manager.get_room_temperature.return_value = 24.5
+        await coordinator._async_update_data()
+
+        assert coordinator._offset_engine.calculate_offset.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_hour_change_recalculates(self):
+        """A new hour changes the fingerprint even when the readings are the same."""
+        coordinator = _coordinator()
+
+        with patch("custom_components.smart_climate.coordinator.datetime") as mock_datetime:
+            mock_datetime.now.return_value = datetime(2024, 7, 1, 13, 59)
+            await coordinator._async_update_data()
+            mock_datetime.now.return_value = datetime(2024, 7, 1, 14, 0)
+            await coordinator._async_update_data()
+
+        assert coordinator._offset_engine.calculate_offset.call_count == 2
+        args = coordinator._offset_engine.calculate_offset.call_args[0][0]
+        assert args.time_of_day.hour == 14
+
+    @pytest.mark.asyncio
+    async def test_engine_state_change_recalculates(self):
+        """New learning data changes the engine token and invalidates the memo."""
+        coordinator = _coordinator()
+
+        await coordinator._async_update_data()
+        coordinator._offset_engine.get_offset_cache_token.return_value = (1, 2)
+        await coordinator._async_update_data()
+
+        assert coordinator._offset_engine.calculate_offset.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_memo_expires(self):
+        """Memoized outputs are recomputed after the maximum age."""
+        coordinator = _coordinator()
+
+        with patch("custom_components.smart_climate.coordinator.time.monotonic", return_value=1000.0):
+            await coordinator._async_update_data()
+        with patch(
+            "custom_components.smart_climate.coordinator.time.monotonic",
+            return_value=1000.0 + STAGE_MEMO_MAX_AGE,
+        ):
+            await coordinator._async_update_data()
+
+        assert coordinator._offset_engine.calculate_offset.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_engine_without_token_is_not_memoized(self):
+        """Engines without a cache token are recalculated on every update."""
+        coordinator = _coordinator()
+        coordinator._offset_engine.get_offset_cache_token.return_value = None
+
+        await coordinator._async_update_data()
+        await coordinator._async_update_data()
+
+        assert coordinator._offset_engine.calculate_offset.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_outliers_run_on_every_update(self):
+        """Outlier detection records each reading, so it is never memoized."""
+        coordinator = _coordinator()
+
+        await coordinator._async_update_data()
+        await coordinator._async_update_data()
+
+        assert coordinator._outlier_detector.get_history_size() == 2
+
+
+class TestStageTimings:
+    """Test the published stage timings."""
+
+    @pytest.mark.asyncio
+    async def test_timings_for_every_stage(self):
+        """Each stage gets a non-negative duration on the coordinator data."""
+        coordinator = _coordinator()
+
+        data = await coordinator._async_update_data()
+
+        assert set(data.stage_timings_ms) == {stage.name for stage in UPDATE_PIPELINE}
+        assert all(duration >= 0.0 for duration in data.stage_timings_ms.values())
+        assert data.stage_cache_hits == {STAGE_OFFSET: 0}
@@ -0,0 +1,158 @@
+"""ABOUTME: Tests for the shared algorithm metrics snapshot behind the dashboard sensors.
+Checks the vectorized metrics match the per-metric formulas and are computed once per learner change."""
+
+import random
+import statistics
+from unittest.mock import Mock, patch
+
+import pytest
+
+from custom_components.smart_climate import lightweight_learner
+from custom_components.smart_climate import sample_store
+from custom_components.smart_climate.offset_engine import OffsetEngine
+from custom_components.smart_climate.sample_store import (
+    SampleMetrics,
+    _compute_sample_metrics_python,
+    compute_sample_metrics,
+)
+from custom_components.smart_climate.sensor_algorithm import (
+    CorrelationCoefficientSensor,
+    PredictionVarianceSensor,
+    ModelEntropySensor,
+    LearningRateSensor,
+    MomentumFactorSensor,
+    RegularizationStrengthSensor,
+    MeanSquaredErrorSensor,
+    MeanAbsoluteErrorSensor,
+    RSquaredSensor,
+)
+
+ALGORITHM_SENSORS = (
+    CorrelationCoefficientSensor,
+    PredictionVarianceSensor,
+    ModelEntropySensor,
+    LearningRateSensor,
+    MomentumFactorSensor,
+    RegularizationStrengthSensor,
+    MeanSquaredErrorSensor,
+    MeanAbsoluteErrorSensor,
+    RSquaredSensor,
+)
+
+
+def _trained_engine(sample_count=120):
+    """Create an OffsetEngine whose learner holds random samples."""
+    engine = OffsetEngine({"enable_learning": True, "max_offset": 5.0})
+    rng = random.Random(7)
+    for _ in range(sample_count):
+        engine._learner.add_sample(
+            predicted=rng.uniform(-2.0, 2.0),
+            actual=rng.uniform(-2.0, 2.0),
+            ac_temp=rng.uniform(20.0, 28.0),
+            room_temp=rng.uniform(20.0, 28.0),
+            outdoor_temp=rng.uniform(15.0, 35.0),
+            mode="none",
+        )
+    return engine
+
+
+def _add_sample(engine):
+    """Add one more sample to the engine's learner."""
+    engine._learner.add_sample(
+        predicted=0.5, actual=0.7, ac_temp=24.0, room_temp=25.0, outdoor_temp=30.0, mode="none"
+    )
+
+
+class TestComputeSampleMetrics:
+    """Tests for compute_sample_metrics()."""
+
+    def test_matches_reference_formulas(self):
+        """Metrics agree with the straightforward statistics-module formulas."""
+        rng = random.Random(3)
+        predicted = [rng.uniform(-2.0, 2.0) for _ in range(50)]
+        actual = [rng.uniform(-2.0, 2.0) for _ in range(50)]
+
+        metrics = compute_sample_metrics(predicted, actual)
+
+        errors = [abs(p - a) for p, a in zip(predicted, actual)]
+        actual_mean = statistics.mean(actual)
+        ss_total = sum((a - actual_mean) ** 2 for a in actual)
+        ss_residual = sum((a - p) ** 2 for p, a in zip(predicted, actual))
+        assert metrics.sample_count == 50
+        assert metrics.prediction_variance == pytest.approx(statistics.variance(predicted))
+        assert metrics.mean_absolute_error == pytest.approx(statistics.mean(errors))
+        assert metrics.mean_squared_error == pytest.approx(statistics.mean(e * e for e in errors))
+        assert metrics.r_squared == pytest.approx(1.0 - ss_residual / ss_total)
+        assert metrics.momentum_factor == pytest.approx(
+            1.0 / (1.0 + statistics.stdev(errors) / statistics.mean(errors))
+        )
+
+    def test_vectorized_matches_python_fallback(self):
+        """The numpy and pure Python paths produce the same snapshot."""
+        if not sample_store.HAS_NUMPY:
+            pytest.skip("numpy not installed")
+        rng = random.Random(11)
+        predicted = [rng.uniform(-3.0, 3.0) for _ in range(200)]
+        actual = [rng.uniform(-3.0, 3.0) for _ in range(200)]
+        temps = [rng.uniform(10.0, 35.0) for _ in range(40)]
+        offsets = [t * 0.1 + rng.uniform(-0.5, 0.5) for t in temps]
+
+        vectorized = compute_sample_metrics(predicted, actual, temps, offsets)
+        reference = _compute_sample_metrics_python(predicted, actual, temps, offsets)
+
+        for name in SampleMetrics.__dataclass_fields__:
+            assert getattr(vectorized, name) == pytest.approx(getattr(reference, name)), name
+
+    def test_too_few_samples_gives_zeros(self):
+        """Metrics needing more samples than available stay at 0.0."""
+        assert compute_sample_metrics([], []) == SampleMetrics()
+
+        single = compute_sample_metrics([1.0], [1.5])
+        assert single.mean_absolute_error == pytest.approx(0.5)
+        assert single.prediction_variance == 0.0
+        assert single.r_squared == 0.0
+        assert single.momentum_factor == 0.0
+
+
+class TestSharedMetricsSnapshot:
+    """The snapshot is computed once and shared by every consumer."""
+
+    @pytest.mark.asyncio
+    async def test_sensor_reads_cause_one_pass(self):
+        """One coordinator refresh plus N sensor and attribute reads compute the metrics once."""
+        engine = _trained_engine()
+        with patch.object(
+            lightweight_learner, "compute_sample_metrics", wraps=compute_sample_metrics
+        ) as compute:
+            coordinator = Mock()
+            coordinator.data = await engine.async_get_dashboard_data()
+            sensors = [cls(coordinator, "climate.test_ac", Mock()) for cls in ALGORITHM_SENSORS]
+
+            for _ in range(25):
+                values = [sensor.native_value for sensor in sensors]
+                engine.get_metrics_snapshot()
+
+            assert compute.call_count == 1
+
+        snapshot = engine.get_metrics_snapshot()
+        assert values[1] == round(snapshot.prediction_variance, 3)
+        assert values[8] == round(snapshot.r_squared, 3)
+
+    @pytest.mark.asyncio
+    async def test_snapshot_recomputed_after_new_sample(self):
+        """Adding a learning sample invalidates the snapshot."""
+        engine = _trained_engine()
+        first = engine.get_metrics_snapshot()
+
+        _add_sample(engine)
+
+        second = engine.get_metrics_snapshot()
+        assert second is not first
+        assert second.sample_count == first.sample_count + 1
+        data = await engine.async_get_dashboard_data()
+        assert data["algorithm_metrics"]["prediction_variance"] == pytest.approx(second.prediction_variance)
+
+    def test_no_learner_returns_empty_snapshot(self):
+        """Engines without learning report an empty snapshot."""
+        engine = OffsetEngine({"enable_learning": False})
+        assert engine.get_metrics_snapshot() == SampleMetrics()
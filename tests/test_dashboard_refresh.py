@@ -0,0 +1,106 @@
+"""ABOUTME: Tests for the adaptive dashboard refresh interval.
+Covers exponential backoff while idle, reset on engine activity and the OffsetEngine dashboard token."""
+
+import pytest
+
+from custom_components.smart_climate.dashboard_refresh import AdaptiveRefreshPolicy
+from custom_components.smart_climate.offset_engine import OffsetEngine
+
+
+class TestAdaptiveRefreshPolicy:
+    """Tests for AdaptiveRefreshPolicy."""
+
+    def test_backs_off_while_token_unchanged(self):
+        """Unchanged tokens double the interval up to the idle bound."""
+        policy = AdaptiveRefreshPolicy(active_interval=15, idle_interval=300, backoff_factor=2.0)
+
+        intervals = [policy.next_interval("same") for _ in range(8)]
+
+        assert intervals == [15, 30, 60, 120, 240, 300, 300, 300]
+
+    def test_changed_token_returns_to_active_interval(self):
+        """Activity after a long idle period refreshes quickly again."""
+        policy = AdaptiveRefreshPolicy(active_interval=15, idle_interval=300)
+        for _ in range(10):
+            policy.next_interval(1)
+
+        assert policy.interval == 300
+        assert policy.next_interval(2) == 15
+
+    def test_reset_returns_to_active_interval(self):
+        """reset() drops back to the active interval and forgets the last token."""
+        policy = AdaptiveRefreshPolicy(active_interval=15, idle_interval=300)
+        for _ in range(5):
+            policy.next_interval(1)
+
+        policy.reset()
+
+        assert policy.interval == 15
+        assert policy.next_interval(1) == 15
+
+    def test_invalid_configuration_rejected(self):
+        """Intervals and backoff factor are validated."""
+        with pytest.raises(ValueError):
+            AdaptiveRefreshPolicy(active_interval=0)
+        with pytest.raises(ValueError):
+            AdaptiveRefreshPolicy(active_interval=60, idle_interval=30)
+        with pytest.raises(ValueError):
+            AdaptiveRefreshPolicy(backoff_factor=0.5)
+
+    def test_idle_day_needs_fewer_refreshes(self):
+        """An idle day refreshes far less often than the former fixed 30 second poll."""
+        policy = AdaptiveRefreshPolicy()
+        elapsed = 0.0
+        refreshes = 0
+        while elapsed < 24 * 3600:
+            elapsed += policy.next_interval("idle")
+            refreshes += 1
+
+        assert refreshes < (24 * 3600 // 30) / 5
+
+
+class TestDashboardToken:
+    """Tests for OffsetEngine.get_dashboard_token()."""
+
+    def test_stable_while_idle(self):
+        """The token does not change when nothing happens."""
+        engine = OffsetEngine({"enable_learning": True})
+
+        assert engine.get_dashboard_token() == engine.get_dashboard_token()
+
+    def test_changes_after_sample(self):
+        """A learned sample changes the token."""
+        engine = OffsetEngine({"enable_learning": True})
+        before = engine.get_dashboard_token()
+
+        engine._learner.add_sample(
+            predicted=0.5, actual=0.7, ac_temp=24.0, room_temp=25.0, outdoor_temp=30.0, mode="none"
+        )
+
+        assert engine.get_dashboard_token() != before
+
+    def test_changes_after_save_and_transition(self):
+        """Saves and power state transitions change the token."""
+        engine = OffsetEngine({"enable_learning": True})
+        before = engine.get_dashboard_token()
+
+        engine._save_count += 1
+        after_save = engine.get_dashboard_token()
+        engine._last_power_state = "high"
+
+        assert after_save != before
+        assert engine.get_dashboard_token() != after_save
+
+    def test_update_callback_fires_on_learning_toggle(self):
+        """Learning toggles notify the callback the coordinator uses for an immediate refresh."""
+        engine = OffsetEngine({"enable_learning": False})
+        policy = AdaptiveRefreshPolicy(active_interval=15, idle_interval=300)
+        for _ in range(6):
+            policy.next_interval(engine.get_dashboard_token())
+        unregister = engine.register_update_callback(policy.reset)
+
+        engine.enable_learning()
+
+        assert policy.interval == 15
+        unregister()
+        assert policy.reset not in engine._update_callbacks
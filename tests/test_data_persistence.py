@@ -75,12 +75,8 @@ class TestSmartClimateDataStore:
             
             await store.async_save_learning_data(learning_data)
             
-            # Verify that executor jobs were called for directory creation, backup, and atomic write
-            assert hass.async_add_executor_job.call_count >= 2  # At least directory and write operations
-            
-            # Verify atomic write was called through executor
-            executor_calls = [call[0][0] for call in hass.async_add_executor_job.call_args_list]
-            assert any("atomic_json_write" in str(func) for func in executor_calls)
+            # The whole save (directory, diff, atomic write) is one executor job
+            hass.async_add_executor_job.assert_called_once_with(store._save_sync, learning_data)
     
     @pytest.mark.asyncio
     async def test_save_learning_data_creates_backup_if_file_exists(self):
@@ -104,8 +100,8 @@ class TestSmartClimateDataStore:
             
             await store.async_save_learning_data(learning_data)
             
-            # Verify executor jobs were called 
-            assert hass.async_add_executor_job.call_count >= 2
+            # Verify the save ran as one executor job
+            assert hass.async_add_executor_job.call_count == 1
     
     @pytest.mark.asyncio
     async def test_save_learning_data_handles_write_errors(self):
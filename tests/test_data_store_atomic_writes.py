@@ -511,8 +511,8 @@ class TestDataStoreThreadSafety:
         await asyncio.gather(*save_tasks)
         
         # Operations should be serialized (not interleaved)
-        # Each save should complete fully before next one starts
-        assert len(operation_order) >= 6  # At least 2 operations per save (directory + write)
+        # Each save runs as one complete executor job
+        assert operation_order == ["_save_sync"] * 3
     
     @pytest.mark.asyncio
     async def test_concurrent_save_and_load_operations(self):
@@ -575,20 +575,15 @@ class TestCompleteDataLossScenarios:
             with primary_file.open("w") as f:
                 json.dump(good_data, f)
             
-            # Simulate power loss during atomic write (after backup created)
-            call_count = 0
-            def failing_executor(func, *args):
-                nonlocal call_count
-                call_count += 1
-                if call_count <= 2:  # Allow directory creation and backup
-                    return func(*args) if args else func()
-                else:  # Fail on atomic write (simulating power loss)
-                    raise OSError("Power loss - write interrupted")
-            
-            hass.async_add_executor_job.side_effect = failing_executor
+            # Simulate power loss during atomic write
+            hass.async_add_executor_job.side_effect = lambda func, *args: func(*args) if args else func()
             
-            # Save should fail gracefully
-            await store.async_save_learning_data({"new": "data"})
+            with patch(
+                "custom_components.smart_climate.data_store.atomic_json_write",
+                side_effect=OSError("Power loss - write interrupted"),
+            ):
+                # Save should fail gracefully
+                await store.async_save_learning_data({"new": "data"})
             
             # Original file should still be intact
             assert primary_file.exists()
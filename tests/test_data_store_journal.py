@@ -0,0 +1,282 @@
+"""ABOUTME: Tests for the snapshot + append-only journal persistence in SmartClimateDataStore.
+Covers delta appends, compaction, crash replay, stale generations and migration of pre-journal files."""
+
+import json
+import tempfile
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from custom_components.smart_climate.data_store import (
+    SmartClimateDataStore,
+    WRITE_KIND_APPEND,
+    WRITE_KIND_COMPACTION,
+    apply_journal_ops,
+    journal_diff,
+)
+
+
+def _sample(i):
+    """Build an enhanced-sample-like record."""
+    return {"predicted": i * 0.1, "actual": i * 0.2, "ac_temp": 22.0, "room_temp": 24.0, "mode": "cool"}
+
+
+def _learning_data(samples, hour_offset=0.5):
+    """Build a persistent_data-like payload as OffsetEngine saves it."""
+    return {
+        "version": "2.1",
+        "learning_data": {
+            "engine_state": {"enable_learning": True},
+            "learner_data": {
+                "version": "1.2",
+                "time_patterns": {13: hour_offset},
+                "enhanced_samples": samples,
+                "sample_count": len(samples),
+            },
+        },
+        "thermal_data": None,
+    }
+
+
+@pytest.fixture
+def config_dir():
+    """Temporary Home Assistant config directory."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield temp_dir
+
+
+def _store(config_dir, compaction_ratio=0.5):
+    """Create a data store whose executor runs jobs inline."""
+    hass = Mock()
+    hass.config.config_dir = config_dir
+    hass.async_add_executor_job = AsyncMock(side_effect=lambda func, *args: func(*args))
+    return SmartClimateDataStore(hass, "climate.test", compaction_ratio=compaction_ratio)
+
+
+def _read_snapshot(store):
+    with store.get_data_file_path().open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class TestJournalDiff:
+    """Test the journal diff and replay helpers."""
+
+    def test_round_trip_reproduces_new_state(self):
+        """Applying the diff to the old JSON state yields the new state."""
+        old = json.loads(json.dumps(_learning_data([_sample(i) for i in range(10)])))
+        new = _learning_data([_sample(i) for i in range(3, 15)], hour_offset=0.7)
+        new["learning_data"]["hysteresis_data"] = {"start_temps": [24.5]}
+        del new["thermal_data"]
+
+        ops = journal_diff(old, new)
+        result = apply_journal_ops(old, json.loads(json.dumps(ops)))
+
+        assert result == json.loads(json.dumps(new))
+
+    def test_pruned_history_is_an_extend(self):
+        """A list pruned at the front and appended at the end only journals new items."""
+        old = [_sample(i) for i in range(10)]
+        new = [_sample(i) for i in range(4, 12)]
+
+        assert journal_diff(old, new) == [["extend", [], 4, [_sample(10), _sample(11)]]]
+
+    def test_unchanged_state_has_no_ops(self):
+        """Identical states produce no operations, including int dict keys."""
+        data = _learning_data([_sample(1)])
+
+        assert journal_diff(json.loads(json.dumps(data)), data) == []
+
+
+class TestJournaledPersistence:
+    """Test SmartClimateDataStore journaling on a real filesystem."""
+
+    @pytest.mark.asyncio
+    async def test_first_save_writes_snapshot(self, config_dir):
+        """Without a known persisted state the save writes a compact snapshot."""
+        store = _store(config_dir)
+        data = _learning_data([_sample(i) for i in range(5)])
+
+        await store.async_save_learning_data(data)
+
+        snapshot = _read_snapshot(store)
+        assert snapshot["version"] == "1.0"
+        assert snapshot["journal_generation"] == 1
+        assert snapshot["learning_data"] == json.loads(json.dumps(data))
+        assert "\n" not in store.get_data_file_path().read_text(encoding="utf-8")
+        assert not store._journal_file_path.exists()
+        assert store.get_last_write_latency(WRITE_KIND_COMPACTION) > 0.0
+
+    @pytest.mark.asyncio
+    async def test_later_saves_append_only_new_samples(self, config_dir):
+        """New samples are appended to the journal and replayed on load."""
+        store = _store(config_dir)
+        samples = [_sample(i) for i in range(200)]
+        await store.async_save_learning_data(_learning_data(samples))
+        snapshot_before = store.get_data_file_path().read_bytes()
+
+        samples.extend(_sample(i) for i in range(200, 205))
+        await store.async_save_learning_data(_learning_data(samples))
+        del samples[:3]
+        samples.append(_sample(205))
+        await store.async_save_learning_data(_learning_data(samples, hour_offset=0.6))
+
+        assert store.get_data_file_path().read_bytes() == snapshot_before
+        assert store.get_journal_stats()["journal_entries"] == 2
+        journal_lines = store._journal_file_path.read_text(encoding="utf-8").splitlines()
+        assert all(len(line) < 1000 for line in journal_lines)
+        assert store.get_last_write_latency(WRITE_KIND_APPEND) > 0.0
+        assert store.get_last_write_latency() == store.get_last_write_latency(WRITE_KIND_APPEND)
+
+        loaded = await _store(config_dir).async_load_learning_data()
+        assert loaded == json.loads(json.dumps(_learning_data(samples, hour_offset=0.6)))
+
+    @pytest.mark.asyncio
+    async def test_diff_runs_inside_the_executor_job(self, config_dir):
+        """Diffing and serialization happen in the executor, one job per save."""
+        store = _store(config_dir)
+        in_executor = False
+        plan_threads = []
+
+        def executor(func, *args):
+            nonlocal in_executor
+            in_executor = True
+            try:
+                return func(*args)
+            finally:
+                in_executor = False
+
+        plan_save = store._plan_save
+
+        def tracking_plan_save(learning_data):
+            plan_threads.append(in_executor)
+            return plan_save(learning_data)
+
+        store._hass.async_add_executor_job.side_effect = executor
+        store._plan_save = tracking_plan_save
+        samples = [_sample(i) for i in range(50)]
+        await store.async_save_learning_data(_learning_data(samples))
+        samples.append(_sample(50))
+        await store.async_save_learning_data(_learning_data(samples))
+
+        assert plan_threads == [True, True]
+        assert store._hass.async_add_executor_job.call_count == 2
+        assert store.get_journal_stats()["journal_entries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unchanged_save_writes_nothing(self, config_dir):
+        """Saving identical data neither appends nor compacts."""
+        store = _store(config_dir)
+        data = _learning_data([_sample(i) for i in range(20)])
+        await store.async_save_learning_data(data)
+
+        await store.async_save_learning_data(data)
+
+        assert not store._journal_file_path.exists()
+        assert store.get_journal_stats()["generation"] == 1
+
+    @pytest.mark.asyncio
+    async def test_compaction_when_journal_exceeds_ratio(self, config_dir):
+        """The journal is folded into a new snapshot once it outgrows the ratio."""
+        store = _store(config_dir, compaction_ratio=0.1)
+        samples = [_sample(i) for i in range(50)]
+        await store.async_save_learning_data(_learning_data(samples))
+
+        for i in range(50, 70):
+            samples.append(_sample(i))
+            await store.async_save_learning_data(_learning_data(samples))
+
+        stats = store.get_journal_stats()
+        assert stats["generation"] > 1
+        assert stats["journal_size_bytes"] <= 0.1 * stats["snapshot_size_bytes"]
+        assert _read_snapshot(store)["journal_generation"] == stats["generation"]
+        loaded = await _store(config_dir).async_load_learning_data()
+        assert loaded["learning_data"]["learner_data"]["enhanced_samples"] == samples
+
+    @pytest.mark.asyncio
+    async def test_replay_stops_at_torn_entry_and_next_save_compacts(self, config_dir):
+        """A partially written last entry is ignored and removed by the next save."""
+        store = _store(config_dir)
+        samples = [_sample(i) for i in range(100)]
+        await store.async_save_learning_data(_learning_data(samples))
+        samples.append(_sample(100))
+        await store.async_save_learning_data(_learning_data(samples))
+        with store._journal_file_path.open("a", encoding="utf-8") as f:
+            f.write('{"generation":1,"ops":[["ext')
+
+        recovered = _store(config_dir)
+        loaded = await recovered.async_load_learning_data()
+
+        assert loaded["learning_data"]["learner_data"]["enhanced_samples"] == samples
+        samples.append(_sample(101))
+        await recovered.async_save_learning_data(_learning_data(samples))
+        assert _read_snapshot(recovered)["journal_generation"] == 2
+        assert not recovered._journal_file_path.exists()
+
+    @pytest.mark.asyncio
+    async def test_stale_generation_entries_are_ignored(self, config_dir):
+        """Entries left over from before a compaction are not replayed twice."""
+        store = _store(config_dir)
+        samples = [_sample(i) for i in range(100)]
+        await store.async_save_learning_data(_learning_data(samples))
+        stale_entry = json.dumps({"generation": 0, "ops": [["set", ["version"], "stale"]]})
+        store._journal_file_path.write_text(stale_entry + "\n", encoding="utf-8")
+
+        loaded = await _store(config_dir).async_load_learning_data()
+
+        assert loaded["version"] == "2.1"
+
+    @pytest.mark.asyncio
+    async def test_pre_journal_file_is_migrated(self, config_dir):
+        """An indented v2.1 file without a generation loads and is snapshotted on next save."""
+        store = _store(config_dir)
+        data = _learning_data([_sample(i) for i in range(10)])
+        path = store.get_data_file_path()
+        path.parent.mkdir(parents=True)
+        path.write_text(json.dumps({
+            "version": "1.0",
+            "entity_id": "climate.test",
+            "last_updated": "2025-07-07T17:15:00",
+            "learning_enabled": True,
+            "learning_data": data,
+        }, indent=2), encoding="utf-8")
+
+        loaded = await store.async_load_learning_data()
+        assert loaded == json.loads(json.dumps(data))
+
+        await store.async_save_learning_data(loaded)
+        snapshot = _read_snapshot(store)
+        assert snapshot["journal_generation"] == 1
+        assert snapshot["learning_data"] == loaded
+        assert Path(f"{path}.backup").exists()
+
+    @pytest.mark.asyncio
+    async def test_manual_compaction(self, config_dir):
+        """async_compact_journal folds pending entries into a new snapshot."""
+        store = _store(config_dir)
+        samples = [_sample(i) for i in range(100)]
+        await store.async_save_learning_data(_learning_data(samples))
+        assert await store.async_compact_journal() is False
+
+        samples.append(_sample(100))
+        await store.async_save_learning_data(_learning_data(samples))
+        assert await store.async_compact_journal() is True
+
+        assert not store._journal_file_path.exists()
+        assert _read_snapshot(store)["learning_data"]["learning_data"]["learner_data"]["enhanced_samples"] == samples
+
+    @pytest.mark.asyncio
+    async def test_delete_moves_journal_aside(self, config_dir):
+        """Deleting learning data also retires the journal and resets journal state."""
+        store = _store(config_dir)
+        samples = [_sample(i) for i in range(100)]
+        await store.async_save_learning_data(_learning_data(samples))
+        samples.append(_sample(100))
+        await store.async_save_learning_data(_learning_data(samples))
+
+        await store.delete_learning_data()
+
+        assert not store._journal_file_path.exists()
+        assert store._journal_file_path.with_suffix(".journal.deleted").exists()
+        assert await store.async_load_learning_data() is None
+        assert store.get_journal_stats()["journal_entries"] == 0
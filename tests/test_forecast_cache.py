@@ -0,0 +1,197 @@
+"""ABOUTME: Tests for the domain-wide forecast cache shared by all ForecastEngine instances.
+Covers one fetch per TTL, coalescing of concurrent requests, failures and hit/miss metrics."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from custom_components.smart_climate.forecast_cache import (
+    DATA_FORECAST_CACHE,
+    DEFAULT_FORECAST_TTL,
+    ForecastCache,
+    async_get_forecast_cache,
+    async_remove_forecast_cache,
+    parse_forecasts,
+)
+from custom_components.smart_climate.forecast_engine import ForecastEngine
+
+NOW = datetime(2026, 7, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _response(entity_id="weather.home", hours=(2, 1, 3)):
+    return {
+        entity_id: {
+            "forecast": [
+                {"datetime": (NOW + timedelta(hours=h)).isoformat(), "temperature": 30.0 + h, "condition": "sunny"}
+                for h in hours
+            ]
+        }
+    }
+
+
+@pytest.fixture
+def hass():
+    """Mock hass whose weather service answers after yielding to the loop."""
+    mock_hass = Mock()
+    mock_hass.data = {}
+
+    async def _call(domain, service, data, blocking=False, return_response=False):
+        await asyncio.sleep(0)
+        return _response(data["entity_id"])
+
+    mock_hass.services.async_call = AsyncMock(side_effect=_call)
+    return mock_hass
+
+
+@pytest.fixture(autouse=True)
+def utcnow():
+    """Freeze dt_util.utcnow for the TTL checks and parse ISO datetimes."""
+    dt_util = "custom_components.smart_climate.forecast_cache.dt_util"
+    with patch(f"{dt_util}.utcnow", return_value=NOW) as mock_now, \
+            patch(f"{dt_util}.parse_datetime", side_effect=datetime.fromisoformat), \
+            patch(f"{dt_util}.as_utc", side_effect=lambda value: value.astimezone(timezone.utc)):
+        yield mock_now
+
+
+class TestForecastCache:
+    """Test fetching, coalescing and expiry."""
+
+    def test_parse_sorts_by_time_and_skips_bad_points(self):
+        """Forecasts are UTC and time-sorted; unparsable datetimes are dropped."""
+        raw = _response(hours=(3, 1))["weather.home"]["forecast"] + [{"datetime": "not a date", "temperature": 1.0}]
+
+        with patch("custom_components.smart_climate.forecast_cache.dt_util.parse_datetime",
+                   side_effect=lambda value: None if value == "not a date" else datetime.fromisoformat(value)):
+            forecasts = parse_forecasts(raw)
+
+        assert [f.temperature for f in forecasts] == [31.0, 33.0]
+
+    @pytest.mark.asyncio
+    async def test_one_fetch_per_ttl(self, hass, utcnow):
+        """Requests within the TTL are served from the cache."""
+        cache = ForecastCache(hass)
+
+        first = await cache.async_get_forecast("weather.home")
+        utcnow.return_value = NOW + DEFAULT_FORECAST_TTL - timedelta(seconds=1)
+        second = await cache.async_get_forecast("weather.home")
+
+        assert second is first
+        assert hass.services.async_call.await_count == 1
+        assert [f.temperature for f in first.forecasts] == [31.0, 32.0, 33.0]
+
+        utcnow.return_value = NOW + DEFAULT_FORECAST_TTL
+        await cache.async_get_forecast("weather.home")
+        assert hass.services.async_call.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_are_coalesced(self, hass):
+        """Requests arriving during a fetch wait for it instead of fetching again."""
+        cache = ForecastCache(hass)
+
+        results = await asyncio.gather(*(cache.async_get_forecast("weather.home") for _ in range(4)))
+
+        assert hass.services.async_call.await_count == 1
+        assert all(result is results[0] for result in results)
+        metrics = cache.get_metrics()
+        assert metrics["misses"] == 1
+        assert metrics["coalesced"] == 3
+
+    @pytest.mark.asyncio
+    async def test_entities_and_types_are_cached_separately(self, hass):
+        """Each weather entity and forecast type has its own entry."""
+        cache = ForecastCache(hass)
+
+        await cache.async_get_forecast("weather.home")
+        await cache.async_get_forecast("weather.cabin")
+        await cache.async_get_forecast("weather.home", "daily")
+
+        assert hass.services.async_call.await_count == 3
+        assert cache.get_metrics()["entries"] == 3
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_cached(self, hass):
+        """A failed fetch raises for every waiter and the next request retries."""
+        cache = ForecastCache(hass)
+        hass.services.async_call.side_effect = RuntimeError("service unavailable")
+
+        results = await asyncio.gather(
+            cache.async_get_forecast("weather.home"),
+            cache.async_get_forecast("weather.home"),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        hass.services.async_call.side_effect = None
+        hass.services.async_call.return_value = _response()
+        assert len((await cache.async_get_forecast("weather.home")).forecasts) == 3
+        assert cache.get_metrics()["failed_fetches"] == 1
+
+    @pytest.mark.asyncio
+    async def test_metrics(self, hass):
+        """Hits, misses and fetch latency are reported."""
+        cache = ForecastCache(hass)
+
+        await cache.async_get_forecast("weather.home")
+        await cache.async_get_forecast("weather.home")
+        metrics = cache.get_metrics()
+
+        assert metrics["hits"] == 1
+        assert metrics["misses"] == 1
+        assert metrics["hit_rate"] == 0.5
+        assert metrics["last_fetch_latency_ms"] >= 0.0
+        assert metrics["avg_fetch_latency_ms"] == metrics["last_fetch_latency_ms"]
+
+    def test_cache_is_shared_per_domain(self, hass):
+        """async_get_forecast_cache returns one cache stored in hass.data."""
+        cache = async_get_forecast_cache(hass)
+
+        assert async_get_forecast_cache(hass) is cache
+        assert hass.data[DATA_FORECAST_CACHE] is cache
+
+    @pytest.mark.asyncio
+    async def test_remove_clears_entries_and_pending_fetches(self, hass):
+        """Removing the shared cache drops forecasts and cancels running fetches."""
+        cache = async_get_forecast_cache(hass)
+        await cache.async_get_forecast("weather.home")
+        waiter = asyncio.ensure_future(cache.async_get_forecast("weather.cabin"))
+        await asyncio.sleep(0)
+
+        async_remove_forecast_cache(hass)
+
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert DATA_FORECAST_CACHE not in hass.data
+        assert cache.get_metrics()["entries"] == 0
+        assert async_get_forecast_cache(hass) is not cache
+        async_remove_forecast_cache(hass)
+        async_remove_forecast_cache(hass)
+
+
+class TestForecastEngineWithCache:
+    """Test engines sharing the cache."""
+
+    @pytest.mark.asyncio
+    async def test_engines_share_one_fetch(self, hass):
+        """Several engines on the same weather entity trigger one service call."""
+        cache = ForecastCache(hass)
+        engines = [ForecastEngine(hass, {"weather_entity": "weather.home"}, forecast_cache=cache) for _ in range(3)]
+
+        for engine in engines:
+            assert await engine._async_fetch_forecast()
+
+        assert hass.services.async_call.await_count == 1
+        assert all(len(engine._forecast_data) == 3 for engine in engines)
+        assert engines[0]._forecast_data is not engines[1]._forecast_data
+        assert engines[0].get_cache_metrics()["hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_engine_without_cache_fetches_directly(self, hass):
+        """Without a cache the engine calls the weather service itself."""
+        engine = ForecastEngine(hass, {"weather_entity": "weather.home"})
+
+        assert await engine._async_fetch_forecast()
+
+        assert hass.services.async_call.await_count == 1
+        assert engine.get_cache_metrics() is None
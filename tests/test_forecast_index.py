@@ -0,0 +1,175 @@
+"""ABOUTME: Tests for the time-indexed forecast used by strategy evaluation.
+Covers window lookups, run queries against the linear scan, predicate reuse and registered strategy types."""
+
+import random
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+
+from custom_components.smart_climate.forecast_engine import (
+    STRATEGY_TYPES,
+    ForecastEngine,
+    StrategyType,
+    register_strategy_type,
+)
+from custom_components.smart_climate.forecast_index import ForecastIndex
+from custom_components.smart_climate.models import Forecast
+
+BASE = datetime(2025, 7, 13, 10, 0, 0)
+
+
+def _forecasts(temps, conditions=None):
+    conditions = conditions or ["sunny"] * len(temps)
+    return [
+        Forecast(datetime=BASE + timedelta(hours=i), temperature=t, condition=c)
+        for i, (t, c) in enumerate(zip(temps, conditions))
+    ]
+
+
+def _hot(f):
+    return f.temperature >= 30.0
+
+
+class TestForecastIndex:
+    """Test window and run queries."""
+
+    def test_window_excludes_now_and_includes_lookahead_end(self):
+        """The window holds points after now up to and including now + lookahead."""
+        index = ForecastIndex(_forecasts([20.0] * 10))
+
+        lo, hi = index.window(BASE + timedelta(hours=2), timedelta(hours=3))
+
+        assert [f.datetime for f in index.points(lo, hi)] == [BASE + timedelta(hours=h) for h in (3, 4, 5)]
+
+    def test_points_are_sorted(self):
+        """Unsorted input is indexed by time."""
+        forecasts = _forecasts([30.0, 31.0, 32.0])
+        index = ForecastIndex(list(reversed(forecasts)))
+
+        assert index.points(0, 3) == tuple(forecasts)
+
+    def test_count_uses_prefix_sums(self):
+        """Matching points in a window are counted."""
+        index = ForecastIndex(_forecasts([30.0, 25.0, 31.0, 32.0, 20.0]))
+
+        assert index.count("hot", _hot, 0, 5) == 3
+        assert index.count("hot", _hot, 1, 3) == 1
+        assert index.count("hot", _hot, 3, 3) == 0
+
+    def test_run_in_progress_at_window_start_is_clipped(self):
+        """A run that began before the window counts only its points inside it."""
+        index = ForecastIndex(_forecasts([30.0] * 6 + [20.0] * 4))
+
+        assert index.find_run("hot", _hot, 3, 10, timedelta(hours=3)) == BASE + timedelta(hours=3)
+        assert index.find_run("hot", _hot, 3, 10, timedelta(hours=4)) is None
+
+    def test_run_clipped_at_window_end(self):
+        """A run must fit inside the window."""
+        index = ForecastIndex(_forecasts([20.0] * 4 + [30.0] * 6))
+
+        assert index.find_run("hot", _hot, 0, 7, timedelta(hours=4)) is None
+        assert index.find_run("hot", _hot, 0, 8, timedelta(hours=4)) == BASE + timedelta(hours=4)
+
+    def test_matches_linear_scan(self):
+        """find_run agrees with ForecastEngine._find_consecutive_event on random windows."""
+        rng = random.Random(42)
+        engine = ForecastEngine(Mock(), {"strategies": []})
+        forecasts = _forecasts([rng.choice([25.0, 30.0, 30.0]) for _ in range(72)])
+        index = ForecastIndex(forecasts)
+
+        for _ in range(500):
+            lo = rng.randrange(0, 72)
+            hi = rng.randrange(lo, 73)
+            duration = timedelta(hours=rng.randint(1, 6))
+            expected = engine._find_consecutive_event(forecasts[lo:hi], duration, _hot)
+            assert index.find_run("hot", _hot, lo, hi, duration) == expected
+
+    def test_predicate_is_encoded_once(self):
+        """Repeated queries with the same key reuse one encoding."""
+        checker = Mock(side_effect=_hot)
+        index = ForecastIndex(_forecasts([30.0] * 24))
+
+        for hours in (1, 2, 5, 5):
+            index.find_run("hot", checker, 0, 24, timedelta(hours=hours))
+        index.count("hot", checker, 0, 24)
+
+        assert checker.call_count == 24
+
+
+class TestEngineUsesIndex:
+    """Test that ForecastEngine evaluates strategies on one index per forecast."""
+
+    def _engine(self, strategies):
+        hass = Mock()
+        hass.states.get.return_value = None
+        engine = ForecastEngine(hass, {"weather_entity": "weather.test", "strategies": strategies})
+        engine._forecast_data = _forecasts([25.0] * 8 + [31.0] * 6 + [25.0] * 10)
+        return engine
+
+    def test_index_reused_until_forecast_changes(self):
+        """The index is rebuilt only when the forecast list is replaced or grows."""
+        engine = self._engine([])
+        index = engine._get_forecast_index()
+
+        assert engine._get_forecast_index() is index
+        engine._forecast_data.append(Forecast(datetime=BASE + timedelta(hours=24), temperature=20.0))
+        assert engine._get_forecast_index() is not index
+        engine._forecast_data = list(engine._forecast_data)
+        assert len(engine._get_forecast_index()) == 25
+
+    def test_heat_wave_uses_index(self):
+        """The heat wave strategy activates from the indexed run."""
+        engine = self._engine([{
+            "name": "Heat Wave", "strategy_type": "heat_wave", "temp_threshold_c": 30.0,
+            "min_duration_hours": 5, "pre_action_hours": 4, "adjustment_c": -1.5,
+        }])
+
+        with patch.object(ForecastIndex, "find_run", wraps=engine._get_forecast_index().find_run) as find_run:
+            engine._evaluate_strategies(BASE + timedelta(hours=5))
+
+        find_run.assert_called_once()
+        assert engine._active_strategy.end_time == BASE + timedelta(hours=8)
+        assert engine._active_strategy.adjustment == -1.5
+
+
+class TestRegisteredStrategyTypes:
+    """Test user-defined strategy types."""
+
+    @pytest.fixture(autouse=True)
+    def cold_snap(self):
+        register_strategy_type(
+            "cold_snap",
+            StrategyType(
+                lambda config: (config["below"], lambda f: f.temperature < config["below"]),
+                min_duration_hours=3,
+                pre_action_hours=2,
+            ),
+        )
+        yield
+        STRATEGY_TYPES.pop("cold_snap")
+
+    def test_registered_type_activates(self):
+        """A registered type is evaluated on the same index as the built-ins."""
+        hass = Mock()
+        engine = ForecastEngine(hass, {"weather_entity": "weather.test", "strategies": [
+            {"name": "Cold Snap", "strategy_type": "cold_snap", "below": 10.0, "adjustment": 1.0},
+        ]})
+        engine._forecast_data = _forecasts([15.0] * 6 + [5.0] * 4 + [15.0] * 4)
+
+        engine._evaluate_strategies(BASE + timedelta(hours=4))
+
+        assert engine._active_strategy.name == "Cold Snap"
+        assert engine._active_strategy.adjustment == 1.0
+        assert engine._active_strategy.end_time == BASE + timedelta(hours=6)
+
+    def test_registered_type_waits_for_pre_action(self):
+        """The event is found but the strategy stays inactive before pre-action time."""
+        engine = ForecastEngine(Mock(), {"weather_entity": "weather.test", "strategies": [
+            {"name": "Cold Snap", "strategy_type": "cold_snap", "below": 10.0},
+        ]})
+        engine._forecast_data = _forecasts([15.0] * 6 + [5.0] * 4)
+
+        engine._evaluate_strategies(BASE + timedelta(hours=1))
+
+        assert engine._active_strategy is None
@@ -0,0 +1,157 @@
+"""ABOUTME: Tests for the OffsetEngine hot-path latency instrumentation.
+Covers the fixed-size reservoirs, per-stage timers and the dashboard and sensor exposure."""
+
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from custom_components.smart_climate.const import CONF_LATENCY_INSTRUMENTATION
+from custom_components.smart_climate.latency_tracker import (
+    LatencyReservoir,
+    LatencyTracker,
+    STAGE_CALCULATE_OFFSET,
+    STAGE_HYSTERESIS_DETECTION,
+    STAGE_PREDICT,
+)
+from custom_components.smart_climate.models import OffsetInput
+from custom_components.smart_climate.offset_engine import OffsetEngine
+from custom_components.smart_climate.sensor_performance import PredictionLatencySensor
+
+
+def _offset_input():
+    """Create an OffsetInput with all critical sensors available."""
+    return OffsetInput(
+        ac_internal_temp=22.0,
+        room_temp=24.5,
+        outdoor_temp=30.0,
+        mode="none",
+        power_consumption=None,
+        time_of_day=Mock(hour=14),
+        day_of_week=2,
+    )
+
+
+def _trained_engine(**config):
+    """Create an OffsetEngine with a few learned samples."""
+    engine = OffsetEngine({"enable_learning": True, **config})
+    for index in range(20):
+        engine._learner.add_sample(
+            predicted=0.1 * index, actual=0.1 * index + 0.2,
+            ac_temp=22.0, room_temp=24.0 + 0.05 * index, outdoor_temp=30.0, mode="none",
+        )
+    return engine
+
+
+class TestLatencyReservoir:
+    """Tests for LatencyReservoir."""
+
+    def test_nearest_rank_percentiles(self):
+        """Percentiles use the nearest-rank method over the buffered durations."""
+        reservoir = LatencyReservoir(size=100)
+        for value in range(1, 101):
+            reservoir.add(float(value))
+
+        summary = reservoir.summary()
+
+        assert summary["p50"] == 50.0
+        assert summary["p95"] == 95.0
+        assert summary["p99"] == 99.0
+        assert summary["max"] == 100.0
+        assert summary["count"] == 100
+
+    def test_window_keeps_most_recent_durations(self):
+        """Once full, new durations replace the oldest; max and count stay all-time."""
+        reservoir = LatencyReservoir(size=4)
+        for value in (100.0, 1.0, 2.0, 3.0, 4.0):
+            reservoir.add(value)
+
+        assert reservoir.percentile(99) == 4.0
+        assert reservoir.summary()["max"] == 100.0
+        assert reservoir.count == 5
+
+    def test_empty_reservoir(self):
+        """An empty reservoir reports no summary and zero percentiles."""
+        reservoir = LatencyReservoir(size=8)
+
+        assert reservoir.summary() == {}
+        assert reservoir.percentile(95) == 0.0
+
+    def test_invalid_size_rejected(self):
+        """Reservoirs need room for at least one duration."""
+        with pytest.raises(ValueError):
+            LatencyReservoir(size=0)
+
+
+class TestOffsetEngineInstrumentation:
+    """Tests for the timers around the OffsetEngine hot paths."""
+
+    def test_calculate_offset_stages_recorded(self):
+        """calculate_offset(), hysteresis detection and prediction are timed."""
+        engine = _trained_engine()
+
+        for _ in range(10):
+            engine.calculate_offset(_offset_input())
+
+        metrics = engine.get_latency_metrics()
+        assert metrics[STAGE_CALCULATE_OFFSET]["count"] == 10
+        assert metrics[STAGE_HYSTERESIS_DETECTION]["count"] == 10
+        assert metrics[STAGE_PREDICT]["count"] == 10
+        assert metrics[STAGE_CALCULATE_OFFSET]["p50"] >= metrics[STAGE_PREDICT]["p50"]
+        assert engine._last_prediction_latency_ms > 0.0
+
+    def test_disabled_instrumentation_records_nothing(self):
+        """With instrumentation off no tracker exists and nothing is timed."""
+        engine = _trained_engine(**{CONF_LATENCY_INSTRUMENTATION: False})
+
+        engine.calculate_offset(_offset_input())
+
+        assert engine._latency_tracker is None
+        assert engine.get_latency_metrics() == {}
+        assert engine._measure_prediction_latency() == 0.0
+        assert engine._last_prediction_latency_ms is None
+
+    @pytest.mark.asyncio
+    async def test_dashboard_reports_measured_latency(self):
+        """The dashboard performance data carries real percentiles, not a constant."""
+        engine = _trained_engine()
+        for _ in range(5):
+            engine.calculate_offset(_offset_input())
+        tracker = engine._latency_tracker
+        expected_p95 = round(tracker.percentile(STAGE_CALCULATE_OFFSET, 95), 3)
+
+        performance = (await engine.async_get_dashboard_data())["performance"]
+
+        assert performance["prediction_latency_ms"] == round(
+            tracker.percentile(STAGE_CALCULATE_OFFSET, 50), 3
+        )
+        assert performance["prediction_latency_p95_ms"] == expected_p95
+        assert STAGE_PREDICT in performance["hot_path_latency_ms"]
+
+    def test_tracker_record_returns_elapsed_ms(self):
+        """record() converts the perf_counter start mark into milliseconds."""
+        tracker = LatencyTracker(reservoir_size=8)
+
+        latency_ms = tracker.record("stage", time.perf_counter() - 0.002)
+
+        assert latency_ms >= 2.0
+        assert tracker.get_stage("stage").count == 1
+
+
+def test_prediction_latency_sensor_attributes():
+    """The diagnostic latency sensor exposes tail latencies and the stage breakdown."""
+    coordinator = Mock()
+    coordinator.data = {
+        "performance": {
+            "prediction_latency_ms": 0.42,
+            "prediction_latency_p95_ms": 1.1,
+            "prediction_latency_p99_ms": 2.3,
+            "hot_path_latency_ms": {"predict": {"p50": 0.2, "p95": 0.5, "p99": 0.9, "max": 1.0, "count": 12}},
+        }
+    }
+    sensor = PredictionLatencySensor(coordinator, "climate.test_ac", Mock())
+
+    assert sensor.native_value == 0.4
+    assert sensor.extra_state_attributes["prediction_latency_p99_ms"] == 2.3
+    assert sensor.extra_state_attributes["hot_path_latency_ms"]["predict"]["count"] == 12
+    assert "hot_path_latency_ms" in PredictionLatencySensor._unrecorded_attributes
@@ -0,0 +1,77 @@
+"""ABOUTME: Benchmark comparing the pure Python and vectorized learner prediction paths.
+Runs at 1k, 10k and 100k samples and checks both paths agree."""
+
+import random
+import time
+
+import pytest
+
+from custom_components.smart_climate.lightweight_learner import LightweightOffsetLearner
+
+
+def _build_learner(count: int) -> LightweightOffsetLearner:
+    """Create a learner holding `count` synthetic enhanced samples."""
+    rng = random.Random(count)
+    learner = LightweightOffsetLearner(max_history=count)
+    learner._enhanced_samples = [
+        {
+            "predicted": rng.uniform(-2.0, 2.0),
+            "actual": rng.uniform(-2.0, 2.0),
+            "ac_temp": rng.uniform(20.0, 28.0),
+            "room_temp": rng.uniform(20.0, 28.0),
+            "outdoor_temp": rng.uniform(10.0, 38.0) if i % 5 else None,
+            "mode": "cool" if i % 7 else "heat",
+            "power": rng.uniform(0.0, 1500.0) if i % 3 else None,
+            "hysteresis_state": ["active_phase", "idle_stable_zone"][i % 2],
+            "indoor_humidity": rng.uniform(30.0, 70.0),
+            "outdoor_humidity": None,
+            "timestamp": "2025-07-01T12:00:00",
+        }
+        for i in range(count)
+    ]
+    return learner
+
+
+def _time_per_call(func, repeats: int) -> tuple:
+    """Return the average wall time of func() in milliseconds and its last result."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = func()
+    elapsed = time.perf_counter() - start
+    return elapsed * 1000 / repeats, result
+
+
+@pytest.mark.parametrize("count", [1_000, 10_000, 100_000])
+def test_vectorized_predict_benchmark(count):
+    """Benchmark predict() against the Python loop at increasing history sizes."""
+    learner = _build_learner(count)
+    query = {
+        "ac_temp": 24.0,
+        "room_temp": 25.0,
+        "outdoor_temp": 30.0,
+        "mode": "cool",
+        "power": 800.0,
+        "hysteresis_state": "active_phase",
+        "indoor_humidity": 50.0,
+        "outdoor_humidity": None,
+    }
+
+    # Warm up: the first call builds the columnar store from the sample list
+    learner.predict(**query)
+
+    repeats = max(1, 10_000 // count)
+    python_ms, python_result = _time_per_call(
+        lambda: learner._predict_python(*query.values()), repeats
+    )
+    vectorized_ms, vectorized_result = _time_per_call(lambda: learner.predict(**query), repeats * 10)
+
+    print(
+        f"\n{count} samples: python={python_ms:.3f}ms vectorized={vectorized_ms:.3f}ms "
+        f"speedup={python_ms / vectorized_ms:.1f}x"
+    )
+
+    assert vectorized_result == pytest.approx(python_result, rel=1e-9)
+    if count >= 10_000:
+        assert vectorized_ms < python_ms, (
+            f"Vectorized prediction ({vectorized_ms:.3f}ms) not faster than Python ({python_ms:.3f}ms)"
+        )
@@ -0,0 +1,238 @@
+"""ABOUTME: Tests for OffsetEngine.predict_batch side-effect-free what-if predictions.
+Checks results match calculate_offset() while engine and learner state stay untouched."""
+
+import random
+from datetime import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from custom_components.smart_climate import (
+    DOMAIN,
+    _async_register_prediction_service,
+    handle_predict_offsets,
+)
+from custom_components.smart_climate.const import CONF_CLIMATE_ENTITY
+from custom_components.smart_climate.offset_engine import OffsetEngine
+from custom_components.smart_climate.models import OffsetInput, OffsetResult
+from custom_components.smart_climate.feature_engineering import FeatureEngineering
+
+
+def _make_input(ac_temp, room_temp, outdoor_temp=30.0, power=800.0, mode="none", indoor_humidity=None):
+    """Build an OffsetInput for the given conditions."""
+    return OffsetInput(
+        ac_internal_temp=ac_temp,
+        room_temp=room_temp,
+        outdoor_temp=outdoor_temp,
+        mode=mode,
+        power_consumption=power,
+        time_of_day=time(14, 0),
+        day_of_week=2,
+        indoor_humidity=indoor_humidity,
+    )
+
+
+def _trained_engine(sample_count=200, **config):
+    """Create an OffsetEngine whose learner is past the calibration phase."""
+    engine = OffsetEngine({"enable_learning": True, "max_offset": 5.0, **config})
+    rng = random.Random(42)
+    for _ in range(sample_count):
+        engine._learner.add_sample(
+            predicted=rng.uniform(-2.0, 2.0),
+            actual=rng.uniform(-2.0, 2.0),
+            ac_temp=rng.uniform(20.0, 28.0),
+            room_temp=rng.uniform(20.0, 28.0),
+            outdoor_temp=rng.uniform(15.0, 35.0),
+            mode="none",
+            power=rng.uniform(0.0, 1500.0),
+            indoor_humidity=rng.uniform(30.0, 70.0),
+        )
+    return engine
+
+
+def _conditions():
+    """Forecast-style grid of hypothetical conditions."""
+    return [
+        _make_input(ac_temp, 24.0 + hour * 0.1, outdoor_temp=25.0 + hour * 0.5, indoor_humidity=humidity)
+        for hour in range(6)
+        for ac_temp in (22.0, 23.5, 25.0)
+        for humidity in (None, 55.0)
+    ]
+
+
+class TestPredictBatch:
+    """Test OffsetEngine.predict_batch."""
+
+    def test_empty_batch(self):
+        """An empty batch returns an empty list."""
+        assert _trained_engine().predict_batch([]) == []
+
+    def test_matches_calculate_offset(self):
+        """Each batch result equals a calculate_offset() call on the same input."""
+        inputs = _conditions()
+        results = _trained_engine().predict_batch(inputs)
+
+        assert len(results) == len(inputs)
+        for input_data, result in zip(inputs, results):
+            expected = _trained_engine().calculate_offset(input_data)
+            assert isinstance(result, OffsetResult)
+            assert result.offset == pytest.approx(expected.offset, rel=1e-9, abs=1e-12)
+            assert result.clamped == expected.clamped
+            assert result.confidence == pytest.approx(expected.confidence)
+            assert result.reason == expected.reason
+
+    def test_does_not_mutate_engine_state(self):
+        """predict_batch leaves last input/offset, humidity and hysteresis state alone."""
+        engine = _trained_engine(power_sensor="sensor.ac_power")
+        engine.calculate_offset(_make_input(23.0, 24.0, power=10.0))
+        engine._hysteresis_learner.record_transition = Mock()
+        last_input = engine._last_input_data
+        last_offset = engine._last_offset
+        last_power_state = engine._last_power_state
+        humidity_contribution = engine._last_humidity_contribution
+        sample_count = len(engine._learner._enhanced_samples)
+
+        engine.predict_batch([_make_input(23.0, 24.0, power=power, indoor_humidity=60.0)
+                              for power in (10.0, 1200.0, 10.0)])
+
+        assert engine._last_input_data is last_input
+        assert engine._last_offset == last_offset
+        assert engine._last_power_state == last_power_state
+        assert engine._last_humidity_contribution == humidity_contribution
+        assert len(engine._learner._enhanced_samples) == sample_count
+        engine._hysteresis_learner.record_transition.assert_not_called()
+
+    def test_does_not_enrich_caller_inputs(self):
+        """Feature enrichment works on copies of the caller's inputs."""
+        engine = OffsetEngine({"enable_learning": False}, feature_engineer=FeatureEngineering())
+        input_data = _make_input(23.0, 24.0, indoor_humidity=60.0)
+
+        engine.predict_batch([input_data])
+
+        assert input_data.indoor_dew_point is None
+
+    def test_calibration_does_not_update_cache(self):
+        """A stable reading during calibration is returned but not cached."""
+        engine = OffsetEngine({"enable_learning": True, "power_sensor": "sensor.ac_power"})
+        assert engine.is_in_calibration_phase
+
+        result = engine.predict_batch([_make_input(23.0, 24.0, power=10.0)])[0]
+
+        assert result.offset == pytest.approx(-1.0)
+        assert result.confidence == 0.2
+        assert engine._stable_calibration_offset is None
+
+    def test_critical_sensor_unavailable(self):
+        """Inputs without AC or room temperature get the safe fallback."""
+        results = _trained_engine().predict_batch([
+            _make_input(None, 24.0),
+            _make_input(23.0, 24.0),
+        ])
+
+        assert results[0].offset == 0.0
+        assert results[0].confidence == 0.0
+        assert "Critical sensor unavailable" in results[0].reason
+        assert "learning-enhanced" in results[1].reason
+
+    def test_learner_scores_batch_once(self):
+        """Learned offsets for the whole batch come from a single predict_batch call."""
+        engine = _trained_engine()
+        original = engine._learner.predict_batch
+        engine._learner.predict_batch = Mock(side_effect=original)
+        engine._learner.predict = Mock(side_effect=AssertionError("per-input predict used"))
+
+        engine.predict_batch(_conditions())
+
+        engine._learner.predict_batch.assert_called_once()
+
+    def test_learning_failure_falls_back_to_rule_based(self):
+        """A failing learner yields rule-based offsets with the learning error noted."""
+        engine = _trained_engine()
+        engine._learner.predict_batch = Mock(side_effect=RuntimeError("boom"))
+
+        result = engine.predict_batch([_make_input(23.0, 24.0)])[0]
+
+        assert "learning error, fallback used" in result.reason
+
+
+class TestLearnerPredictBatch:
+    """Test the learner's batched prediction against single predictions."""
+
+    def test_matches_single_predictions(self):
+        """predict_batch returns the same values as repeated predict() calls."""
+        learner = _trained_engine()._learner
+        queries = [
+            {"ac_temp": 22.0 + i * 0.3, "room_temp": 24.0, "outdoor_temp": None if i % 3 else 30.0,
+             "mode": "none" if i % 2 else "cool", "power": 700.0 if i % 4 else None,
+             "hysteresis_state": "no_power_sensor", "indoor_humidity": 50.0 if i % 5 else None,
+             "outdoor_humidity": None}
+            for i in range(20)
+        ]
+
+        batch = learner.predict_batch(queries)
+
+        assert batch == pytest.approx([learner.predict(**query) for query in queries], rel=1e-12)
+
+    def test_empty_learner_returns_zeros(self):
+        """Without samples every prediction is 0.0."""
+        learner = OffsetEngine({"enable_learning": True})._learner
+
+        assert learner.predict_batch([{"ac_temp": 22.0, "room_temp": 24.0}] * 3) == [0.0, 0.0, 0.0]
+
+
+class TestPredictOffsetsService:
+    """Test the predict_offsets response service."""
+
+    @staticmethod
+    def _hass_with_engine(engine):
+        """Create a mock hass holding one config entry with the given engine."""
+        hass = Mock()
+        hass.services.has_service = Mock(return_value=False)
+        hass.services.async_register = Mock()
+        hass.config_entries.async_get_entry.return_value = Mock(
+            data={CONF_CLIMATE_ENTITY: "climate.real_ac"}
+        )
+        hass.data = {DOMAIN: {"entry_1": {"offset_engines": {"climate.real_ac": engine}}}}
+        return hass
+
+    @pytest.mark.asyncio
+    async def test_service_registered_with_response(self):
+        """The service is registered once, returning its response only."""
+        hass = self._hass_with_engine(Mock())
+
+        await _async_register_prediction_service(hass)
+
+        args, kwargs = hass.services.async_register.call_args
+        assert args[:3] == (DOMAIN, "predict_offsets", handle_predict_offsets)
+        assert "supports_response" in kwargs
+
+    @pytest.mark.asyncio
+    async def test_handler_returns_batch_results(self):
+        """The handler returns one result per condition from predict_batch."""
+        engine = _trained_engine()
+        hass = self._hass_with_engine(engine)
+        call = Mock()
+        call.hass = hass
+        call.data = {
+            "climate_entity_id": "climate.smart_ac",
+            "conditions": [
+                {"ac_internal_temp": 23.0, "room_temp": 24.0, "outdoor_temp": 30.0, "mode": "none"},
+                {"ac_internal_temp": 25.0, "room_temp": 24.0, "mode": "none"},
+            ],
+        }
+
+        with patch("custom_components.smart_climate.er") as mock_er:
+            mock_er.async_get.return_value.async_get.return_value = Mock(
+                platform=DOMAIN, config_entry_id="entry_1"
+            )
+            response = await handle_predict_offsets(call)
+
+        assert len(response["results"]) == 2
+        expected = engine.predict_batch([
+            _make_input(23.0, 24.0, outdoor_temp=30.0, power=None),
+            _make_input(25.0, 24.0, outdoor_temp=None, power=None),
+        ])
+        for item, result in zip(response["results"], expected):
+            assert item["offset"] == pytest.approx(result.offset)
+            assert item["reason"] == result.reason
+        assert getattr(engine, "_last_input_data", None) is None
@@ -0,0 +1,264 @@
+"""ABOUTME: Tests for change-aware learning data saves in OffsetEngine.
+Covers generation-based dirty tracking, skipped saves, section reuse and debounced save coalescing."""
+
+from datetime import time
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from custom_components.smart_climate.const import CONF_SAVE_DEBOUNCE, CONF_SAVE_MAX_STALENESS
+from custom_components.smart_climate.models import OffsetInput
+from custom_components.smart_climate.offset_engine import OffsetEngine, _thermal_fingerprint
+
+
+def _engine(**config):
+    """Create a learning engine with a mocked data store."""
+    engine = OffsetEngine({"enable_learning": True, "power_sensor": "sensor.ac_power", **config})
+    engine.set_data_store(AsyncMock())
+    return engine
+
+
+def _add_sample(engine, actual=0.5):
+    engine._learner.add_sample(
+        predicted=0.0, actual=actual, ac_temp=22.0, room_temp=24.0, outdoor_temp=30.0,
+        mode="none", power=800.0,
+    )
+
+
+def _saved_payload(engine):
+    return engine._data_store.async_save_learning_data.call_args[0][0]
+
+
+class TestDirtyTracking:
+    """Test skipping and partial serialization of unchanged sections."""
+
+    @pytest.mark.asyncio
+    async def test_clean_scheduled_save_is_skipped(self):
+        """A scheduled save after an unchanged interval writes nothing."""
+        engine = _engine()
+        _add_sample(engine)
+        await engine.async_save_learning_data(only_if_dirty=True)
+
+        await engine.async_save_learning_data(only_if_dirty=True)
+
+        assert engine._data_store.async_save_learning_data.await_count == 1
+        assert engine.save_count == 1
+        assert engine.skipped_save_count == 1
+
+    @pytest.mark.asyncio
+    async def test_explicit_save_always_writes(self):
+        """Direct saves (shutdown, switch) keep writing even when clean."""
+        engine = _engine()
+        await engine.async_save_learning_data()
+
+        await engine.async_save_learning_data()
+
+        assert engine.save_count == 2
+        assert engine.skipped_save_count == 0
+
+    @pytest.mark.asyncio
+    async def test_only_changed_sections_are_serialized(self):
+        """New hysteresis data re-serializes hysteresis but reuses the learner section."""
+        engine = _engine()
+        _add_sample(engine)
+        await engine.async_save_learning_data(only_if_dirty=True)
+        first_learner_data = _saved_payload(engine)["learning_data"]["learner_data"]
+
+        engine._learner.serialize_for_persistence = Mock(side_effect=AssertionError("learner re-serialized"))
+        engine._hysteresis_learner.record_transition("start", 24.5)
+        await engine.async_save_learning_data(only_if_dirty=True)
+
+        learning_data = _saved_payload(engine)["learning_data"]
+        assert learning_data["learner_data"] is first_learner_data
+        assert learning_data["hysteresis_data"]["start_temps"] == [24.5]
+        assert engine.save_count == 2
+
+    @pytest.mark.asyncio
+    async def test_new_sample_marks_learner_dirty(self):
+        """Adding a sample makes the next scheduled save write the new sample."""
+        engine = _engine()
+        await engine.async_save_learning_data(only_if_dirty=True)
+
+        _add_sample(engine)
+        await engine.async_save_learning_data(only_if_dirty=True)
+
+        assert engine.save_count == 2
+        assert len(_saved_payload(engine)["learning_data"]["learner_data"]["enhanced_samples"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_learning_toggle_and_reset_mark_dirty(self):
+        """Engine state changes and learner replacement are saved."""
+        engine = _engine()
+        await engine.async_save_learning_data(only_if_dirty=True)
+
+        engine.disable_learning()
+        await engine.async_save_learning_data(only_if_dirty=True)
+        assert _saved_payload(engine)["learning_data"]["engine_state"] == {"enable_learning": False}
+
+        engine.enable_learning()
+        engine.reset_learning()
+        await engine.async_save_learning_data(only_if_dirty=True)
+        assert engine.save_count == 3
+        assert engine.skipped_save_count == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_save_stays_dirty(self):
+        """A failed write does not record the sections as saved."""
+        engine = _engine()
+        _add_sample(engine)
+        engine._data_store.async_save_learning_data.side_effect = OSError("disk full")
+        await engine.async_save_learning_data(only_if_dirty=True)
+
+        engine._data_store.async_save_learning_data.side_effect = None
+        await engine.async_save_learning_data(only_if_dirty=True)
+
+        assert engine.failed_save_count == 1
+        assert engine.save_count == 1
+
+    @pytest.mark.asyncio
+    async def test_unchanged_thermal_data_is_clean(self):
+        """Thermal bookkeeping fields that change on every serialize() do not dirty the save."""
+        calls = iter(range(100))
+
+        def thermal_data():
+            call = next(calls)
+            return {
+                "state": {"current_state": "drifting", "last_transition": f"2025-07-01T12:00:{call:02d}"},
+                "model": {"tau_cooling": 90.0, "last_modified": f"2025-07-01T12:00:{call:02d}"},
+                "metadata": {"saves_count": call},
+            }
+
+        engine = OffsetEngine({"enable_learning": True}, get_thermal_data_cb=thermal_data)
+        engine.set_data_store(AsyncMock())
+        await engine.async_save_learning_data(only_if_dirty=True)
+
+        await engine.async_save_learning_data(only_if_dirty=True)
+
+        assert engine.skipped_save_count == 1
+
+    def test_thermal_fingerprint_does_not_modify_input(self):
+        """The fingerprint drops volatile fields from copies only."""
+        data = {"state": {"current_state": "priming", "last_transition": "x"}, "metadata": {"saves_count": 3}}
+
+        assert _thermal_fingerprint(data) == {"state": {"current_state": "priming"}}
+        assert data["state"]["last_transition"] == "x"
+        assert "metadata" in data
+
+    @pytest.mark.asyncio
+    async def test_counts_in_learning_info_and_dashboard(self):
+        """Skipped and coalesced counts are reported next to the save counts."""
+        engine = _engine()
+        await engine.async_save_learning_data(only_if_dirty=True)
+        await engine.async_save_learning_data(only_if_dirty=True)
+
+        info = engine.get_learning_info()
+        assert info["save_count"] == 1
+        assert info["failed_save_count"] == 0
+        assert info["skipped_save_count"] == 1
+        assert info["coalesced_save_count"] == 0
+
+        engine.set_data_store(None)
+        dashboard = await engine.async_get_dashboard_data()
+        save_diagnostics = dashboard["save_diagnostics"]
+        assert save_diagnostics["skipped_save_count"] == 1
+        assert save_diagnostics["coalesced_save_count"] == 0
+
+
+class TestSaveCoalescing:
+    """Test debounced saves after bursts of samples."""
+
+    @staticmethod
+    async def _scheduled_engine(**config):
+        engine = _engine(**config)
+        with patch("homeassistant.helpers.event.async_track_time_interval") as mock_track:
+            mock_track.return_value = Mock()
+            remove = await engine.async_setup_periodic_save(Mock())
+        return engine, remove, mock_track
+
+    @pytest.mark.asyncio
+    async def test_burst_is_coalesced_into_one_save(self):
+        """Each request restarts the debounce timer; only the last one fires."""
+        engine, _, _ = await self._scheduled_engine(**{CONF_SAVE_DEBOUNCE: 60})
+        cancels = []
+
+        def call_later(hass, delay, action):
+            cancels.append(Mock())
+            return cancels[-1]
+
+        with patch("homeassistant.helpers.event.async_call_later", side_effect=call_later) as mock_later:
+            for _ in range(5):
+                _add_sample(engine)
+                engine.async_request_save()
+
+        assert mock_later.call_count == 5
+        assert all(cancel.called for cancel in cancels[:-1])
+        assert not cancels[-1].called
+        assert engine.coalesced_save_count == 4
+
+        action = mock_later.call_args[0][2]
+        await action(None)
+        assert engine.save_count == 1
+        assert engine._cancel_pending_save is None
+
+    @pytest.mark.asyncio
+    async def test_max_staleness_bounds_the_delay(self):
+        """A long burst cannot postpone the save beyond the staleness bound."""
+        engine, _, _ = await self._scheduled_engine(**{CONF_SAVE_DEBOUNCE: 60, CONF_SAVE_MAX_STALENESS: 100})
+
+        with patch("homeassistant.helpers.event.async_call_later", return_value=Mock()) as mock_later, \
+                patch("custom_components.smart_climate.offset_engine.time.monotonic", side_effect=[0.0, 30.0, 70.0, 130.0]):
+            for _ in range(4):
+                engine.async_request_save()
+
+        delays = [call[0][1] for call in mock_later.call_args_list]
+        assert delays == [60, 60, 30.0, 0.0]
+
+    @pytest.mark.asyncio
+    async def test_recorded_performance_requests_save(self):
+        """Recording a learning sample schedules a debounced save."""
+        engine, _, _ = await self._scheduled_engine()
+        input_data = OffsetInput(
+            ac_internal_temp=22.0, room_temp=24.0, outdoor_temp=30.0, mode="none",
+            power_consumption=800.0, time_of_day=time(14, 0), day_of_week=2,
+        )
+
+        with patch("homeassistant.helpers.event.async_call_later", return_value=Mock()) as mock_later:
+            engine.record_actual_performance(predicted_offset=1.0, actual_offset=1.2, input_data=input_data)
+
+        mock_later.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_periodic_save_skips_when_clean(self):
+        """The periodic timer callback only writes dirty data."""
+        engine, _, mock_track = await self._scheduled_engine()
+        periodic_save = mock_track.call_args[0][1]
+
+        await periodic_save(None)
+        await periodic_save(None)
+
+        assert engine.save_count == 1
+        assert engine.skipped_save_count == 1
+
+    @pytest.mark.asyncio
+    async def test_remove_cancels_pending_save(self):
+        """Removing periodic saving also cancels a pending debounced save."""
+        engine, remove, mock_track = await self._scheduled_engine()
+        cancel = Mock()
+        with patch("homeassistant.helpers.event.async_call_later", return_value=cancel):
+            engine.async_request_save()
+
+        remove()
+
+        mock_track.return_value.assert_called_once()
+        cancel.assert_called_once()
+        engine.async_request_save()  # no hass anymore: nothing scheduled
+        assert engine._cancel_pending_save is None
+
+    def test_request_without_hass_is_noop(self):
+        """Before periodic saving is set up, requests do nothing."""
+        engine = _engine()
+
+        engine.async_request_save()
+
+        assert engine.coalesced_save_count == 0
+        assert engine._cancel_pending_save is None
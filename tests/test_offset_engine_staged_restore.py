@@ -0,0 +1,230 @@
+"""ABOUTME: Tests for the two-phase startup restore of learning data in OffsetEngine.
+Covers hot-state restore, background hydration, guards while hydrating and the reported timings."""
+
+import asyncio
+import threading
+from datetime import time
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from custom_components.smart_climate.models import OffsetInput
+from custom_components.smart_climate.offset_engine import OffsetEngine
+
+CONFIG = {"enable_learning": True, "power_sensor": "sensor.ac_power"}
+
+THERMAL_DATA = {
+    "version": "2.1",
+    "state": {"current_state": "drifting"},
+    "model": {"tau_cooling": 95.0, "tau_warming": 155.0},
+    "probe_history": [{"tau_value": 95.0, "confidence": 0.8, "duration": 3600, "fit_quality": 0.9, "aborted": False}],
+}
+
+
+def _persistent_data():
+    """Build saved v2.1 data with samples, hysteresis thresholds and probe history."""
+    source = OffsetEngine(CONFIG)
+    for i in range(20):
+        source._learner.add_sample(
+            predicted=0.0, actual=0.5 + i * 0.01, ac_temp=22.0, room_temp=24.0,
+            outdoor_temp=30.0, mode="none", power=800.0,
+        )
+    for i in range(5):
+        source._hysteresis_learner.record_transition("start", 24.5 + i * 0.1)
+        source._hysteresis_learner.record_transition("stop", 23.5 + i * 0.1)
+    return {
+        "version": "2.1",
+        "learning_data": {
+            "engine_state": {"enable_learning": True},
+            "learner_data": source._learner.serialize_for_persistence(),
+            "hysteresis_data": source._hysteresis_learner.serialize_for_persistence(),
+            "seasonal_data": None,
+        },
+        "thermal_data": THERMAL_DATA,
+    }
+
+
+def _engine():
+    restore_thermal = Mock()
+    engine = OffsetEngine(CONFIG, restore_thermal_data_cb=restore_thermal)
+    data_store = AsyncMock()
+    data_store.async_load_learning_data.return_value = _persistent_data()
+    data_store.get_writer_metrics = Mock(return_value=None)
+    data_store.get_last_write_latency = Mock(return_value=0.0)
+    engine.set_data_store(data_store)
+    return engine, restore_thermal
+
+
+def _hass():
+    """Mock hass whose executor jobs run in a worker thread."""
+    hass = Mock()
+
+    async def add_executor_job(func, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    hass.async_add_executor_job = AsyncMock(side_effect=add_executor_job)
+    return hass
+
+
+def _input():
+    return OffsetInput(
+        ac_internal_temp=22.0, room_temp=24.0, outdoor_temp=30.0, mode="none",
+        power_consumption=800.0, time_of_day=time(14, 0), day_of_week=2,
+    )
+
+
+class TestStagedRestore:
+    """Test phase one and phase two of the restore."""
+
+    @pytest.mark.asyncio
+    async def test_hot_state_first_then_background_hydration(self):
+        """Hysteresis and thermal state are restored at once; samples and probes later."""
+        engine, restore_thermal = _engine()
+
+        assert await engine.async_load_learning_data(hydrate_in_background=True)
+
+        assert not engine.is_learning_hydrated
+        assert engine._hysteresis_learner.has_sufficient_data
+        assert engine._learner._enhanced_samples == []
+        hot_thermal = restore_thermal.call_args_list[0][0][0]
+        assert "probe_history" not in hot_thermal
+        assert hot_thermal["model"] == THERMAL_DATA["model"]
+
+        await engine.async_wait_for_hydration()
+
+        assert engine.is_learning_hydrated
+        assert len(engine._learner._enhanced_samples) == 20
+        restore_thermal.assert_called_with({"probe_history": THERMAL_DATA["probe_history"]})
+        assert restore_thermal.call_count == 2
+        timings = engine.restore_timings
+        assert timings["phase_one_ms"] > 0.0
+        assert timings["phase_two_ms"] > 0.0
+
+    @pytest.mark.asyncio
+    async def test_rule_based_prediction_while_hydrating(self):
+        """Offsets are calculated without learned samples until hydration completes."""
+        engine, _ = _engine()
+        await engine.async_load_learning_data(hydrate_in_background=True)
+
+        engine._learner.predict = Mock(side_effect=AssertionError("learner used before hydration"))
+
+        engine.calculate_offset(_input())
+
+        engine._learner.predict.assert_not_called()
+        await engine.async_wait_for_hydration()
+
+    @pytest.mark.asyncio
+    async def test_no_calibration_while_hydrating(self):
+        """The empty learner does not put the engine in calibration or touch its cache."""
+        engine, _ = _engine()
+        await engine.async_load_learning_data(hydrate_in_background=True)
+        stable = OffsetInput(
+            ac_internal_temp=23.5, room_temp=24.0, outdoor_temp=30.0, mode="none",
+            power_consumption=10.0, time_of_day=time(14, 0), day_of_week=2,
+        )
+
+        assert not engine.is_in_calibration_phase
+        result = engine.calculate_offset(stable)
+
+        assert not result.reason.startswith("Calibration")
+        assert engine._stable_calibration_offset is None
+        await engine.async_wait_for_hydration()
+
+    @pytest.mark.asyncio
+    async def test_learner_deserialized_in_executor(self):
+        """Samples are restored into a new learner off the event loop, then swapped in."""
+        engine, _ = _engine()
+        empty_learner = engine._learner
+        build = engine._build_restored_learner
+        building = threading.Event()
+        release = threading.Event()
+        build_threads = []
+
+        def gated_build(learner_data):
+            build_threads.append(threading.get_ident())
+            building.set()
+            release.wait(5)
+            return build(learner_data)
+
+        engine._build_restored_learner = gated_build
+        await engine.async_load_learning_data(hydrate_in_background=True, hass=_hass())
+        while not building.is_set():
+            await asyncio.sleep(0.01)
+
+        # Offsets computed mid-hydration stay rule-based and use the old learner
+        result = engine.calculate_offset(_input())
+        assert not result.reason.startswith("Calibration")
+        assert engine._learner is empty_learner
+        assert not engine.is_learning_hydrated
+
+        release.set()
+        await engine.async_wait_for_hydration()
+
+        assert build_threads and build_threads[0] != threading.get_ident()
+        assert engine.is_learning_hydrated
+        assert engine._learner is not empty_learner
+        assert len(engine._learner._enhanced_samples) == 20
+        timings = engine.restore_timings
+        assert 0.0 < timings["phase_two_max_step_ms"] < timings["phase_two_ms"]
+
+    @pytest.mark.asyncio
+    async def test_default_load_restores_everything_inline(self):
+        """Without background hydration the full thermal data is restored in one call."""
+        engine, restore_thermal = _engine()
+
+        assert await engine.async_load_learning_data()
+
+        assert engine.is_learning_hydrated
+        assert engine._hydration_task is None
+        assert len(engine._learner._enhanced_samples) == 20
+        restore_thermal.assert_called_once_with(THERMAL_DATA)
+
+    @pytest.mark.asyncio
+    async def test_save_waits_for_hydration(self):
+        """A save during hydration does not overwrite the file with an empty learner."""
+        engine, _ = _engine()
+        await engine.async_load_learning_data(hydrate_in_background=True)
+
+        await engine.async_save_learning_data()
+
+        saved = engine._data_store.async_save_learning_data.call_args[0][0]
+        assert len(saved["learning_data"]["learner_data"]["enhanced_samples"]) == 20
+
+    @pytest.mark.asyncio
+    async def test_samples_are_not_recorded_while_hydrating(self):
+        """Samples recorded before hydration would be lost, so they are skipped."""
+        engine, _ = _engine()
+        await engine.async_load_learning_data(hydrate_in_background=True)
+
+        engine.record_actual_performance(predicted_offset=1.0, actual_offset=1.2, input_data=_input())
+        await engine.async_wait_for_hydration()
+
+        assert len(engine._learner._enhanced_samples) == 20
+
+    @pytest.mark.asyncio
+    async def test_reset_cancels_hydration(self):
+        """Resetting during hydration keeps the old samples from coming back."""
+        engine, _ = _engine()
+        await engine.async_load_learning_data(hydrate_in_background=True)
+
+        engine.reset_learning()
+        await asyncio.sleep(0)
+
+        assert engine.is_learning_hydrated
+        assert engine._learner._enhanced_samples == []
+
+    @pytest.mark.asyncio
+    async def test_timings_in_system_health(self):
+        """Restore timings and the hydration flag are reported in the system health data."""
+        engine, _ = _engine()
+        await engine.async_load_learning_data(hydrate_in_background=True)
+        assert engine._compute_system_health_data().learning_hydrated is False
+
+        await engine.async_wait_for_hydration()
+        health = engine._compute_system_health_data()
+
+        assert health.learning_hydrated is True
+        assert health.restore_phase_one_ms > 0.0
+        assert health.restore_phase_two_ms > 0.0
+        assert 0.0 < health.restore_phase_two_max_step_ms <= health.restore_phase_two_ms
+
@@ -0,0 +1,273 @@
+"""ABOUTME: Tests for the domain-wide PersistenceWriter shared by all data stores.
+Covers batching saves into one executor job, failure isolation, metrics and staggered periodic saves."""
+
+import asyncio
+import json
+import tempfile
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from custom_components.smart_climate.const import DOMAIN
+from custom_components.smart_climate.data_store import SmartClimateDataStore
+from custom_components.smart_climate.offset_engine import OffsetEngine
+from custom_components.smart_climate import async_unload_entry
+from custom_components.smart_climate.persistence_writer import (
+    DATA_PERSISTENCE_WRITER,
+    PersistenceWriter,
+    async_get_persistence_writer,
+    async_remove_persistence_writer,
+)
+
+
+@pytest.fixture
+def hass():
+    """Mock hass whose executor runs jobs inline in a temporary config directory."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        mock_hass = Mock()
+        mock_hass.config.config_dir = temp_dir
+        mock_hass.data = {}
+        mock_hass.async_add_executor_job = AsyncMock(side_effect=lambda func, *args: func(*args))
+        yield mock_hass
+
+
+def _learning_data(samples):
+    return {"version": "2.1", "learning_data": {"learner_data": {"enhanced_samples": samples}}}
+
+
+class TestPersistenceWriter:
+    """Test batching in the shared writer."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_saves_share_one_executor_job(self, hass):
+        """Saves from several entities at once run in a single executor call."""
+        writer = PersistenceWriter(hass, batch_window=0.01)
+        stores = [
+            SmartClimateDataStore(hass, f"climate.room_{i}", writer=writer) for i in range(5)
+        ]
+
+        await asyncio.gather(*(
+            store.async_save_learning_data(_learning_data([i])) for i, store in enumerate(stores)
+        ))
+
+        assert hass.async_add_executor_job.await_count == 1
+        metrics = writer.get_metrics()
+        assert metrics["batch_count"] == 1
+        assert metrics["last_batch_size"] == 5
+        assert metrics["max_queue_depth"] == 5
+        assert metrics["queue_depth"] == 0
+        assert metrics["last_batch_latency_ms"] >= 0.0
+        for i, store in enumerate(stores):
+            with store.get_data_file_path().open("r", encoding="utf-8") as f:
+                assert json.load(f)["learning_data"] == _learning_data([i])
+
+    @pytest.mark.asyncio
+    async def test_journal_appends_go_through_writer(self, hass):
+        """Later saves append to the journal and load back the same data."""
+        writer = PersistenceWriter(hass, batch_window=0.0)
+        store = SmartClimateDataStore(hass, "climate.test", writer=writer)
+        samples = list(range(100))
+        await store.async_save_learning_data(_learning_data(samples))
+
+        samples.append(100)
+        await store.async_save_learning_data(_learning_data(samples))
+
+        assert store.get_journal_stats()["journal_entries"] == 1
+        assert writer.get_metrics()["job_count"] == 2
+        loaded = await SmartClimateDataStore(hass, "climate.test").async_load_learning_data()
+        assert loaded == _learning_data(samples)
+
+    @pytest.mark.asyncio
+    async def test_failing_job_does_not_affect_others(self, hass):
+        """Each job's exception is delivered to its own caller only."""
+        writer = PersistenceWriter(hass, batch_window=0.01)
+
+        def fail():
+            raise OSError("disk full")
+
+        results = await asyncio.gather(
+            writer.async_run(lambda: "ok"), writer.async_run(fail), return_exceptions=True
+        )
+
+        assert results[0] == "ok"
+        assert isinstance(results[1], OSError)
+        assert writer.get_metrics()["failed_job_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_jobs_queued_during_a_batch_run_next(self, hass):
+        """Jobs submitted while a batch is in the executor are not stranded."""
+        writer = PersistenceWriter(hass, batch_window=0.0)
+        late = []
+
+        async def executor(func, *args):
+            if not late:
+                late.append(asyncio.ensure_future(writer.async_run(lambda: "late")))
+                await asyncio.sleep(0)
+            return func(*args)
+
+        hass.async_add_executor_job = AsyncMock(side_effect=executor)
+
+        assert await writer.async_run(lambda: "first") == "first"
+        assert await asyncio.wait_for(late[0], timeout=1.0) == "late"
+        assert writer.get_metrics()["batch_count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_save_failure_is_logged_not_raised(self, hass):
+        """A failed batched save is handled like a failed direct save."""
+        writer = PersistenceWriter(hass, batch_window=0.0)
+        store = SmartClimateDataStore(hass, "climate.test", writer=writer)
+
+        with patch(
+            "custom_components.smart_climate.data_store.atomic_json_write",
+            side_effect=OSError("disk full"),
+        ), patch("custom_components.smart_climate.data_store._LOGGER") as mock_logger:
+            await store.async_save_learning_data(_learning_data([1]))
+
+        mock_logger.error.assert_called_once()
+        assert not store.get_data_file_path().exists()
+
+    def test_stagger_fractions_are_spread(self, hass):
+        """Successive entities get distinct, evenly spread phases."""
+        writer = PersistenceWriter(hass)
+
+        fractions = sorted(writer.next_stagger_fraction() for _ in range(8))
+
+        assert fractions[0] == 0.0
+        assert all(0.0 <= f < 1.0 for f in fractions)
+        gaps = [b - a for a, b in zip(fractions, fractions[1:])]
+        assert min(gaps) > 0.05
+
+    def test_writer_is_shared_per_domain(self, hass):
+        """async_get_persistence_writer returns one writer stored in hass.data."""
+        writer = async_get_persistence_writer(hass)
+
+        assert async_get_persistence_writer(hass) is writer
+        assert hass.data[DATA_PERSISTENCE_WRITER] is writer
+        assert DATA_PERSISTENCE_WRITER not in hass.data.get(DOMAIN, {})
+
+    def test_data_store_reports_writer_metrics(self, hass):
+        """Stores expose the writer metrics; stores without a writer report None."""
+        writer = PersistenceWriter(hass)
+
+        assert SmartClimateDataStore(hass, "climate.a", writer=writer).get_writer_metrics() == writer.get_metrics()
+        assert SmartClimateDataStore(hass, "climate.b").get_writer_metrics() is None
+
+
+class TestShutdownFlush:
+    """Test that queued saves are written out on unload and shutdown."""
+
+    @staticmethod
+    async def _queue_save(writer, hass):
+        """Submit a save that waits for the (long) batch window."""
+        store = SmartClimateDataStore(hass, "climate.test", writer=writer)
+        task = asyncio.ensure_future(store.async_save_learning_data(_learning_data([1])))
+        await asyncio.sleep(0)
+        assert writer.queue_depth == 1
+        return store, task
+
+    @pytest.mark.asyncio
+    async def test_flush_runs_queued_saves(self, hass):
+        """async_flush writes queued saves without waiting for the window."""
+        writer = PersistenceWriter(hass, batch_window=60.0)
+        store, task = await self._queue_save(writer, hass)
+
+        await writer.async_flush()
+
+        assert store.get_data_file_path().exists()
+        await asyncio.wait_for(task, timeout=1.0)
+
+    @pytest.mark.asyncio
+    async def test_stop_event_flushes_writer(self, hass):
+        """The shared writer flushes when Home Assistant stops."""
+        writer = async_get_persistence_writer(hass)
+        writer._batch_window = 60.0
+        event_type, on_stop = hass.bus.async_listen_once.call_args[0]
+        store, task = await self._queue_save(writer, hass)
+
+        assert event_type == "homeassistant_stop"
+        await on_stop(Mock())
+
+        assert store.get_data_file_path().exists()
+        await asyncio.wait_for(task, timeout=1.0)
+
+    @pytest.mark.asyncio
+    async def test_remove_flushes_and_drops_writer(self, hass):
+        """Removing the writer flushes it and unregisters its stop listener."""
+        writer = async_get_persistence_writer(hass)
+        writer._batch_window = 60.0
+        store, task = await self._queue_save(writer, hass)
+
+        await async_remove_persistence_writer(hass)
+
+        assert store.get_data_file_path().exists()
+        assert DATA_PERSISTENCE_WRITER not in hass.data
+        hass.bus.async_listen_once.return_value.assert_called_once()
+        await asyncio.wait_for(task, timeout=1.0)
+
+    @pytest.mark.asyncio
+    async def test_unloading_last_entry_flushes_writer(self, hass):
+        """Unloading the last config entry writes out queued saves."""
+        entry = Mock(entry_id="entry_1")
+        hass.data[DOMAIN] = {entry.entry_id: {}}
+        hass.config_entries.async_unload_platforms = AsyncMock(return_value=True)
+        hass.config_entries.async_entries = Mock(return_value=[entry])
+        writer = async_get_persistence_writer(hass)
+        writer._batch_window = 60.0
+        store, task = await self._queue_save(writer, hass)
+
+        assert await async_unload_entry(hass, entry) is True
+
+        assert store.get_data_file_path().exists()
+        assert DATA_PERSISTENCE_WRITER not in hass.data
+        await asyncio.wait_for(task, timeout=1.0)
+
+
+class TestStaggeredPeriodicSave:
+    """Test the phase shift of periodic saves."""
+
+    @pytest.mark.asyncio
+    async def test_phase_delays_interval_start(self):
+        """With a phase the interval timer starts after phase * interval seconds."""
+        engine = OffsetEngine({"enable_learning": True})
+        hass = Mock()
+        cancel_start = Mock()
+
+        with patch("homeassistant.helpers.event.async_track_time_interval") as mock_track, \
+                patch("homeassistant.helpers.event.async_call_later", return_value=cancel_start) as mock_later:
+            remove = await engine.async_setup_periodic_save(hass, save_interval=600, phase=0.25)
+
+            mock_track.assert_not_called()
+            assert mock_later.call_args[0][1] == 150.0
+            await mock_later.call_args[0][2](None)
+            mock_track.assert_called_once()
+
+        remove()
+        mock_track.return_value.assert_called_once()
+        cancel_start.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_remove_before_start_cancels_delay(self):
+        """Removing before the phase elapsed cancels the delayed start."""
+        engine = OffsetEngine({"enable_learning": True})
+        cancel_start = Mock()
+
+        with patch("homeassistant.helpers.event.async_track_time_interval") as mock_track, \
+                patch("homeassistant.helpers.event.async_call_later", return_value=cancel_start):
+            remove = await engine.async_setup_periodic_save(Mock(), save_interval=600, phase=0.5)
+
+        remove()
+
+        cancel_start.assert_called_once()
+        mock_track.assert_not_called()
+
+    def test_system_health_includes_writer_metrics(self, hass):
+        """Queue depth and batch latency reach the system health data."""
+        engine = OffsetEngine({"enable_learning": True})
+        writer = PersistenceWriter(hass)
+        writer._last_batch_latency_ms = 12.5
+        engine.set_data_store(SmartClimateDataStore(hass, "climate.test", writer=writer))
+
+        health = engine._compute_system_health_data()
+
+        assert health.persistence_queue_depth == 0
+        assert health.persistence_batch_latency_ms == 12.5
@@ -551,6 +551,37 @@ class TestProbeResultCalculation:
                 assert result.fit_quality == 0.92
                 assert result.aborted is False
     
+    def test_tau_from_least_squares_fit(self):
+        """Tau is fitted from a noisy exponential drift, including an outlier reading."""
+        import math
+        start_time = datetime(2025, 1, 6, 14, 0)
+        offsets = [0.03, -0.04, 0.02, 0.0, -0.03, 0.04, -0.01, 0.02, -0.02, 0.01, 0.03, -0.03]
+        temperatures = [
+            (start_time + timedelta(minutes=5 * i),
+             28.0 - 6.0 * math.exp(-5 * i / 60.0) + offsets[i])
+            for i in range(12)
+        ]
+        temperatures[6] = (temperatures[6][0], temperatures[6][1] + 1.5)  # Sensor glitch
+        
+        tau, fit_quality = self.manager._calculate_tau_from_temperatures(temperatures, 22.0)
+        
+        assert tau == pytest.approx(60.0, rel=0.15)
+        assert 0.5 < fit_quality <= 1.0
+    
+    def test_tau_falls_back_to_crossing_with_few_readings(self):
+        """Probes with too few readings for the fit use the 63.2% crossing estimate."""
+        start_time = datetime(2025, 1, 6, 14, 0)
+        temperatures = [
+            (start_time, 22.0),
+            (start_time + timedelta(minutes=30), 23.3),
+            (start_time + timedelta(minutes=60), 24.0),
+        ]
+        
+        tau, fit_quality = self.manager._calculate_tau_from_temperatures(temperatures, 22.0)
+        
+        assert tau == 30.0
+        assert fit_quality == pytest.approx(0.3)
+    
     def test_complete_probe_partial_data(self):
         """Test probe completion with insufficient data (reduced confidence)."""
         with patch('uuid.uuid4') as mock_uuid:
@@ -0,0 +1,149 @@
+"""ABOUTME: Tests for the packed enhanced-sample encoding and the learner's version 1.3 persistence.
+Checks exact dict round-trips, float32/float64 record selection and per-sample dict fallback."""
+
+import json
+
+import pytest
+
+from custom_components.smart_climate.lightweight_learner import LightweightOffsetLearner
+from custom_components.smart_climate.offset_engine import OffsetEngine
+from custom_components.smart_climate.sample_codec import (
+    pack_sample,
+    pack_samples,
+    unpack_sample,
+    unpack_samples,
+)
+
+
+def _sample(**overrides):
+    """Build an enhanced sample as add_sample() stores it."""
+    sample = {
+        "predicted": 0.5,
+        "actual": -1.25,
+        "ac_temp": 22.5,
+        "room_temp": 24.0,
+        "outdoor_temp": 31.0,
+        "mode": "none",
+        "power": 850.0,
+        "hysteresis_state": "active_phase",
+        "indoor_humidity": 55.0,
+        "outdoor_humidity": None,
+        "timestamp": "2025-07-14T13:05:42.123456",
+    }
+    sample.update(overrides)
+    return sample
+
+
+class TestSampleCodec:
+    """Test pack_sample/unpack_sample."""
+
+    def test_float32_record_round_trip(self):
+        """Values representable in float32 use the short record and decode exactly."""
+        sample = _sample()
+        encoded = pack_sample(sample)
+
+        assert unpack_sample(encoded) == sample
+        assert len(encoded) < len(json.dumps(sample)) / 3
+
+    def test_float64_record_round_trip(self):
+        """Values needing double precision switch to the float64 record."""
+        sample = _sample(predicted=0.1, room_temp=24.123456789)
+        encoded = pack_sample(sample)
+
+        decoded = unpack_sample(encoded)
+        assert decoded == sample
+        assert decoded["predicted"] == 0.1
+        assert len(encoded) > len(pack_sample(_sample()))
+
+    def test_missing_values_and_empty_timestamp(self):
+        """Optional None fields and an empty timestamp survive the round trip."""
+        sample = _sample(outdoor_temp=None, power=None, indoor_humidity=None, timestamp="")
+
+        assert unpack_sample(pack_sample(sample)) == sample
+
+    def test_timestamp_without_microseconds(self):
+        """Timestamps keep their original isoformat() spelling."""
+        sample = _sample(timestamp="2025-07-14T13:05:42")
+
+        assert unpack_sample(pack_sample(sample))["timestamp"] == "2025-07-14T13:05:42"
+
+    @pytest.mark.parametrize("overrides", [
+        {"mode": "vacation"},
+        {"hysteresis_state": "unknown"},
+        {"power": 850},
+        {"predicted": None},
+        {"outdoor_temp": float("nan")},
+        {"timestamp": "2025-07-14T13:05:42+00:00"},
+        {"timestamp": "2025-07-14 13:05:42"},
+        {"extra": 1},
+    ])
+    def test_unpackable_samples_are_rejected(self, overrides):
+        """Samples that would not decode to an equal dict are not packed."""
+        assert pack_sample(_sample(**overrides)) is None
+
+    def test_list_keeps_unpackable_samples_as_dicts(self):
+        """pack_samples falls back to dicts per sample and preserves order."""
+        samples = [_sample(), _sample(mode="vacation"), _sample(actual=0.3)]
+
+        packed = pack_samples(samples)
+
+        assert isinstance(packed[0], str)
+        assert packed[1] == samples[1]
+        assert unpack_samples(json.loads(json.dumps(packed))) == samples
+
+    def test_malformed_record_raises_value_error(self):
+        """Corrupt records raise ValueError."""
+        with pytest.raises(ValueError):
+            unpack_sample("not base64!")
+        with pytest.raises(ValueError):
+            unpack_sample(pack_sample(_sample())[:-8])
+
+
+class TestPackedLearnerPersistence:
+    """Test the learner saving and loading version 1.3 packed samples."""
+
+    @staticmethod
+    def _learner(pack):
+        learner = LightweightOffsetLearner(pack_samples=pack)
+        for i in range(50):
+            learner.add_sample(
+                predicted=i * 0.1,
+                actual=i * 0.05,
+                ac_temp=22.0 + i * 0.01,
+                room_temp=24.0,
+                outdoor_temp=30.0 if i % 2 else None,
+                mode="none",
+                power=900.0,
+                hysteresis_state="active_phase",
+                indoor_humidity=50.0 + i,
+            )
+        return learner
+
+    def test_save_load_round_trip(self):
+        """Packed persistence restores the same samples and predictions."""
+        learner = self._learner(pack=True)
+
+        saved = json.loads(json.dumps(learner.save_patterns()))
+        assert saved["version"] == "1.3"
+        assert "enhanced_samples" not in saved
+        assert all(isinstance(item, str) for item in saved["enhanced_samples_packed"])
+
+        restored = LightweightOffsetLearner()
+        restored.load_patterns(saved)
+
+        assert restored._enhanced_samples == learner._enhanced_samples
+        assert restored._sample_count == 50
+        assert restored.predict(23.0, 24.0, 30.0, "none", 900.0) == learner.predict(23.0, 24.0, 30.0, "none", 900.0)
+
+    def test_dict_format_unchanged_by_default(self):
+        """Without the option the learner keeps writing version 1.2 dicts."""
+        saved = self._learner(pack=False).save_patterns()
+
+        assert saved["version"] == "1.2"
+        assert isinstance(saved["enhanced_samples"][0], dict)
+
+    def test_offset_engine_option(self):
+        """The learning_packed_samples option enables packed persistence."""
+        engine = OffsetEngine({"enable_learning": True, "learning_packed_samples": True})
+
+        assert engine._learner.save_patterns()["version"] == "1.3"
@@ -0,0 +1,66 @@
+"""ABOUTME: Benchmark of learner persistence size and load time, JSON objects vs packed samples.
+Runs at 1k and 10k samples and checks the packed file is smaller and loads the same samples."""
+
+import json
+import random
+import time
+
+import pytest
+
+from custom_components.smart_climate.lightweight_learner import LightweightOffsetLearner
+
+
+def _build_learner(count: int, pack: bool) -> LightweightOffsetLearner:
+    """Create a learner holding `count` synthetic enhanced samples as add_sample() records them."""
+    rng = random.Random(count)
+    learner = LightweightOffsetLearner(max_history=count, pack_samples=pack)
+    learner._enhanced_samples = [
+        {
+            "predicted": rng.uniform(-2.0, 2.0),
+            "actual": rng.uniform(-2.0, 2.0),
+            "ac_temp": rng.uniform(20.0, 28.0),
+            "room_temp": rng.uniform(20.0, 28.0),
+            "outdoor_temp": rng.uniform(10.0, 38.0) if i % 5 else None,
+            "mode": "none" if i % 7 else "away",
+            "power": rng.uniform(0.0, 1500.0) if i % 3 else None,
+            "hysteresis_state": ["active_phase", "idle_stable_zone"][i % 2],
+            "indoor_humidity": rng.uniform(30.0, 70.0),
+            "outdoor_humidity": None,
+            "timestamp": f"2025-07-01T12:{i // 60 % 60:02d}:{i % 60:02d}.{i + 1:06d}",
+        }
+        for i in range(count)
+    ]
+    learner._sample_count = count
+    return learner
+
+
+def _load_ms(text: str, repeats: int) -> tuple:
+    """Return the average json.loads + load_patterns time in milliseconds and the learner."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        learner = LightweightOffsetLearner(max_history=100_000)
+        learner.load_patterns(json.loads(text))
+    elapsed = time.perf_counter() - start
+    return elapsed * 1000 / repeats, learner
+
+
+@pytest.mark.parametrize("count", [1_000, 10_000])
+def test_packed_samples_benchmark(count):
+    """Compare file size and load time of dict and packed enhanced samples."""
+    dict_learner = _build_learner(count, pack=False)
+    packed_learner = _build_learner(count, pack=True)
+    dict_text = json.dumps(dict_learner.save_patterns())
+    packed_text = json.dumps(packed_learner.save_patterns())
+
+    repeats = max(1, 10_000 // count)
+    dict_ms, dict_loaded = _load_ms(dict_text, repeats)
+    packed_ms, packed_loaded = _load_ms(packed_text, repeats)
+
+    print(
+        f"\n{count} samples: dict={len(dict_text) / 1024:.0f}KiB/{dict_ms:.2f}ms "
+        f"packed={len(packed_text) / 1024:.0f}KiB/{packed_ms:.2f}ms "
+        f"size={len(packed_text) / len(dict_text):.0%}"
+    )
+
+    assert packed_loaded._enhanced_samples == dict_loaded._enhanced_samples
+    assert len(packed_text) < len(dict_text) * 0.6
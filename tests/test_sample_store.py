@@ -0,0 +1,473 @@
+"""ABOUTME: Tests for the columnar enhanced sample store and vectorized learner prediction.
+Verifies the vectorized path matches the pure Python geometric-mean similarity."""
+
+import random
+
+import pytest
+
+from custom_components.smart_climate.lightweight_learner import LightweightOffsetLearner
+from custom_components.smart_climate.sample_store import EnhancedSampleStore, OutdoorTemperatureIndex
+
+MODES = ["cool", "heat", "dry"]
+HYSTERESIS_STATES = ["active_phase", "idle_stable_zone", "learning_hysteresis", "no_power_sensor"]
+
+
+def _random_conditions(rng: random.Random) -> dict:
+    """Build a random set of conditions with some missing optional values."""
+    return {
+        "ac_temp": rng.uniform(18.0, 30.0),
+        "room_temp": rng.uniform(18.0, 30.0),
+        "outdoor_temp": rng.choice([None, rng.uniform(-5.0, 40.0)]),
+        "mode": rng.choice(MODES),
+        "power": rng.choice([None, rng.uniform(0.0, 2000.0)]),
+        "hysteresis_state": rng.choice(HYSTERESIS_STATES),
+        "indoor_humidity": rng.choice([None, rng.uniform(20.0, 80.0)]),
+        "outdoor_humidity": rng.choice([None, rng.uniform(20.0, 100.0)]),
+    }
+
+
+def _populated_learner(count: int, max_history: int = 1000, seed: int = 42) -> LightweightOffsetLearner:
+    """Create a learner filled with random samples."""
+    rng = random.Random(seed)
+    learner = LightweightOffsetLearner(max_history=max_history)
+    for _ in range(count):
+        conditions = _random_conditions(rng)
+        learner.add_sample(
+            predicted=rng.uniform(-3.0, 3.0),
+            actual=rng.uniform(-3.0, 3.0),
+            **conditions
+        )
+    return learner
+
+
+class TestEnhancedSampleStore:
+    """Test the columnar ring buffer itself."""
+
+    def test_append_and_len(self):
+        """Test samples are appended until capacity is reached."""
+        store = EnhancedSampleStore(capacity=3)
+        for i in range(3):
+            evicted = store.append({"actual": float(i), "ac_temp": 24.0, "room_temp": 25.0})
+            assert evicted is None
+        assert len(store) == 3
+
+    def test_ring_buffer_evicts_oldest(self):
+        """Test appending to a full store overwrites the oldest slot."""
+        store = EnhancedSampleStore(capacity=3)
+        for i in range(3):
+            store.append({"actual": float(i), "ac_temp": 24.0, "room_temp": 25.0})
+
+        evicted = store.append({"actual": 3.0, "ac_temp": 24.0, "room_temp": 25.0})
+
+        assert evicted == 0
+        assert len(store) == 3
+        assert sorted(store.column("actual")) == [1.0, 2.0, 3.0]
+
+    def test_missing_values_stored_as_nan(self):
+        """Test None optional values become NaN in the columns."""
+        store = EnhancedSampleStore(capacity=2)
+        store.append({"actual": 1.0, "ac_temp": 24.0, "room_temp": 25.0, "outdoor_temp": None})
+
+        outdoor = store.column("outdoor_temp")
+        assert outdoor[0] != outdoor[0]  # NaN
+
+    def test_rebuild_grows_capacity_for_oversized_input(self):
+        """Test rebuild keeps every sample when given more than the capacity."""
+        store = EnhancedSampleStore(capacity=2)
+        samples = [{"actual": float(i), "ac_temp": 24.0, "room_temp": 25.0} for i in range(5)]
+
+        store.rebuild(samples)
+
+        assert len(store) == 5
+        store.rebuild(samples[:2])
+        assert store.capacity == 2
+
+    def test_empty_store_has_no_prediction(self):
+        """Test weighted_prediction returns None when empty."""
+        store = EnhancedSampleStore(capacity=2)
+        assert store.weighted_prediction(ac_temp=24.0, room_temp=25.0) is None
+
+    def test_similarity_matches_scalar_calculation(self):
+        """Test vectorized similarity equals the per-sample calculation."""
+        learner = _populated_learner(200)
+        rng = random.Random(7)
+
+        for _ in range(20):
+            query = _random_conditions(rng)
+            learner._sync_sample_store()
+            weights = learner._sample_store.similarity_weights(**query)
+            expected = [
+                learner._calculate_similarity_with_hysteresis(
+                    query["ac_temp"], query["room_temp"], query["outdoor_temp"], query["mode"],
+                    query["power"], query["hysteresis_state"], query["indoor_humidity"],
+                    query["outdoor_humidity"], sample
+                )
+                for sample in learner._enhanced_samples
+            ]
+            assert list(weights) == pytest.approx(expected, rel=1e-12)
+
+
+class TestVectorizedPrediction:
+    """Test the learner uses the columnar store consistently."""
+
+    def test_predict_matches_python_path(self):
+        """Test vectorized predict() equals the pure Python loop."""
+        learner = _populated_learner(500)
+        rng = random.Random(11)
+
+        for _ in range(25):
+            query = _random_conditions(rng)
+            vectorized = learner.predict(**query)
+            python = learner._predict_python(
+                query["ac_temp"], query["room_temp"], query["outdoor_temp"], query["mode"],
+                query["power"], query["hysteresis_state"], query["indoor_humidity"],
+                query["outdoor_humidity"]
+            )
+            assert vectorized == pytest.approx(python, rel=1e-12, abs=1e-12)
+
+    def test_store_follows_pruning(self):
+        """Test the store mirrors the learner after max_history pruning."""
+        learner = _populated_learner(150, max_history=100)
+
+        assert len(learner._enhanced_samples) == 100
+        assert learner._is_sample_store_in_sync()
+        assert sorted(learner._sample_store.column("actual")) == sorted(
+            sample["actual"] for sample in learner._enhanced_samples
+        )
+
+    def test_store_resyncs_after_load_patterns(self):
+        """Test predict() uses loaded samples after load_patterns()."""
+        source = _populated_learner(50)
+        learner = LightweightOffsetLearner()
+        learner.load_patterns(source.save_patterns())
+
+        query = {"ac_temp": 24.0, "room_temp": 25.0, "mode": "cool"}
+        assert learner.predict(**query) == pytest.approx(source.predict(**query), rel=1e-12)
+        assert learner._is_sample_store_in_sync()
+
+    def test_store_resyncs_after_direct_assignment(self):
+        """Test predict() notices a replaced _enhanced_samples list."""
+        learner = _populated_learner(20)
+        learner._enhanced_samples = [
+            {"predicted": 0.0, "actual": 2.0, "ac_temp": 24.0, "room_temp": 25.0,
+             "mode": "cool", "hysteresis_state": "no_power_sensor"}
+        ]
+
+        assert learner.predict(ac_temp=24.0, room_temp=25.0) == pytest.approx(2.0)
+
+    def test_reset_clears_store(self):
+        """Test reset_learning() empties the store."""
+        learner = _populated_learner(20)
+        learner.reset_learning()
+
+        assert len(learner._sample_store) == 0
+        assert learner.predict(ac_temp=24.0, room_temp=25.0) == 0.0
+
+    def test_python_fallback_without_store(self):
+        """Test predict() falls back to the Python loop when numpy is unavailable."""
+        learner = _populated_learner(100)
+        expected = learner.predict(ac_temp=24.0, room_temp=25.0, outdoor_temp=30.0)
+
+        learner._sample_store = None
+
+        assert learner.predict(ac_temp=24.0, room_temp=25.0, outdoor_temp=30.0) == pytest.approx(
+            expected, rel=1e-12
+        )
+
+
+class TestSpatialSampleIndex:
+    """Test the optional grid index used for candidate lookup."""
+
+    @staticmethod
+    def _indexed_learner(count: int, max_history: int = 1000, min_candidates: int = 1) -> LightweightOffsetLearner:
+        """Create an indexed learner filled with random samples."""
+        rng = random.Random(3)
+        learner = LightweightOffsetLearner(
+            max_history=max_history, use_spatial_index=True, min_index_candidates=min_candidates
+        )
+        for _ in range(count):
+            learner.add_sample(
+                predicted=0.0, actual=rng.uniform(-3.0, 3.0), **_random_conditions(rng)
+            )
+        learner._sync_sample_store()
+        return learner
+
+    def test_candidates_cover_similarity_windows(self):
+        """Test every same-partition sample inside the windows is a candidate."""
+        learner = self._indexed_learner(800)
+        store = learner._sample_store
+        rng = random.Random(5)
+
+        for _ in range(30):
+            query = _random_conditions(rng)
+            slots = store.candidate_slots(**query)
+            candidates = set() if slots is None else set(slots.tolist())
+            for slot in range(len(store)):
+                sample = learner._enhanced_samples[slot]
+                in_window = (
+                    sample["mode"] == query["mode"]
+                    and sample["hysteresis_state"] == query["hysteresis_state"]
+                    and abs(sample["ac_temp"] - query["ac_temp"]) < 5.0
+                    and abs(sample["room_temp"] - query["room_temp"]) < 5.0
+                    and (
+                        query["outdoor_temp"] is None
+                        or sample["outdoor_temp"] is None
+                        or abs(sample["outdoor_temp"] - query["outdoor_temp"]) < 10.0
+                    )
+                )
+                if in_window and slots is not None:
+                    assert slot in candidates
+
+    def test_index_stays_consistent_after_eviction(self):
+        """Test incremental eviction leaves the same index as a full rebuild."""
+        learner = self._indexed_learner(500, max_history=120)
+        store = learner._sample_store
+        rebuilt = EnhancedSampleStore(capacity=120, use_spatial_index=True, min_index_candidates=1)
+        rebuilt.rebuild(learner._enhanced_samples)
+        rng = random.Random(9)
+
+        assert len(store.index) == 120
+        for _ in range(30):
+            query = _random_conditions(rng)
+            incremental_slots = store.candidate_slots(**query)
+            rebuilt_slots = rebuilt.candidate_slots(**query)
+            if incremental_slots is None or rebuilt_slots is None:
+                assert incremental_slots is None and rebuilt_slots is None
+                continue
+            assert sorted(store.column("actual")[incremental_slots]) == sorted(
+                rebuilt.column("actual")[rebuilt_slots]
+            )
+
+    def test_falls_back_to_full_scan_with_few_candidates(self):
+        """Test predictions are exact when the index finds too few candidates."""
+        learner = self._indexed_learner(300, min_candidates=10_000)
+        query = {"ac_temp": 24.0, "room_temp": 25.0, "outdoor_temp": 30.0, "mode": "cool"}
+
+        indexed = learner.predict(**query)
+        exact = learner._predict_python(
+            24.0, 25.0, 30.0, "cool", None, "no_power_sensor", None, None
+        )
+
+        assert indexed == pytest.approx(exact, rel=1e-12)
+        assert learner._sample_store.last_scan_size == 300
+
+    def test_indexed_prediction_scores_fewer_samples(self):
+        """Test the index limits scoring to nearby candidates."""
+        learner = self._indexed_learner(1000)
+        query = {
+            "ac_temp": 24.0, "room_temp": 25.0, "outdoor_temp": 30.0,
+            "mode": "cool", "hysteresis_state": "active_phase"
+        }
+
+        prediction = learner.predict(**query)
+
+        assert -3.0 <= prediction <= 3.0
+        assert 0 < learner._sample_store.last_scan_size < 1000
+
+    def test_index_rebuilt_after_load_patterns(self):
+        """Test load_patterns() samples are indexed on the next prediction."""
+        source = _populated_learner(200)
+        learner = LightweightOffsetLearner(use_spatial_index=True, min_index_candidates=1)
+        learner.load_patterns(source.save_patterns())
+
+        learner.predict(ac_temp=24.0, room_temp=25.0)
+
+        assert len(learner._sample_store.index) == 200
+
+
+class TestRunningSampleStatistics:
+    """Test incremental statistics match a full recompute."""
+
+    @staticmethod
+    def _full_recompute(samples) -> dict:
+        """Recompute accuracy and diversity inputs by scanning every sample."""
+        errors = [abs(s.get("predicted", 0.0) - s.get("actual", 0.0)) for s in samples]
+        return {
+            "mae": sum(errors) / len(errors) if errors else None,
+            "ac": len({round(s["ac_temp"] * 2) / 2 for s in samples}),
+            "room": len({round(s["room_temp"] * 2) / 2 for s in samples}),
+            "outdoor": len({round(s["outdoor_temp"] * 2) / 2 for s in samples if s.get("outdoor_temp") is not None}),
+            "power": len({round(s["power"] / 100) * 100 for s in samples if s.get("power") is not None}),
+            "modes": len({s.get("mode", "unknown") for s in samples}),
+            "hysteresis": len({s.get("hysteresis_state", "unknown") for s in samples}),
+        }
+
+    @staticmethod
+    def _incremental(stats) -> dict:
+        """Read the incremental values in the same shape as _full_recompute."""
+        return {
+            "mae": stats.mean_absolute_error,
+            "ac": stats.distinct_ac_temps,
+            "room": stats.distinct_room_temps,
+            "outdoor": stats.distinct_outdoor_temps,
+            "power": stats.distinct_power_levels,
+            "modes": stats.distinct_modes,
+            "hysteresis": stats.distinct_hysteresis_states,
+        }
+
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_incremental_matches_full_recompute_after_add_evict(self, seed):
+        """Test random add/evict sequences leave statistics equal to a rescan."""
+        rng = random.Random(seed)
+        learner = LightweightOffsetLearner(max_history=rng.randint(20, 80))
+
+        for step in range(400):
+            learner.add_sample(
+                predicted=rng.uniform(-3.0, 3.0), actual=rng.uniform(-3.0, 3.0), **_random_conditions(rng)
+            )
+            if step % 37 == 0:
+                assert learner._is_sample_store_in_sync()
+                expected = self._full_recompute(learner._enhanced_samples)
+                actual = self._incremental(learner._sample_stats)
+                assert actual.pop("mae") == pytest.approx(expected.pop("mae"), rel=1e-9)
+                assert actual == expected
+
+    def test_confidence_factors_match_full_recompute(self):
+        """Test learner confidence factors use values equal to a rescan."""
+        learner = _populated_learner(300, max_history=120)
+        expected = self._full_recompute(learner._enhanced_samples)
+
+        diversity = learner._calculate_condition_diversity_confidence()
+
+        factors = [min(1.0, expected["ac"] / 5.0), min(1.0, expected["room"] / 5.0)]
+        if expected["outdoor"]:
+            factors.append(min(1.0, expected["outdoor"] / 8.0))
+        factors.append(min(1.0, expected["modes"] / 2.0))
+        if expected["power"]:
+            factors.append(min(1.0, expected["power"] / 5.0))
+        factors.append(min(1.0, expected["hysteresis"] / 2.0))
+        assert diversity == pytest.approx(sum(factors) / len(factors))
+
+    def test_statistics_rebuilt_after_load_patterns(self):
+        """Test statistics are recomputed for samples restored by load_patterns()."""
+        source = _populated_learner(60)
+        learner = LightweightOffsetLearner()
+        learner.load_patterns(source.save_patterns())
+
+        assert learner._calculate_prediction_accuracy() == pytest.approx(
+            source._calculate_prediction_accuracy()
+        )
+        assert learner._sample_stats.count == 60
+
+    def test_reset_clears_statistics(self):
+        """Test reset_learning() clears the running statistics."""
+        learner = _populated_learner(30)
+        learner.reset_learning()
+
+        assert learner._sample_stats.count == 0
+        assert learner._sample_stats.mean_absolute_error is None
+
+
+def _reference_correlation(data, outdoor_temp):
+    """Original full-sort temperature correlation prediction."""
+    temps = [item["outdoor_temp"] for item in data]
+    offsets = [item["offset"] for item in data]
+    if len(set(temps)) < 2:
+        return sum(offsets) / len(offsets)
+    temp_diffs = sorted((abs(t - outdoor_temp), t, o) for t, o in zip(temps, offsets))
+    _, temp1, offset1 = temp_diffs[0]
+    _, temp2, offset2 = temp_diffs[1]
+    if temp1 == temp2:
+        return (offset1 + offset2) / 2
+    return offset1 + (outdoor_temp - temp1) / (temp2 - temp1) * (offset2 - offset1)
+
+
+class TestOutdoorTemperatureIndex:
+    """Test the sorted index behind temperature-correlation prediction."""
+
+    def test_nearest_matches_full_sort_order(self):
+        """Test neighbours come back in (|Δt|, temp, offset) order, including ties."""
+        rng = random.Random(21)
+        index = OutdoorTemperatureIndex()
+        points = [(rng.choice([20.0, 20.5, 21.0, 22.0, 25.0]), rng.choice([-1.0, 0.0, 1.0, 2.0])) for _ in range(60)]
+        for temp, offset in points:
+            index.add(temp, offset)
+
+        for query in (19.0, 20.25, 20.5, 21.0, 23.5, 30.0):
+            expected = [(t, o) for _, t, o in sorted((abs(t - query), t, o) for t, o in points)][:6]
+            assert index.nearest(query, 6) == expected
+
+    def test_nearest_touches_only_nearby_points(self):
+        """Test a lookup reads about `count` entries, not everything below the split."""
+
+        class CountingList(list):
+            reads = 0
+
+            def __getitem__(self, position):
+                CountingList.reads += 1
+                return super().__getitem__(position)
+
+            def __iter__(self):
+                for item in super().__iter__():
+                    CountingList.reads += 1
+                    yield item
+
+        index = OutdoorTemperatureIndex()
+        index.rebuild({"outdoor_temp": i * 0.01, "offset": 0.0} for i in range(10000))
+        index._entries = CountingList(index._entries)
+
+        for query in (0.0, 50.005, 99.99):
+            CountingList.reads = 0
+            assert len(index.nearest(query, 5)) == 5
+            # bisect (~14 reads per search) plus a few reads per yielded neighbour
+            assert CountingList.reads < 100
+
+    @pytest.mark.parametrize("seed", [4, 5, 6])
+    def test_prediction_matches_full_sort_after_evictions(self, seed):
+        """Test interpolation through the index equals the original sort-based result."""
+        rng = random.Random(seed)
+        learner = LightweightOffsetLearner(max_history=25)
+
+        for step in range(200):
+            learner.update_pattern(
+                rng.uniform(-2.0, 2.0), round(rng.uniform(10.0, 35.0) * 2) / 2, step % 24, None
+            )
+            if step % 9 == 0 and len(learner._temp_correlation_data) >= 2:
+                query = rng.uniform(5.0, 40.0)
+                assert learner._predict_from_temperature_correlation(query) == pytest.approx(
+                    _reference_correlation(learner._temp_correlation_data, query)
+                )
+        assert len(learner._temp_correlation_index) == 25
+
+    def test_single_temperature_returns_mean(self):
+        """Test identical temperatures fall back to the mean offset."""
+        learner = LightweightOffsetLearner()
+        for offset in (1.0, 2.0, 3.0):
+            learner.update_pattern(offset, 25.0, 12, None)
+
+        assert learner._predict_from_temperature_correlation(30.0) == pytest.approx(2.0)
+
+    def test_index_rebuilt_after_external_replacement(self):
+        """Test a replaced correlation container is re-indexed before use."""
+        learner = LightweightOffsetLearner()
+        learner._temp_correlation_data = [
+            {"outdoor_temp": 20.0, "offset": 1.0},
+            {"outdoor_temp": 30.0, "offset": 3.0},
+        ]
+
+        assert learner._predict_from_temperature_correlation(25.0) == pytest.approx(2.0)
+
+    def test_index_follows_load_patterns(self):
+        """Test load_patterns() re-indexes the restored correlation data."""
+        source = LightweightOffsetLearner()
+        for temp, offset in ((20.0, 1.0), (25.0, 2.0), (30.0, 3.0)):
+            source.update_pattern(offset, temp, 10, None)
+        learner = LightweightOffsetLearner()
+        learner.load_patterns(source.save_patterns())
+
+        assert learner._is_temp_correlation_index_in_sync()
+        assert learner._predict_from_temperature_correlation(27.5) == pytest.approx(2.5)
+
+    def test_local_linear_mode_fits_line_robustly(self):
+        """Test local_linear mode follows the trend and ignores a single outlier."""
+        learner = LightweightOffsetLearner(correlation_mode="local_linear")
+        for temp in range(20, 30):
+            learner.update_pattern(0.2 * temp - 4.0, float(temp), 10, None)
+        learner.update_pattern(10.0, 25.2, 10, None)  # outlier
+
+        assert learner._predict_from_temperature_correlation(25.5) == pytest.approx(1.1, abs=0.05)
+
+    def test_invalid_correlation_mode_rejected(self):
+        """Test unsupported correlation modes raise ValueError."""
+        with pytest.raises(ValueError):
+            LightweightOffsetLearner(correlation_mode="cubic")
@@ -539,4 +539,89 @@ class TestSensorManagerNoneEntityGracefulDegradation:
             # Verify the log messages contain appropriate information
             debug_calls = [call[0][0] for call in mock_logger.debug.call_args_list]
             assert any("Indoor humidity sensor ID is None" in msg for msg in debug_calls)
-            assert any("Outdoor humidity sensor ID is None" in msg for msg in debug_calls)
\ No newline at end of file
+            assert any("Outdoor humidity sensor ID is None" in msg for msg in debug_calls)
+
+class TestSensorSnapshot:
+    """Test the shared sensor snapshot and the parse cache."""
+
+    @staticmethod
+    def _manager(states):
+        hass = Mock()
+        hass.states.get.side_effect = states.get
+        manager = SensorManager(
+            hass=hass,
+            room_sensor_id="sensor.room_temp",
+            outdoor_sensor_id="sensor.outdoor_temp",
+            power_sensor_id="sensor.ac_power",
+            indoor_humidity_sensor_id="sensor.indoor_humidity",
+        )
+        return hass, manager
+
+    @staticmethod
+    def _state(value, last_updated="t1"):
+        return Mock(state=value, last_updated=last_updated)
+
+    def test_snapshot_values_and_availability(self):
+        """The snapshot holds every reading with its timestamp and availability."""
+        states = {
+            "sensor.room_temp": self._state("24.5"),
+            "sensor.outdoor_temp": self._state(STATE_UNAVAILABLE),
+            "sensor.ac_power": self._state("800", "t2"),
+        }
+        _, manager = self._manager(states)
+
+        snapshot = manager.get_snapshot()
+
+        assert snapshot.room_temp == 24.5
+        assert snapshot.outdoor_temp is None
+        assert snapshot.power == 800.0
+        assert snapshot.room_updated == "t1"
+        assert snapshot.power_updated == "t2"
+        assert snapshot.outdoor_updated is None
+        assert snapshot.available == frozenset({"room", "power"})
+        with pytest.raises(AttributeError):
+            snapshot.room_temp = 20.0
+
+    @pytest.mark.asyncio
+    async def test_snapshot_shared_while_listening_until_change(self):
+        """While listening, reads share one snapshot until a sensor changes."""
+        states = {"sensor.room_temp": self._state("24.5"), "sensor.ac_power": self._state("800")}
+        hass, manager = self._manager(states)
+        manager._remove_listeners.append(Mock())
+
+        assert manager.get_room_temperature() == 24.5
+        assert manager.get_power_consumption() == 800.0
+        assert manager.get_snapshot() is manager.get_snapshot()
+        assert hass.states.get.call_count == 4  # One read per configured sensor
+
+        states["sensor.room_temp"] = self._state("25.0", "t2")
+        assert manager.get_room_temperature() == 24.5
+
+        event = Mock()
+        event.data = {"entity_id": "sensor.room_temp", "old_state": None, "new_state": states["sensor.room_temp"]}
+        await manager._async_sensor_state_changed(event)
+
+        assert manager.get_room_temperature() == 25.0
+
+    def test_reads_are_live_without_listeners(self):
+        """Without listeners a change is not signalled, so readings are not kept."""
+        states = {"sensor.room_temp": self._state("24.5")}
+        _, manager = self._manager(states)
+
+        assert manager.get_room_temperature() == 24.5
+        states["sensor.room_temp"] = self._state("25.0", "t2")
+        assert manager.get_room_temperature() == 25.0
+        assert manager._snapshot is None
+
+    def test_unchanged_state_is_not_parsed_again(self):
+        """The parsed value is reused while last_updated and the raw state are unchanged."""
+        state = self._state("24.5")
+        _, manager = self._manager({"sensor.room_temp": state})
+
+        with patch("custom_components.smart_climate.sensor_manager.float", create=True, side_effect=float) as mock_float:
+            manager.get_room_temperature()
+            manager.get_room_temperature()
+            state.state = "25.0"
+            assert manager.get_room_temperature() == 25.0
+
+        assert mock_float.call_count == 2
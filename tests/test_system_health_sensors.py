@@ -116,6 +116,28 @@ class TestPersistenceLatencySensor:
         sensor = PersistenceLatencySensor(mock_coordinator, "climate.test", mock_config_entry)
         
         assert sensor.native_value is None
+        assert sensor.extra_state_attributes == {}
+        
+    def test_writer_and_restore_attributes(self, mock_coordinator, mock_config_entry):
+        """Test writer queue and restore timings are exposed as attributes."""
+        mock_coordinator.data["system_health"].update({
+            "persistence_queue_depth": 2,
+            "persistence_batch_latency_ms": 4.5,
+            "restore_phase_one_ms": 3.2,
+            "restore_phase_two_ms": 41.0,
+            "restore_phase_two_max_step_ms": 1.5,
+            "learning_hydrated": True,
+        })
+        sensor = PersistenceLatencySensor(mock_coordinator, "climate.test", mock_config_entry)
+        
+        assert sensor.extra_state_attributes == {
+            "persistence_queue_depth": 2,
+            "persistence_batch_latency_ms": 4.5,
+            "restore_phase_one_ms": 3.2,
+            "restore_phase_two_ms": 41.0,
+            "restore_phase_two_max_step_ms": 1.5,
+            "learning_hydrated": True,
+        }
 
 
 class TestOutlierDetectionSensor:
@@ -836,3 +836,56 @@ class TestPassiveThermalModelRefinement:
         assert tau_after_first != initial_cooling_tau
         assert final_tau != tau_after_first
         assert final_tau != initial_cooling_tau
+
+
+class TestPassiveThermalModelDriftCurve:
+    """Test vectorized drift trajectories under an outdoor forecast."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.model = PassiveThermalModel(tau_cooling=90.0, tau_warming=150.0)
+
+    def test_constant_forecast_matches_point_prediction(self):
+        """A flat forecast reproduces predict_drift() at every grid point."""
+        grid = list(range(0, 24 * 60 + 1, 30))
+
+        curve = self.model.predict_drift_curve(22.0, [30.0] * 24, grid, is_cooling=True)
+
+        assert len(curve) == len(grid)
+        for minutes, predicted in zip(grid, curve):
+            assert predicted == pytest.approx(
+                self.model.predict_drift(22.0, 30.0, minutes, is_cooling=True), abs=1e-9
+            )
+
+    def test_piecewise_forecast_integration(self):
+        """Each hour drifts towards that hour's outdoor temperature from where the last ended."""
+        curve = self.model.predict_drift_curve(22.0, [30.0, 18.0], [60, 90, 180], is_cooling=False)
+
+        after_first_hour = self.model.predict_drift(22.0, 30.0, 60, is_cooling=False)
+        assert curve[0] == pytest.approx(after_first_hour)
+        assert curve[1] == pytest.approx(
+            self.model.predict_drift(after_first_hour, 18.0, 30, is_cooling=False)
+        )
+        # Beyond the forecast the last outdoor value is held
+        assert curve[2] == pytest.approx(
+            self.model.predict_drift(after_first_hour, 18.0, 120, is_cooling=False)
+        )
+
+    def test_results_cached_per_tau_and_inputs(self):
+        """Repeated calls reuse the cached array until tau or the inputs change."""
+        first = self.model.predict_drift_curve(22.0, [30.0, 31.0], range(0, 121, 10), True)
+
+        assert self.model.predict_drift_curve(22.0, [30.0, 31.0], range(0, 121, 10), True) is first
+        assert not first.flags.writeable
+
+        self.model._tau_cooling = 60.0
+        retuned = self.model.predict_drift_curve(22.0, [30.0, 31.0], range(0, 121, 10), True)
+        assert retuned is not first
+        assert retuned[-1] > first[-1]
+
+    def test_invalid_inputs(self):
+        """Empty forecasts and negative times are rejected."""
+        with pytest.raises(ValueError):
+            self.model.predict_drift_curve(22.0, [], [0, 60], True)
+        with pytest.raises(ValueError):
+            self.model.predict_drift_curve(22.0, [30.0], [-5], True)
@@ -506,6 +506,65 @@ class TestProbeState:
         # Should not raise exception
         handler.on_exit(mock_context)
 
+    @staticmethod
+    def _run_probe(handler, context, tau_minutes, minutes):
+        """Feed one reading per minute of a warming drift; return (minute, result) of the first transition."""
+        import math
+        start = datetime(2025, 1, 1, 12, 0, 0)
+        handler._probe_start_time = start
+        handler._probe_start_temp = 23.0
+        drift_result = ProbeResult(
+            tau_value=tau_minutes, confidence=0.9, duration=0, fit_quality=0.95, aborted=False
+        )
+        with patch('custom_components.smart_climate.thermal_special_states.datetime') as mock_dt, \
+                patch('custom_components.smart_climate.thermal_utils.analyze_drift_data',
+                      return_value=drift_result):
+            for minute in range(1, minutes + 1):
+                mock_dt.now.return_value = start + timedelta(minutes=minute)
+                context.current_temp = 23.0 + 5.0 * (1 - math.exp(-minute / tau_minutes))
+                result = handler.execute(context, context.current_temp, (22.0, 25.0))
+                if result is not None:
+                    return minute, result
+        return None, None
+
+    def test_probe_stops_early_when_tau_converges(self):
+        """A fast, clean drift ends the probe before the minimum duration and records time saved."""
+        from custom_components.smart_climate.const import CONF_PROBE_EARLY_STOP
+        from custom_components.smart_climate.thermal_special_states import ProbeState
+        
+        handler = ProbeState()
+        context = Mock()
+        context.probe_aborted = False
+        context._config = {CONF_PROBE_EARLY_STOP: True}
+        context.thermal_constants = Mock(min_probe_duration=1800)
+        context.last_probe_time_saved_seconds = 0.0
+        
+        minute, result = self._run_probe(handler, context, tau_minutes=8.0, minutes=30)
+        
+        assert result == ThermalState.CALIBRATING
+        assert 10 <= minute < 30
+        assert context.last_probe_time_saved_seconds == (30 - minute) * 60
+        tau, (low, high) = handler._tau_estimator.estimate()
+        assert low <= 8.0 <= high
+
+    @pytest.mark.parametrize("config", [{}, {"probe_early_stop": False}])
+    def test_probe_early_stop_is_opt_in(self, config):
+        """Unless probe_early_stop is enabled the probe runs to the minimum duration."""
+        from custom_components.smart_climate.thermal_special_states import ProbeState
+        
+        handler = ProbeState()
+        context = Mock()
+        context.probe_aborted = False
+        context._config = config
+        context.thermal_constants = Mock(min_probe_duration=1800)
+        context.last_probe_time_saved_seconds = 0.0
+        
+        minute, result = self._run_probe(handler, context, tau_minutes=8.0, minutes=30)
+        
+        assert result == ThermalState.CALIBRATING
+        assert minute == 30
+        assert context.last_probe_time_saved_seconds == 0.0
+
 
 class TestCalibratingState:
     """Test CalibratingState handler behavior and transitions."""
@@ -0,0 +1,179 @@
+"""ABOUTME: Tests for the optional two-node (air + thermal mass) drift model.
+Covers the recursive mode estimator, the single-tau fallback and the drift trace hooks."""
+
+import json
+import math
+from unittest.mock import Mock
+
+import pytest
+
+from custom_components.smart_climate.thermal_model import PassiveThermalModel
+from custom_components.smart_climate.thermal_two_node import (
+    MIN_TWO_NODE_TRACES,
+    TwoNodeDriftEstimator,
+    TwoNodeThermalModel,
+)
+from tests.fixtures.drift_traces import simulate_drift_traces
+
+
+def _learned_model(traces, anchored=True):
+    """Create a TwoNodeThermalModel that observed the given traces."""
+    model = TwoNodeThermalModel()
+    for trace in traces:
+        model.observe_drift(trace.readings, trace.outdoor_temp if anchored else None)
+    return model
+
+
+class TestTwoNodeDriftEstimator:
+    """Tests for TwoNodeDriftEstimator."""
+
+    def test_recovers_modes_of_heavy_mass_room(self):
+        """The fast and slow modes of the simulated room are found."""
+        model = _learned_model(simulate_drift_traces(12, seed=1))
+
+        tau_fast, tau_slow, fast_fraction = model.two_node_parameters
+
+        # Eigenmodes of the simulated network are ~6.1 and ~392 minutes
+        assert tau_fast == pytest.approx(6.1, rel=0.15)
+        assert tau_slow == pytest.approx(392.0, rel=0.15)
+        assert 0.1 < fast_fraction < 0.4
+
+    def test_light_room_keeps_single_tau(self):
+        """A room without significant mass never activates the second mode."""
+        model = _learned_model(
+            simulate_drift_traces(12, seed=2, air_outdoor_minutes=90.0, mass_ratio=0.02)
+        )
+
+        assert model.two_node_parameters is None
+
+    def test_needs_minimum_traces(self):
+        """Fewer than MIN_TWO_NODE_TRACES traces give no estimate."""
+        model = _learned_model(simulate_drift_traces(MIN_TWO_NODE_TRACES - 1, seed=1))
+
+        assert model._drift_estimator.trace_count == MIN_TWO_NODE_TRACES - 1
+        assert model.two_node_parameters is None
+
+    def test_traces_without_outdoor_do_not_set_fraction(self):
+        """Free-asymptote traces refine the modes but cannot set the fast-mode share."""
+        model = _learned_model(simulate_drift_traces(8, seed=1), anchored=False)
+
+        assert model._drift_estimator.trace_count == 8
+        assert model.two_node_parameters is None
+
+    def test_short_or_invalid_traces_rejected(self):
+        """Traces that are too short or malformed are ignored."""
+        estimator = TwoNodeDriftEstimator()
+
+        assert estimator.update([0, 1, 2], [22.0, 22.1, 22.2], 30.0) is False
+        assert estimator.update(list(range(8)), [22.0 + 0.1 * i for i in range(8)], 30.0) is False
+        assert estimator.update([0, 1], [22.0], 30.0) is False
+        assert estimator.trace_count == 0
+
+        with pytest.raises(ValueError):
+            TwoNodeDriftEstimator(forgetting_factor=0.0)
+
+    def test_persistence_round_trip(self):
+        """Restored statistics give the same estimate and keep learning alike."""
+        traces = simulate_drift_traces(6, seed=3)
+        original = TwoNodeDriftEstimator()
+        for trace in traces[:5]:
+            original.update([ts / 60.0 for ts, _ in trace.readings], [t for _, t in trace.readings], trace.outdoor_temp)
+
+        restored = TwoNodeDriftEstimator()
+        assert restored.restore_from_persistence(original.serialize_for_persistence()) is True
+
+        assert restored.trace_count == 5
+        assert restored.estimate() == original.estimate()
+        last = traces[5]
+        for estimator in (original, restored):
+            estimator.update([ts / 60.0 for ts, _ in last.readings], [t for _, t in last.readings], last.outdoor_temp)
+        assert restored.estimate() == original.estimate()
+
+    def test_restore_rejects_mismatched_state(self):
+        """State from another grid, version or with damaged arrays is discarded."""
+        estimator = TwoNodeDriftEstimator()
+        for trace in simulate_drift_traces(4, seed=4):
+            estimator.update([ts / 60.0 for ts, _ in trace.readings], [t for _, t in trace.readings], trace.outdoor_temp)
+        saved = estimator.serialize_for_persistence()
+
+        assert TwoNodeDriftEstimator(grid_size=32).restore_from_persistence(saved) is False
+        for damaged in (
+            {**saved, "version": 99},
+            {**saved, "pair_deviance": saved["pair_deviance"][:-8]},
+            {**saved, "single_deviance": "not base64!"},
+            {**saved, "points": -1.0},
+            {key: value for key, value in saved.items() if key != "fraction_sum"},
+            None,
+        ):
+            target = TwoNodeDriftEstimator()
+            assert target.restore_from_persistence(damaged) is False
+            assert target.trace_count == 0
+
+
+class TestTwoNodeThermalModel:
+    """Tests for TwoNodeThermalModel predictions."""
+
+    def test_falls_back_to_single_tau(self):
+        """Without learned modes predictions equal PassiveThermalModel."""
+        model = TwoNodeThermalModel(tau_cooling=80.0, tau_warming=140.0)
+        single = PassiveThermalModel(tau_cooling=80.0, tau_warming=140.0)
+
+        for minutes in (0, 15, 60, 240):
+            assert model.predict_drift(22.0, 30.0, minutes, False) == single.predict_drift(
+                22.0, 30.0, minutes, False
+            )
+
+    def test_two_mode_prediction(self):
+        """Learned modes give the fast-then-slow drift on the predict_drift interface."""
+        model = TwoNodeThermalModel()
+        model._two_node_parameters = (6.0, 400.0, 0.25)
+
+        predicted = model.predict_drift(22.0, 30.0, 60, is_cooling=False)
+
+        remaining = 0.25 * math.exp(-60 / 6.0) + 0.75 * math.exp(-60 / 400.0)
+        assert predicted == pytest.approx(30.0 - 8.0 * remaining)
+        assert model.predict_drift(22.0, 30.0, 0, False) == 22.0
+        with pytest.raises(ValueError):
+            model.predict_drift(22.0, 30.0, -1, False)
+
+    def test_curve_uses_both_modes(self):
+        """Drift curves with a flat forecast match the two-mode point predictions."""
+        model = TwoNodeThermalModel()
+        model._two_node_parameters = (6.0, 400.0, 0.25)
+        grid = [0, 10, 60, 180]
+
+        curve = model.predict_drift_curve(22.0, [30.0] * 4, grid, is_cooling=False)
+
+        for minutes, predicted in zip(grid, curve):
+            assert predicted == pytest.approx(model.predict_drift(22.0, 30.0, minutes, False))
+
+
+def test_thermal_manager_passes_drift_events_to_model():
+    """ThermalManager forwards drift traces with the last known outdoor temperature."""
+    from custom_components.smart_climate.thermal_manager import ThermalManager
+
+    model = Mock(spec=TwoNodeThermalModel)
+    manager = ThermalManager(Mock(), model, Mock(), config={})
+    manager._last_outdoor_temp = 31.0
+    drift_data = [(float(60 * i), 22.0 + 0.1 * i) for i in range(12)]
+
+    manager.observe_drift_event(drift_data)
+
+    model.observe_drift.assert_called_once_with(drift_data, 31.0)
+
+
+def test_thermal_manager_persists_two_node_statistics():
+    """Learned drift modes survive a save and restore of the thermal data."""
+    from custom_components.smart_climate.thermal_manager import ThermalManager
+
+    model = _learned_model(simulate_drift_traces(12, seed=1))
+    saved = json.loads(json.dumps(ThermalManager(Mock(), model, Mock(), config={}).serialize()))
+
+    restored_model = TwoNodeThermalModel()
+    ThermalManager(Mock(), restored_model, Mock(), config={}).restore(saved)
+
+    assert restored_model.two_node_parameters == model.two_node_parameters
+    assert restored_model._drift_estimator.trace_count == 12
+    assert "two_node_model" not in ThermalManager(
+        Mock(), PassiveThermalModel(), Mock(), config={}
+    ).serialize()
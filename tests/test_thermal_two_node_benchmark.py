@@ -0,0 +1,84 @@
+"""ABOUTME: Benchmark of drift prediction error for the single-tau and two-node thermal models.
+Trains both on recorded drift traces and compares mean absolute error on held-out traces."""
+
+from typing import Dict, Iterable, List
+
+import pytest
+
+from custom_components.smart_climate.thermal_model import PassiveThermalModel
+from custom_components.smart_climate.thermal_models import ProbeResult
+from custom_components.smart_climate.thermal_two_node import TwoNodeThermalModel
+from custom_components.smart_climate.thermal_utils import fit_exponential_drift
+from tests.fixtures.drift_traces import DriftTrace, simulate_drift_traces
+
+HORIZONS_MINUTES = (15, 30, 60, 90)
+TRAINING_TRACES = 12
+
+
+def _train(model: PassiveThermalModel, traces: Iterable[DriftTrace]) -> None:
+    """Feed traces to a model the way the passive learning path does."""
+    for trace in traces:
+        times = [timestamp / 60.0 for timestamp, _ in trace.readings]
+        temps = [temp for _, temp in trace.readings]
+        fit = fit_exponential_drift(times, temps)
+        if fit is not None:
+            probe = ProbeResult(
+                tau_value=fit.tau, confidence=fit.fit_quality, duration=int(times[-1] - times[0]) * 60,
+                fit_quality=fit.fit_quality, aborted=False, outdoor_temp=trace.outdoor_temp,
+            )
+            model.update_tau(probe, is_cooling=False)
+        if hasattr(model, "observe_drift"):
+            model.observe_drift(trace.readings, trace.outdoor_temp)
+
+
+def drift_prediction_mae(
+    model: PassiveThermalModel, traces: Iterable[DriftTrace], horizons=HORIZONS_MINUTES
+) -> Dict[int, float]:
+    """Return the MAE per horizon of predicting each trace from its first reading."""
+    errors: Dict[int, List[float]] = {horizon: [] for horizon in horizons}
+    for trace in traces:
+        start_ts, start_temp = trace.readings[0]
+        by_minute = {round((ts - start_ts) / 60.0): temp for ts, temp in trace.readings}
+        for horizon in horizons:
+            if horizon in by_minute:
+                predicted = model.predict_drift(start_temp, trace.outdoor_temp, horizon, is_cooling=False)
+                errors[horizon].append(abs(predicted - by_minute[horizon]))
+    return {horizon: sum(values) / len(values) for horizon, values in errors.items() if values}
+
+
+def _compare(traces: List[DriftTrace]) -> Dict[str, Dict[int, float]]:
+    """Train both models on the first traces and score them on the rest."""
+    training, held_out = traces[:TRAINING_TRACES], traces[TRAINING_TRACES:]
+    single, two_node = PassiveThermalModel(), TwoNodeThermalModel()
+    _train(single, training)
+    _train(two_node, training)
+    results = {
+        "single": drift_prediction_mae(single, held_out),
+        "two_node": drift_prediction_mae(two_node, held_out),
+    }
+    print(
+        "\n" + " ".join(
+            f"{horizon}min single={results['single'][horizon]:.2f} two_node={results['two_node'][horizon]:.2f}"
+            for horizon in results["single"]
+        )
+    )
+    return results
+
+
+def test_two_node_model_beats_single_tau_on_heavy_mass_room():
+    """Fast-then-slow drift is predicted far better with the second mode."""
+    results = _compare(simulate_drift_traces(30, seed=11))
+
+    for horizon in HORIZONS_MINUTES:
+        assert results["two_node"][horizon] < 0.5 * results["single"][horizon]
+    assert max(results["two_node"].values()) < 0.3
+
+
+def test_two_node_model_matches_single_tau_on_light_room():
+    """Without significant mass the two-node model keeps the single-tau predictions."""
+    results = _compare(
+        simulate_drift_traces(30, seed=12, air_outdoor_minutes=90.0, mass_ratio=0.02)
+    )
+
+    for horizon in HORIZONS_MINUTES:
+        assert results["two_node"][horizon] == pytest.approx(results["single"][horizon])
@@ -5,7 +5,12 @@ import pytest
 import numpy as np
 from typing import List, Tuple, Optional
 
-from custom_components.smart_climate.thermal_utils import exponential_decay, analyze_drift_data
+from custom_components.smart_climate.thermal_utils import (
+    exponential_decay,
+    analyze_drift_data,
+    fit_exponential_drift,
+    OnlineTauEstimator,
+)
 from custom_components.smart_climate.thermal_models import ProbeResult
 
 
@@ -169,4 +174,101 @@ class TestAnalyzeDriftData:
         # Test with points that don't have 2 elements
         invalid_data2 = [(1, 2, 3), (4, 5, 6)]
         result2 = analyze_drift_data(invalid_data2)
-        assert result2 is None
\ No newline at end of file
+        assert result2 is None
+
+
+class TestFitExponentialDrift:
+    """Test the robust least-squares exponential fit."""
+
+    @staticmethod
+    def _drift(tau, count, span, noise=0.0, seed=0):
+        """Return (times, temps) of a warming drift from 22°C towards 30°C."""
+        rng = np.random.default_rng(seed)
+        times = np.linspace(0.0, span, count)
+        temps = exponential_decay(times, 30.0, 22.0, tau) + rng.normal(0.0, noise, count)
+        return times, temps
+
+    def test_recovers_parameters_from_clean_data(self):
+        """Noise-free data gives the exact tau and asymptote."""
+        times, temps = self._drift(tau=90.0, count=20, span=120.0)
+
+        fit = fit_exponential_drift(times, temps)
+
+        assert fit.tau == pytest.approx(90.0, rel=1e-3)
+        assert fit.t_final == pytest.approx(30.0, abs=0.01)
+        assert fit.t_initial == pytest.approx(22.0, abs=0.01)
+        assert fit.rmse < 1e-3
+        assert fit.fit_quality > 0.95
+
+    def test_interval_contains_true_tau_with_noise(self):
+        """The tau interval covers the true value for noisy readings."""
+        times, temps = self._drift(tau=90.0, count=30, span=90.0, noise=0.05, seed=3)
+
+        fit = fit_exponential_drift(times, temps)
+
+        low, high = fit.tau_interval
+        assert low < 90.0 < high
+        assert fit.rmse == pytest.approx(0.05, rel=0.5)
+
+    def test_outliers_rejected(self):
+        """A single large glitch is rejected and does not bias tau."""
+        times, temps = self._drift(tau=60.0, count=25, span=90.0, noise=0.03, seed=5)
+        temps[12] += 2.0
+
+        fit = fit_exponential_drift(times, temps)
+
+        assert fit.rejected_count >= 1
+        assert fit.inlier_count == 25 - fit.rejected_count
+        assert fit.tau == pytest.approx(60.0, rel=0.1)
+
+    def test_short_probe_gives_wide_interval(self):
+        """Observing a small part of a slow drift lowers fit quality."""
+        long_times, long_temps = self._drift(tau=150.0, count=30, span=300.0, noise=0.05, seed=7)
+        short_times, short_temps = self._drift(tau=150.0, count=10, span=20.0, noise=0.05, seed=7)
+
+        long_fit = fit_exponential_drift(long_times, long_temps)
+        short_fit = fit_exponential_drift(short_times, short_temps)
+
+        assert short_fit.fit_quality < long_fit.fit_quality
+
+    def test_insufficient_or_flat_data(self):
+        """Too few points or no drift cannot be fitted."""
+        assert fit_exponential_drift([0.0, 1.0, 2.0], [22.0, 22.5, 23.0]) is None
+        assert fit_exponential_drift([0.0, 1.0, 2.0, 3.0], [22.0] * 4) is None
+        assert fit_exponential_drift([0.0, 0.0, 0.0, 0.0], [22.0, 23.0, 24.0, 25.0]) is None
+
+
+class TestOnlineTauEstimator:
+    """Test the streaming tau estimator used for probe early stopping."""
+
+    def test_converges_on_clean_drift(self):
+        """Readings of a fast drift give a narrow interval around the true tau."""
+        estimator = OnlineTauEstimator()
+        for minute in range(1, 31):
+            estimator.add(float(minute), float(exponential_decay(minute, 28.0, 23.0, 8.0)))
+
+        tau, (low, high) = estimator.estimate()
+
+        assert estimator.count == 30
+        assert tau == pytest.approx(8.0, rel=0.05)
+        assert low <= 8.0 <= high
+        assert estimator.relative_interval_width() < 0.15
+
+    def test_noisy_slow_drift_stays_wide(self):
+        """A short window on a slow, noisy drift does not look converged."""
+        rng = np.random.default_rng(3)
+        estimator = OnlineTauEstimator()
+        for minute in range(1, 16):
+            temp = exponential_decay(minute, 28.0, 23.0, 180.0) + rng.normal(0.0, 0.1)
+            estimator.add(float(minute), float(temp))
+
+        assert estimator.relative_interval_width() > 0.15
+
+    def test_too_few_readings(self):
+        """Fewer than four readings give no estimate."""
+        estimator = OnlineTauEstimator()
+        for minute in range(3):
+            estimator.add(float(minute), 23.0 + 0.1 * minute)
+
+        assert estimator.estimate() is None
+        assert estimator.relative_interval_width() == float("inf")
@@ -224,4 +224,81 @@ class TestExponentialDecayWeighting:
         result = model._calculate_weighted_tau(is_cooling=True)
         
         # Should be exactly 100.0 since it's fresh with effective confidence 1.0
-        assert abs(result - 100.0) < 0.01, f"Expected 100.0, got {result}"
\ No newline at end of file
+        assert abs(result - 100.0) < 0.01, f"Expected 100.0, got {result}"
+
+class TestIncrementalProbeAggregates:
+    """Test that the incrementally maintained aggregates match a full recomputation."""
+
+    @staticmethod
+    def _brute_force_tau(probes):
+        """Weighted tau computed directly from probe ages."""
+        now = datetime.now(timezone.utc)
+        weights = [
+            DECAY_RATE_PER_DAY ** ((now - p.timestamp).total_seconds() / 86400)
+            * (p.confidence if p.confidence is not None else 1.0)
+            for p in probes
+        ]
+        return sum(p.tau_value * w for p, w in zip(probes, weights)) / sum(weights)
+
+    @staticmethod
+    def _probes(count, seed=0):
+        """Probes spread over several seasons, partly out of order."""
+        import random
+        rng = random.Random(seed)
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        return [
+            ProbeResult(
+                tau_value=rng.uniform(60.0, 200.0),
+                confidence=rng.choice([None, rng.uniform(0.2, 1.0)]),
+                duration=3600,
+                fit_quality=0.9,
+                aborted=False,
+                timestamp=start + timedelta(days=index * 2 + rng.uniform(-3.0, 3.0)),
+                outdoor_temp=rng.uniform(-15.0, 35.0),
+            )
+            for index in range(count)
+        ]
+
+    def test_matches_full_recomputation_through_evictions(self):
+        """Sums, diversity and last probe time survive many evictions unchanged."""
+        model = PassiveThermalModel(tau_cooling=90.0, tau_warming=150.0)
+        probes = self._probes(400)
+
+        for probe in probes:
+            model.update_tau(probe, is_cooling=True)
+
+        window = probes[-model._probe_history.maxlen:]
+        assert model._calculate_weighted_tau(is_cooling=True) == pytest.approx(
+            self._brute_force_tau(window), rel=1e-9
+        )
+        assert model.get_last_probe_time() == max(p.timestamp for p in window)
+        expected_bins = {model._get_temperature_bin_index(p.outdoor_temp) for p in window}
+        assert model._calculate_diversity_score() == len(expected_bins) / 6
+
+    def test_external_history_changes_are_detected(self):
+        """Direct edits to _probe_history are picked up on the next read."""
+        model = PassiveThermalModel(tau_cooling=90.0, tau_warming=150.0)
+        probes = self._probes(10, seed=1)
+        for probe in probes[:5]:
+            model.update_tau(probe, is_cooling=True)
+
+        model._probe_history.clear()
+        model._probe_history.extend(probes[5:])
+        assert model._calculate_weighted_tau(is_cooling=True) == pytest.approx(
+            self._brute_force_tau(probes[5:]), rel=1e-9
+        )
+
+        model._probe_history = list(probes[:3])
+        assert model.get_probe_count() == 3
+        assert model._calculate_weighted_tau(is_cooling=True) == pytest.approx(
+            self._brute_force_tau(probes[:3]), rel=1e-9
+        )
+
+    def test_temperature_bin_boundaries(self):
+        """Bin lookup keeps the below-first and above-last bins."""
+        model = PassiveThermalModel()
+
+        assert model._get_temperature_bin_index(-20.0) == 0
+        assert model._get_temperature_bin_index(-10.0) == 1
+        assert model._get_temperature_bin_index(29.9) == 4
+        assert model._get_temperature_bin_index(30.0) == 5